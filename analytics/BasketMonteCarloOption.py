@@ -0,0 +1,173 @@
+import numpy as np
+from analytics.MonteCarloSampling import MonteCarloSampler
+
+'''
+This section prices a European option on a basket of several stocks, ie the
+payoff is Max(w1 S1 + w2 S2 + ... - K, 0) for a call, using Monte Carlo.
+A spread option (S1 - S2 - K) is just a basket with weights of 1 and -1.
+
+Each stock follows its own geometric brownian motion with its own vol, and
+the brownian motions are correlated.   The Cholesky factor L of the
+correlation matrix (L L' = correlation) is calculated once when the object
+is built.   For each chunk of paths an (assets x paths) block of independent
+normal numbers Z is drawn and L x Z gives the correlated normal numbers in a
+single matrix multiply.
+
+As in BasicMonteCarloOption, the final stock prices are the initial stock
+prices multiplied by the simulated multipliers.   npStock holds one row for
+each set of initial stock prices and one column for each asset, so the
+basket value for every row and path is (npStock x weights) multiplied by the
+(assets x paths) matrix of multipliers.
+
+The paths are run in chunks of intChunkSize paths and only the running mean
+and M2 of the results are kept (see MonteCarloSampler.getChunkedMeanAndSTD),
+so the memory used does not grow with the number of paths.   The chunks
+use their own random number generator seeded with intSeed (or a seed drawn
+from np.random if this is not set, so np.random.seed still works).
+
+The delta for each asset bumps that asset's stock price by 1% and uses the
+same paths (common random numbers), as extra rows.   The price functions
+return (value, std) in the same way as BasicMonteCarloOption, while the
+delta and gamma return (number of rows x number of assets) matrices.
+'''
+
+
+class BasketMonteCarloOption():
+
+    # Private Functions
+
+    def __init__(self, npWeights, fltStrike, npVols, npCorrelation,
+                 fltRiskFreeRate, fltTimeToMaturity, boolIsCall, intNoIter,
+                 intChunkSize=10000, intSeed=None):
+        self.__npWeights = np.asarray(npWeights, dtype=np.float64)
+        self.__fltStrike = fltStrike
+        self.__npVols = np.asarray(npVols, dtype=np.float64)
+        self.__npCorrelation = np.asarray(npCorrelation, dtype=np.float64)
+        self.__fltRiskFreeRate = fltRiskFreeRate
+        self.__fltTimeToMaturity = fltTimeToMaturity
+        self.__boolIsCall = boolIsCall
+        self.__intNoIter = intNoIter
+        self.__intChunkSize = intChunkSize
+        self.__intSeed = intSeed
+        self.__objSampler = MonteCarloSampler()
+
+        intNoAssets = len(self.__npWeights)
+        if self.__npVols.shape != (intNoAssets,) or \
+                self.__npCorrelation.shape != (intNoAssets, intNoAssets):
+            raise ValueError('Weights, vols and correlation do not have '
+                             'the same number of assets')
+        try:
+            self.__npCholesky = np.linalg.cholesky(self.__npCorrelation)
+        except np.linalg.LinAlgError:
+            raise ValueError('Correlation matrix is not positive definite')
+
+        # The drift and vol of each asset's log multiplier, as columns
+        self.__npDrift = ((fltRiskFreeRate - 0.5 * self.__npVols ** 2)
+                          * fltTimeToMaturity)[:, np.newaxis]
+        self.__npVolRootT = (self.__npVols
+                             * np.sqrt(fltTimeToMaturity))[:, np.newaxis]
+
+    def __str__(self):
+        strF = 'BasketMonteCarloOption: [Weights:{weights}; ' \
+               'Strike:{strike}; Vols:{vols}; RFRate:{rfrate}; ' \
+               'Time:{time}; IsCall:{iscall}; NoIter:{noiter}]'
+        return strF.format(weights=self.__npWeights.tolist(),
+                           strike=self.__fltStrike,
+                           vols=self.__npVols.tolist(),
+                           rfrate=self.__fltRiskFreeRate,
+                           time=self.__fltTimeToMaturity,
+                           iscall=self.__boolIsCall,
+                           noiter=self.__intNoIter)
+
+    def __getSeed(self):
+        if self.__intSeed is not None:
+            return self.__intSeed
+        return np.random.randint(2 ** 31)
+
+    def __getChunks(self, npStockPrice):
+        # Yield the discounted payoff for each chunk of paths, with a row
+        # for each row of npStockPrice.
+        objRandom = np.random.RandomState(self.__getSeed())
+        fltPV = np.exp(-self.__fltRiskFreeRate * self.__fltTimeToMaturity)
+        npWeighted = npStockPrice * self.__npWeights
+        intNoAssets = len(self.__npWeights)
+        intDone = 0
+        while intDone < self.__intNoIter:
+            intNoIter = min(self.__intChunkSize, self.__intNoIter - intDone)
+
+            # Correlated normal numbers, then the multipliers
+            Z = objRandom.standard_normal((intNoAssets, intNoIter))
+            npMult = np.exp(self.__npDrift
+                            + self.__npVolRootT * (self.__npCholesky @ Z))
+
+            npBasket = npWeighted @ npMult
+            if self.__boolIsCall:
+                npPayoff = np.maximum(npBasket - self.__fltStrike, 0)
+            else:
+                npPayoff = np.maximum(self.__fltStrike - npBasket, 0)
+            yield npPayoff * fltPV
+            intDone += intNoIter
+
+    def __getBumpedStock(self, npStockPrice, lstBumps):
+        # Stack npStockPrice with a copy for each asset and each bump, eg
+        # for lstBumps = [0.01] the rows are [S, S with asset 0 bumped,
+        # S with asset 1 bumped, ...]
+        lstStock = [npStockPrice]
+        for fltBump in lstBumps:
+            for j in range(0, len(self.__npWeights)):
+                npBumped = npStockPrice.copy()
+                npBumped[:, j] *= 1 + fltBump
+                lstStock.append(npBumped)
+        return np.concatenate(lstStock)
+
+    def __splitMeanAndSTD(self, npMean, npSTD, intNoRows):
+        # Turn the stacked results back into (rows x assets) matrices
+        return (np.reshape(npMean, (-1, intNoRows)).T,
+                np.reshape(npSTD, (-1, intNoRows)).T)
+
+    # Public Functions
+
+    def getOptionPrice(self, npStock):
+        # npStock is (number of rows x number of assets)
+        npStockPrice = np.reshape(np.asarray(npStock, dtype=np.float64),
+                                  (-1, len(self.__npWeights)))
+        return self.__objSampler.getChunkedMeanAndSTD(
+            self.__getChunks(npStockPrice))
+
+    def getOptionDelta(self, npStock):
+
+        # Every bumped stock price uses the same paths
+        npStockPrice = np.reshape(np.asarray(npStock, dtype=np.float64),
+                                  (-1, len(self.__npWeights)))
+        intNoRows = len(npStockPrice)
+        npBump = (npStockPrice.T.ravel() * 0.01)[:, np.newaxis]
+        npStacked = self.__getBumpedStock(npStockPrice, [0.01])
+
+        def getDelta(npValues):
+            npPV = np.tile(npValues[:intNoRows], (len(self.__npWeights), 1))
+            return (npValues[intNoRows:] - npPV) / npBump
+
+        (npMean, npSTD) = self.__objSampler.getChunkedMeanAndSTD(
+            getDelta(npV) for npV in self.__getChunks(npStacked))
+        return self.__splitMeanAndSTD(npMean, npSTD, intNoRows)
+
+    def getOptionGamma(self, npStock):
+
+        # Again, the bumped stock prices use the same paths
+        npStockPrice = np.reshape(np.asarray(npStock, dtype=np.float64),
+                                  (-1, len(self.__npWeights)))
+        intNoRows = len(npStockPrice)
+        intNoBumped = intNoRows * len(self.__npWeights)
+        npBump = (npStockPrice.T.ravel() * 0.01)[:, np.newaxis]
+        npStacked = self.__getBumpedStock(npStockPrice, [0.01, -0.01])
+
+        def getGamma(npValues):
+            npPV = np.tile(npValues[:intNoRows], (len(self.__npWeights), 1))
+            npPVBumpPlus = npValues[intNoRows:intNoRows + intNoBumped]
+            npPVBumpMinus = npValues[intNoRows + intNoBumped:]
+            return (npPVBumpPlus - (2 * npPV) + npPVBumpMinus) \
+                / (npBump * npBump)
+
+        (npMean, npSTD) = self.__objSampler.getChunkedMeanAndSTD(
+            getGamma(npV) for npV in self.__getChunks(npStacked))
+        return self.__splitMeanAndSTD(npMean, npSTD, intNoRows)
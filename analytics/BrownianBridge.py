@@ -0,0 +1,101 @@
+import numpy as np
+from collections import deque
+
+'''
+This section builds brownian motion paths using a Brownian Bridge rather than
+adding the steps together one after another.
+
+The first normal number is used to set the final point of the path, the
+second sets the middle point (given the start and end), the next two set the
+quarter points and so on.   This means the first few numbers decide most of
+the shape of the path.   With pseudo random numbers this makes no difference,
+but with low discrepancy numbers (eg Sobol) the first dimensions are much
+better distributed than the later ones, so the bridge gives a much lower
+error when there are many steps in the path.
+
+The order in which the points are filled in and the weights used are only
+dependent upon the time grid, so they are calculated once when the object is
+built.   The construction then uses one vectorised calculation across all of
+the paths for each point in the grid.
+
+Note that the bridge needs every dimension at the same time, so it uses a
+(number of steps x number of paths) matrix.
+'''
+
+
+class BrownianBridge():
+
+    # Private Functions
+
+    def __init__(self, npTimes):
+        # npTimes is the time grid, starting at 0, eg from getTimeGrid.
+        self.__npTimes = np.asarray(npTimes, dtype=np.float64)
+        self.__intNoSteps = len(self.__npTimes) - 1
+
+        # For each normal number (row), record which point it builds, the
+        # points either side of it and the weights.   Point 0 is the start
+        # of the path which is always 0.
+        intN = self.__intNoSteps
+        self.__npBridgeIndex = np.zeros(intN, dtype=int)
+        self.__npLeftIndex = np.zeros(intN, dtype=int)
+        self.__npRightIndex = np.zeros(intN, dtype=int)
+        self.__npLeftWeight = np.zeros(intN)
+        self.__npRightWeight = np.zeros(intN)
+        self.__npStdDev = np.zeros(intN)
+
+        # The first number sets the final point
+        self.__npBridgeIndex[0] = intN
+        self.__npStdDev[0] = np.sqrt(self.__npTimes[intN])
+
+        # Then fill in the middle of each gap, biggest gaps first
+        qGaps = deque([(0, intN)])
+        i = 1
+        while qGaps:
+            (intLeft, intRight) = qGaps.popleft()
+            if intRight - intLeft < 2:
+                continue
+            intMid = (intLeft + intRight) // 2
+            fltTL = self.__npTimes[intLeft]
+            fltTM = self.__npTimes[intMid]
+            fltTR = self.__npTimes[intRight]
+            self.__npBridgeIndex[i] = intMid
+            self.__npLeftIndex[i] = intLeft
+            self.__npRightIndex[i] = intRight
+            self.__npLeftWeight[i] = (fltTR - fltTM) / (fltTR - fltTL)
+            self.__npRightWeight[i] = (fltTM - fltTL) / (fltTR - fltTL)
+            self.__npStdDev[i] = np.sqrt(
+                (fltTM - fltTL) * (fltTR - fltTM) / (fltTR - fltTL))
+            qGaps.append((intLeft, intMid))
+            qGaps.append((intMid, intRight))
+            i += 1
+
+    def __str__(self):
+        strF = 'BrownianBridge: [NoSteps:{nosteps}; Time:{time}]'
+        return strF.format(nosteps=self.__intNoSteps,
+                           time=self.__npTimes[-1])
+
+    # Public Functions
+
+    def getNoSteps(self):
+        return self.__intNoSteps
+
+    def buildPath(self, npZ):
+        # npZ is a (number of steps x number of paths) matrix of normal
+        # numbers, with the most important dimension in the first row.
+        # Returns the brownian motion W at every point in the time grid,
+        # including the start, ie (number of steps + 1 x number of paths)
+        npW = np.zeros((self.__intNoSteps + 1, npZ.shape[1]))
+        for i in range(0, self.__intNoSteps):
+            npW[self.__npBridgeIndex[i]] = \
+                self.__npLeftWeight[i] * npW[self.__npLeftIndex[i]] \
+                + self.__npRightWeight[i] * npW[self.__npRightIndex[i]] \
+                + self.__npStdDev[i] * npZ[i]
+        return npW
+
+    def getIncrements(self, npZ):
+        # Returns the increments of the path divided by sqrt(dt), ie a
+        # (number of steps x number of paths) matrix of standard normal
+        # numbers that can be used one step at a time.
+        npW = self.buildPath(npZ)
+        npDT = np.diff(self.__npTimes)
+        return np.diff(npW, axis=0) / np.sqrt(npDT)[:, np.newaxis]
@@ -0,0 +1,230 @@
+import numpy as np
+import numpy.polynomial.chebyshev as cheb
+
+'''
+This section builds a fast approximation (proxy) of a slow pricer, eg
+BasicMonteCarloOption, so that prices and greeks can be calculated in
+microseconds once the proxy has been built.
+
+The pricer is run once, offline, at Chebyshev nodes in the stock price and
+optionally also the vol and the time to maturity.   The price is then
+approximated by a sum of Chebyshev polynomials in each of these (a tensor
+product), which converges very quickly for smooth functions and does not
+suffer from the wiggles you get when fitting a polynomial through evenly
+spaced points.   The derivatives of the Chebyshev series are found exactly
+using numpy's chebder, so the delta and gamma (and vega and theta if the vol
+and time are included) come from the same proxy without bumping.
+
+The pricer is a function pricer(npStock, fltVol=..., fltTime=...) that
+returns the price for each stock price in npStock, where fltVol and fltTime
+are only passed if they are part of the proxy.   Note that a Monte Carlo
+pricer should use the same random numbers at every node (eg by calling
+np.random.seed inside the pricer), otherwise the proxy will try to fit the
+random noise.
+
+The proxy is only valid inside the ranges it was built on, so an error is
+raised if it is used outside of them.   checkError compares the proxy with
+the pricer at random points inside the ranges.   save writes the proxy to
+disk (using np.savez) and loadChebyshevProxy reads it back, so a pricing
+process can start without rebuilding it.
+
+The greeks are returned in the same units as BlackScholes, ie vega for a 1%
+move and theta for 1 day.
+'''
+
+
+class ChebyshevProxy():
+
+    # Private Functions
+
+    def __init__(self, tpSpotRange, intSpotNodes=20, tpVolRange=None,
+                 intVolNodes=10, tpTimeRange=None, intTimeNodes=10):
+        # A dimension that is not used has a single node and no range
+        self.__lstRanges = [tuple(tpSpotRange),
+                            None if tpVolRange is None else tuple(tpVolRange),
+                            None if tpTimeRange is None
+                            else tuple(tpTimeRange)]
+        self.__lstNoNodes = [intSpotNodes,
+                             1 if tpVolRange is None else intVolNodes,
+                             1 if tpTimeRange is None else intTimeNodes]
+        for tpRange in self.__lstRanges:
+            if tpRange is not None and not tpRange[0] < tpRange[1]:
+                raise ValueError('Invalid range: ' + str(tpRange))
+        self.__npCoef = None
+        self.__npDelta = None
+        self.__npGamma = None
+        self.__npVega = None
+        self.__npTheta = None
+        self.__funcPricer = None
+
+    def __str__(self):
+        strF = 'ChebyshevProxy: [SpotRange:{spot}; VolRange:{vol}; ' \
+               'TimeRange:{time}; NoNodes:{nodes}]'
+        return strF.format(spot=self.__lstRanges[0],
+                           vol=self.__lstRanges[1],
+                           time=self.__lstRanges[2],
+                           nodes=self.__lstNoNodes)
+
+    def __getNodes(self, intDim):
+        # Chebyshev points (of the first kind) on [-1, 1] and the same
+        # points within the range
+        intN = self.__lstNoNodes[intDim]
+        npX = np.cos(np.pi * (np.arange(intN) + 0.5) / intN)
+        if self.__lstRanges[intDim] is None:
+            return (npX, npX)
+        (fltA, fltB) = self.__lstRanges[intDim]
+        return (npX, fltA + (npX + 1) * (fltB - fltA) / 2)
+
+    def __toUnit(self, intDim, npValue):
+        # Map a value in the range onto [-1, 1]
+        strName = ('stock price', 'vol', 'time')[intDim]
+        if npValue is None:
+            raise ValueError('The proxy was built with the ' + strName
+                             + ', so it must be given')
+        (fltA, fltB) = self.__lstRanges[intDim]
+        npValue = np.asarray(npValue, dtype=np.float64)
+        if np.any(np.isnan(npValue)):
+            raise ValueError('The ' + strName + ' is not a number')
+        if np.any(npValue < fltA) or np.any(npValue > fltB):
+            raise ValueError('Value outside of the proxy range: '
+                             + str(self.__lstRanges[intDim]))
+        return 2 * (npValue - fltA) / (fltB - fltA) - 1
+
+    def __getKwargs(self, fltVol, fltTime):
+        dctKwargs = dict()
+        if self.__lstRanges[1] is not None:
+            dctKwargs['fltVol'] = fltVol
+        if self.__lstRanges[2] is not None:
+            dctKwargs['fltTime'] = fltTime
+        return dctKwargs
+
+    def __getBasis(self, intDim, npValue, intN):
+        # T_0 ... T_n-1 at the values, using T_k(x) = Cos(k ArcCos(x)).   A
+        # dimension that is not used only has T_0 = 1.
+        if self.__lstRanges[intDim] is None:
+            return np.ones((np.size(npValue), intN))
+        npX = np.ravel(self.__toUnit(intDim, npValue))
+        return np.cos(np.multiply.outer(np.arccos(npX), np.arange(intN)))
+
+    def __evaluate(self, npCoef, npStock, fltVol, fltTime):
+        # Sum the series over time, then vol, then the stock price
+        if self.__npCoef is None:
+            raise ValueError('The proxy has not been built')
+        npCoef = npCoef @ self.__getBasis(2, fltTime, npCoef.shape[2])[0]
+        npCoef = npCoef @ self.__getBasis(1, fltVol, npCoef.shape[1])[0]
+        return self.__getBasis(0, npStock, npCoef.shape[0]) @ npCoef
+
+    def __getDerivative(self, intDim, intOrder):
+        # Coefficients of the derivative, scaled from [-1, 1] to the range
+        (fltA, fltB) = self.__lstRanges[intDim]
+        npCoef = cheb.chebder(self.__npCoef, m=intOrder, axis=intDim)
+        npCoef = npCoef * (2 / (fltB - fltA)) ** intOrder
+        if npCoef.shape[intDim] == 0:
+            npCoef = np.zeros(self.__npCoef.shape)
+        return npCoef
+
+    # Public Functions
+
+    def setCoefficients(self, npCoef):
+        # Set the Chebyshev coefficients directly, eg from a saved proxy,
+        # with one axis for the stock price, vol and time.
+        npCoef = np.ascontiguousarray(npCoef, dtype=np.float64)
+        if list(npCoef.shape) != self.__lstNoNodes:
+            raise ValueError('Coefficients do not match the number of nodes')
+        self.__npCoef = npCoef
+        self.__npDelta = self.__getDerivative(0, 1)
+        self.__npGamma = self.__getDerivative(0, 2)
+        if self.__lstRanges[1] is not None:
+            self.__npVega = self.__getDerivative(1, 1)
+        if self.__lstRanges[2] is not None:
+            self.__npTheta = self.__getDerivative(2, 1)
+
+    def build(self, funcPricer):
+        # Run the pricer at every node, with all of the stock prices for a
+        # given vol and time in one call.
+        (npX, npSpot) = self.__getNodes(0)
+        (npY, npVol) = self.__getNodes(1)
+        (npZ, npTime) = self.__getNodes(2)
+        npValues = np.empty(self.__lstNoNodes)
+        for j in range(0, len(npVol)):
+            for k in range(0, len(npTime)):
+                npValues[:, j, k] = funcPricer(
+                    npSpot, **self.__getKwargs(npVol[j], npTime[k]))
+
+        # The Chebyshev polynomials at the nodes form a square matrix in
+        # each dimension, so the coefficients come from solving along
+        # each axis in turn.
+        npCoef = npValues
+        for (intDim, npNodes) in enumerate((npX, npY, npZ)):
+            npVander = cheb.chebvander(npNodes, len(npNodes) - 1)
+            npCoef = np.moveaxis(np.tensordot(
+                np.linalg.inv(npVander), npCoef, axes=(1, intDim)),
+                0, intDim)
+        self.setCoefficients(npCoef)
+        self.__funcPricer = funcPricer
+
+    def checkError(self, intNoPoints=20):
+        # Compare the proxy with the pricer at random points inside the
+        # ranges, returning the largest absolute error.
+        if self.__funcPricer is None:
+            raise ValueError('The proxy has no pricer to check against')
+        lstRandom = [None if tpRange is None
+                     else np.random.uniform(tpRange[0], tpRange[1],
+                                            intNoPoints)
+                     for tpRange in self.__lstRanges]
+        fltMaxError = 0.0
+        for i in range(0, intNoPoints):
+            fltVol = None if lstRandom[1] is None else lstRandom[1][i]
+            fltTime = None if lstRandom[2] is None else lstRandom[2][i]
+            npStock = lstRandom[0][i:i + 1]
+            fltPricer = self.__funcPricer(
+                npStock, **self.__getKwargs(fltVol, fltTime))[0]
+            fltProxy = self.getOptionPrice(npStock, fltVol, fltTime)[0]
+            fltMaxError = max(fltMaxError, abs(fltPricer - fltProxy))
+        return fltMaxError
+
+    def save(self, strFile):
+        if self.__npCoef is None:
+            raise ValueError('The proxy has not been built')
+        npRanges = np.array([(np.nan, np.nan) if tpRange is None
+                             else tpRange for tpRange in self.__lstRanges])
+        np.savez(strFile, coef=self.__npCoef, ranges=npRanges,
+                 nonodes=np.array(self.__lstNoNodes))
+
+    def getOptionPrice(self, npStock, fltVol=None, fltTime=None):
+        return self.__evaluate(self.__npCoef, npStock, fltVol, fltTime)
+
+    def getOptionDelta(self, npStock, fltVol=None, fltTime=None):
+        return self.__evaluate(self.__npDelta, npStock, fltVol, fltTime)
+
+    def getOptionGamma(self, npStock, fltVol=None, fltTime=None):
+        return self.__evaluate(self.__npGamma, npStock, fltVol, fltTime)
+
+    def getOptionVega(self, npStock, fltVol=None, fltTime=None):
+        # Vega for a 1% move in the vol
+        if self.__lstRanges[1] is None:
+            raise ValueError('The proxy was built without the vol')
+        return self.__evaluate(self.__npVega, npStock, fltVol,
+                               fltTime) * 0.01
+
+    def getOptionTheta(self, npStock, fltVol=None, fltTime=None):
+        # Theta for 1 day, the time is the time to maturity, so this is
+        # minus the derivative
+        if self.__lstRanges[2] is None:
+            raise ValueError('The proxy was built without the time')
+        return -self.__evaluate(self.__npTheta, npStock, fltVol,
+                                fltTime) / 365
+
+
+def loadChebyshevProxy(strFile):
+    # Build a proxy from a file written by ChebyshevProxy.save
+    with np.load(strFile) as objFile:
+        npRanges = objFile['ranges']
+        lstNoNodes = [int(intN) for intN in objFile['nonodes']]
+        lstRanges = [None if np.isnan(npRange[0])
+                     else (float(npRange[0]), float(npRange[1]))
+                     for npRange in npRanges]
+        objProxy = ChebyshevProxy(lstRanges[0], lstNoNodes[0], lstRanges[1],
+                                  lstNoNodes[1], lstRanges[2], lstNoNodes[2])
+        objProxy.setCoefficients(objFile['coef'])
+    return objProxy
@@ -1,6 +1,10 @@
+import collections
 import numpy as np
-import pandas as pd
-import scipy.stats as si
+from analytics.LazyImport import LazyModule
+from analytics.MonteCarloSampling import MonteCarloSampler
+from analytics.ParameterKey import getParameterKey
+from analytics.EuropeanOptionBoundaryConditions import \
+    EuropeanOptionBoundaryConditions
 
 '''
 This section is highly dependent upon knowledge of the black & scholes formula
@@ -16,22 +20,70 @@ array containing multiple stock prices is passed in, which results n multiple
 price, delta, gamma etx values being calculated and which will later be used
 to plot graphs.
 
-This module has two classes:
+This module has three classes:
 
 BlackScholes:
 This calculates the price, delta, gamma etc of an option using the B&S Formula
+getOptionValues calculates several of these in one go, sharing d1, d2 and
+their normal distribution values, including the higher order greeks speed,
+vanna, volga, charm and colour (which then only cost a few multiplies).
+For small moves in the stock price and vol, getTaylorPrice estimates the new
+prices from these values with a second order Taylor expansion, along with a
+bound on the error.   The bound takes each third derivative at the largest
+it can be anywhere between the old and new stock price and vol (found from
+the range of d1 and d2), as the third derivatives at the old stock price
+alone can be 0 even though the error is not.   getQuickOptionPrice falls
+back to the B&S Formula wherever the bound is too big.
 
 BasicMonteCarloOption:
 This calculates the price, delta, gamma etc by using monte carlo methods.
 With this class I tend to return 2 argument (not 1) from the functions.
 The second argument tends to be the standard deviation. So I may have
 (optPrice, optStdDev) = calculateSomeValue( numpyArrayOfStockPrices )
+If fltShortCircuit is given, getOptionPrice first prices every stock price
+with the B&S Formula and only runs the paths for the ones that need it.   A
+stock price deep out of the money (B&S price no more than fltShortCircuit)
+or deep in the money (B&S price no more than fltShortCircuit above the lower
+boundary of EuropeanOptionBoundaryConditions) is taken as determined and is
+given the lower boundary if the boundaries are within fltShortCircuit of
+each other, or the B&S price otherwise, with a stdev of 0.   The paths are
+then only run for the rest and the results put back in the original order,
+so on a wide range of stock prices most of the path work is saved.   As the
+paths do not depend upon the stock prices, with a seed the stock prices that
+are simulated get exactly the same results as without the short circuit.
+
+ConstantsTable:
+The square root of the time, the discount factor, the drifts etc only depend
+upon the vol, rate and time to maturity, so both of the classes above work
+them out once, the first time a getter needs them (see
+calculateExpiryConstants), rather than in every getter.   They are not
+worked out when the option is built, as many options (eg in a large book)
+are never priced one at a time.   A book of options usually has far fewer
+expiries than options, so a ConstantsTable can be passed in as objConstants
+and shared by all of them, eg a million options over twelve expiries (with
+one vol and rate) only work these out twelve times and each option only
+holds a reference to its expiry's constants (see run_10_OptionBookMemory
+for the timings).   For a large book, OptionBookIndex in OptionBook prices
+a whole expiry at once, which is far quicker than either.
+
+As the constants are worked out from the parameters, the parameters cannot
+be changed once the option is built (an array parameter is copied and made
+read only).   Options with the same parameters (from getParameters) are
+equal and have the same hash, so they can be used in a set or as a dict key.
+A BasicMonteCarloOption without a seed draws new random numbers on every
+call, so two of them with the same parameters do not give the same results.
+They are only equal to themselves and are hashed on their identity, so
+only seeded Monte Carlo options are equal by their parameters.
 
 This section is only for European Options and it does not include things such
 as interest rate curves, borrow curves, volatility surface etc etc.
 (ie it is a simplified version)
 
 '''
+si = LazyModule('scipy.stats')
+ExpiryConstants = collections.namedtuple(
+    'ExpiryConstants',
+    ('rootT', 'volRootT', 'driftD1', 'driftMC', 'discount', 'forward'))
 
 
 class BlackScholes():
@@ -39,14 +91,53 @@ class BlackScholes():
     # Private Functions
 
     def __init__(self, fltStrike, fltVol, fltRiskFreeRate, fltTimeToMaturity,
-                 boolIsCall):
-        # Set the variables
-        self.__fltStrike = fltStrike
-        self.__fltVol = fltVol
-        self.__fltRiskFreeRate = fltRiskFreeRate
-        self.__fltTimeToMaturity = fltTimeToMaturity
+                 boolIsCall, objConstants=None):
+        # Set the variables, which cannot be changed afterwards
+        self.__fltStrike = getFrozenParameter(fltStrike)
+        self.__fltVol = getFrozenParameter(fltVol)
+        self.__fltRiskFreeRate = getFrozenParameter(fltRiskFreeRate)
+        self.__fltTimeToMaturity = getFrozenParameter(fltTimeToMaturity)
         self.__boolIsCall = boolIsCall
 
+        # The values that only depend upon the vol, rate and time, shared
+        # from objConstants (a ConstantsTable) if given, otherwise worked
+        # out the first time they are needed (see __getConstants)
+        self.__tpConstants = None if objConstants is None else \
+            objConstants.getConstants(self.__fltVol, self.__fltRiskFreeRate,
+                                      self.__fltTimeToMaturity)
+
+    def __setattr__(self, strName, objValue):
+        # The parameters are fixed once the option is built, which is when
+        # the constants (the last attribute set) are there.   Looking in
+        # self.__dict__ would build the dict, which takes more memory.
+        if hasattr(self, '_BlackScholes__tpConstants'):
+            raise AttributeError('BlackScholes is immutable')
+        object.__setattr__(self, strName, objValue)
+
+    def __delattr__(self, strName):
+        raise AttributeError('BlackScholes is immutable')
+
+    def __eq__(self, objOther):
+        if not isinstance(objOther, BlackScholes):
+            return NotImplemented
+        return getParameterKey(self.getParameters()) \
+            == getParameterKey(objOther.getParameters())
+
+    def __hash__(self):
+        return hash(getParameterKey(self.getParameters()))
+
+    def __getConstants(self):
+        # Worked out once, the first time a getter needs them
+        if self.__tpConstants is None:
+            object.__setattr__(self, '_BlackScholes__tpConstants',
+                               calculateExpiryConstants(
+                                   self.__fltVol, self.__fltRiskFreeRate,
+                                   self.__fltTimeToMaturity))
+        return self.__tpConstants
+
+    def __getStrikePV(self):
+        return self.__fltStrike * self.__getConstants().discount
+
     def __str__(self):
         strF = 'EuropeanOption: [Strike:{strike}; Vol:{vol}; '\
                 'RFRate:{rfrate}; Time:{time}; IsCall:{iscall};]'
@@ -58,29 +149,24 @@ class BlackScholes():
 
     def __getD1(self, npStock):
         npSK = np.log(npStock / self.__fltStrike)
-        npTopD1 = npSK + (
-                          self.__fltRiskFreeRate
-                          + (self.__fltVol ** 2) / 2
-                          ) * self.__fltTimeToMaturity
-        npD1 = npTopD1 / (self.__fltVol * np.sqrt(self.__fltTimeToMaturity))
+        tpConstants = self.__getConstants()
+        npD1 = (npSK + tpConstants.driftD1) / tpConstants.volRootT
         return npD1
 
     def __getD2(self, npStock):
         npD1 = self.__getD1(npStock)
-        npD2 = npD1 - (self.__fltVol * np.sqrt(self.__fltTimeToMaturity))
+        npD2 = npD1 - self.__getConstants().volRootT
         return npD2
 
     def __getD2FromD1(self, npD1):
-        npD2 = npD1 - (self.__fltVol * np.sqrt(self.__fltTimeToMaturity))
+        npD2 = npD1 - self.__getConstants().volRootT
         return npD2
 
     def __getCallPrice(self, npStock):
         npD1 = self.__getD1(npStock)
         npD2 = self.__getD2FromD1(npD1)
         npCall = npStock * si.norm.cdf(npD1)\
-            - (self.__fltStrike
-               * np.exp(-self.__fltRiskFreeRate * self.__fltTimeToMaturity)
-               * si.norm.cdf(npD2))
+            - self.__getStrikePV() * si.norm.cdf(npD2)
         return npCall
 
     def __getCallDelta(self, npStock):
@@ -92,26 +178,23 @@ class BlackScholes():
         npD1 = self.__getD1(npStock)
         npD2 = self.__getD2FromD1(npD1)
         npArg1 = -(npStock * si.norm.pdf(npD1) * self.__fltVol) \
-            / (2 * np.sqrt(self.__fltTimeToMaturity))
-        npArg2 = -self.__fltRiskFreeRate * self.__fltStrike * np.exp(
-            -self.__fltRiskFreeRate * self.__fltTimeToMaturity) \
+            / (2 * self.__getConstants().rootT)
+        npArg2 = -self.__fltRiskFreeRate * self.__getStrikePV() \
             * si.norm.cdf(npD2)
         npTheta = (npArg1 + npArg2) / 365
         return npTheta
 
     def __getCallRho(self, npStock):
         npD2 = self.__getD2(npStock)
-        npRho = (self.__fltStrike * self.__fltTimeToMaturity * np.exp(
-            -self.__fltRiskFreeRate * self.__fltTimeToMaturity)
-            * si.norm.cdf(npD2)) * 0.01
+        npRho = (self.__getStrikePV() * self.__fltTimeToMaturity
+                 * si.norm.cdf(npD2)) * 0.01
         return npRho
 
     def __getPutPrice(self, npStock):
         npD1 = self.__getD1(npStock)
         npD2 = self.__getD2FromD1(npD1)
-        npPut = self.__fltStrike * np.exp(
-            -self.__fltRiskFreeRate * self.__fltTimeToMaturity) \
-            * si.norm.cdf(-npD2) - npStock * si.norm.cdf(-npD1)
+        npPut = self.__getStrikePV() * si.norm.cdf(-npD2) \
+            - npStock * si.norm.cdf(-npD1)
         return npPut
 
     def __getPutDelta(self, npStock):
@@ -123,22 +206,327 @@ class BlackScholes():
         npD1 = self.__getD1(npStock)
         npD2 = self.__getD2FromD1(npD1)
         npArg1 = -(npStock * si.norm.pdf(npD1) * self.__fltVol) \
-            / (2 * np.sqrt(self.__fltTimeToMaturity))
-        npArg2 = self.__fltRiskFreeRate * self.__fltStrike * np.exp(
-            -self.__fltRiskFreeRate * self.__fltTimeToMaturity) \
+            / (2 * self.__getConstants().rootT)
+        npArg2 = self.__fltRiskFreeRate * self.__getStrikePV() \
             * si.norm.cdf(-npD2)
         npTheta = (npArg1 + npArg2) / 365
         return npTheta
 
     def __getPutRho(self, npStock):
         npD2 = self.__getD2(npStock)
-        npRho = (- self.__fltStrike * self.__fltTimeToMaturity * np.exp(
-            -self.__fltRiskFreeRate * self.__fltTimeToMaturity)
-            * si.norm.cdf(-npD2)) * 0.01
+        npRho = (- self.__getStrikePV() * self.__fltTimeToMaturity
+                 * si.norm.cdf(-npD2)) * 0.01
         return npRho
 
+    def __getIntervalProduct(self, tpA, tpB):
+        # The range of a x b for a in the range tpA and b in tpB, where a
+        # range is a (low, high) tuple of arrays
+        lstProducts = [tpA[0] * tpB[0], tpA[0] * tpB[1], tpA[1] * tpB[0],
+                       tpA[1] * tpB[1]]
+        return (np.minimum.reduce(lstProducts),
+                np.maximum.reduce(lstProducts))
+
+    def __getIntervalSquare(self, tpA):
+        # The range of a^2 for a in the range tpA
+        npLow = np.where((tpA[0] < 0) & (tpA[1] > 0), 0,
+                         np.minimum(tpA[0] ** 2, tpA[1] ** 2))
+        return (npLow, np.maximum(tpA[0] ** 2, tpA[1] ** 2))
+
+    def __getIntervalSum(self, tpA, tpB, fltSign=1):
+        # The range of a + b (or a - b with fltSign -1)
+        if fltSign > 0:
+            return (tpA[0] + tpB[0], tpA[1] + tpB[1])
+        return (tpA[0] - tpB[1], tpA[1] - tpB[0])
+
+    def __getLargest(self, tpA):
+        # The largest absolute value in the range tpA
+        return np.maximum(np.abs(tpA[0]), np.abs(tpA[1]))
+
+    def __getTaylorError(self, npSLow, npSHigh, npAbsMove, fltVolLow,
+                         fltVolHigh, fltVolMove):
+        # A bound on the error of the second order Taylor expansion for a
+        # move of up to npAbsMove in the stock price and fltVolMove in the
+        # vol, staying inside the box of stock prices npSLow to npSHigh and
+        # vols fltVolLow to fltVolHigh.   The error is the third order terms
+        # with each third derivative (speed, zomma, dvanna/dvol and ultima)
+        # taken somewhere in the box, so each one is replaced by the largest
+        # it can be anywhere in it.   Using the third derivatives at the old
+        # stock price alone is not a bound, eg speed is 0 near the stock
+        # price where gamma peaks but not either side of it.
+        fltRootT = self.__getConstants().rootT
+        fltVLow = fltVolLow * fltRootT
+        fltVHigh = fltVolHigh * fltRootT
+
+        # d1 = a / v + v / 2 and d2 = a / v - v / 2, with
+        # a = log(S / K) + rT and v = vol root T.   Both increase with a,
+        # and in v they are smallest (d1) or largest (d2) either at the ends
+        # or at the turning point v = root(2a) (d1) or root(-2a) (d2).
+        fltRT = self.__fltRiskFreeRate * self.__fltTimeToMaturity
+        npALow = np.log(npSLow / self.__fltStrike) + fltRT
+        npAHigh = np.log(npSHigh / self.__fltStrike) + fltRT
+        npRoot = np.sqrt(2 * np.maximum(npALow, 0))
+        npD1Low = np.where(
+            (npRoot > fltVLow) & (npRoot < fltVHigh), npRoot,
+            np.minimum(npALow / fltVLow + fltVLow / 2,
+                       npALow / fltVHigh + fltVHigh / 2))
+        npD1High = np.maximum(npAHigh / fltVLow + fltVLow / 2,
+                              npAHigh / fltVHigh + fltVHigh / 2)
+        npD2Low = np.minimum(npALow / fltVLow - fltVLow / 2,
+                             npALow / fltVHigh - fltVHigh / 2)
+        npRoot = np.sqrt(2 * np.maximum(-npAHigh, 0))
+        npD2High = np.where(
+            (npRoot > fltVLow) & (npRoot < fltVHigh), -npRoot,
+            np.maximum(npAHigh / fltVLow - fltVLow / 2,
+                       npAHigh / fltVHigh - fltVHigh / 2))
+        tpD1 = (npD1Low, npD1High)
+        tpD2 = (npD2Low, npD2High)
+
+        # The pdf is largest at the d1 nearest to 0
+        npPDF = si.norm.pdf(np.clip(0, npD1Low, npD1High))
+        tpD1D2 = self.__getIntervalProduct(tpD1, tpD2)
+
+        # speed = -pdf (d1 / v + 1) / (S^2 v)
+        tpD1OverV = self.__getIntervalProduct(tpD1, (1 / fltVHigh,
+                                                     1 / fltVLow))
+        npSpeed = npPDF * self.__getLargest(
+            (tpD1OverV[0] + 1, tpD1OverV[1] + 1)) / (npSLow ** 2 * fltVLow)
+        npError = npSpeed * npAbsMove ** 3 / 6
+
+        if fltVolMove > 0:
+            # zomma = pdf (d1 d2 - 1) / (S vol v),
+            # dvanna/dvol = pdf (d1 + d2 - d1 d2^2) / vol^2 and
+            # ultima = -S pdf root T (d1 d2 (1 - d1 d2) + d1^2 + d2^2) / vol^2
+            npZomma = npPDF * self.__getLargest(
+                (tpD1D2[0] - 1, tpD1D2[1] - 1)) \
+                / (npSLow * fltVolLow * fltVLow)
+            tpDVannaDVol = self.__getIntervalSum(
+                self.__getIntervalSum(tpD1, tpD2), self.__getIntervalProduct(
+                    tpD1, self.__getIntervalSquare(tpD2)), -1)
+            npDVannaDVol = npPDF * self.__getLargest(tpDVannaDVol) \
+                / fltVolLow ** 2
+            tpUltima = self.__getIntervalSum(
+                self.__getIntervalSum(tpD1D2, self.__getIntervalSquare(tpD1D2),
+                                      -1),
+                self.__getIntervalSum(self.__getIntervalSquare(tpD1),
+                                      self.__getIntervalSquare(tpD2)))
+            npUltima = npSHigh * npPDF * fltRootT \
+                * self.__getLargest(tpUltima) / fltVolLow ** 2
+            npError = npError \
+                + npAbsMove ** 2 * fltVolMove * npZomma / 2 \
+                + npAbsMove * fltVolMove ** 2 * npDVannaDVol / 2 \
+                + fltVolMove ** 3 * npUltima / 6
+        return npError
+
+    def __getTaylorEstimate(self, npStock, dctValues, npNewStock,
+                            fltNewVol):
+        # The second order Taylor expansion in the stock price and vol
+        # (the vol greeks are for a 1% move)
+        npMove = npNewStock - npStock
+        fltVolMove = (fltNewVol - self.__fltVol) * 100
+        if fltVolMove == 0:
+            # Only the stock price moves, so there are no vol terms
+            return dctValues['Price'] + npMove * (
+                dctValues['Delta'] + 0.5 * dctValues['Gamma'] * npMove)
+        return dctValues['Price'] \
+            + npMove * (dctValues['Delta'] + 0.5 * dctValues['Gamma'] * npMove
+                        + dctValues['Vanna'] * fltVolMove) \
+            + fltVolMove * (dctValues['Vega']
+                            + 0.5 * dctValues['Volga'] * fltVolMove)
+
+    def __getQuickRadius(self, npStock, fltTolerance, fltVolRadius):
+        # The largest move in the stock price, up to half of it, for which
+        # the bound on the error stays within fltTolerance for any move in
+        # the vol of up to fltVolRadius.   The bound only grows with the
+        # move, so the radius is found by bisection (on its log, to 5%),
+        # keeping the low end as one that is known to be within it.
+        # Anything where even a tiny move (a millionth of the stock price)
+        # is not is given a radius of -1.
+        fltVolLow = self.__fltVol - fltVolRadius
+        fltVolHigh = self.__fltVol + fltVolRadius
+
+        def isWithin(npRadius):
+            return self.__getTaylorError(
+                npStock - npRadius, npStock + npRadius, npRadius, fltVolLow,
+                fltVolHigh, fltVolRadius) <= fltTolerance
+
+        npLow = np.full(np.shape(npStock), np.log(1e-6))
+        npHigh = np.full(np.shape(npStock), np.log(0.5))
+        npIsHighWithin = isWithin(npStock * 0.5)
+        npIsLowWithin = isWithin(npStock * np.exp(npLow))
+        for i in range(0, 8):
+            npMid = (npLow + npHigh) / 2
+            npIsMidWithin = isWithin(npStock * np.exp(npMid))
+            npLow = np.where(npIsMidWithin, npMid, npLow)
+            npHigh = np.where(npIsMidWithin, npHigh, npMid)
+        npRadius = np.where(npIsHighWithin, npStock * 0.5,
+                            npStock * np.exp(npLow))
+        return np.where(npIsLowWithin, npRadius, -1.0)
+
     # Public Functions
 
+    def getParameters(self):
+        # Everything that the results depend upon (apart from the stock
+        # prices), eg to use as a key when caching the results
+        return ('BlackScholes', self.__fltStrike, self.__fltVol,
+                self.__fltRiskFreeRate, self.__fltTimeToMaturity,
+                self.__boolIsCall)
+
+    def getOptionValues(self, npStock, tpCalcRequirements):
+        # Calculate several values at once, eg ("Price", "Delta", "Gamma"),
+        # working out d1, d2 and their normal pdf and cdf only once.   The
+        # greeks are in the same units as the getters, so anything with a
+        # vol in it is for a 1% move in the vol (ie times 0.01 for each vol
+        # derivative) and theta, charm and colour are for 1 day.   Zomma,
+        # DVannaDVol and Ultima are the third order derivatives in the stock
+        # price and vol.
+        lstUnknown = [strName for strName in tpCalcRequirements
+                      if strName not in ('Price', 'Delta', 'Gamma', 'Vega',
+                                         'Theta', 'Rho', 'Speed', 'Vanna',
+                                         'Volga', 'Charm', 'Colour', 'Zomma',
+                                         'DVannaDVol', 'Ultima')]
+        if lstUnknown:
+            raise ValueError('Unknown values: ' + str(lstUnknown))
+
+        tpConstants = self.__getConstants()
+        fltRootT = tpConstants.rootT
+        fltVolRootT = tpConstants.volRootT
+        fltStrikePV = self.__getStrikePV()
+        npD1 = self.__getD1(npStock)
+        npD2 = npD1 - fltVolRootT
+        npPDF = si.norm.pdf(npD1)
+        npGamma = npPDF / (npStock * fltVolRootT)
+        npVega = npStock * npPDF * fltRootT
+
+        # The cdf's are only needed by the price, delta, theta and rho
+        if set(tpCalcRequirements) & {'Price', 'Delta', 'Theta', 'Rho'}:
+            if self.__boolIsCall:
+                npCDF1 = si.norm.cdf(npD1)
+                npCDF2 = si.norm.cdf(npD2)
+            else:
+                npCDF1 = -si.norm.cdf(-npD1)
+                npCDF2 = -si.norm.cdf(-npD2)
+
+        dctValues = dict()
+        for strName in tpCalcRequirements:
+            if strName == 'Price':
+                dctValues[strName] = npStock * npCDF1 - fltStrikePV * npCDF2
+            elif strName == 'Delta':
+                # For a put this is N(d1) - 1 = -N(-d1)
+                dctValues[strName] = npCDF1
+            elif strName == 'Gamma':
+                dctValues[strName] = npGamma
+            elif strName == 'Vega':
+                dctValues[strName] = npVega / 100
+            elif strName == 'Theta':
+                dctValues[strName] = (
+                    -(npStock * npPDF * self.__fltVol) / (2 * fltRootT)
+                    - self.__fltRiskFreeRate * fltStrikePV * npCDF2) / 365
+            elif strName == 'Rho':
+                dctValues[strName] = fltStrikePV \
+                    * self.__fltTimeToMaturity * npCDF2 * 0.01
+            elif strName == 'Speed':
+                dctValues[strName] = -(npGamma / npStock) \
+                    * (npD1 / fltVolRootT + 1)
+            elif strName == 'Vanna':
+                dctValues[strName] = -npPDF * npD2 / self.__fltVol * 0.01
+            elif strName == 'Volga':
+                dctValues[strName] = npVega * npD1 * npD2 / self.__fltVol \
+                    * 1e-4
+            elif strName == 'Charm':
+                # The change in delta (and for colour gamma) over 1 day,
+                # which is the same for a call and a put
+                dctValues[strName] = -npPDF * (
+                    2 * self.__fltRiskFreeRate * self.__fltTimeToMaturity
+                    - npD2 * fltVolRootT) \
+                    / (2 * self.__fltTimeToMaturity * fltVolRootT) / 365
+            elif strName == 'Colour':
+                dctValues[strName] = npGamma / (
+                    2 * self.__fltTimeToMaturity) * (1 + npD1 * (
+                        2 * self.__fltRiskFreeRate * self.__fltTimeToMaturity
+                        - npD2 * fltVolRootT) / fltVolRootT) / 365
+            elif strName == 'Zomma':
+                dctValues[strName] = npGamma * (npD1 * npD2 - 1) \
+                    / self.__fltVol * 0.01
+            elif strName == 'DVannaDVol':
+                dctValues[strName] = npPDF * (npD1 + npD2 - npD1 * npD2 ** 2) \
+                    / self.__fltVol ** 2 * 1e-4
+            elif strName == 'Ultima':
+                dctValues[strName] = -npVega / self.__fltVol ** 2 * (
+                    npD1 * npD2 * (1 - npD1 * npD2) + npD1 ** 2
+                    + npD2 ** 2) * 1e-6
+        return dctValues
+
+    def getTaylorPrice(self, npStock, dctValues, npNewStock, fltNewVol=None):
+        # Estimate the price at new stock prices (and optionally a new vol)
+        # from the values at npStock, as returned by getOptionValues, using
+        # a Taylor expansion in the stock price and vol to second order.
+        # Returns the prices and a bound on their error for this move, see
+        # __getTaylorError (the vol terms are only needed if the vol moves).
+        lstNeeded = ['Price', 'Delta', 'Gamma']
+        if fltNewVol is not None and fltNewVol != self.__fltVol:
+            lstNeeded += ['Vega', 'Vanna', 'Volga']
+        lstMissing = [strName for strName in lstNeeded
+                      if strName not in dctValues]
+        if lstMissing:
+            raise ValueError('Missing values: ' + str(lstMissing))
+        fltNewVol = self.__fltVol if fltNewVol is None else fltNewVol
+        npNewStock = np.broadcast_to(np.asarray(npNewStock, dtype=np.float64),
+                                     np.shape(dctValues['Price']))
+        npPrice = self.__getTaylorEstimate(npStock, dctValues, npNewStock,
+                                           fltNewVol)
+        return (npPrice, self.__getTaylorError(
+            np.minimum(npStock, npNewStock), np.maximum(npStock, npNewStock),
+            np.abs(npNewStock - npStock), min(self.__fltVol, fltNewVol),
+            max(self.__fltVol, fltNewVol), abs(fltNewVol - self.__fltVol)))
+
+    def getQuickValues(self, npStock, fltTolerance=1e-6, fltVolRadius=0.0):
+        # The values getQuickOptionPrice needs at npStock: the price and
+        # greeks from getOptionValues, and for each stock price the radius,
+        # ie the largest move in the stock price that can be estimated to
+        # within fltTolerance while the vol moves by no more than
+        # fltVolRadius (see __getQuickRadius).   All of the logs, square
+        # roots and normal distributions are worked out here, once.
+        if not 0 <= fltVolRadius < np.min(self.__fltVol):
+            raise ValueError('The vol radius must be at least 0 and less '
+                             'than the vol')
+        dctValues = self.getOptionValues(
+            npStock, ('Price', 'Delta', 'Gamma', 'Speed', 'Vega', 'Vanna',
+                      'Volga'))
+        dctValues['Radius'] = self.__getQuickRadius(
+            np.asarray(npStock, dtype=np.float64), fltTolerance,
+            fltVolRadius)
+        dctValues['VolRadius'] = fltVolRadius
+        return dctValues
+
+    def getQuickOptionPrice(self, npStock, dctValues, npNewStock,
+                            fltNewVol=None):
+        # The prices from a Taylor expansion around npStock, using the
+        # values from getQuickValues, except that any price where the stock
+        # price (or vol) has moved further than its radius is fully
+        # calculated.   This only needs a few multiplies and a compare.
+        # Returns the prices and a boolean array of those fully calculated.
+        lstMissing = [strName for strName in ('Radius', 'VolRadius')
+                      if strName not in dctValues]
+        if lstMissing:
+            raise ValueError('Missing values: ' + str(lstMissing)
+                             + ', see getQuickValues')
+        fltNewVol = self.__fltVol if fltNewVol is None else fltNewVol
+        npNewStock = np.broadcast_to(np.asarray(npNewStock, dtype=np.float64),
+                                     np.shape(dctValues['Price']))
+        npPrice = self.__getTaylorEstimate(npStock, dctValues, npNewStock,
+                                           fltNewVol)
+
+        if abs(fltNewVol - self.__fltVol) > dctValues['VolRadius']:
+            npIsFull = np.ones(npPrice.shape, dtype=bool)
+        else:
+            npIsFull = ~(np.abs(npNewStock - npStock) <= dctValues['Radius'])
+        if np.any(npIsFull):
+            objBS = self if fltNewVol == self.__fltVol else BlackScholes(
+                self.__fltStrike, fltNewVol, self.__fltRiskFreeRate,
+                self.__fltTimeToMaturity, self.__boolIsCall)
+            npPrice[npIsFull] = objBS.getOptionPrice(npNewStock[npIsFull])
+        return (npPrice, npIsFull)
+
     def getOptionPrice(self, npStock):
         if self.__boolIsCall:
             return self.__getCallPrice(npStock)
@@ -155,15 +543,20 @@ class BlackScholes():
         # Gamma is Call/Put independent
         npD1 = self.__getD1(npStock)
         n1 = (si.norm.pdf(npD1))
-        d1 = (npStock * self.__fltVol * np.sqrt(self.__fltTimeToMaturity))
+        d1 = (npStock * self.__getConstants().volRootT)
         npGamma = n1 / d1
         return npGamma
 
+    def getOptionSpeed(self, npStock):
+        # Speed is the change in gamma for a change in the stock price and
+        # is Call/Put independent
+        return self.getOptionValues(npStock, ('Speed',))['Speed']
+
     def getOptionVega(self, npStock):
         # Vega is Call/Put independent
         npD1 = self.__getD1(npStock)
         npVega = npStock * (si.norm.pdf(npD1)) \
-            * np.sqrt(self.__fltTimeToMaturity) / 100
+            * self.__getConstants().rootT / 100
         return npVega
 
     def getOptionTheta(self, npStock):
@@ -178,19 +571,91 @@ class BlackScholes():
         else:
             return self.__getPutRho(npStock)
 
+    def getOptionVanna(self, npStock):
+        # Change in delta for a 1% move in the vol, Call/Put independent
+        return self.getOptionValues(npStock, ('Vanna',))['Vanna']
+
+    def getOptionVolga(self, npStock):
+        # Change in vega for a 1% move in the vol, Call/Put independent
+        return self.getOptionValues(npStock, ('Volga',))['Volga']
+
+    def getOptionCharm(self, npStock):
+        # Change in delta over 1 day, Call/Put independent
+        return self.getOptionValues(npStock, ('Charm',))['Charm']
+
+    def getOptionColour(self, npStock):
+        # Change in gamma over 1 day, Call/Put independent
+        return self.getOptionValues(npStock, ('Colour',))['Colour']
+
 
 class BasicMonteCarloOption():
 
     # Private Functions
 
     def __init__(self, fltStrike, fltVol, fltRiskFreeRate, fltTimeToMaturity,
-                 boolIsCall, intNoIter):
-        self.__fltStrike = fltStrike
-        self.__fltVol = fltVol
-        self.__fltRiskFreeRate = fltRiskFreeRate
-        self.__fltTimeToMaturity = fltTimeToMaturity
+                 boolIsCall, intNoIter, strSampling='Standard',
+                 intNoBatches=10, intSeed=None, fltShortCircuit=None,
+                 objConstants=None):
+        self.__fltStrike = getFrozenParameter(fltStrike)
+        self.__fltVol = getFrozenParameter(fltVol)
+        self.__fltRiskFreeRate = getFrozenParameter(fltRiskFreeRate)
+        self.__fltTimeToMaturity = getFrozenParameter(fltTimeToMaturity)
         self.__boolIsCall = boolIsCall
         self.__intNoIter = intNoIter
+        # Object used to draw the random numbers, see MonteCarloSampling
+        self.__objSampler = MonteCarloSampler(strSampling, intNoBatches,
+                                              intSeed)
+        self.__strSampling = strSampling
+        self.__intNoBatches = intNoBatches
+        self.__intSeed = intSeed
+        self.__fltShortCircuit = fltShortCircuit
+        self.__objConstants = objConstants
+
+        # The values that only depend upon the vol, rate and time, used by
+        # the paths that are not bumped (see BlackScholes)
+        self.__tpConstants = None if objConstants is None else \
+            objConstants.getConstants(self.__fltVol, self.__fltRiskFreeRate,
+                                      self.__fltTimeToMaturity)
+
+    def __setattr__(self, strName, objValue):
+        # The parameters are fixed once the option is built (see
+        # BlackScholes)
+        if hasattr(self, '_BasicMonteCarloOption__tpConstants'):
+            raise AttributeError('BasicMonteCarloOption is immutable')
+        object.__setattr__(self, strName, objValue)
+
+    def __delattr__(self, strName):
+        raise AttributeError('BasicMonteCarloOption is immutable')
+
+    def __eq__(self, objOther):
+        # Without a seed the results differ on every call, so the option is
+        # only equal to itself
+        if not isinstance(objOther, BasicMonteCarloOption):
+            return NotImplemented
+        if self.__intSeed is None or objOther.getSeed() is None:
+            return self is objOther
+        return getParameterKey(self.getParameters()) \
+            == getParameterKey(objOther.getParameters())
+
+    def __hash__(self):
+        if self.__intSeed is None:
+            return object.__hash__(self)
+        return hash(getParameterKey(self.getParameters()))
+
+    def __getConstants(self):
+        # Worked out once, the first time they are needed
+        if self.__tpConstants is None:
+            object.__setattr__(self, '_BasicMonteCarloOption__tpConstants',
+                               calculateExpiryConstants(
+                                   self.__fltVol, self.__fltRiskFreeRate,
+                                   self.__fltTimeToMaturity))
+        return self.__tpConstants
+
+    def __getMultiplier(self, Z):
+        # The multipliers for the paths that are not bumped
+        tpConstants = self.__getConstants()
+        return self.__objSampler.getMultiplierFromConstants(
+            Z, tpConstants.volRootT, tpConstants.driftMC, tpConstants.forward)
 
     def __str__(self):
         strF = 'BasicMonteCarloOption: [Strike:{strike}; Vol:{vol}; ' \
@@ -202,16 +667,31 @@ class BasicMonteCarloOption():
                            iscall=self.__boolIsCall,
                            noiter=self.__intNoIter)
 
-    def getOptionPrice(self, npStock):
+    def __getDetermined(self, npStock):
+        # Returns (is determined, value) for each stock price, see the notes
+        # at the top
+        objBounds = EuropeanOptionBoundaryConditions(
+            self.__fltStrike, self.__boolIsCall, self.__fltRiskFreeRate,
+            self.__fltTimeToMaturity)
+        (npLower, npUpper) = objBounds.getBounds(npStock)
+        npPrice = BlackScholes(
+            self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+            self.__fltTimeToMaturity, self.__boolIsCall,
+            self.__objConstants).getOptionPrice(npStock)
+        fltTol = self.__fltShortCircuit
+        npIsBounded = npUpper - npLower <= fltTol
+        npIsDetermined = npIsBounded | (npPrice <= fltTol) \
+            | (npPrice - npLower <= fltTol)
+        return (npIsDetermined, np.where(npIsBounded, npLower, npPrice))
+
+    def __simulateOptionPrice(self, npStock):
 
         # Get the random numbers
-        Z = np.random.standard_normal((1, self.__intNoIter))
+        self.__objSampler.startRun()
+        Z = self.__objSampler.getNormals(self.__intNoIter)
 
         # Now get the multipliers to find the final stock price
-        a1 = Z * self.__fltVol * np.sqrt(self.__fltTimeToMaturity)
-        a2 = (self.__fltRiskFreeRate - 0.5 * self.__fltVol ** 2) \
-            * self.__fltTimeToMaturity
-        Mult = np.exp(a1 + a2)
+        Mult = self.__getMultiplier(Z)
 
         # For every stock price, get m_intNoIter final stock prices by doing
         # a matrix multiplication.   We multiply the initial stock price,by
@@ -234,28 +714,61 @@ class BasicMonteCarloOption():
         npPayoffAdj = np.maximum(npPayoff, npZeros)
 
         # Get the present value of the monte carlo simulations
-        npPV = npPayoffAdj * np.exp(
-            -self.__fltRiskFreeRate * self.__fltTimeToMaturity)
-
-        # Calculate the mean for each axis.
-        npPrice = np.mean(npPV, axis=1)
+        npPV = npPayoffAdj * self.__getConstants().discount
 
-        # Calculate the stdev for each axis.
-        npSTD = np.std(npPV, axis=1)
+        # Calculate the mean and stdev for each axis.
+        (npPrice, npSTD) = self.__objSampler.getMeanAndSTD(npPV)
 
         # Return the option price.
         return (npPrice, npSTD)
 
+    # Public Functions
+
+    def getParameters(self):
+        # Everything that the results depend upon (apart from the stock
+        # prices), including the seed and the short circuit
+        return ('BasicMonteCarloOption', self.__fltStrike, self.__fltVol,
+                self.__fltRiskFreeRate, self.__fltTimeToMaturity,
+                self.__boolIsCall, self.__intNoIter, self.__strSampling,
+                self.__intNoBatches, self.__intSeed, self.__fltShortCircuit)
+
+    def getSeed(self):
+        # The seed, or None if each run uses different random numbers
+        return self.__intSeed
+
+    def getConstructorArguments(self):
+        # The keyword arguments that build the same option again (apart from
+        # any table of constants, which only saves time)
+        return {'fltStrike': self.__fltStrike, 'fltVol': self.__fltVol,
+                'fltRiskFreeRate': self.__fltRiskFreeRate,
+                'fltTimeToMaturity': self.__fltTimeToMaturity,
+                'boolIsCall': self.__boolIsCall, 'intNoIter': self.__intNoIter,
+                'strSampling': self.__strSampling,
+                'intNoBatches': self.__intNoBatches, 'intSeed': self.__intSeed,
+                'fltShortCircuit': self.__fltShortCircuit}
+
+    def getOptionPrice(self, npStock):
+        if self.__fltShortCircuit is None:
+            return self.__simulateOptionPrice(npStock)
+
+        # Only run the paths for the stock prices that are not determined
+        npStock = np.asarray(npStock, dtype=np.float64)
+        (npIsDetermined, npPrice) = self.__getDetermined(npStock)
+        npSTD = np.zeros(npPrice.shape)
+        npIsSimulated = ~npIsDetermined
+        if np.any(npIsSimulated):
+            (npPrice[npIsSimulated], npSTD[npIsSimulated]) = \
+                self.__simulateOptionPrice(npStock[npIsSimulated])
+        return (npPrice, npSTD)
+
     def getOptionDelta(self, npStock):
 
         # Get the random numbers
-        Z = np.random.standard_normal((1, self.__intNoIter))
+        self.__objSampler.startRun()
+        Z = self.__objSampler.getNormals(self.__intNoIter)
 
         # Now get the multipliers to find the final stock price
-        a1 = Z * self.__fltVol * np.sqrt(self.__fltTimeToMaturity)
-        a2 = (self.__fltRiskFreeRate - 0.5 * self.__fltVol ** 2) \
-            * self.__fltTimeToMaturity
-        Mult = np.exp(a1 + a2)
+        Mult = self.__getMultiplier(Z)
 
         # For every stock price, get m_intNoIter final stock prices by doing
         # a matrix multiplication.   We multiply the initial stock price,by
@@ -285,19 +798,14 @@ class BasicMonteCarloOption():
         npPayoffAdjBump = np.maximum(npPayoffBump, npZeros)
 
         # Get the present value of the monte carlo simulations
-        npPV = npPayoffAdj * np.exp(
-            -self.__fltRiskFreeRate * self.__fltTimeToMaturity)
-        npPVBump = npPayoffAdjBump * np.exp(
-            -self.__fltRiskFreeRate * self.__fltTimeToMaturity)
+        npPV = npPayoffAdj * self.__getConstants().discount
+        npPVBump = npPayoffAdjBump * self.__getConstants().discount
 
         # Calculate the delta
         npAllDelta = (npPVBump - npPV) / npBump
 
-        # Calculate the mean for each axis.
-        npDelta = np.mean(npAllDelta, axis=1)
-
-        # Calculate the stdev for each axis.
-        npDeltaSTD = np.std(npAllDelta, axis=1)
+        # Calculate the mean and stdev for each axis.
+        (npDelta, npDeltaSTD) = self.__objSampler.getMeanAndSTD(npAllDelta)
 
         # Return the option price.
         return (npDelta, npDeltaSTD)
@@ -305,20 +813,16 @@ class BasicMonteCarloOption():
     def getOptionRho(self, npStock):
 
         # Get the random numbers
-        Z = np.random.standard_normal((1, self.__intNoIter))
+        self.__objSampler.startRun()
+        Z = self.__objSampler.getNormals(self.__intNoIter)
 
         fltBump = 0.0001
         fltRiskFreeRateBump = self.__fltRiskFreeRate + fltBump
 
         # Now get the multipliers to find the final stock price
-        a1 = Z * self.__fltVol * np.sqrt(self.__fltTimeToMaturity)
-        a2 = (self.__fltRiskFreeRate - 0.5 * self.__fltVol ** 2) \
-            * self.__fltTimeToMaturity
-        Mult = np.exp(a1 + a2)
-        a1 = Z * self.__fltVol * np.sqrt(self.__fltTimeToMaturity)
-        a2 = (fltRiskFreeRateBump - 0.5 * self.__fltVol ** 2) \
-            * self.__fltTimeToMaturity
-        MultBump = np.exp(a1 + a2)
+        Mult = self.__getMultiplier(Z)
+        MultBump = self.__objSampler.getMultiplier(
+            Z, self.__fltVol, fltRiskFreeRateBump, self.__fltTimeToMaturity)
 
         # For every stock price, get m_intNoIter final stock prices by
         # doing a matrix multiplication.   We multiply the initial stock
@@ -347,19 +851,15 @@ class BasicMonteCarloOption():
         npPayoffAdjBump = np.maximum(npPayoffBump, npZeros)
 
         # Get the present value of the monte carlo simulations
-        npPV = npPayoffAdj * np.exp(
-            -self.__fltRiskFreeRate * self.__fltTimeToMaturity)
+        npPV = npPayoffAdj * self.__getConstants().discount
         npPVBump = npPayoffAdjBump * np.exp(
             -fltRiskFreeRateBump * self.__fltTimeToMaturity)
 
         # Calculate the delta
         npAllRho = (npPVBump - npPV) * (0.01 / fltBump)
 
-        # Calculate the mean for each axis.
-        npRho = np.mean(npAllRho, axis=1)
-
-        # Calculate the stdev for each axis.
-        npRhoSTD = np.std(npAllRho, axis=1)
+        # Calculate the mean and stdev for each axis.
+        (npRho, npRhoSTD) = self.__objSampler.getMeanAndSTD(npAllRho)
 
         # Return the option price.
         return (npRho, npRhoSTD)
@@ -370,13 +870,11 @@ class BasicMonteCarloOption():
         # greeks-why-does-my-monte-carlo-give-correct-delta-but-incorrect-gamma
 
         # Get the random numbers
-        Z = np.random.standard_normal((1, self.__intNoIter))
+        self.__objSampler.startRun()
+        Z = self.__objSampler.getNormals(self.__intNoIter)
 
         # Now get the multipliers to find the final stock price
-        a1 = Z * self.__fltVol * np.sqrt(self.__fltTimeToMaturity)
-        a2 = (self.__fltRiskFreeRate - 0.5 * self.__fltVol ** 2) \
-            * self.__fltTimeToMaturity
-        Mult = np.exp(a1 + a2)
+        Mult = self.__getMultiplier(Z)
 
         # For every stock price, get m_intNoIter final stock prices by
         # doing a matrix multiplication.   We multiply the initial stock
@@ -410,12 +908,9 @@ class BasicMonteCarloOption():
         npPayoffAdjBumpMinus = np.maximum(npPayoffBumpMinus, npZeros)
 
         # Get the present value of the monte carlo simulations
-        npPV = npPayoffAdj * np.exp(
-            -self.__fltRiskFreeRate * self.__fltTimeToMaturity)
-        npPVBumpPlus = npPayoffAdjBumpPlus * np.exp(
-            -self.__fltRiskFreeRate * self.__fltTimeToMaturity)
-        npPVBumpMinus = npPayoffAdjBumpMinus * np.exp(
-            -self.__fltRiskFreeRate * self.__fltTimeToMaturity)
+        npPV = npPayoffAdj * self.__getConstants().discount
+        npPVBumpPlus = npPayoffAdjBumpPlus * self.__getConstants().discount
+        npPVBumpMinus = npPayoffAdjBumpMinus * self.__getConstants().discount
 
         # Calculate the numerator and denominator
         n1 = (npPVBumpPlus - (2 * npPV) + npPVBumpMinus)
@@ -424,11 +919,8 @@ class BasicMonteCarloOption():
         # Calculate the delta
         npAllGamma = n1 / d1
 
-        # Calculate the mean for each axis.
-        npGamma = np.mean(npAllGamma, axis=1)
-
-        # Calculate the stdev for each axis.
-        npGammaSTD = np.std(npAllGamma, axis=1)
+        # Calculate the mean and stdev for each axis.
+        (npGamma, npGammaSTD) = self.__objSampler.getMeanAndSTD(npAllGamma)
 
         # Return the option price.
         return (npGamma, npGammaSTD)
@@ -436,19 +928,15 @@ class BasicMonteCarloOption():
     def getOptionVega(self, npStock):
 
         # Get the random numbers
-        Z = np.random.standard_normal((1, self.__intNoIter))
+        self.__objSampler.startRun()
+        Z = self.__objSampler.getNormals(self.__intNoIter)
 
         # Now get the multipliers to find the final stock price
-        a1 = Z * self.__fltVol * np.sqrt(self.__fltTimeToMaturity)
-        a2 = (self.__fltRiskFreeRate - 0.5 * (self.__fltVol ** 2)) \
-            * self.__fltTimeToMaturity
-        Mult = np.exp(a1 + a2)
+        Mult = self.__getMultiplier(Z)
         fltBump = 0.0001
         volBump = self.__fltVol + fltBump
-        a1 = Z * volBump * np.sqrt(self.__fltTimeToMaturity)
-        a2 = (self.__fltRiskFreeRate - 0.5 * (volBump ** 2)) \
-            * self.__fltTimeToMaturity
-        MultBump = np.exp(a1 + a2)
+        MultBump = self.__objSampler.getMultiplier(
+            Z, volBump, self.__fltRiskFreeRate, self.__fltTimeToMaturity)
 
         # For every stock price, get m_intNoIter final stock prices by doing
         # a matrix multiplication.   We multiply the initial stock price,by
@@ -476,19 +964,14 @@ class BasicMonteCarloOption():
         npPayoffAdjBump = np.maximum(npPayoffBump, npZeros)
 
         # Get the present value of the monte carlo simulations
-        npPV = npPayoffAdj * np.exp(
-            -self.__fltRiskFreeRate * self.__fltTimeToMaturity)
-        npPVBump = npPayoffAdjBump * np.exp(
-            -self.__fltRiskFreeRate * self.__fltTimeToMaturity)
+        npPV = npPayoffAdj * self.__getConstants().discount
+        npPVBump = npPayoffAdjBump * self.__getConstants().discount
 
         # Calculate the vega
         npAllVega = (npPVBump - npPV) * (0.01 / fltBump)
 
-        # Calculate the mean for each axis.
-        npVega = np.mean(npAllVega, axis=1)
-
-        # Calculate the stdev for each axis.
-        npVegaSTD = np.std(npAllVega, axis=1)
+        # Calculate the mean and stdev for each axis.
+        (npVega, npVegaSTD) = self.__objSampler.getMeanAndSTD(npAllVega)
 
         # Return the option price.
         return (npVega, npVegaSTD)
@@ -496,20 +979,17 @@ class BasicMonteCarloOption():
     def getOptionTheta(self, npStock):
 
         # Get the random numbers
-        Z = np.random.standard_normal((1, self.__intNoIter))
+        self.__objSampler.startRun()
+        Z = self.__objSampler.getNormals(self.__intNoIter)
 
         # Get bumped time to maturity
         fltDBump = 1 / 365
         fltTimeBump = self.__fltTimeToMaturity - fltDBump
 
         # Now get the multipliers to find the final stock price
-        a1 = Z * self.__fltVol * np.sqrt(self.__fltTimeToMaturity)
-        a2 = (self.__fltRiskFreeRate - 0.5 * self.__fltVol ** 2) \
-            * self.__fltTimeToMaturity
-        Mult = np.exp(a1 + a2)
-        a1 = Z * self.__fltVol * np.sqrt(fltTimeBump)
-        a2 = (self.__fltRiskFreeRate - 0.5 * self.__fltVol ** 2) * fltTimeBump
-        MultBump = np.exp(a1 + a2)
+        Mult = self.__getMultiplier(Z)
+        MultBump = self.__objSampler.getMultiplier(
+            Z, self.__fltVol, self.__fltRiskFreeRate, fltTimeBump)
 
         # For every stock price, get m_intNoIter final stock prices by
         # doing a matrix multiplication.   We multiply the initial stock
@@ -538,19 +1018,85 @@ class BasicMonteCarloOption():
         npPayoffAdjBump = np.maximum(npPayoffBump, npZeros)
 
         # Get the present value of the monte carlo simulations
-        npPV = npPayoffAdj * np.exp(
-                        - self.__fltRiskFreeRate * self.__fltTimeToMaturity)
+        npPV = npPayoffAdj * self.__getConstants().discount
         npPVBump = npPayoffAdjBump * np.exp(
                         - self.__fltRiskFreeRate * fltTimeBump)
 
         # Calculate the Theta
         npAllTheta = (npPVBump - npPV)
 
-        # Calculate the mean for each axis.
-        npTheta = np.mean(npAllTheta, axis=1)
-
-        # Calculate the stdev for each axis.
-        npThetaSTD = np.std(npAllTheta, axis=1)
+        # Calculate the mean and stdev for each axis.
+        (npTheta, npThetaSTD) = self.__objSampler.getMeanAndSTD(npAllTheta)
 
         # Return the option price.
         return (npTheta, npThetaSTD)
+
+
+class ConstantsTable():
+
+    # Private Functions
+
+    def __init__(self):
+        self.__dctConstants = dict()
+        self.__intHits = 0
+        self.__intMisses = 0
+
+    def __str__(self):
+        strF = 'ConstantsTable: [Entries:{entries}]'
+        return strF.format(entries=len(self.__dctConstants))
+
+    # Public Functions
+
+    def getConstants(self, fltVol, fltRiskFreeRate, fltTimeToMaturity):
+        # The constants for the vol, rate and time, only calculated the
+        # first time they are asked for
+        tpKey = (fltVol, fltRiskFreeRate, fltTimeToMaturity)
+        try:
+            tpConstants = self.__dctConstants.get(tpKey)
+        except TypeError:
+            # An array (eg a vol for each stock price) is not kept
+            return calculateExpiryConstants(*tpKey)
+        if tpConstants is not None:
+            self.__intHits += 1
+            return tpConstants
+
+        self.__intMisses += 1
+        tpConstants = calculateExpiryConstants(fltVol, fltRiskFreeRate,
+                                               fltTimeToMaturity)
+        self.__dctConstants[tpKey] = tpConstants
+        return tpConstants
+
+    def getStatistics(self):
+        return {'Hits': self.__intHits, 'Misses': self.__intMisses,
+                'Entries': len(self.__dctConstants)}
+
+    def clear(self):
+        self.__dctConstants.clear()
+        self.__intHits = 0
+        self.__intMisses = 0
+
+
+def calculateExpiryConstants(fltVol, fltRiskFreeRate, fltTimeToMaturity):
+    # The values that only depend upon the vol, rate and time to maturity:
+    # root T, vol root T, the B&S drift in d1, the drift of the log stock
+    # price, the discount factor and the forward factor
+    fltRootT = np.sqrt(fltTimeToMaturity)
+    fltHalfVar = fltVol ** 2 / 2
+    return ExpiryConstants(
+        fltRootT, fltVol * fltRootT,
+        (fltRiskFreeRate + fltHalfVar) * fltTimeToMaturity,
+        (fltRiskFreeRate - fltHalfVar) * fltTimeToMaturity,
+        np.exp(-fltRiskFreeRate * fltTimeToMaturity),
+        np.exp(fltRiskFreeRate * fltTimeToMaturity))
+
+
+def getFrozenParameter(objValue):
+    # A parameter that is an array is copied and made read only, so that
+    # changing the caller's array does not change the option.   Only a read
+    # only array that owns its data is kept as it is, a read only view (eg
+    # OptionBook.getStrike) still changes with the array it is a view of.
+    if isinstance(objValue, np.ndarray) and \
+            (objValue.base is not None or objValue.flags.writeable):
+        objValue = objValue.copy()
+        objValue.flags.writeable = False
+    return objValue
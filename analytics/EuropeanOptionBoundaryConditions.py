@@ -1,8 +1,4 @@
 import numpy as np
-import pandas as pd
-import scipy.stats as si
-import math
-import copy
 
 '''
 This section calculates the boundary conditions for a European Option, which
@@ -13,6 +9,16 @@ A put option has a lower boundary of max [K x Exp(-rT) - S, 0]
 A call has an upper boundary of the stock price
 A put has an upper boundary of K x Exp(-rt)
 
+The strike and time to maturity can also be numpy arrays, in which case the
+boundaries are calculated for each of them (see OptionChainValidator).
+
+As these are used on large sweeps of stock prices, K x Exp(-rT) is worked
+out once when the object is built and the upper boundaries are not copied:
+the call upper boundary is a read only view of the stock prices passed in
+and the put upper boundary is K x Exp(-rT) broadcast (read only) to the
+shape of the stock prices.   Copy them if you want to change them.   Each
+boundary can also be written into an existing array with npOut, and
+getBounds returns both the lower and upper boundaries from one call.
 '''
 
 
@@ -25,49 +31,67 @@ class EuropeanOptionBoundaryConditions():
         self.__fltRate = fltRate
         self.__fltTimeToMaturity = fltTimeToMaturity
 
+        # The discounted strike K x Exp(-rT) is used by every boundary
+        self.__fltDiscountedStrike = fltStrike * np.exp(
+            -fltRate * fltTimeToMaturity)
+
     def __str__(self):
         strF = 'OptionBoundaryConditions: [Strike:{strike}; IsCall:{iscall};]'
         return strF.format(strike=self.__fltStrike, iscall=self.__boolIsCall)
 
+    def __getReadOnly(self, npArray):
+        npView = np.asarray(npArray).view()
+        npView.flags.writeable = False
+        return npView
+
     # Public Functions
-    def getLowerBoundary(self, npStock):
+    def getDiscountedStrike(self):
+        return self.__fltDiscountedStrike
+
+    def getLowerBoundary(self, npStock, npOut=None):
 
         if self.__boolIsCall:
 
             # Lower boundary for call is max( S - K x Exp(-rT), 0)
-            npLower = np.maximum(
-                npStock - self.__fltStrike * math.exp(
-                    -self.__fltRate * self.__fltTimeToMaturity),
-                0)
+            npLower = np.subtract(npStock, self.__fltDiscountedStrike,
+                                  out=npOut)
 
         else:
 
             # Lower boundary for put is max ( K x Exp(-rT) - S, 0)
-            npLower = np.maximum(
-                self.__fltStrike * math.exp(
-                    -self.__fltRate * self.__fltTimeToMaturity)
-                - npStock,
-                0)
+            npLower = np.subtract(self.__fltDiscountedStrike, npStock,
+                                  out=npOut)
 
-        # return npLower[:, 0]
-        return npLower
+        # Floor at 0 in place, so no more arrays are made (a single stock
+        # price gives a numpy scalar, which can not be changed in place)
+        if np.ndim(npLower) == 0:
+            return np.maximum(npLower, 0)
+        return np.maximum(npLower, 0, out=npLower)
 
-    def getUpperBoundary(self, npStock):
+    def getUpperBoundary(self, npStock, npOut=None):
 
         if self.__boolIsCall:
 
             # Call must always be worth less than the stock price
-            npUpper = copy.deepcopy(npStock)
+            if npOut is None:
+                return self.__getReadOnly(npStock)
+            npOut[...] = npStock
 
         else:
 
-            # Upper boundary for put is K x Exp(-rT)
-            fltUB = self.__fltStrike * math.exp(
-                    -self.__fltRate * self.__fltTimeToMaturity)
-
-            # Fill numpy array with the result
-            npUpper = np.empty(len(npStock))
-            npUpper.fill(fltUB)
-
-        # return npUpper[:, 0]
-        return npUpper
+            # Upper boundary for put is K x Exp(-rT), broadcast to the
+            # shape of the stock prices (the strike and time can also be
+            # arrays, eg for a chain of options)
+            if npOut is None:
+                return np.broadcast_to(
+                    self.__fltDiscountedStrike,
+                    np.broadcast(npStock, self.__fltDiscountedStrike).shape)
+            npOut[...] = self.__fltDiscountedStrike
+
+        return npOut
+
+    def getBounds(self, npStock, npLowerOut=None, npUpperOut=None):
+        # Returns (lower, upper) for the stock prices, the upper boundary
+        # needs no calculation so there is only the one pass over them
+        return (self.getLowerBoundary(npStock, npLowerOut),
+                self.getUpperBoundary(npStock, npUpperOut))
@@ -1,9 +1,13 @@
 import numpy as np
-import pandas as pd
-import scipy.stats as si
+import os
 import threading
+import time
 import queue
-import matplotlib.pyplot as plot
+from analytics.MonteCarloSampling import MonteCarloSampler
+from analytics.EuropeanOption import calculateExpiryConstants
+from analytics.ParameterKey import getArrayDigest, getKeyDigest, \
+    getParameterKey
+from analytics.OptionResults import OptionResults
 
 '''
 Within this section, I wanted to explore two things:
@@ -20,6 +24,23 @@ can improve calculation time.   A package class has been created
 where more than one monte carlo object can be added.   In addition
 to this a Monte Carlo Option for threading has been created which
 uses the calculation method mentioned previously.
+
+Long runs can be checkpointed.   With intChunkSize set the paths are run in
+chunks, keeping the running mean and M2 of each result (see
+MonteCarloSampler.addChunkMoments, which for sampling other than Standard takes
+the error from the spread of the chunk means).   If the option has a seed and a
+checkpoint file (setCheckpoint, or setCheckpointDirectory on the package, which
+names the file after the package id and the option's place in the package), the
+moments, the number of paths done and the state of the random number generator
+are saved every so many paths and/or seconds.   If the calculation stops (eg
+the worker crashes), running it again with the same option and stock prices
+carries on from the last checkpoint.   As the chunks and random numbers are the
+same either way, the results are identical to a run that did not stop.
+
+The results and their stdevs are returned as OptionResults (named numpy
+arrays, eg objResults['Price']) rather than pandas DataFrames, which are
+slow to build for a small set of stock prices.   Use toPandas on them to
+get a DataFrame.
 '''
 
 
@@ -30,10 +51,56 @@ class PackageForThreading():
         self.__intPackageID = intPackageID
         self.__strPackageName = strPackageName
         self.__lstOptions = list()
+        self.__tpCheckpoint = None
+
+    def __setOptionCheckpoint(self, intIndex, objOption):
+        # Each option has its own checkpoint file in the directory, named
+        # after the package id and its index only.   The thread's name is
+        # not used, as unless it is given it is Thread-N, which depends upon
+        # how many threads the process has made, so would change on restart.
+        (strDirectory, intCheckpointPaths, fltCheckpointSeconds) = \
+            self.__tpCheckpoint
+        strFile = os.path.join(strDirectory, '{id}_{index}.npz'.format(
+            id=self.__intPackageID, index=intIndex))
+        objOption.setCheckpoint(strFile, intCheckpointPaths,
+                                fltCheckpointSeconds)
+
+    def __addResults(self, objResults, objSTDResults, objOptRes,
+                     objOptSTDRes):
+        # Add the option's results to the package results.   The first
+        # option's results are copied, so that adding the others to them
+        # does not change that option's own results.
+        for strName in objOptRes:
+            if strName in objResults:
+                objResults[strName] += objOptRes[strName]
+            else:
+                objResults[strName] = objOptRes[strName].copy()
+        # Add the STD results to the package STD results
+        for strName in objOptSTDRes:
+            if strName in objSTDResults:
+                # Combining standard deviation results for multiple
+                # options is meaningless
+                objSTDResults[strName] = np.empty(
+                    objSTDResults.getNoValues())
+            else:
+                objSTDResults[strName] = objOptSTDRes[strName].copy()
 
     # Public Functions
     def addOption(self, objOption):
         self.__lstOptions.append(objOption)
+        if self.__tpCheckpoint is not None:
+            self.__setOptionCheckpoint(len(self.__lstOptions) - 1, objOption)
+
+    def setCheckpointDirectory(self, strDirectory, intCheckpointPaths=None,
+                               fltCheckpointSeconds=None):
+        # Checkpoint every option in the package (they must have a seed), so
+        # that a package that stops carries on from where it was when it is
+        # run again.
+        os.makedirs(strDirectory, exist_ok=True)
+        self.__tpCheckpoint = (strDirectory, intCheckpointPaths,
+                               fltCheckpointSeconds)
+        for (intIndex, objOption) in enumerate(self.__lstOptions):
+            self.__setOptionCheckpoint(intIndex, objOption)
 
     def start(self):
         # This is a play on the start of threading.   In the package, I am
@@ -42,59 +109,29 @@ class PackageForThreading():
             obj.start()
 
     def calculateSyncronousResults(self, npStockPrice):
-        # Build a dataframe for the results
-        pdResults = pd.DataFrame()
-        pdSTDResults = pd.DataFrame()
+        # Build the results
+        objResults = OptionResults(len(npStockPrice))
+        objSTDResults = OptionResults(len(npStockPrice))
         # Scan through the options calculating the results.
         for opt in self.__lstOptions:
-            (pdOptRes, pdOptSTDRes) = opt.calculateOption(npStockPrice)
-            # Add the columns to the pdResults dataframe
-            cols = list(pdOptRes.columns.values)
-            for col in cols:
-                if col in pdResults.columns:
-                    pdResults[col] += pdOptRes[col]
-                else:
-                    pdResults[col] = pdOptRes[col]
-            # Add the STD columns to the pdSTDResults dataframe
-            cols = list(pdOptSTDRes.columns.values)
-            for col in cols:
-                if col in pdSTDResults.columns:
-                    # Combining standard deviation results for multiple
-                    # options is meaningless
-                    pdSTDResults[col] = np.empty(len(npStockPrice))
-                else:
-                    pdSTDResults[col] = pdOptSTDRes[col]
-        return (pdResults, pdSTDResults)
+            (objOptRes, objOptSTDRes) = opt.calculateOption(npStockPrice)
+            self.__addResults(objResults, objSTDResults, objOptRes,
+                              objOptSTDRes)
+        return (objResults, objSTDResults)
 
     def retrieveThreadedResults(self, npStockPrice):
         # Scan through the options and add the stock price to the queue.
         for obj in self.__lstOptions:
             obj.m_q_Stock.put(npStockPrice)
-        # Build a pandas dataframe for the calculation results that we
-        # return from this function.
-        pdReturn = pd.DataFrame()
-        pdSTDReturn = pd.DataFrame()
+        # Build the calculation results that we return from this function.
+        objReturn = OptionResults(len(npStockPrice))
+        objSTDReturn = OptionResults(len(npStockPrice))
         # Scan through the options and get the results.   Then add them to
-        # the dataframe that we are going to return from this function.
+        # the results that we are going to return from this function.
         for obj in self.__lstOptions:
-            (pdRes, pdSTD) = obj.m_q_Results.get()
-            # Get the pdRes to pdReturn dataframe
-            cols = list(pdRes.columns.values)
-            for col in cols:
-                if col in pdReturn.columns:
-                    pdReturn[col] += pdRes[col]
-                else:
-                    pdReturn[col] = pdRes[col]
-            # Add the pdSTD columns to the pdSTDReturn dataframe
-            cols = list(pdSTD.columns.values)
-            for col in cols:
-                if col in pdSTDReturn.columns:
-                    # Combining standard deviation results for multiple
-                    # options is meaningless
-                    pdSTDReturn[col] = np.empty(len(npStockPrice))
-                else:
-                    pdSTDReturn[col] = pdSTD[col]
-        return (pdReturn, pdSTDReturn)
+            (objRes, objSTD) = obj.m_q_Results.get()
+            self.__addResults(objReturn, objSTDReturn, objRes, objSTD)
+        return (objReturn, objSTDReturn)
 
     def join(self):
         # Again this is a play on the join of threading.   In the package, I am
@@ -109,8 +146,10 @@ class BasicMonteCarloOptionThreaded(threading.Thread):
     # Private Functions
 
     def __init__(self, tpCalcRequirements, fltStrike, fltVol, fltRiskFreeRate,
-                 fltTimeToMaturity, boolIsCall, intNoIter, group=None,
-                 target=None, name=None, daemon=None):
+                 fltTimeToMaturity, boolIsCall, intNoIter,
+                 strSampling='Standard', intNoBatches=10, intSeed=None,
+                 intChunkSize=None, group=None, target=None, name=None,
+                 daemon=None):
         super().__init__(group=group, target=target, name=name, daemon=daemon)
         # Core option data
         self.__fltStrike = fltStrike
@@ -120,6 +159,28 @@ class BasicMonteCarloOptionThreaded(threading.Thread):
         self.__boolIsCall = boolIsCall
         self.__intNoIter = intNoIter
         self.__tpCalcRequirements = tpCalcRequirements
+        # The values that only depend upon the vol, rate and time, see
+        # calculateExpiryConstants
+        tpConstants = calculateExpiryConstants(fltVol, fltRiskFreeRate,
+                                               fltTimeToMaturity)
+        self.__fltVolRootT = tpConstants.volRootT
+        self.__fltDrift = tpConstants.driftMC
+        self.__fltPV = tpConstants.discount
+        self.__fltForward = tpConstants.forward
+        # Object used to draw the random numbers, see MonteCarloSampling
+        self.__objSampler = MonteCarloSampler(strSampling, intNoBatches,
+                                              intSeed)
+        # Paths are run in chunks of intChunkSize (None is all of them)
+        if intChunkSize is not None and \
+                (not isinstance(intChunkSize, (int, np.integer))
+                 or intChunkSize <= 0):
+            raise ValueError('The chunk size must be None or a positive '
+                             'int')
+        self.__intSeed = intSeed
+        self.__intChunkSize = intChunkSize
+        self.__strCheckpointFile = None
+        self.__intCheckpointPaths = None
+        self.__fltCheckpointSeconds = None
         # Input Queue of stock prices
         self.m_q_Stock = queue.Queue()
         # Output Queue for calculation results.
@@ -156,7 +217,7 @@ class BasicMonteCarloOptionThreaded(threading.Thread):
         # Return the present value of the monte carlo simulations
         return npPayoffAdj * fltPV
 
-    def __addDeltaCalculation(self, pdResults, pdSTDResults, npStockPrice,
+    def __addDeltaCalculation(self, objResults, objSTDResults, npStockPrice,
                               Mult_PDG, fltPV, npPayoffPVd):
 
         # Calculate payoff when stock price bumped by 1%
@@ -169,14 +230,14 @@ class BasicMonteCarloOptionThreaded(threading.Thread):
         npResults = (npPayoffPVd_BUp - npPayoffPVd) / (npStockPrice * 0.01)
 
         # Calculate the mean and standard deviation
-        npForResults = np.mean(npResults, axis=1)
-        npSTDForResults = np.std(npResults, axis=1)
+        (npForResults, npSTDForResults) = \
+            self.__objSampler.getMeanAndSTD(npResults)
 
         # Add Delta and its standard deviation to the results.
-        pdResults['Delta'] = npForResults
-        pdSTDResults['DeltaSTD'] = npSTDForResults
+        objResults['Delta'] = npForResults
+        objSTDResults['DeltaSTD'] = npSTDForResults
 
-    def __addGammaCalculation(self, pdResults, pdSTDResults, npStockPrice,
+    def __addGammaCalculation(self, objResults, objSTDResults, npStockPrice,
                               Mult_PDG, fltPV, npPayoffPVd):
         # Note the gamma may become unstable, see the following:
         # https://quant.stackexchange.com/questions/18208/
@@ -201,14 +262,14 @@ class BasicMonteCarloOptionThreaded(threading.Thread):
         npResults = n1/d1
 
         # Calculate the mean and standard deviation
-        npForResults = np.mean(npResults, axis=1)
-        npSTDForResults = np.std(npResults, axis=1)
+        (npForResults, npSTDForResults) = \
+            self.__objSampler.getMeanAndSTD(npResults)
 
         # Add Gamma and its std to the results.
-        pdResults['Gamma'] = npForResults
-        pdSTDResults['GammaSTD'] = npSTDForResults
+        objResults['Gamma'] = npForResults
+        objSTDResults['GammaSTD'] = npSTDForResults
 
-    def __addVegaCalculation(self, pdResults, pdSTDResults, npStockPrice, Z,
+    def __addVegaCalculation(self, objResults, objSTDResults, npStockPrice, Z,
                              Mult_PDG, fltPV, npPayoffPVd):
         # Bump the vol by fltVegaBumpSize to get the vega, then divide by
         # fltVegaBumpSize, but times by 0.01 to get it in terms of a 0.01
@@ -218,10 +279,8 @@ class BasicMonteCarloOptionThreaded(threading.Thread):
         fltVolBumped = self.__fltVol + fltVegaBumpSize
 
         # Calculate the multipliers for vega random walk
-        a1 = Z * fltVolBumped * np.sqrt(self.__fltTimeToMaturity)
-        a2 = (self.__fltRiskFreeRate
-              - 0.5 * fltVolBumped ** 2) * self.__fltTimeToMaturity
-        Mult_Vega = np.exp(a1 + a2)
+        Mult_Vega = self.__objSampler.getMultiplier(
+            Z, fltVolBumped, self.__fltRiskFreeRate, self.__fltTimeToMaturity)
 
         # Get the payoff of the vega simulation
         npPayoffPVd_Vega = self.__buildPayoffMatrixPVd(
@@ -234,14 +293,14 @@ class BasicMonteCarloOptionThreaded(threading.Thread):
             * (0.01 / fltVegaBumpSize)
 
         # Calculate the mean and std dev
-        npForResults = np.mean(npResults, axis=1)
-        npSTDForResults = np.std(npResults, axis=1)
+        (npForResults, npSTDForResults) = \
+            self.__objSampler.getMeanAndSTD(npResults)
 
         # Add vega to the results
-        pdResults['Vega'] = npForResults
-        pdSTDResults['VegaSTD'] = npSTDForResults
+        objResults['Vega'] = npForResults
+        objSTDResults['VegaSTD'] = npSTDForResults
 
-    def __addThetaCalculation(self, pdResults, pdSTDResults, npStockPrice, Z,
+    def __addThetaCalculation(self, objResults, objSTDResults, npStockPrice, Z,
                               Mult_PDG, fltPV, npPayoffPVd):
         # Bump the time by fltThetaBumpSize to get the theta, then divide
         # by fltThetaBumpSize, but times by 1/365 to get it in terms of a
@@ -252,10 +311,8 @@ class BasicMonteCarloOptionThreaded(threading.Thread):
         fltPVTimeBumped = np.exp(-self.__fltRiskFreeRate * fltTimeBumped)
 
         # Calculate the multipliers for theta random walk
-        a1 = Z * self.__fltVol * np.sqrt(fltTimeBumped)
-        a2 = (self.__fltRiskFreeRate - 0.5 * self.__fltVol ** 2) \
-            * fltTimeBumped
-        Mult_Theta = np.exp(a1 + a2)
+        Mult_Theta = self.__objSampler.getMultiplier(
+            Z, self.__fltVol, self.__fltRiskFreeRate, fltTimeBumped)
 
         # Get the payoff of the theta simulation
         npPayoffPVd_Theta = self.__buildPayoffMatrixPVd(
@@ -267,14 +324,14 @@ class BasicMonteCarloOptionThreaded(threading.Thread):
         npResults = (npPayoffPVd_Theta - npPayoffPVd)
 
         # Calculate the mean and std dev
-        npForResults = np.mean(npResults, axis=1)
-        npSTDForResults = np.std(npResults, axis=1)
+        (npForResults, npSTDForResults) = \
+            self.__objSampler.getMeanAndSTD(npResults)
 
         # Add theta to the results
-        pdResults['Theta'] = npForResults
-        pdSTDResults['ThetaSTD'] = npSTDForResults
+        objResults['Theta'] = npForResults
+        objSTDResults['ThetaSTD'] = npSTDForResults
 
-    def __addRhoCalculation(self, pdResults, pdSTDResults, npStockPrice, Z,
+    def __addRhoCalculation(self, objResults, objSTDResults, npStockPrice, Z,
                             Mult_PDG, fltPV, npPayoffPVd):
         # Bump the rate by fltRhoBumpSize to get the rho, then divide by
         # fltRhoBumpSize, but times by 0.01 to get it in terms of a 0.01
@@ -286,10 +343,8 @@ class BasicMonteCarloOptionThreaded(threading.Thread):
             -fltRiskFreeRateBumped * self.__fltTimeToMaturity)
 
         # Calculate the multipliers for rho random walk
-        a1 = Z * self.__fltVol * np.sqrt(self.__fltTimeToMaturity)
-        a2 = (fltRiskFreeRateBumped
-              - 0.5 * self.__fltVol ** 2) * self.__fltTimeToMaturity
-        Mult_Rho = np.exp(a1 + a2)
+        Mult_Rho = self.__objSampler.getMultiplier(
+            Z, self.__fltVol, fltRiskFreeRateBumped, self.__fltTimeToMaturity)
 
         # Get the payoff of the theta simulation
         npPayoffPVd_Rho = self.__buildPayoffMatrixPVd(
@@ -304,32 +359,25 @@ class BasicMonteCarloOptionThreaded(threading.Thread):
         npResults = a1 * a2
 
         # Calculate the mean and std dev
-        npForResults = np.mean(npResults, axis=1)
-        npSTDForResults = np.std(npResults, axis=1)
+        (npForResults, npSTDForResults) = \
+            self.__objSampler.getMeanAndSTD(npResults)
 
         # Add rho to the results
-        pdResults['Rho'] = npForResults
-        pdSTDResults['RhoSTD'] = npSTDForResults
-
-    def __calculateOptionNew(self, npStock):
+        objResults['Rho'] = npForResults
+        objSTDResults['RhoSTD'] = npSTDForResults
 
-        # Resize the npStock numpy array so that it is an (? x 1) matrix
-        # which is used extensively in the calculations.
-        npStockPrice = npStock.copy()
-        npStockPrice = np.reshape(npStockPrice, (len(npStock), -1))
+    def __calculateChunk(self, npStockPrice, intNoIter):
 
         # Get the random numbers
-        Z = np.random.standard_normal((1, self.__intNoIter))
+        Z = self.__objSampler.getNormals(intNoIter)
 
         # Now get the multipliers for price, delta and gamma should we
         # need them
-        a1 = Z * self.__fltVol * np.sqrt(self.__fltTimeToMaturity)
-        a2 = (self.__fltRiskFreeRate - 0.5 * self.__fltVol ** 2) \
-            * self.__fltTimeToMaturity
-        Mult_PDG = np.exp(a1 + a2)
+        Mult_PDG = self.__objSampler.getMultiplierFromConstants(
+            Z, self.__fltVolRootT, self.__fltDrift, self.__fltForward)
 
-        # Now calculate the present value multiplier.
-        fltPV = np.exp(-self.__fltRiskFreeRate * self.__fltTimeToMaturity)
+        # The present value multiplier, worked out once in __init__
+        fltPV = self.__fltPV
 
         # Get the payoff of the option with no bumps and normal present
         # value calculation.
@@ -339,40 +387,161 @@ class BasicMonteCarloOptionThreaded(threading.Thread):
             fltPV)
 
         # Add this to the result's
-        npForResults = np.mean(npPayoffPVd, axis=1)
-        npSTDForResults = np.std(npPayoffPVd, axis=1)
-        pdResults = pd.DataFrame({'Price': npForResults})
-        pdSTDResults = pd.DataFrame({'PriceSTD': npSTDForResults})
+        (npForResults, npSTDForResults) = \
+            self.__objSampler.getMeanAndSTD(npPayoffPVd)
+        objResults = OptionResults(len(npStockPrice),
+                                   {'Price': npForResults})
+        objSTDResults = OptionResults(len(npStockPrice),
+                                      {'PriceSTD': npSTDForResults})
 
         # Now potentially add the delta
         if "Delta" in self.__tpCalcRequirements:
-            self.__addDeltaCalculation(pdResults, pdSTDResults, npStockPrice,
+            self.__addDeltaCalculation(objResults, objSTDResults, npStockPrice,
                                        Mult_PDG, fltPV, npPayoffPVd)
 
         # Now potentially add the gamma
         if "Gamma" in self.__tpCalcRequirements:
-            self.__addGammaCalculation(pdResults, pdSTDResults, npStockPrice,
+            self.__addGammaCalculation(objResults, objSTDResults, npStockPrice,
                                        Mult_PDG, fltPV, npPayoffPVd)
 
         # Now potentially add the vega
         if "Vega" in self.__tpCalcRequirements:
-            self.__addVegaCalculation(pdResults, pdSTDResults, npStockPrice,
+            self.__addVegaCalculation(objResults, objSTDResults, npStockPrice,
                                       Z, Mult_PDG, fltPV, npPayoffPVd)
 
         # Now potentially add the theta
         if "Theta" in self.__tpCalcRequirements:
-            self.__addThetaCalculation(pdResults, pdSTDResults, npStockPrice,
+            self.__addThetaCalculation(objResults, objSTDResults, npStockPrice,
                                        Z, Mult_PDG, fltPV, npPayoffPVd)
 
         # Now potentially add the rho
         if "Rho" in self.__tpCalcRequirements:
-            self.__addRhoCalculation(pdResults, pdSTDResults, npStockPrice,
+            self.__addRhoCalculation(objResults, objSTDResults, npStockPrice,
                                      Z, Mult_PDG, fltPV, npPayoffPVd)
 
         # now return the results
-        return (pdResults, pdSTDResults)
+        return (objResults, objSTDResults)
+
+    def __getCheckpointKey(self, npStockPrice):
+        # A checkpoint can only be used by the same option on the same stock
+        # prices
+        tpKey = (getParameterKey(
+            (self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+             self.__fltTimeToMaturity, self.__boolIsCall, self.__intNoIter,
+             tuple(self.__tpCalcRequirements),
+             self.__objSampler.getSampling(), self.__intSeed,
+             self.__intChunkSize)),) + getArrayDigest(npStockPrice)
+        return getKeyDigest(tpKey)
+
+    def __readCheckpoint(self, strKey):
+        # Return the number of paths and chunks done and the running moments
+        # from the checkpoint file, having moved the random numbers on to
+        # where they were, or (0, 0, None) if there is no checkpoint for this
+        # calculation
+        if self.__strCheckpointFile is None or \
+                not os.path.exists(self.__strCheckpointFile):
+            return (0, 0, None)
+        with np.load(self.__strCheckpointFile) as objFile:
+            if str(objFile['key']) != strKey:
+                return (0, 0, None)
+            self.__objSampler.setState(
+                ('MT19937', objFile['rngkeys'], int(objFile['rngpos']),
+                 int(objFile['rnghasgauss']), float(objFile['rnggauss'])))
+            dctMoments = {strName: objFile['moments_' + strName]
+                          for strName in objFile['names']}
+            return (int(objFile['nopaths']), int(objFile['nochunks']),
+                    dctMoments)
+
+    def __writeCheckpoint(self, strKey, intNoPaths, intNoChunks, dctMoments):
+        # Write the checkpoint to a new file then swap it in, so a crash
+        # while writing leaves the last checkpoint in place
+        tpState = self.__objSampler.getState()
+        dctArrays = {'moments_' + strName: npMoments
+                     for (strName, npMoments) in dctMoments.items()}
+        strTemp = self.__strCheckpointFile + '.tmp'
+        with open(strTemp, 'wb') as objFile:
+            np.savez(objFile, key=strKey, nopaths=intNoPaths,
+                     nochunks=intNoChunks,
+                     names=list(dctMoments.keys()), rngkeys=tpState[1],
+                     rngpos=tpState[2], rnghasgauss=tpState[3],
+                     rnggauss=tpState[4], **dctArrays)
+        os.replace(strTemp, self.__strCheckpointFile)
+
+    def __isCheckpointDue(self, intNoPaths, intLastPaths, fltLastTime):
+        if self.__strCheckpointFile is None or intNoPaths >= self.__intNoIter:
+            return False
+        if self.__intCheckpointPaths is not None and \
+                intNoPaths - intLastPaths >= self.__intCheckpointPaths:
+            return True
+        return self.__fltCheckpointSeconds is not None and \
+            time.time() - fltLastTime >= self.__fltCheckpointSeconds
+
+    def __calculateOptionNew(self, npStock):
+
+        # Resize the npStock numpy array so that it is an (? x 1) matrix
+        # which is used extensively in the calculations.
+        npStockPrice = npStock.copy()
+        npStockPrice = np.reshape(npStockPrice, (len(npStock), -1))
+
+        # With a seed, every calculation starts from the same random numbers
+        self.__objSampler.startRun()
+        intChunkSize = self.__intNoIter if self.__intChunkSize is None \
+            else self.__intChunkSize
+        if intChunkSize >= self.__intNoIter and \
+                self.__strCheckpointFile is None:
+            return self.__calculateChunk(npStockPrice, self.__intNoIter)
+
+        # Run the paths in chunks, keeping the running mean and M2 of each
+        # result (see MonteCarloSampler.addChunkMoments), and carry on from
+        # the checkpoint if there is one.
+        strKey = self.__getCheckpointKey(npStockPrice)
+        (intNoPaths, intNoChunks, dctMoments) = self.__readCheckpoint(strKey)
+        intLastPaths = intNoPaths
+        fltLastTime = time.time()
+        while intNoPaths < self.__intNoIter:
+            intNoIter = min(intChunkSize, self.__intNoIter - intNoPaths)
+            (objResults, objSTDResults) = self.__calculateChunk(
+                npStockPrice, intNoIter)
+            if dctMoments is None:
+                dctMoments = {strName: None for strName in objResults}
+            for (strName, npMean) in objResults.items():
+                dctMoments[strName] = self.__objSampler.addChunkMoments(
+                    dctMoments[strName], intNoPaths, intNoChunks, npMean,
+                    objSTDResults[strName + 'STD'], intNoIter)
+            intNoPaths += intNoIter
+            intNoChunks += 1
+
+            if self.__isCheckpointDue(intNoPaths, intLastPaths, fltLastTime):
+                self.__writeCheckpoint(strKey, intNoPaths, intNoChunks,
+                                       dctMoments)
+                intLastPaths = intNoPaths
+                fltLastTime = time.time()
+
+        # The calculation is finished, so the checkpoint is not needed
+        if self.__strCheckpointFile is not None and \
+                os.path.exists(self.__strCheckpointFile):
+            os.remove(self.__strCheckpointFile)
+
+        objResults = OptionResults(len(npStock))
+        objSTDResults = OptionResults(len(npStock))
+        for (strName, npMoments) in dctMoments.items():
+            (objResults[strName], objSTDResults[strName + 'STD']) = \
+                self.__objSampler.getMomentsMeanAndSTD(
+                    npMoments, self.__intNoIter, intNoChunks)
+        return (objResults, objSTDResults)
 
     # Public Functions
+    def setCheckpoint(self, strCheckpointFile, intCheckpointPaths=None,
+                      fltCheckpointSeconds=None):
+        # Save the running results to strCheckpointFile every
+        # intCheckpointPaths paths and/or every fltCheckpointSeconds
+        # seconds, so that a calculation that stops can be resumed.
+        if strCheckpointFile is not None and self.__intSeed is None:
+            raise ValueError('A checkpoint needs an option with a seed')
+        self.__strCheckpointFile = strCheckpointFile
+        self.__intCheckpointPaths = intCheckpointPaths
+        self.__fltCheckpointSeconds = fltCheckpointSeconds
+
     def run(self):
         while not self.stoprequest.isSet():
             try:
@@ -380,9 +549,10 @@ class BasicMonteCarloOptionThreaded(threading.Thread):
                 npStockPrice = self.m_q_Stock.get(True, 1)
                 # Attept to calculate the results, but price/delta etc only,
                 # no stddev hence the use of [0]
-                (pdResults, pdResultsSTD) = self.calculateOption(npStockPrice)
+                (objResults, objResultsSTD) = self.calculateOption(
+                    npStockPrice)
                 # Attempt to push the results back out of to the results queue
-                self.m_q_Results.put((pdResults, pdResultsSTD))
+                self.m_q_Results.put((objResults, objResultsSTD))
             except queue.Empty:
                 continue
 
@@ -0,0 +1,217 @@
+import numpy as np
+from analytics.LazyImport import LazyModule
+
+'''
+This section prices a European Option by solving the Black Scholes partial
+differential equation on a grid of stock prices using the Crank Nicolson
+finite difference method.
+
+The PDE is solved backwards from the payoff at maturity.   Each time step
+needs a tridiagonal set of equations to be solved, which is done using the
+banded solver scipy.linalg.solve_banded.   Crank Nicolson can produce
+oscillations in the greeks near the strike because the payoff has a kink in
+it, so the first few steps are replaced by fully implicit half steps
+(Rannacher smoothing).
+
+One solve gives the price at every point in the stock price grid at the same
+time and without any random noise, so the delta and gamma can be read off the
+grid.   The results are then moved onto the stock prices in npStock by using
+the price, delta and gamma of the nearest grid point.   Vega and Rho need the
+PDE to be solved again with the vol or rate bumped.
+
+The grid goes from 0 to the larger of 1.5 x the largest stock price in
+npStock and the strike x Exp(6 x vol x sqrt(T)), so the last grid that was
+solved is kept and only rebuilt if npStock needs a bigger grid.
+
+CrankNicolsonOption has the same functions as BlackScholes and returns the
+greeks in the same units, ie vega and rho for a 1% move and theta for 1 day.
+'''
+sl = LazyModule('scipy.linalg')
+
+
+class CrankNicolsonOption():
+
+    # Private Functions
+
+    def __init__(self, fltStrike, fltVol, fltRiskFreeRate, fltTimeToMaturity,
+                 boolIsCall, intNoSpaceSteps=400, intNoTimeSteps=200,
+                 intNoRannacherSteps=2):
+        self.__fltStrike = fltStrike
+        self.__fltVol = fltVol
+        self.__fltRiskFreeRate = fltRiskFreeRate
+        self.__fltTimeToMaturity = fltTimeToMaturity
+        self.__boolIsCall = boolIsCall
+        self.__intNoSpaceSteps = intNoSpaceSteps
+        self.__intNoTimeSteps = intNoTimeSteps
+        self.__intNoRannacherSteps = min(intNoRannacherSteps, intNoTimeSteps)
+        # The last grid that was solved, (max stock price, results)
+        self.__tpLastSolve = None
+
+    def __str__(self):
+        strF = 'CrankNicolsonOption: [Strike:{strike}; Vol:{vol}; ' \
+               'RFRate:{rfrate}; Time:{time}; IsCall:{iscall}; ' \
+               'NoSpaceSteps:{nospace}; NoTimeSteps:{notime}]'
+        return strF.format(strike=self.__fltStrike, vol=self.__fltVol,
+                           rfrate=self.__fltRiskFreeRate,
+                           time=self.__fltTimeToMaturity,
+                           iscall=self.__boolIsCall,
+                           nospace=self.__intNoSpaceSteps,
+                           notime=self.__intNoTimeSteps)
+
+    def __getMaxStock(self, npStock):
+        fltSMax = self.__fltStrike * np.exp(
+            6 * self.__fltVol * np.sqrt(self.__fltTimeToMaturity))
+        return max(fltSMax, 1.5 * np.max(npStock))
+
+    def __getBoundaries(self, fltSMax, fltRate, fltTau):
+        # The value at S = 0 and S = SMax when there is fltTau to maturity
+        fltPVStrike = self.__fltStrike * np.exp(-fltRate * fltTau)
+        if self.__boolIsCall:
+            return (0.0, fltSMax - fltPVStrike)
+        else:
+            return (fltPVStrike, 0.0)
+
+    def __buildBandedMatrix(self, npA, npB, npC, fltDT, fltTheta):
+        # Left hand side (I - theta x dt x L) in the form used by
+        # solve_banded, ie upper diagonal, diagonal and lower diagonal rows.
+        npAB = np.zeros((3, len(npB)))
+        npAB[0, 1:] = -fltTheta * fltDT * npC[:-1]
+        npAB[1, :] = 1 - fltTheta * fltDT * npB
+        npAB[2, :-1] = -fltTheta * fltDT * npA[1:]
+        return npAB
+
+    def __solveGrid(self, fltSMax, fltVol, fltRate):
+        # Returns the stock price grid, the values today and the values one
+        # time step later (used for theta).
+        intM = self.__intNoSpaceSteps
+        npS = np.linspace(0, fltSMax, intM + 1)
+        fltDT = self.__fltTimeToMaturity / self.__intNoTimeSteps
+
+        # Coefficients of the Black Scholes operator L at each interior node
+        npI = np.arange(1, intM)
+        npA = 0.5 * (fltVol ** 2 * npI ** 2 - fltRate * npI)
+        npB = -(fltVol ** 2 * npI ** 2 + fltRate)
+        npC = 0.5 * (fltVol ** 2 * npI ** 2 + fltRate * npI)
+
+        # Rannacher steps are fully implicit half steps, the rest are
+        # Crank Nicolson.   The banded matrices are built once for each.
+        lstSteps = [(fltDT / 2, 1.0)] * (2 * self.__intNoRannacherSteps) \
+            + [(fltDT, 0.5)] * (self.__intNoTimeSteps
+                                - self.__intNoRannacherSteps)
+        dctMatrix = dict()
+        for tpStep in set(lstSteps):
+            dctMatrix[tpStep] = self.__buildBandedMatrix(npA, npB, npC,
+                                                         tpStep[0], tpStep[1])
+
+        # Start from the payoff at maturity
+        if self.__boolIsCall:
+            npV = np.maximum(npS - self.__fltStrike, 0)
+        else:
+            npV = np.maximum(self.__fltStrike - npS, 0)
+
+        fltTau = 0.0
+        npVPrevious = npV
+        for (fltStepDT, fltTheta) in lstSteps:
+            fltTau += fltStepDT
+            (fltLow, fltHigh) = self.__getBoundaries(fltSMax, fltRate, fltTau)
+
+            # Right hand side (I + (1 - theta) x dt x L) V
+            npRHS = npV[1:-1] + (1 - fltTheta) * fltStepDT * (
+                npA * npV[:-2] + npB * npV[1:-1] + npC * npV[2:])
+            npRHS[0] += fltTheta * fltStepDT * npA[0] * fltLow
+            npRHS[-1] += fltTheta * fltStepDT * npC[-1] * fltHigh
+
+            npVPrevious = npV
+            npV = np.empty(intM + 1)
+            npV[0] = fltLow
+            npV[-1] = fltHigh
+            npV[1:-1] = sl.solve_banded((1, 1),
+                                        dctMatrix[(fltStepDT, fltTheta)],
+                                        npRHS)
+
+        return (npS, npV, npVPrevious, lstSteps[-1][0])
+
+    def __getGridResults(self, npStock):
+        # Solve the grid (or reuse the last one) and get the delta and gamma
+        # at every grid point.
+        fltSMax = self.__getMaxStock(npStock)
+        if self.__tpLastSolve is None or self.__tpLastSolve[0] < fltSMax:
+            (npS, npV, npVPrevious, fltLastDT) = self.__solveGrid(
+                fltSMax, self.__fltVol, self.__fltRiskFreeRate)
+            fltDS = npS[1] - npS[0]
+            npDelta = np.gradient(npV, fltDS)
+            npGamma = np.zeros(len(npV))
+            npGamma[1:-1] = (npV[2:] - 2 * npV[1:-1] + npV[:-2]) \
+                / (fltDS * fltDS)
+            npGamma[0] = npGamma[1]
+            npGamma[-1] = npGamma[-2]
+            npTheta = (npVPrevious - npV) / fltLastDT / 365
+            self.__tpLastSolve = (fltSMax, (npS, npV, npDelta, npGamma,
+                                            npTheta))
+        return self.__tpLastSolve[1]
+
+    def __getNearest(self, npS, npStock):
+        # Index of the nearest grid point and the distance from it
+        fltDS = npS[1] - npS[0]
+        npIndex = np.clip(np.rint(npStock / fltDS).astype(int), 0,
+                          len(npS) - 1)
+        return (npIndex, npStock - npS[npIndex])
+
+    def __getBumpedPrice(self, npStock, fltVol, fltRate):
+        # Solve a new grid with the vol or rate bumped, then move the prices
+        # onto npStock using a quadratic through the neighbouring points.
+        fltSMax = self.__getMaxStock(npStock)
+        (npS, npV) = self.__solveGrid(fltSMax, fltVol, fltRate)[0:2]
+        (npIndex, npDist) = self.__getNearest(npS, npStock)
+        npIndex = np.clip(npIndex, 1, len(npS) - 2)
+        npDist = npStock - npS[npIndex]
+        fltDS = npS[1] - npS[0]
+        npDelta = (npV[npIndex + 1] - npV[npIndex - 1]) / (2 * fltDS)
+        npGamma = (npV[npIndex + 1] - 2 * npV[npIndex] + npV[npIndex - 1]) \
+            / (fltDS * fltDS)
+        return npV[npIndex] + npDelta * npDist + 0.5 * npGamma * npDist ** 2
+
+    # Public Functions
+
+    def getGridValues(self, npStock):
+        # Return the stock price grid along with the price, delta, gamma and
+        # theta at every point on it.
+        return self.__getGridResults(npStock)
+
+    def getOptionPrice(self, npStock):
+        (npS, npV, npDelta, npGamma) = self.__getGridResults(npStock)[0:4]
+        (npIndex, npDist) = self.__getNearest(npS, npStock)
+        return npV[npIndex] + npDelta[npIndex] * npDist \
+            + 0.5 * npGamma[npIndex] * npDist ** 2
+
+    def getOptionDelta(self, npStock):
+        (npS, npV, npDelta, npGamma) = self.__getGridResults(npStock)[0:4]
+        (npIndex, npDist) = self.__getNearest(npS, npStock)
+        return npDelta[npIndex] + npGamma[npIndex] * npDist
+
+    def getOptionGamma(self, npStock):
+        (npS, npV, npDelta, npGamma) = self.__getGridResults(npStock)[0:4]
+        return np.interp(npStock, npS, npGamma)
+
+    def getOptionTheta(self, npStock):
+        (npS, npV, npDelta, npGamma, npTheta) = \
+            self.__getGridResults(npStock)
+        return np.interp(npStock, npS, npTheta)
+
+    def getOptionVega(self, npStock):
+        # Central difference, expressed for a 1% move in the vol
+        fltBump = 0.001
+        npUp = self.__getBumpedPrice(npStock, self.__fltVol + fltBump,
+                                     self.__fltRiskFreeRate)
+        npDown = self.__getBumpedPrice(npStock, self.__fltVol - fltBump,
+                                       self.__fltRiskFreeRate)
+        return (npUp - npDown) / (2 * fltBump) * 0.01
+
+    def getOptionRho(self, npStock):
+        # Central difference, expressed for a 1% move in the rate
+        fltBump = 0.001
+        npUp = self.__getBumpedPrice(npStock, self.__fltVol,
+                                     self.__fltRiskFreeRate + fltBump)
+        npDown = self.__getBumpedPrice(npStock, self.__fltVol,
+                                       self.__fltRiskFreeRate - fltBump)
+        return (npUp - npDown) / (2 * fltBump) * 0.01
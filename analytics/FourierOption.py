@@ -0,0 +1,167 @@
+import numpy as np
+from analytics.LazyImport import LazyModule
+
+'''
+This section prices a whole strip of European Options with different strikes
+(but the same stock price and maturity) in one go, using the Fast Fourier
+Transform method of Carr & Madan (1999).
+
+The method only needs the characteristic function of the log of the stock
+price at maturity, ie E[Exp(i u Ln(S_T))].   The call price is damped by
+Exp(alpha x k), where k is the log strike, so that it has a Fourier
+transform, and that transform can be written in terms of the
+characteristic function.   One FFT of N points then gives the call price at
+N log strikes that are evenly spaced around Ln(S), which costs O(N Log(N))
+rather than O(N) separate pricings.   Simpson's rule weights are used for
+the integral.
+
+Prices for any other strikes are found using a cubic spline through the
+grid, and puts are found using put-call parity.
+
+The characteristic function is held in a separate class, so that models
+other than Black Scholes can be used by writing a new class with a
+getCharacteristicFunction(npU, fltStock, fltRiskFreeRate,
+fltTimeToMaturity) function.   HestonCharacteristicFunction is the Heston
+stochastic volatility model, written in the form that avoids the branch cut
+problems of the original paper (Albrecher et al, 'The Little Heston Trap').
+'''
+sint = LazyModule('scipy.interpolate')
+
+
+class BlackScholesCharacteristicFunction():
+
+    # Private Functions
+
+    def __init__(self, fltVol):
+        self.__fltVol = fltVol
+
+    def __str__(self):
+        return 'BlackScholesCharacteristicFunction: [Vol:{vol}]'.format(
+            vol=self.__fltVol)
+
+    # Public Functions
+
+    def getCharacteristicFunction(self, npU, fltStock, fltRiskFreeRate,
+                                  fltTimeToMaturity):
+        # Ln(S_T) is normal with the following mean and variance
+        fltVar = self.__fltVol ** 2 * fltTimeToMaturity
+        fltMean = np.log(fltStock) + fltRiskFreeRate * fltTimeToMaturity \
+            - 0.5 * fltVar
+        return np.exp(1j * npU * fltMean - 0.5 * fltVar * npU * npU)
+
+
+class HestonCharacteristicFunction():
+
+    # Private Functions
+
+    def __init__(self, fltV0, fltKappa, fltTheta, fltXi, fltRho):
+        # Initial variance, mean reversion speed, long run variance,
+        # vol of variance and correlation between the stock and variance
+        self.__fltV0 = fltV0
+        self.__fltKappa = fltKappa
+        self.__fltTheta = fltTheta
+        self.__fltXi = fltXi
+        self.__fltRho = fltRho
+
+    def __str__(self):
+        strF = 'HestonCharacteristicFunction: [V0:{v0}; Kappa:{kappa}; ' \
+               'Theta:{theta}; Xi:{xi}; Rho:{rho}]'
+        return strF.format(v0=self.__fltV0, kappa=self.__fltKappa,
+                           theta=self.__fltTheta, xi=self.__fltXi,
+                           rho=self.__fltRho)
+
+    # Public Functions
+
+    def getCharacteristicFunction(self, npU, fltStock, fltRiskFreeRate,
+                                  fltTimeToMaturity):
+        fltKappa = self.__fltKappa
+        fltXi2 = self.__fltXi ** 2
+        npB = fltKappa - self.__fltRho * self.__fltXi * 1j * npU
+        npD = np.sqrt(npB ** 2 + fltXi2 * (1j * npU + npU * npU))
+        npG = (npB - npD) / (npB + npD)
+        npExp = np.exp(-npD * fltTimeToMaturity)
+
+        npC = fltKappa * self.__fltTheta / fltXi2 * (
+            (npB - npD) * fltTimeToMaturity
+            - 2 * np.log((1 - npG * npExp) / (1 - npG)))
+        npD = (npB - npD) / fltXi2 * (1 - npExp) / (1 - npG * npExp)
+        fltForward = np.log(fltStock) + fltRiskFreeRate * fltTimeToMaturity
+        return np.exp(1j * npU * fltForward + npC + npD * self.__fltV0)
+
+
+class FourierOption():
+
+    # Private Functions
+
+    def __init__(self, objCharacteristicFunction, fltRiskFreeRate,
+                 fltTimeToMaturity, intNoPoints=4096, fltEta=0.25,
+                 fltAlpha=1.5):
+        self.__objCharacteristicFunction = objCharacteristicFunction
+        self.__fltRiskFreeRate = fltRiskFreeRate
+        self.__fltTimeToMaturity = fltTimeToMaturity
+        self.__intNoPoints = intNoPoints
+        self.__fltEta = fltEta
+        self.__fltAlpha = fltAlpha
+
+        # The integration grid (v) and the log strike spacing (lambda) are
+        # linked by lambda x eta = 2 pi / N
+        self.__npV = fltEta * np.arange(intNoPoints)
+        self.__fltLambda = 2 * np.pi / (intNoPoints * fltEta)
+
+        # Simpson's rule weights
+        npJ = np.arange(1, intNoPoints + 1)
+        self.__npWeights = fltEta / 3 * (3 + (-1) ** npJ)
+        self.__npWeights[0] = fltEta / 3
+
+    def __str__(self):
+        strF = 'FourierOption: [Model:{model}; RFRate:{rfrate}; ' \
+               'Time:{time}; NoPoints:{nopoints}; Eta:{eta}; Alpha:{alpha}]'
+        return strF.format(model=self.__objCharacteristicFunction,
+                           rfrate=self.__fltRiskFreeRate,
+                           time=self.__fltTimeToMaturity,
+                           nopoints=self.__intNoPoints,
+                           eta=self.__fltEta,
+                           alpha=self.__fltAlpha)
+
+    def __getCallStrip(self, fltStock):
+        # Log strikes, centred on Ln(S)
+        fltStart = np.log(fltStock) \
+            - 0.5 * self.__intNoPoints * self.__fltLambda
+        npK = fltStart + self.__fltLambda * np.arange(self.__intNoPoints)
+
+        # Fourier transform of the damped call price
+        fltAlpha = self.__fltAlpha
+        npV = self.__npV
+        npPhi = self.__objCharacteristicFunction.getCharacteristicFunction(
+            npV - (fltAlpha + 1) * 1j, fltStock, self.__fltRiskFreeRate,
+            self.__fltTimeToMaturity)
+        npPsi = np.exp(-self.__fltRiskFreeRate * self.__fltTimeToMaturity) \
+            * npPhi / (fltAlpha ** 2 + fltAlpha - npV ** 2
+                       + 1j * (2 * fltAlpha + 1) * npV)
+
+        npX = np.exp(-1j * npV * fltStart) * npPsi * self.__npWeights
+        npCall = np.exp(-fltAlpha * npK) / np.pi * np.real(np.fft.fft(npX))
+        return (npK, npCall)
+
+    # Public Functions
+
+    def getStrikeStrip(self, fltStock, boolIsCall=True):
+        # Return the strikes on the FFT grid and the price for each of them
+        (npK, npCall) = self.__getCallStrip(fltStock)
+        npStrike = np.exp(npK)
+        if boolIsCall:
+            return (npStrike, npCall)
+        npPut = npCall - fltStock + npStrike * np.exp(
+            -self.__fltRiskFreeRate * self.__fltTimeToMaturity)
+        return (npStrike, npPut)
+
+    def getOptionPrice(self, npStrike, fltStock, boolIsCall=True):
+        # Price any set of strikes using a cubic spline in the log strike
+        npStrike = np.asarray(npStrike, dtype=np.float64)
+        (npK, npCall) = self.__getCallStrip(fltStock)
+        objSpline = sint.CubicSpline(npK, npCall)
+        npPrice = objSpline(np.log(npStrike))
+        if not boolIsCall:
+            npPrice = npPrice - fltStock + npStrike * np.exp(
+                -self.__fltRiskFreeRate * self.__fltTimeToMaturity)
+        return npPrice
@@ -0,0 +1,227 @@
+import numpy as np
+from analytics.MonteCarloSampling import MonteCarloSampler
+from analytics.LazyImport import LazyModule
+
+'''
+This section prices an option using Monte Carlo when the volatility is not
+constant but follows the Heston stochastic volatility model:
+
+dS = r S dt + Sqrt(V) S dW1
+dV = kappa (theta - V) dt + xi Sqrt(V) dW2,      dW1 dW2 = rho dt
+
+The variance is moved forward using the Quadratic Exponential (QE) scheme
+of Andersen (2008), which matches the mean and variance of the exact
+distribution of V over a step and never lets V go negative.   When the
+variance is large compared to its mean it uses a squared normal number and
+when it is small it uses an exponential distribution with a mass at zero.
+The log of the stock price is then moved forward using the integral of V
+over the step (trapezoid rule) and a normal number that is independent of
+the one used for the variance.   With no vol of vol (fltXi = 0) the variance
+is not random, it follows its mean, and the log of the stock price uses the
+exact integral of the variance over each step.
+
+As with MonteCarloPathOption, the stock price paths only ever multiply the
+initial stock price, so only the path starting at 1 (npUnit) is simulated
+and the payoff classes from MonteCarloPathOption (EuropeanPathPayoff,
+AsianPathPayoff etc) are used.
+
+The paths are run in chunks of intChunkSize paths and only the running mean and
+M2 of the results are kept (see MonteCarloSampler.getChunkedMeanAndSTD), so the
+memory used does not grow with the number of paths.   The chunks use their own
+random number generator, which is seeded with intSeed (or a seed drawn from
+np.random if this is not set, so np.random.seed still works).   Re-running the
+simulation with the same seed gives exactly the same random numbers, so the
+vega uses common random numbers for the bumped initial variance.   The delta
+and gamma use bumped stock prices on the same paths.
+
+The functions return (value, std) in the same way as BasicMonteCarloOption.
+Vega is for a 1% move in the initial volatility (Sqrt(V0)).
+'''
+si = LazyModule('scipy.stats')
+
+
+class HestonMonteCarloOption():
+
+    # Private Functions
+
+    def __init__(self, objPayoff, fltV0, fltKappa, fltTheta, fltXi, fltRho,
+                 fltRiskFreeRate, fltTimeToMaturity, intNoSteps, intNoIter,
+                 intChunkSize=10000, intSeed=None):
+        self.__objPayoff = objPayoff
+        self.__fltV0 = fltV0
+        self.__fltKappa = fltKappa
+        self.__fltTheta = fltTheta
+        self.__fltXi = fltXi
+        self.__fltRho = fltRho
+        self.__fltRiskFreeRate = fltRiskFreeRate
+        self.__fltTimeToMaturity = fltTimeToMaturity
+        self.__intNoSteps = intNoSteps
+        self.__intNoIter = intNoIter
+        self.__intChunkSize = intChunkSize
+        self.__intSeed = intSeed
+        self.__objSampler = MonteCarloSampler()
+
+    def __str__(self):
+        strF = 'HestonMonteCarloOption: [Payoff:{payoff}; V0:{v0}; ' \
+               'Kappa:{kappa}; Theta:{theta}; Xi:{xi}; Rho:{rho}; ' \
+               'RFRate:{rfrate}; Time:{time}; NoSteps:{nosteps}; ' \
+               'NoIter:{noiter}]'
+        return strF.format(payoff=str(self.__objPayoff), v0=self.__fltV0,
+                           kappa=self.__fltKappa, theta=self.__fltTheta,
+                           xi=self.__fltXi, rho=self.__fltRho,
+                           rfrate=self.__fltRiskFreeRate,
+                           time=self.__fltTimeToMaturity,
+                           nosteps=self.__intNoSteps,
+                           noiter=self.__intNoIter)
+
+    def __getSeed(self):
+        if self.__intSeed is not None:
+            return self.__intSeed
+        return np.random.randint(2 ** 31)
+
+    def __getQEVariance(self, npV, npM, npU, fltS2A, fltS2B):
+        # QE step for the variance, npM is its mean at the end of the step
+        # and psi is the variance over the mean^2
+        npS2 = npV * fltS2A + fltS2B
+        npPsi = npS2 / (npM * npM)
+        npVNext = np.empty(np.shape(npV))
+
+        npQuad = npPsi <= 1.5
+        npPsiQ = npPsi[npQuad]
+        npB2 = 2 / npPsiQ - 1 + np.sqrt(2 / npPsiQ) \
+            * np.sqrt(2 / npPsiQ - 1)
+        npA = npM[npQuad] / (1 + npB2)
+        npZV = si.norm.ppf(np.clip(npU[npQuad], 1e-12, 1 - 1e-12))
+        npVNext[npQuad] = npA * (np.sqrt(npB2) + npZV) ** 2
+
+        npExpo = ~npQuad
+        npPsiE = npPsi[npExpo]
+        npP = (npPsiE - 1) / (npPsiE + 1)
+        npBeta = (1 - npP) / npM[npExpo]
+        npUE = npU[npExpo]
+        npVNext[npExpo] = np.where(
+            npUE <= npP, 0.0,
+            np.log((1 - npP) / np.maximum(1 - npUE, 1e-300)) / npBeta)
+        return npVNext
+
+    def __simulateChunk(self, objRandom, fltV0, intNoIter):
+        # Move the path starting at 1 and its variance forward using the
+        # QE scheme, updating the payoff's running values after each step.
+        fltDT = self.__fltTimeToMaturity / self.__intNoSteps
+        fltKappa = self.__fltKappa
+        fltTheta = self.__fltTheta
+        fltXi = self.__fltXi
+        fltRho = self.__fltRho
+
+        # Constants for the variance (QE) and log stock price steps.   With
+        # no vol of vol (xi = 0) the variance follows its mean instead.
+        fltExp = np.exp(-fltKappa * fltDT)
+        boolIsDeterministic = fltXi == 0
+        if boolIsDeterministic:
+            fltIntV = (1 - fltExp) / fltKappa
+        else:
+            fltS2A = fltXi ** 2 * fltExp * (1 - fltExp) / fltKappa
+            fltS2B = fltTheta * fltXi ** 2 * (1 - fltExp) ** 2 \
+                / (2 * fltKappa)
+            fltK0 = -fltRho * fltKappa * fltTheta * fltDT / fltXi
+            fltK1 = 0.5 * fltDT * (fltKappa * fltRho / fltXi - 0.5) \
+                - fltRho / fltXi
+            fltK2 = 0.5 * fltDT * (fltKappa * fltRho / fltXi - 0.5) \
+                + fltRho / fltXi
+            fltK3 = 0.5 * fltDT * (1 - fltRho ** 2)
+
+        npV = np.full((1, intNoIter), float(fltV0))
+        npLogUnit = np.zeros((1, intNoIter))
+        self.__objPayoff.start(intNoIter)
+
+        for i in range(0, self.__intNoSteps):
+            npU = objRandom.uniform(size=(1, intNoIter))
+            Z = objRandom.standard_normal((1, intNoIter))
+            npM = fltTheta + (npV - fltTheta) * fltExp
+
+            if boolIsDeterministic:
+                # The variance is its mean and the log stock price uses the
+                # exact integral of the variance over the step
+                npVNext = npM
+                npIntV = fltTheta * fltDT + (npV - fltTheta) * fltIntV
+                npLogUnit += self.__fltRiskFreeRate * fltDT - 0.5 * npIntV \
+                    + np.sqrt(npIntV) * Z
+            else:
+                npVNext = self.__getQEVariance(npV, npM, npU, fltS2A, fltS2B)
+                npLogUnit += self.__fltRiskFreeRate * fltDT + fltK0 \
+                    + fltK1 * npV + fltK2 * npVNext \
+                    + np.sqrt(fltK3 * (npV + npVNext)) * Z
+            npV = npVNext
+            self.__objPayoff.update(np.exp(npLogUnit))
+
+        return np.exp(npLogUnit)
+
+    def __getChunks(self, npStockPrice, fltV0, intSeed):
+        # Yield the discounted payoff for each chunk of paths
+        objRandom = np.random.RandomState(intSeed)
+        fltPV = np.exp(-self.__fltRiskFreeRate * self.__fltTimeToMaturity)
+        intDone = 0
+        while intDone < self.__intNoIter:
+            intNoIter = min(self.__intChunkSize, self.__intNoIter - intDone)
+            npUnit = self.__simulateChunk(objRandom, fltV0, intNoIter)
+            yield self.__objPayoff.getPayoff(npStockPrice, npUnit) * fltPV
+            intDone += intNoIter
+
+    # Public Functions
+
+    def getOptionPrice(self, npStock):
+        npStockPrice = np.reshape(npStock, (len(npStock), -1))
+        return self.__objSampler.getChunkedMeanAndSTD(
+            self.__getChunks(npStockPrice, self.__fltV0, self.__getSeed()))
+
+    def getOptionDelta(self, npStock):
+
+        # The bumped stock prices use the same paths.
+        npStockPrice = np.reshape(npStock, (len(npStock), -1))
+        npBump = npStockPrice * 0.01
+        npStacked = np.concatenate((npStockPrice, npStockPrice + npBump))
+
+        def getDelta(npValues):
+            (npPV, npPVBump) = np.split(npValues, 2)
+            return (npPVBump - npPV) / npBump
+
+        itChunks = self.__getChunks(npStacked, self.__fltV0,
+                                    self.__getSeed())
+        return self.__objSampler.getChunkedMeanAndSTD(
+            getDelta(npV) for npV in itChunks)
+
+    def getOptionGamma(self, npStock):
+
+        # Again, the bumped stock prices use the same paths.
+        npStockPrice = np.reshape(npStock, (len(npStock), -1))
+        npBump = npStockPrice * 0.01
+        npStacked = np.concatenate((npStockPrice, npStockPrice + npBump,
+                                    npStockPrice - npBump))
+
+        def getGamma(npValues):
+            (npPV, npPVBumpPlus, npPVBumpMinus) = np.split(npValues, 3)
+            return (npPVBumpPlus - (2 * npPV) + npPVBumpMinus) \
+                / (npBump * npBump)
+
+        itChunks = self.__getChunks(npStacked, self.__fltV0,
+                                    self.__getSeed())
+        return self.__objSampler.getChunkedMeanAndSTD(
+            getGamma(npV) for npV in itChunks)
+
+    def getOptionVega(self, npStock):
+
+        # Bump the initial vol up and down by 1% and re-run the simulation
+        # with the same seed (common random numbers).   The two runs are
+        # moved forward a chunk at a time together.
+        npStockPrice = np.reshape(npStock, (len(npStock), -1))
+        fltVol = np.sqrt(self.__fltV0)
+        fltVolUp = fltVol + 0.01
+        fltVolDown = max(fltVol - 0.01, 0)
+        intSeed = self.__getSeed()
+        itUp = self.__getChunks(npStockPrice, fltVolUp ** 2, intSeed)
+        itDown = self.__getChunks(npStockPrice, fltVolDown ** 2, intSeed)
+
+        # Vega for a 1% move
+        return self.__objSampler.getChunkedMeanAndSTD(
+            (npUp - npDown) / (fltVolUp - fltVolDown) * 0.01
+            for (npUp, npDown) in zip(itUp, itDown))
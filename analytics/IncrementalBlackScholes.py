@@ -0,0 +1,168 @@
+import numpy as np
+from analytics.EuropeanOption import BlackScholes
+
+'''
+This section prices a large set of stock prices with black & scholes and
+then keeps them up to date as a few of the stock prices change, eg on each
+tick in live trading.   BlackScholes recalculates every stock price on
+every call, whereas here only the stock prices that changed are looked at.
+
+setStock prices the whole set of stock prices and keeps the stock prices,
+prices, deltas and gammas.   updateStock then takes the indices of the stock
+prices that have changed and their new values, and only updates those.
+
+For a small move in the stock price, the price, delta and gamma are found
+from a Taylor expansion around the stock price where they were last fully
+calculated (the anchor), ie
+
+price(S0 + dS) = price(S0) + delta(S0) dS + 0.5 gamma(S0) dS^2
+
+which only needs a few multiplies.   The first term that is left out is
+speed dS^3 / 6 (speed being the change in gamma), with speed taken somewhere
+between S0 and S0 + dS.   The bound on the error uses the largest speed can
+be anywhere in that range, not the speed at S0, which can be 0 even when the
+error of a big move is not.   Rather than working out the bound on each
+tick, the largest move that keeps it within fltTolerance (the radius) is
+found once for each anchor (see BlackScholes.getQuickValues), so each tick
+is only a compare of the move with the radius.   If the stock price has
+moved further than that, it is fully recalculated instead and the anchor
+moves to the new stock price.
+
+The tolerance only bounds the price.   The delta, delta(S0) + gamma(S0) dS,
+leaves out speed dS^2 / 2, so it is within 3 fltTolerance / radius (from the
+same bound on speed).   The gamma, gamma(S0) + speed(S0) dS, is not bounded
+at all, it is only a first order estimate.
+Because the expansion is always from the anchor, rather than from the last
+estimate, the errors do not build up tick after tick.
+
+The number of prices fully recalculated and the number estimated from the
+Taylor expansion are counted, so you can see how much work is being saved.
+An index passed to updateStock more than once takes its last stock price,
+and is only counted once.
+The arrays returned are read only views of the arrays held here, so they
+change with each update.   Copy them if you want to keep them.
+'''
+
+
+class IncrementalBlackScholes():
+
+    # Private Functions
+
+    def __init__(self, fltStrike, fltVol, fltRiskFreeRate, fltTimeToMaturity,
+                 boolIsCall, fltTolerance=1e-6):
+        self.__objBS = BlackScholes(fltStrike, fltVol, fltRiskFreeRate,
+                                    fltTimeToMaturity, boolIsCall)
+        self.__fltTolerance = fltTolerance
+        self.__npStock = None
+        self.__intNoFull = 0
+        self.__intNoTaylor = 0
+        self.__intNoSetStock = 0
+
+    def __str__(self):
+        strF = 'IncrementalBlackScholes: [{bs}; Tolerance:{tolerance}]'
+        return strF.format(bs=str(self.__objBS),
+                           tolerance=self.__fltTolerance)
+
+    def __calculate(self, npIndex, npStock):
+        # Fully calculate the stock prices at the indices and make them the
+        # anchor for future Taylor expansions, along with the radius that
+        # they can move by (see BlackScholes.getQuickValues)
+        dctValues = self.__objBS.getQuickValues(npStock, self.__fltTolerance)
+        self.__npAnchor[npIndex] = npStock
+        self.__npAnchorPrice[npIndex] = dctValues['Price']
+        self.__npAnchorDelta[npIndex] = dctValues['Delta']
+        self.__npAnchorGamma[npIndex] = dctValues['Gamma']
+        self.__npAnchorSpeed[npIndex] = dctValues['Speed']
+        self.__npAnchorRadius[npIndex] = dctValues['Radius']
+        self.__npPrice[npIndex] = self.__npAnchorPrice[npIndex]
+        self.__npDelta[npIndex] = self.__npAnchorDelta[npIndex]
+        self.__npGamma[npIndex] = self.__npAnchorGamma[npIndex]
+
+    def __getReadOnly(self, npArray):
+        npView = npArray.view()
+        npView.flags.writeable = False
+        return npView
+
+    # Public Functions
+
+    def setStock(self, npStock):
+        # Fully calculate every stock price
+        self.__npStock = np.array(npStock, dtype=np.float64)
+        intN = len(self.__npStock)
+        self.__npAnchor = np.empty(intN)
+        self.__npAnchorPrice = np.empty(intN)
+        self.__npAnchorDelta = np.empty(intN)
+        self.__npAnchorGamma = np.empty(intN)
+        self.__npAnchorSpeed = np.empty(intN)
+        self.__npAnchorRadius = np.empty(intN)
+        self.__npPrice = np.empty(intN)
+        self.__npDelta = np.empty(intN)
+        self.__npGamma = np.empty(intN)
+        self.__calculate(slice(None), self.__npStock)
+        self.__intNoSetStock += 1
+        self.__intNoFull += intN
+        return (self.getOptionPrice(), self.getOptionDelta(),
+                self.getOptionGamma())
+
+    def updateStock(self, npIndex, npStock):
+        # Update the stock prices at the indices, returning the new price,
+        # delta and gamma at those indices only
+        if self.__npStock is None:
+            raise ValueError('setStock must be called before updateStock')
+        npIndex = np.asarray(npIndex, dtype=np.intp)
+        npNew = np.broadcast_to(np.asarray(npStock, dtype=np.float64),
+                                npIndex.shape).ravel()
+
+        # A stock price that is in npIndex more than once takes its last
+        # tick, and is only updated (and counted) once
+        (npUnique, npLast) = np.unique(npIndex.ravel()[::-1],
+                                       return_index=True)
+        npNew = npNew[::-1][npLast]
+        self.__npStock[npUnique] = npNew
+
+        # Any stock price that has moved no further than the radius from
+        # its anchor is estimated from the Taylor expansion
+        npMove = npNew - self.__npAnchor[npUnique]
+        npIsTaylor = np.abs(npMove) <= self.__npAnchorRadius[npUnique]
+
+        npTaylor = npUnique[npIsTaylor]
+        npMoveTaylor = npMove[npIsTaylor]
+        npDeltaTaylor = self.__npAnchorDelta[npTaylor]
+        npGammaTaylor = self.__npAnchorGamma[npTaylor]
+        self.__npPrice[npTaylor] = self.__npAnchorPrice[npTaylor] \
+            + npMoveTaylor * (npDeltaTaylor + 0.5 * npGammaTaylor
+                              * npMoveTaylor)
+        self.__npDelta[npTaylor] = npDeltaTaylor \
+            + npGammaTaylor * npMoveTaylor
+        self.__npGamma[npTaylor] = npGammaTaylor \
+            + self.__npAnchorSpeed[npTaylor] * npMoveTaylor
+
+        npFull = npUnique[~npIsTaylor]
+        if len(npFull) > 0:
+            self.__calculate(npFull, self.__npStock[npFull])
+
+        self.__intNoTaylor += len(npTaylor)
+        self.__intNoFull += len(npFull)
+        return (self.__npPrice[npIndex], self.__npDelta[npIndex],
+                self.__npGamma[npIndex])
+
+    def getStock(self):
+        return self.__getReadOnly(self.__npStock)
+
+    def getOptionPrice(self):
+        return self.__getReadOnly(self.__npPrice)
+
+    def getOptionDelta(self):
+        return self.__getReadOnly(self.__npDelta)
+
+    def getOptionGamma(self):
+        return self.__getReadOnly(self.__npGamma)
+
+    def getStatistics(self):
+        # How many prices have been fully calculated or estimated, and the
+        # proportion of updates that avoided a full calculation
+        intNoUpdates = self.__intNoFull + self.__intNoTaylor
+        return {'SetStock': self.__intNoSetStock, 'Full': self.__intNoFull,
+                'Taylor': self.__intNoTaylor,
+                'Avoided': self.__intNoTaylor / intNoUpdates
+                if intNoUpdates > 0 else 0.0}
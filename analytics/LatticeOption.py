@@ -0,0 +1,223 @@
+import numpy as np
+from analytics.EuropeanOption import BlackScholes
+
+'''
+This section prices an option using a binomial (Cox, Ross & Rubinstein) or
+trinomial (Boyle) lattice, which is useful for checking the other models and
+also allows the option to be exercised early (American Options).
+
+The lattice is worked backwards from maturity using a single array holding
+the option value at each node in the current time step, ie n + 1 values for
+a binomial lattice (2n + 1 for a trinomial), which is updated in place.
+There is no loop over the nodes, only over the time steps.   The lattice
+for each stock price in npStock is held in a separate row, so all of the
+stock prices are priced at the same time ((number of stock prices x n + 1)
+numbers).
+
+The delta, gamma and theta are read from the nodes at the first couple of
+time steps.   A lattice converges slowly (roughly 1/n) and oscillates, so
+Richardson extrapolation can be used, which prices the lattice with n and
+2n steps and returns 2 x value(2n) - value(n).   Extrapolation only works if
+the error falls smoothly, so when it is used the last time step is replaced
+by the Black Scholes price (Broadie & Detemple), which removes most of the
+oscillation caused by the kink in the payoff.
+
+The greeks are returned in the same units as BlackScholes, ie theta is for
+1 day.
+'''
+
+
+class LatticeOption():
+
+    # Private Functions
+
+    def __init__(self, fltStrike, fltVol, fltRiskFreeRate, fltTimeToMaturity,
+                 boolIsCall, intNoSteps, strLattice='Binomial',
+                 boolIsAmerican=False, boolRichardson=False):
+        if strLattice not in ('Binomial', 'Trinomial'):
+            raise ValueError('Unknown lattice: ' + str(strLattice))
+        if intNoSteps < 3:
+            # The greeks are read from the nodes at the second time step
+            raise ValueError('A lattice needs at least 3 steps')
+        self.__fltStrike = fltStrike
+        self.__fltVol = fltVol
+        self.__fltRiskFreeRate = fltRiskFreeRate
+        self.__fltTimeToMaturity = fltTimeToMaturity
+        self.__boolIsCall = boolIsCall
+        self.__intNoSteps = intNoSteps
+        self.__strLattice = strLattice
+        self.__boolIsAmerican = boolIsAmerican
+        self.__boolRichardson = boolRichardson
+
+    def __str__(self):
+        strF = 'LatticeOption: [Strike:{strike}; Vol:{vol}; ' \
+               'RFRate:{rfrate}; Time:{time}; IsCall:{iscall}; ' \
+               'NoSteps:{nosteps}; Lattice:{lattice}; ' \
+               'IsAmerican:{isamerican}]'
+        return strF.format(strike=self.__fltStrike, vol=self.__fltVol,
+                           rfrate=self.__fltRiskFreeRate,
+                           time=self.__fltTimeToMaturity,
+                           iscall=self.__boolIsCall,
+                           nosteps=self.__intNoSteps,
+                           lattice=self.__strLattice,
+                           isamerican=self.__boolIsAmerican)
+
+    def __setPayoff(self, npStock, npPower, npOut):
+        # Fill npOut with the payoff at the nodes S x npPower
+        np.multiply(npStock, npPower, out=npOut)
+        if self.__boolIsCall:
+            npOut -= self.__fltStrike
+        else:
+            np.subtract(self.__fltStrike, npOut, out=npOut)
+
+    def __exercise(self, npStock, npPower, npValue, npWork):
+        # Replace the value with the payoff if it is worth more
+        self.__setPayoff(npStock, npPower, npWork)
+        np.maximum(npValue, npWork, out=npValue)
+
+    def __setSmoothedValues(self, npStock, npPower, npOut, fltDT):
+        # Fill npOut with the Black Scholes value one time step before
+        # maturity, at the nodes S x npPower
+        objBS = BlackScholes(self.__fltStrike, self.__fltVol,
+                             self.__fltRiskFreeRate, fltDT, self.__boolIsCall)
+        npOut[:] = objBS.getOptionPrice(npStock * npPower)
+        if self.__boolIsAmerican:
+            self.__exercise(npStock, npPower, npOut, np.empty(npOut.shape))
+
+    def __runBinomial(self, npStock, intN):
+        fltDT = self.__fltTimeToMaturity / intN
+        fltU = np.exp(self.__fltVol * np.sqrt(fltDT))
+        fltD = 1 / fltU
+        fltP = (np.exp(self.__fltRiskFreeRate * fltDT) - fltD) / (fltU - fltD)
+        fltDisc = np.exp(-self.__fltRiskFreeRate * fltDT)
+        fltDiscUp = fltDisc * fltP
+        fltDiscDown = fltDisc * (1 - fltP)
+
+        # u^k for k = -n ... n, the node with i up moves at step j is
+        # S x u^(2i - j)
+        npPower = fltU ** np.arange(-intN, intN + 1)
+
+        # Value at maturity, then the backwards induction.
+        npValue = np.empty((len(npStock), intN + 1))
+        npWork = np.empty((len(npStock), intN + 1))
+        if self.__boolRichardson:
+            intStart = intN - 1
+            self.__setSmoothedValues(npStock, npPower[1:2 * intN:2],
+                                     npValue[:, :intN], fltDT)
+        else:
+            intStart = intN
+            self.__setPayoff(npStock, npPower[0::2], npValue)
+            np.maximum(npValue, 0, out=npValue)
+
+        # Keep the nodes needed for the greeks
+        dctNodes = {intStart: npValue[:, :min(intStart + 1, 3)].copy()}
+        for j in range(intStart - 1, -1, -1):
+            npV = npValue[:, :j + 1]
+            npW = npWork[:, :j + 1]
+            np.multiply(npValue[:, 1:j + 2], fltDiscUp, out=npW)
+            npV *= fltDiscDown
+            npV += npW
+            if self.__boolIsAmerican:
+                self.__exercise(npStock, npPower[intN - j:intN + j + 1:2],
+                                npV, npW)
+            if j <= 2:
+                dctNodes[j] = npV.copy()
+
+        # Read the greeks from the nodes at steps 1 and 2
+        npS = npStock[:, 0]
+        npV1 = dctNodes[1]
+        npV2 = dctNodes[2]
+        npPrice = dctNodes[0][:, 0]
+        npDelta = (npV1[:, 1] - npV1[:, 0]) / (npS * (fltU - fltD))
+        npDeltaUp = (npV2[:, 2] - npV2[:, 1]) / (npS * (fltU * fltU - 1))
+        npDeltaDown = (npV2[:, 1] - npV2[:, 0]) / (npS * (1 - fltD * fltD))
+        npGamma = (npDeltaUp - npDeltaDown) \
+            / (0.5 * npS * (fltU * fltU - fltD * fltD))
+        npTheta = (npV2[:, 1] - npPrice) / (2 * fltDT) / 365
+        return (npPrice, npDelta, npGamma, npTheta)
+
+    def __runTrinomial(self, npStock, intN):
+        fltDT = self.__fltTimeToMaturity / intN
+        fltU = np.exp(self.__fltVol * np.sqrt(2 * fltDT))
+        fltA = np.exp(self.__fltRiskFreeRate * fltDT / 2)
+        fltB = np.exp(self.__fltVol * np.sqrt(fltDT / 2))
+        fltPU = ((fltA - 1 / fltB) / (fltB - 1 / fltB)) ** 2
+        fltPD = ((fltB - fltA) / (fltB - 1 / fltB)) ** 2
+        fltPM = 1 - fltPU - fltPD
+        fltDisc = np.exp(-self.__fltRiskFreeRate * fltDT)
+
+        # u^k for k = -n ... n, node k at step j is S x u^(k - j)
+        npPower = fltU ** np.arange(-intN, intN + 1)
+
+        npValue = np.empty((len(npStock), 2 * intN + 1))
+        npWorkMid = np.empty((len(npStock), 2 * intN + 1))
+        npWorkUp = np.empty((len(npStock), 2 * intN + 1))
+        if self.__boolRichardson:
+            intStart = intN - 1
+            self.__setSmoothedValues(npStock, npPower[1:2 * intN],
+                                     npValue[:, :2 * intN - 1], fltDT)
+        else:
+            intStart = intN
+            self.__setPayoff(npStock, npPower, npValue)
+            np.maximum(npValue, 0, out=npValue)
+
+        dctNodes = {intStart: npValue[:, :min(2 * intStart + 1, 3)].copy()}
+        for j in range(intStart - 1, -1, -1):
+            intM = 2 * j + 1
+            npV = npValue[:, :intM]
+            np.multiply(npValue[:, 1:intM + 1], fltDisc * fltPM,
+                        out=npWorkMid[:, :intM])
+            np.multiply(npValue[:, 2:intM + 2], fltDisc * fltPU,
+                        out=npWorkUp[:, :intM])
+            npV *= fltDisc * fltPD
+            npV += npWorkMid[:, :intM]
+            npV += npWorkUp[:, :intM]
+            if self.__boolIsAmerican:
+                self.__exercise(npStock, npPower[intN - j:intN + j + 1],
+                                npV, npWorkMid[:, :intM])
+            if j <= 1:
+                dctNodes[j] = npV.copy()
+
+        # Read the greeks from the three nodes at step 1
+        npS = npStock[:, 0]
+        npPrice = dctNodes[0][:, 0]
+        npV1 = dctNodes[1]
+        npDelta = (npV1[:, 2] - npV1[:, 0]) / (npS * (fltU - 1 / fltU))
+        npDeltaUp = (npV1[:, 2] - npV1[:, 1]) / (npS * (fltU - 1))
+        npDeltaDown = (npV1[:, 1] - npV1[:, 0]) / (npS * (1 - 1 / fltU))
+        npGamma = (npDeltaUp - npDeltaDown) \
+            / (0.5 * npS * (fltU - 1 / fltU))
+        npTheta = (npV1[:, 1] - npPrice) / fltDT / 365
+        return (npPrice, npDelta, npGamma, npTheta)
+
+    def __runLattice(self, npStock, intN):
+        npStockPrice = np.reshape(np.asarray(npStock, dtype=np.float64),
+                                  (len(npStock), -1))
+        if self.__strLattice == 'Trinomial':
+            return self.__runTrinomial(npStockPrice, intN)
+        else:
+            return self.__runBinomial(npStockPrice, intN)
+
+    # Public Functions
+
+    def getOptionValues(self, npStock):
+        # Returns (price, delta, gamma, theta) from one run of the lattice,
+        # or two runs when using Richardson extrapolation.
+        tpValues = self.__runLattice(npStock, self.__intNoSteps)
+        if not self.__boolRichardson:
+            return tpValues
+        tpDouble = self.__runLattice(npStock, 2 * self.__intNoSteps)
+        return tuple(2 * npDouble - npSingle
+                     for (npDouble, npSingle) in zip(tpDouble, tpValues))
+
+    def getOptionPrice(self, npStock):
+        return self.getOptionValues(npStock)[0]
+
+    def getOptionDelta(self, npStock):
+        return self.getOptionValues(npStock)[1]
+
+    def getOptionGamma(self, npStock):
+        return self.getOptionValues(npStock)[2]
+
+    def getOptionTheta(self, npStock):
+        return self.getOptionValues(npStock)[3]
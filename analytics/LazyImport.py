@@ -0,0 +1,55 @@
+import importlib
+
+'''
+This section puts off importing a module until it is first used.
+
+scipy.stats (and pandas and matplotlib) take far longer to import than the
+pricing itself takes for a small set of stock prices, so a short lived
+worker that only prices a few options spends most of its time importing.
+Rather than
+
+import scipy.stats as si
+
+a module does
+
+si = LazyModule('scipy.stats')
+
+and carries on using si.norm.cdf etc as before.   The module is only
+imported the first time one of its attributes is asked for.   Each attribute
+is then kept on the LazyModule, so after the first use it is looked up as
+quickly as it would be on the module itself.   A module that is not
+installed only raises its ImportError when it is first used.
+'''
+
+
+class LazyModule():
+
+    # Private Functions
+
+    def __init__(self, strName):
+        self.__strName = strName
+        self.__objModule = None
+
+    def __str__(self):
+        strF = 'LazyModule: [Name:{name}; IsLoaded:{isloaded}]'
+        return strF.format(name=self.__strName,
+                           isloaded=self.__objModule is not None)
+
+    def __getattr__(self, strAttribute):
+        # Only called for attributes that are not already kept here, so
+        # import the module (once) and keep the attribute for next time
+        if strAttribute.startswith('_LazyModule__'):
+            raise AttributeError(strAttribute)
+        if self.__objModule is None:
+            self.__objModule = importlib.import_module(self.__strName)
+        objAttribute = getattr(self.__objModule, strAttribute)
+        setattr(self, strAttribute, objAttribute)
+        return objAttribute
+
+    # Public Functions
+
+    def getName(self):
+        return self.__strName
+
+    def isLoaded(self):
+        return self.__objModule is not None
@@ -0,0 +1,205 @@
+import numpy as np
+from analytics.MonteCarloSampling import MonteCarloSampler
+
+'''
+This section prices an American (strictly Bermudan) option using the least
+squares Monte Carlo method of Longstaff & Schwartz (2001).
+
+The option can be exercised at each date in the time grid.   Working
+backwards from maturity, the value of holding on to the option at each date
+is estimated by regressing the (discounted) cash flow that each path goes
+on to receive against a set of basis functions of the stock price.   A path
+is exercised if the payoff is worth more than this estimate, and its cash
+flow is replaced by the payoff.
+
+Paths need to be known at every date in reverse order, so rather than
+storing them all, the brownian motion is built backwards using a Brownian
+Bridge, ie W(T) is drawn first and W(t_i) is then drawn given W(t_i+1).
+Only the current value of the brownian motion and the cash flow for each
+path are held, so memory does not grow with the number of exercise dates.
+As with MonteCarloPathOption, only the path starting at 1 is simulated and
+every stock price in npStock (a row each) uses the same paths.
+
+Only the in the money paths are used in the regression (and are the only
+paths that can be exercised), so at each date only these rows are pulled
+out.   The regression for every stock price is done at the same time, by
+building the normal equations (X'X)b = X'y for each stock price using
+np.bincount and then solving them all with one call to np.linalg.pinv.
+
+The basis is either 'Polynomial' (1, x, x^2, ...) or 'Laguerre' (weighted
+Laguerre polynomials as in the original paper), where x is the stock price
+divided by the strike, with intNoBasis functions.
+
+The functions return (value, std) in the same way as BasicMonteCarloOption.
+The delta and gamma use stock prices bumped by 1%, which go through the
+same paths (as extra rows) but have their own regressions.
+'''
+
+
+class LeastSquaresMonteCarloOption():
+
+    # Private Functions
+
+    def __init__(self, fltStrike, fltVol, fltRiskFreeRate, fltTimeToMaturity,
+                 boolIsCall, intNoSteps, intNoIter, strBasis='Polynomial',
+                 intNoBasis=3, strSampling='Standard', intNoBatches=10):
+        if strBasis not in ('Polynomial', 'Laguerre'):
+            raise ValueError('Unknown basis: ' + str(strBasis))
+        self.__fltStrike = fltStrike
+        self.__fltVol = fltVol
+        self.__fltRiskFreeRate = fltRiskFreeRate
+        self.__fltTimeToMaturity = fltTimeToMaturity
+        self.__boolIsCall = boolIsCall
+        self.__intNoSteps = intNoSteps
+        self.__intNoIter = intNoIter
+        self.__strBasis = strBasis
+        self.__intNoBasis = intNoBasis
+        # Object used to draw the random numbers, see MonteCarloSampling
+        self.__objSampler = MonteCarloSampler(strSampling, intNoBatches)
+
+    def __str__(self):
+        strF = 'LeastSquaresMonteCarloOption: [Strike:{strike}; Vol:{vol}; ' \
+               'RFRate:{rfrate}; Time:{time}; IsCall:{iscall}; ' \
+               'NoSteps:{nosteps}; NoIter:{noiter}; Basis:{basis}; ' \
+               'NoBasis:{nobasis}]'
+        return strF.format(strike=self.__fltStrike, vol=self.__fltVol,
+                           rfrate=self.__fltRiskFreeRate,
+                           time=self.__fltTimeToMaturity,
+                           iscall=self.__boolIsCall,
+                           nosteps=self.__intNoSteps,
+                           noiter=self.__intNoIter,
+                           basis=self.__strBasis,
+                           nobasis=self.__intNoBasis)
+
+    def __getPayoff(self, npS):
+        if self.__boolIsCall:
+            return np.maximum(npS - self.__fltStrike, 0)
+        else:
+            return np.maximum(self.__fltStrike - npS, 0)
+
+    def __getBasis(self, npX):
+        # (number of rows x intNoBasis) matrix of basis functions
+        if self.__strBasis == 'Laguerre':
+            return np.exp(-npX / 2)[:, np.newaxis] \
+                * np.polynomial.laguerre.lagvander(npX, self.__intNoBasis - 1)
+        return np.polynomial.polynomial.polyvander(npX, self.__intNoBasis - 1)
+
+    def __getContinuation(self, npRow, npX, npY, intNoRows):
+        # Regress npY on the basis of npX separately for each stock price
+        # (npRow), then return the fitted values.
+        npBasis = self.__getBasis(npX)
+        intB = self.__intNoBasis
+        npXX = np.empty((intNoRows, intB, intB))
+        npXY = np.empty((intNoRows, intB))
+        for a in range(0, intB):
+            npXY[:, a] = np.bincount(npRow, weights=npBasis[:, a] * npY,
+                                     minlength=intNoRows)
+            for b in range(a, intB):
+                npXX[:, a, b] = np.bincount(
+                    npRow, weights=npBasis[:, a] * npBasis[:, b],
+                    minlength=intNoRows)
+                npXX[:, b, a] = npXX[:, a, b]
+
+        # pinv copes with stock prices that have too few in the money paths
+        npCoef = np.matmul(np.linalg.pinv(npXX), npXY[:, :, np.newaxis])
+        return np.sum(npBasis * npCoef[npRow, :, 0], axis=1)
+
+    def __getNormals(self):
+        # Sobol numbers have to be drawn with one dimension per step, the
+        # other methods draw one step at a time (stratified numbers are
+        # shuffled on every draw, so the steps are independent).
+        if self.__objSampler.getSampling() == 'Sobol':
+            npBlockZ = self.__objSampler.getNormalBlock(self.__intNoSteps,
+                                                        self.__intNoIter)
+            for i in range(0, self.__intNoSteps):
+                yield npBlockZ[i:i + 1]
+        else:
+            for i in range(0, self.__intNoSteps):
+                yield self.__objSampler.getNormals(self.__intNoIter)
+
+    def __getPathValues(self, npStockPrice):
+        # Returns the discounted cash flow of every path (column) for each
+        # stock price (row).
+        npTimes = np.linspace(0, self.__fltTimeToMaturity,
+                              self.__intNoSteps + 1)
+        fltDrift = self.__fltRiskFreeRate - 0.5 * self.__fltVol ** 2
+        itNormals = self.__getNormals()
+
+        # Start from the payoff at maturity
+        npW = np.sqrt(npTimes[-1]) * next(itNormals)
+        npUnit = np.exp(fltDrift * npTimes[-1] + self.__fltVol * npW)
+        npCash = self.__getPayoff(npStockPrice * npUnit)
+
+        for i in range(self.__intNoSteps - 1, 0, -1):
+            # Discount the cash flows back to t_i
+            npCash *= np.exp(-self.__fltRiskFreeRate
+                             * (npTimes[i + 1] - npTimes[i]))
+
+            # W(t_i) given W(t_i+1), using the Brownian Bridge
+            fltRatio = npTimes[i] / npTimes[i + 1]
+            npW = fltRatio * npW + np.sqrt(
+                fltRatio * (npTimes[i + 1] - npTimes[i])) * next(itNormals)
+            npUnit = np.exp(fltDrift * npTimes[i] + self.__fltVol * npW)
+
+            # Only the in the money paths are regressed and exercised
+            npS = npStockPrice * npUnit
+            (npRow, npCol) = np.nonzero(
+                npS > self.__fltStrike if self.__boolIsCall
+                else npS < self.__fltStrike)
+            if len(npRow) == 0:
+                continue
+            npSITM = npS[npRow, npCol]
+            npPayoff = self.__getPayoff(npSITM)
+            npContinuation = self.__getContinuation(
+                npRow, npSITM / self.__fltStrike, npCash[npRow, npCol],
+                len(npStockPrice))
+            npExercise = npPayoff > npContinuation
+            npCash[npRow[npExercise], npCol[npExercise]] = \
+                npPayoff[npExercise]
+
+        npCash *= np.exp(-self.__fltRiskFreeRate * npTimes[1])
+        return npCash
+
+    def __getPriceFromValues(self, npStockPrice, npValues):
+        # The option can also be exercised today
+        (npMean, npSTD) = self.__objSampler.getMeanAndSTD(npValues)
+        npPayoff = self.__getPayoff(npStockPrice[:, 0])
+        npExercise = npPayoff > npMean
+        npMean = np.where(npExercise, npPayoff, npMean)
+        npSTD = np.where(npExercise, 0, npSTD)
+        return (npMean, npSTD)
+
+    # Public Functions
+
+    def getOptionPrice(self, npStock):
+        npStockPrice = np.reshape(npStock, (len(npStock), -1))
+        npValues = self.__getPathValues(npStockPrice)
+        return self.__getPriceFromValues(npStockPrice, npValues)
+
+    def getOptionDelta(self, npStock):
+
+        # The bumped stock prices are extra rows on the same paths
+        npStockPrice = np.reshape(npStock, (len(npStock), -1))
+        npBump = npStockPrice * 0.01
+        npValues = self.__getPathValues(
+            np.concatenate((npStockPrice, npStockPrice + npBump)))
+        (npPV, npPVBump) = np.split(npValues, 2)
+
+        # Calculate the delta, then the mean and stdev for each axis.
+        npAllDelta = (npPVBump - npPV) / npBump
+        return self.__objSampler.getMeanAndSTD(npAllDelta)
+
+    def getOptionGamma(self, npStock):
+
+        # Again, the bumped stock prices reuse the same paths.
+        npStockPrice = np.reshape(npStock, (len(npStock), -1))
+        npBump = npStockPrice * 0.01
+        npValues = self.__getPathValues(
+            np.concatenate((npStockPrice, npStockPrice + npBump,
+                            npStockPrice - npBump)))
+        (npPV, npPVBumpPlus, npPVBumpMinus) = np.split(npValues, 3)
+
+        # Calculate the gamma, then the mean and stdev for each axis.
+        npAllGamma = (npPVBumpPlus - (2 * npPV) + npPVBumpMinus) \
+            / (npBump * npBump)
+        return self.__objSampler.getMeanAndSTD(npAllGamma)
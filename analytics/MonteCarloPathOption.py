@@ -0,0 +1,300 @@
+import numpy as np
+from analytics.MonteCarloSampling import MonteCarloSampler
+from analytics.BrownianBridge import BrownianBridge
+
+'''
+BasicMonteCarloOption only simulates the final stock price, which is fine for
+a European Option but not for options that depend upon the path taken by the
+stock, such as Asian, Barrier or Lookback options.
+
+This module has a Monte Carlo class that moves the stock price forward step
+by step over a time grid.   Storing every path would need
+(number of paths x number of steps) numbers, so instead each payoff class
+only keeps the running values that it needs (a running total for the
+average, a running min or max etc) and these are updated at every step.
+
+Because the stock follows a geometric brownian motion, the path for any
+initial stock price S is just S multiplied by the path that starts at 1.
+I therefore only simulate the path starting at 1 (npUnit) and the running
+values are held for that path, which means they take (1 x number of paths)
+numbers regardless of how many stock prices are in npStock.   The initial
+stock prices are only applied when the payoff is calculated at the end.
+
+MonteCarloPathOption:
+This moves the paths forward over the time grid, passes them to the payoff
+and then returns (value, std) from the functions in the same way as
+BasicMonteCarloOption.   A European payoff with 1 step gives exactly the
+same result as BasicMonteCarloOption.
+With Sobol sampling, or if boolBrownianBridge is set, all of the normal
+numbers for a path are drawn at once (one Sobol dimension per step) and with
+the bridge the path is built using a Brownian Bridge, which should be used
+with Sobol sampling (see BrownianBridge).   This needs a
+(number of steps x number of paths) matrix of normal numbers, but the
+running values are still only updated one step at a time.
+As with BasicMonteCarloOption, with intSeed set every call starts again from
+the same random numbers, so the results can be repeated.
+
+EuropeanPathPayoff, AsianPathPayoff, BarrierPathPayoff, LookbackPathPayoff:
+These hold the running values for each type of option.   Each has a start
+function to reset the running values, an update function which is called
+after every step and a getPayoff function that returns the (undiscounted)
+payoff for every stock price (row) and path (column).
+'''
+
+
+class EuropeanPathPayoff():
+
+    # Private Functions
+
+    def __init__(self, fltStrike, boolIsCall):
+        self.__fltStrike = fltStrike
+        self.__boolIsCall = boolIsCall
+
+    def __str__(self):
+        strF = 'EuropeanPathPayoff: [Strike:{strike}; IsCall:{iscall};]'
+        return strF.format(strike=self.__fltStrike, iscall=self.__boolIsCall)
+
+    # Public Functions
+
+    def start(self, intNoIter):
+        # A European option only needs the final stock price
+        pass
+
+    def update(self, npUnit):
+        pass
+
+    def getPayoff(self, npStock, npUnit):
+        # npStock is a (? x 1) matrix and npUnit is (1 x intNoIter)
+        npFinalS = npStock * npUnit
+        if self.__boolIsCall:
+            return np.maximum(npFinalS - self.__fltStrike, 0)
+        else:
+            return np.maximum(self.__fltStrike - npFinalS, 0)
+
+
+class AsianPathPayoff():
+
+    # Private Functions
+
+    def __init__(self, fltStrike, boolIsCall):
+        # Fixed strike option on the arithmetic average of the stock price
+        # at each step in the time grid (not including the start).
+        self.__fltStrike = fltStrike
+        self.__boolIsCall = boolIsCall
+        self.__npRunningSum = None
+        self.__intNoObs = 0
+
+    def __str__(self):
+        strF = 'AsianPathPayoff: [Strike:{strike}; IsCall:{iscall};]'
+        return strF.format(strike=self.__fltStrike, iscall=self.__boolIsCall)
+
+    # Public Functions
+
+    def start(self, intNoIter):
+        self.__npRunningSum = np.zeros((1, intNoIter))
+        self.__intNoObs = 0
+
+    def update(self, npUnit):
+        self.__npRunningSum += npUnit
+        self.__intNoObs += 1
+
+    def getPayoff(self, npStock, npUnit):
+        npAverage = npStock * (self.__npRunningSum / self.__intNoObs)
+        if self.__boolIsCall:
+            return np.maximum(npAverage - self.__fltStrike, 0)
+        else:
+            return np.maximum(self.__fltStrike - npAverage, 0)
+
+
+class BarrierPathPayoff():
+
+    # Private Functions
+
+    def __init__(self, fltStrike, boolIsCall, fltBarrier, boolIsUp):
+        # Knock out option, the barrier is checked at each step in the
+        # time grid (discrete monitoring) and at the start.
+        self.__fltStrike = fltStrike
+        self.__boolIsCall = boolIsCall
+        self.__fltBarrier = fltBarrier
+        self.__boolIsUp = boolIsUp
+        self.__npRunningExtreme = None
+
+    def __str__(self):
+        strF = 'BarrierPathPayoff: [Strike:{strike}; IsCall:{iscall}; ' \
+               'Barrier:{barrier}; IsUp:{isup};]'
+        return strF.format(strike=self.__fltStrike, iscall=self.__boolIsCall,
+                           barrier=self.__fltBarrier, isup=self.__boolIsUp)
+
+    # Public Functions
+
+    def start(self, intNoIter):
+        # The running max (up) or min (down) of the path starting at 1.
+        self.__npRunningExtreme = np.ones((1, intNoIter))
+
+    def update(self, npUnit):
+        if self.__boolIsUp:
+            np.maximum(self.__npRunningExtreme, npUnit,
+                       out=self.__npRunningExtreme)
+        else:
+            np.minimum(self.__npRunningExtreme, npUnit,
+                       out=self.__npRunningExtreme)
+
+    def getPayoff(self, npStock, npUnit):
+        # A path has knocked out if the running max (min) of the stock price
+        # has gone through the barrier.
+        npExtreme = npStock * self.__npRunningExtreme
+        if self.__boolIsUp:
+            npKnockedOut = npExtreme >= self.__fltBarrier
+        else:
+            npKnockedOut = npExtreme <= self.__fltBarrier
+
+        npFinalS = npStock * npUnit
+        if self.__boolIsCall:
+            npPayoff = np.maximum(npFinalS - self.__fltStrike, 0)
+        else:
+            npPayoff = np.maximum(self.__fltStrike - npFinalS, 0)
+        npPayoff[npKnockedOut] = 0
+        return npPayoff
+
+
+class LookbackPathPayoff():
+
+    # Private Functions
+
+    def __init__(self, boolIsCall):
+        # Floating strike lookback, a call pays S_T - min(S) and a put pays
+        # max(S) - S_T.   The start and each step in the grid are included.
+        self.__boolIsCall = boolIsCall
+        self.__npRunningExtreme = None
+
+    def __str__(self):
+        strF = 'LookbackPathPayoff: [IsCall:{iscall};]'
+        return strF.format(iscall=self.__boolIsCall)
+
+    # Public Functions
+
+    def start(self, intNoIter):
+        self.__npRunningExtreme = np.ones((1, intNoIter))
+
+    def update(self, npUnit):
+        if self.__boolIsCall:
+            np.minimum(self.__npRunningExtreme, npUnit,
+                       out=self.__npRunningExtreme)
+        else:
+            np.maximum(self.__npRunningExtreme, npUnit,
+                       out=self.__npRunningExtreme)
+
+    def getPayoff(self, npStock, npUnit):
+        if self.__boolIsCall:
+            return npStock * (npUnit - self.__npRunningExtreme)
+        else:
+            return npStock * (self.__npRunningExtreme - npUnit)
+
+
+class MonteCarloPathOption():
+
+    # Private Functions
+
+    def __init__(self, objPayoff, fltVol, fltRiskFreeRate, fltTimeToMaturity,
+                 intNoSteps, intNoIter, strSampling='Standard',
+                 intNoBatches=10, boolBrownianBridge=False, intSeed=None):
+        self.__objPayoff = objPayoff
+        self.__fltVol = fltVol
+        self.__fltRiskFreeRate = fltRiskFreeRate
+        self.__fltTimeToMaturity = fltTimeToMaturity
+        self.__intNoSteps = intNoSteps
+        self.__intNoIter = intNoIter
+        # Object used to draw the random numbers, see MonteCarloSampling
+        self.__objSampler = MonteCarloSampler(strSampling, intNoBatches,
+                                              intSeed)
+        # The bridge weights only depend upon the time grid, so build once
+        self.__objBridge = None
+        if boolBrownianBridge:
+            self.__objBridge = BrownianBridge(self.getTimeGrid())
+
+    def __str__(self):
+        strF = 'MonteCarloPathOption: [Payoff:{payoff}; Vol:{vol}; ' \
+               'RFRate:{rfrate}; Time:{time}; NoSteps:{nosteps}; ' \
+               'NoIter:{noiter}]'
+        return strF.format(payoff=str(self.__objPayoff), vol=self.__fltVol,
+                           rfrate=self.__fltRiskFreeRate,
+                           time=self.__fltTimeToMaturity,
+                           nosteps=self.__intNoSteps,
+                           noiter=self.__intNoIter)
+
+    def __simulate(self):
+        # Move the path starting at 1 forward one step at a time, only the
+        # current value and the payoff's running values are kept.
+        self.__objSampler.startRun()
+        npTimes = self.getTimeGrid()
+        npUnit = np.ones((1, self.__intNoIter))
+        self.__objPayoff.start(self.__intNoIter)
+
+        # Sobol numbers have to be drawn with one dimension per step and the
+        # Brownian Bridge needs every step, so these are built up front.
+        npBlockZ = None
+        if self.__objBridge is not None \
+                or self.__objSampler.getSampling() == 'Sobol':
+            npBlockZ = self.__objSampler.getNormalBlock(self.__intNoSteps,
+                                                        self.__intNoIter)
+            if self.__objBridge is not None:
+                npBlockZ = self.__objBridge.getIncrements(npBlockZ)
+
+        for (i, fltDT) in enumerate(np.diff(npTimes)):
+            if npBlockZ is None:
+                Z = self.__objSampler.getNormals(self.__intNoIter)
+            else:
+                Z = npBlockZ[i:i + 1]
+            npUnit *= self.__objSampler.getMultiplier(
+                Z, self.__fltVol, self.__fltRiskFreeRate, fltDT)
+            self.__objPayoff.update(npUnit)
+
+        return npUnit
+
+    def __getPayoffPVd(self, npStockPrice, npUnit):
+        fltPV = np.exp(-self.__fltRiskFreeRate * self.__fltTimeToMaturity)
+        return self.__objPayoff.getPayoff(npStockPrice, npUnit) * fltPV
+
+    # Public Functions
+
+    def getTimeGrid(self):
+        return np.linspace(0, self.__fltTimeToMaturity, self.__intNoSteps + 1)
+
+    def getOptionPrice(self, npStock):
+
+        # Simulate the paths, then work out the payoff for each stock price
+        npUnit = self.__simulate()
+        npStockPrice = np.reshape(npStock, (len(npStock), -1))
+        npPV = self.__getPayoffPVd(npStockPrice, npUnit)
+
+        # Calculate the mean and stdev for each axis.
+        return self.__objSampler.getMeanAndSTD(npPV)
+
+    def getOptionDelta(self, npStock):
+
+        # The running values are for the path starting at 1, so a bumped
+        # stock price reuses exactly the same paths.
+        npUnit = self.__simulate()
+        npStockPrice = np.reshape(npStock, (len(npStock), -1))
+        npBump = npStockPrice * 0.01
+        npPV = self.__getPayoffPVd(npStockPrice, npUnit)
+        npPVBump = self.__getPayoffPVd(npStockPrice + npBump, npUnit)
+
+        # Calculate the delta, then the mean and stdev for each axis.
+        npAllDelta = (npPVBump - npPV) / npBump
+        return self.__objSampler.getMeanAndSTD(npAllDelta)
+
+    def getOptionGamma(self, npStock):
+
+        # Again, the bumped stock prices reuse the same paths.
+        npUnit = self.__simulate()
+        npStockPrice = np.reshape(npStock, (len(npStock), -1))
+        npBump = npStockPrice * 0.01
+        npPV = self.__getPayoffPVd(npStockPrice, npUnit)
+        npPVBumpPlus = self.__getPayoffPVd(npStockPrice + npBump, npUnit)
+        npPVBumpMinus = self.__getPayoffPVd(npStockPrice - npBump, npUnit)
+
+        # Calculate the gamma, then the mean and stdev for each axis.
+        npAllGamma = (npPVBumpPlus - (2 * npPV) + npPVBumpMinus) \
+            / (npBump * npBump)
+        return self.__objSampler.getMeanAndSTD(npAllGamma)
@@ -0,0 +1,285 @@
+import numpy as np
+import warnings
+from analytics.LazyImport import LazyModule
+
+'''
+This section builds the normal random numbers used by the Monte Carlo
+classes and then turns the simulated values into a mean and a standard
+deviation.   It has been pulled out into its own class so that
+BasicMonteCarloOption and BasicMonteCarloOptionThreaded draw their random
+numbers in exactly the same way.
+
+Four sampling methods are available:
+
+Standard:
+Plain pseudo random numbers from np.random.standard_normal.   This is the
+original behaviour of the Monte Carlo classes.
+
+Stratified:
+The uniform range (0, 1) is split into equal probability strata and one
+uniform number is drawn from inside each stratum (proportional allocation),
+which is then converted into a normal number using the inverse cdf.   The
+numbers are then put in a random order.   Without this, path i would get
+the i-th stratum at every step of a multi step path, so the steps would be
+perfectly correlated.
+
+MomentMatched:
+The normal numbers are rescaled so that they have a mean of exactly zero and
+a variance of exactly one.   The multipliers built from them are also
+rescaled so that the average final stock price matches the forward, ie
+E[S_T] = S x Exp(rT).
+
+Sobol:
+Scrambled Sobol low discrepancy numbers (randomised quasi monte carlo),
+converted into normal numbers using the inverse cdf.   This needs
+scipy.stats.qmc, which is only in scipy 1.7 onwards, so it is imported when
+it is first used.   For multi step paths, getNormalBlock returns one Sobol
+dimension per row, which works best when the rows are used by a Brownian
+Bridge (see BrownianBridge) so that the first dimensions drive the largest
+moves in the path.
+
+Stratified, moment matched and Sobol numbers are not independent of each
+other, so the standard deviation of the individual paths no longer tells you
+how accurate the mean is (it overstates the error of a stratified sample for
+example).   For these methods, the paths are split into intNoBatches
+independent batches, each batch is stratified, moment matched or scrambled
+on its own and the error is estimated from the spread of the batch means.
+So that the returned value can be used in the same way as before, I return
+the standard deviation of a single path that would give the same standard
+error, ie std = standard error x sqrt(number of paths).
+
+getChunkedMeanAndSTD is getMeanAndSTD for engines (eg BasketMonteCarloOption
+and HestonMonteCarloOption) that run their paths in chunks, and
+addChunkMoments and getMomentsMeanAndSTD do the same for chunks given by
+their mean and std, eg the chunks of a checkpointed run.   Only the running
+mean and sum of squared differences from it (M2) are kept, combined with
+combineMoments.   With Standard sampling this gives the same mean and std as
+all of the paths at once.   With the other methods each chunk is stratified,
+moment matched or scrambled on its own (in its batches), so the chunks are
+independent replicates and the error comes from the spread of the chunk
+means, in the same way as the batches above.
+
+The random numbers come from np.random unless intSeed is set, in which case
+startRun gives the sampler its own generator seeded with intSeed, so every
+run (eg each call to a getter) uses exactly the same random numbers.
+'''
+si = LazyModule('scipy.stats')
+
+
+class MonteCarloSampler():
+
+    # Private Functions
+
+    def __init__(self, strSampling='Standard', intNoBatches=10,
+                 intSeed=None):
+        if strSampling not in ('Standard', 'Stratified', 'MomentMatched',
+                               'Sobol'):
+            raise ValueError('Unknown sampling method: ' + str(strSampling))
+        self.__strSampling = strSampling
+        self.__intNoBatches = intNoBatches
+        self.__intSeed = intSeed
+        self.__objRandom = np.random
+
+    def __str__(self):
+        strF = 'MonteCarloSampler: [Sampling:{sampling}; ' \
+               'NoBatches:{nobatches}]'
+        return strF.format(sampling=self.__strSampling,
+                           nobatches=self.__intNoBatches)
+
+    def __getBatches(self, intNoIter):
+        # Split the columns (paths) into contiguous batches.   I never use
+        # more batches than there are paths.
+        intNoBatches = max(1, min(self.__intNoBatches, intNoIter))
+        return np.array_split(np.arange(intNoIter), intNoBatches)
+
+    def __clipUniform(self, npU):
+        # A uniform number of exactly 0 would give a normal number of -inf
+        return np.clip(npU, 1e-12, 1 - 1e-12)
+
+    def __getStratifiedNormals(self, intNoIter):
+        Z = np.empty((1, intNoIter))
+        for npBatch in self.__getBatches(intNoIter):
+            # One uniform number from inside each equal probability stratum,
+            # in a random order so that each call (eg each step in a path)
+            # is independent of the last
+            intN = len(npBatch)
+            npU = (np.arange(intN)
+                   + self.__objRandom.uniform(size=intN)) / intN
+            Z[0, npBatch] = si.norm.ppf(
+                self.__clipUniform(self.__objRandom.permutation(npU)))
+        return Z
+
+    def __getMomentMatchedNormals(self, intNoIter):
+        Z = self.__objRandom.standard_normal((1, intNoIter))
+        for npBatch in self.__getBatches(intNoIter):
+            # Rescale to an exact mean of 0 and variance of 1, a batch of
+            # one number cannot be rescaled so leave it alone.
+            if len(npBatch) > 1:
+                npZ = Z[0, npBatch]
+                Z[0, npBatch] = (npZ - np.mean(npZ)) / np.std(npZ)
+        return Z
+
+    def __getSobolNormals(self, intNoDims, intNoIter):
+        # Scrambled Sobol numbers have to be imported when first used
+        try:
+            from scipy.stats import qmc
+        except ImportError:
+            raise ImportError('Sobol sampling requires scipy 1.7 or later')
+
+        Z = np.empty((intNoDims, intNoIter))
+        for npBatch in self.__getBatches(intNoIter):
+            # Each batch is an independently scrambled sequence, the seed
+            # comes from np.random (or intSeed) so that seeding still works.
+            objSobol = qmc.Sobol(intNoDims, scramble=True,
+                                 seed=self.__objRandom.randint(2 ** 31))
+            with warnings.catch_warnings():
+                # I don't force the number of paths to be a power of 2
+                warnings.filterwarnings('ignore', message='The balance')
+                npU = objSobol.random(len(npBatch))
+            Z[:, npBatch] = si.norm.ppf(self.__clipUniform(npU)).T
+        return Z
+
+    # Public Functions
+
+    def getSampling(self):
+        return self.__strSampling
+
+    def getSeed(self):
+        return self.__intSeed
+
+    def startRun(self):
+        # With a seed, each run starts again from the same random numbers
+        if self.__intSeed is not None:
+            self.__objRandom = np.random.RandomState(self.__intSeed)
+
+    def getState(self):
+        # The state of the random number generator, eg for a checkpoint
+        return self.__objRandom.get_state()
+
+    def setState(self, tpState):
+        self.__objRandom.set_state(tpState)
+
+    def getNormals(self, intNoIter):
+        # Return a (1 x intNoIter) matrix of normal random numbers.
+        if self.__strSampling == 'Stratified':
+            return self.__getStratifiedNormals(intNoIter)
+        elif self.__strSampling == 'MomentMatched':
+            return self.__getMomentMatchedNormals(intNoIter)
+        elif self.__strSampling == 'Sobol':
+            return self.__getSobolNormals(1, intNoIter)
+        else:
+            return self.__objRandom.standard_normal((1, intNoIter))
+
+    def getNormalBlock(self, intNoDims, intNoIter):
+        # Return a (intNoDims x intNoIter) matrix of normal random numbers,
+        # where each row is a dimension, eg a step in a path.
+        if self.__strSampling == 'Sobol':
+            return self.__getSobolNormals(intNoDims, intNoIter)
+        elif self.__strSampling == 'Standard':
+            return self.__objRandom.standard_normal((intNoDims, intNoIter))
+        else:
+            return np.vstack([self.getNormals(intNoIter)
+                              for i in range(0, intNoDims)])
+
+    def getMultiplier(self, Z, fltVol, fltRiskFreeRate, fltTimeToMaturity):
+        # Get the multipliers that turn the initial stock price into the
+        # final stock price.
+        return self.getMultiplierFromConstants(
+            Z, fltVol * np.sqrt(fltTimeToMaturity),
+            (fltRiskFreeRate - 0.5 * fltVol ** 2) * fltTimeToMaturity,
+            np.exp(fltRiskFreeRate * fltTimeToMaturity))
+
+    def getMultiplierFromConstants(self, Z, fltVolRootT, fltDrift,
+                                   fltForward):
+        # As getMultiplier, with the constants (vol x root T, the drift
+        # (r - vol^2 / 2) x T and the forward Exp(rT)) already worked out,
+        # eg by calculateExpiryConstants in EuropeanOption.
+        a1 = Z * fltVolRootT
+        Mult = np.exp(a1 + fltDrift)
+
+        if self.__strSampling == 'MomentMatched':
+            # Make the average multiplier in each batch equal Exp(rT) so
+            # that the mean final stock price matches the forward.
+            for npBatch in self.__getBatches(Mult.shape[1]):
+                Mult[:, npBatch] *= fltForward / np.mean(Mult[:, npBatch])
+
+        return Mult
+
+    def getMeanAndSTD(self, npValues):
+        # Calculate the mean and stdev for each row (stock price).
+        npMean = np.mean(npValues, axis=1)
+        if self.__strSampling == 'Standard':
+            return (npMean, np.std(npValues, axis=1))
+
+        # Batch replicates: the standard error comes from the spread of the
+        # batch means, which is then scaled back up to a per path stdev.
+        intNoIter = npValues.shape[1]
+        lstBatches = self.__getBatches(intNoIter)
+        if len(lstBatches) < 2:
+            return (npMean, np.zeros(npMean.shape))
+        npBatchMeans = np.column_stack(
+            [np.mean(npValues[:, npBatch], axis=1) for npBatch in lstBatches])
+        npStdErr = np.std(npBatchMeans, axis=1, ddof=1) \
+            / np.sqrt(len(lstBatches))
+        return (npMean, npStdErr * np.sqrt(intNoIter))
+
+    def addChunkMoments(self, npMoments, intNoPaths, intNoChunks,
+                        npChunkMean, npChunkSTD, intChunkPaths):
+        # Add a chunk of intChunkPaths paths, given by its mean and per path
+        # std (from getMeanAndSTD), to the moments of the intNoPaths paths in
+        # the intNoChunks chunks so far.   npMoments is a (4 x rows) matrix,
+        # or None before the first chunk, of the mean and M2 of the paths
+        # and the mean and M2 of the chunk means.
+        npChunkM2 = npChunkSTD * npChunkSTD * intChunkPaths
+        if npMoments is None:
+            return np.stack((npChunkMean, npChunkM2, npChunkMean,
+                             np.zeros(np.shape(npChunkMean))))
+        return np.stack(
+            combineMoments(intNoPaths, npMoments[0], npMoments[1],
+                           intChunkPaths, npChunkMean, npChunkM2)
+            + combineMoments(intNoChunks, npMoments[2], npMoments[3], 1,
+                             npChunkMean, 0))
+
+    def getMomentsMeanAndSTD(self, npMoments, intNoPaths, intNoChunks):
+        # The mean and per path std from the moments of addChunkMoments.
+        # For Standard sampling the std is that of the paths.   For the
+        # other methods each chunk is an independent replicate, so the
+        # standard error comes from the spread of the chunk means, as for
+        # the batches in getMeanAndSTD (a single chunk keeps its own std).
+        if self.__strSampling == 'Standard' or intNoChunks < 2:
+            return (npMoments[0], np.sqrt(npMoments[1] / intNoPaths))
+        npStdErr = np.sqrt(npMoments[3] / (intNoChunks - 1) / intNoChunks)
+        return (npMoments[0], npStdErr * np.sqrt(intNoPaths))
+
+    def getChunkedMeanAndSTD(self, itValues):
+        # As getMeanAndSTD, but for values that arrive in chunks of paths
+        # (columns).   Only the moments of addChunkMoments are kept, so the
+        # memory used does not grow with the number of paths.
+        npMoments = None
+        intNoPaths = 0
+        intNoChunks = 0
+        for npValues in itValues:
+            intChunkPaths = npValues.shape[1]
+            if intChunkPaths == 0:
+                continue
+            (npChunkMean, npChunkSTD) = self.getMeanAndSTD(npValues)
+            npMoments = self.addChunkMoments(npMoments, intNoPaths,
+                                             intNoChunks, npChunkMean,
+                                             npChunkSTD, intChunkPaths)
+            intNoPaths += intChunkPaths
+            intNoChunks += 1
+        if npMoments is None:
+            raise ValueError('There are no paths to take the mean of')
+        return self.getMomentsMeanAndSTD(npMoments, intNoPaths, intNoChunks)
+
+
+def combineMoments(intCount, npMean, npM2, intOtherCount, npOtherMean,
+                   npOtherM2):
+    # Combine the mean and sum of squared differences from the mean (M2) of
+    # two sets of paths, as in Chan et al.   Unlike a sum of squares, this
+    # does not lose the variance when the mean is large compared with it.
+    intTotal = intCount + intOtherCount
+    npDelta = npOtherMean - npMean
+    return (npMean + npDelta * (intOtherCount / intTotal),
+            npM2 + npOtherM2
+            + npDelta * npDelta * (intCount * intOtherCount / intTotal))
@@ -0,0 +1,222 @@
+import json
+import os
+import numpy as np
+import analytics.EuropeanOption
+from analytics.MonteCarloSampling import MonteCarloSampler
+from analytics.ParameterKey import getArrayDigest, getKeyDigest, \
+    getParameterKey
+
+'''
+This section keeps the results of BasicMonteCarloOption runs on disk, so
+that a big run does not have to be repeated when a report is rerun (eg after
+a crash or a restart).
+
+A run is stored against a key made from the option's parameters (from
+getParameters, which includes the number of paths and the seed), the name of
+the getter, the shape, dtype and digest of the stock prices, the chunk size and
+the engine version.   The engine version should be changed whenever the Monte
+Carlo code changes the numbers it produces, so that old results are no longer
+used.   Only an option with a seed can be stored, as without one each run gives
+a different answer.   For sampling other than Standard the chunks are
+independent replicates and the error comes from the spread of the chunk means
+(see MonteCarloSampler.getMomentsMeanAndSTD).
+
+The paths are run in chunks of intChunkSize paths, each chunk being a
+BasicMonteCarloOption with its own seed made from the option's seed and the
+chunk number.   After each chunk the running mean and M2 of the results (see
+MonteCarloSampler.addChunkMoments) and the number of paths done are saved, so
+if the run stops part of the way through, the next call picks up from the last
+chunk that was saved rather than starting again. Because the chunk seeds do not
+depend upon when the run was stopped, a resumed run gives exactly the same
+answer as one that was not stopped.
+
+Each entry's arrays are held in a .npy file, which is opened as a memory map
+(np.load with mmap_mode='r') when it is read back, so a hit is quick and
+returns read only arrays without loading more than is used.   A small JSON
+index file holds the entries, the bytes used, how far through each run is
+and when it was last used.   A new accumulator file is written for each
+chunk and the index is replaced in one step (os.replace), so a crash part of
+the way through writing leaves the previous state in place.
+
+When the files take up more than intMaxBytes, the least recently used
+entries are deleted until the store is back within the quota.   The entry
+being worked on is never deleted.
+'''
+
+
+class MonteCarloStore():
+
+    # Private Functions
+
+    def __init__(self, strDirectory, intMaxBytes=1024 * 1024 * 1024,
+                 strEngineVersion='1'):
+        self.__strDirectory = strDirectory
+        self.__intMaxBytes = intMaxBytes
+        self.__strEngineVersion = strEngineVersion
+        os.makedirs(strDirectory, exist_ok=True)
+        self.__strIndexFile = os.path.join(strDirectory, 'index.json')
+        self.__dctIndex = self.__readIndex()
+        self.__intHits = 0
+        self.__intMisses = 0
+
+    def __str__(self):
+        strF = 'MonteCarloStore: [Directory:{directory}; ' \
+               'MaxBytes:{bytes}; EngineVersion:{version}]'
+        return strF.format(directory=self.__strDirectory,
+                           bytes=self.__intMaxBytes,
+                           version=self.__strEngineVersion)
+
+    def __readIndex(self):
+        if not os.path.exists(self.__strIndexFile):
+            return {'Counter': 0, 'Entries': {}}
+        with open(self.__strIndexFile) as objFile:
+            return json.load(objFile)
+
+    def __writeIndex(self):
+        # Write a new index then swap it in, so the old one is never half
+        # written
+        strTemp = self.__strIndexFile + '.tmp'
+        with open(strTemp, 'w') as objFile:
+            json.dump(self.__dctIndex, objFile)
+        os.replace(strTemp, self.__strIndexFile)
+
+    def __getKey(self, objOption, strFunction, npStock, intChunkSize):
+        tpKey = (getParameterKey(objOption.getParameters()), strFunction) \
+            + getArrayDigest(npStock) + (intChunkSize,
+                                         self.__strEngineVersion)
+        return getKeyDigest(tpKey)
+
+    def __getFile(self, strFile):
+        return os.path.join(self.__strDirectory, strFile)
+
+    def __saveArray(self, strKey, strName, npArray):
+        # Save the array to a new file, returning its name and size
+        strFile = strKey + '_' + strName + '.npy'
+        np.save(self.__getFile(strFile), npArray)
+        return (strFile, os.path.getsize(self.__getFile(strFile)))
+
+    def __removeFile(self, strFile):
+        if os.path.exists(self.__getFile(strFile)):
+            os.remove(self.__getFile(strFile))
+
+    def __touch(self, dctEntry):
+        self.__dctIndex['Counter'] += 1
+        dctEntry['LastUsed'] = self.__dctIndex['Counter']
+
+    def __evict(self, strKeep):
+        # Delete the least recently used entries until within the quota
+        dctEntries = self.__dctIndex['Entries']
+        lstKeys = sorted((strKey for strKey in dctEntries
+                          if strKey != strKeep),
+                         key=lambda strKey: dctEntries[strKey]['LastUsed'])
+        for strKey in lstKeys:
+            if self.getBytes() <= self.__intMaxBytes:
+                break
+            self.__removeFile(dctEntries.pop(strKey)['File'])
+
+    def __getChunkOption(self, objOption, intChunk, intNoIter):
+        # The same option with the chunk's number of paths and its own seed,
+        # made from the option's seed and the chunk number
+        dctArguments = objOption.getConstructorArguments()
+        dctArguments['intNoIter'] = intNoIter
+        dctArguments['intSeed'] = int(np.random.RandomState(
+            [objOption.getSeed(), intChunk]).randint(2 ** 31))
+        return analytics.EuropeanOption.BasicMonteCarloOption(**dctArguments)
+
+    # Public Functions
+
+    def getBytes(self):
+        return sum(dctEntry['Bytes']
+                   for dctEntry in self.__dctIndex['Entries'].values())
+
+    def getStatistics(self):
+        dctEntries = self.__dctIndex['Entries']
+        return {'Hits': self.__intHits, 'Misses': self.__intMisses,
+                'Entries': len(dctEntries),
+                'Complete': sum(dctEntry['Complete']
+                                for dctEntry in dctEntries.values()),
+                'Bytes': self.getBytes()}
+
+    def getOptionValue(self, objOption, strFunction, npStock,
+                       intChunkSize=100000):
+        # Return (value, std) from getter strFunction (eg 'getOptionPrice')
+        # of the BasicMonteCarloOption, from the store if it has been run
+        # before, otherwise running (or finishing) it and storing it.
+        if not isinstance(objOption,
+                          analytics.EuropeanOption.BasicMonteCarloOption):
+            raise ValueError('Only BasicMonteCarloOption can be stored')
+        if objOption.getSeed() is None:
+            raise ValueError('Only an option with a seed can be stored')
+        if not isinstance(intChunkSize, (int, np.integer)) or \
+                intChunkSize <= 0:
+            raise ValueError('The chunk size must be a positive int')
+        intNoIter = objOption.getConstructorArguments()['intNoIter']
+        if intNoIter <= 0:
+            raise ValueError('The option must have at least one path')
+        strKey = self.__getKey(objOption, strFunction, npStock, intChunkSize)
+        dctEntries = self.__dctIndex['Entries']
+        dctEntry = dctEntries.get(strKey)
+        boolIsSaved = dctEntry is not None and dctEntry['File'] is not None \
+            and os.path.exists(self.__getFile(dctEntry['File']))
+
+        if boolIsSaved and dctEntry['Complete']:
+            self.__intHits += 1
+            self.__touch(dctEntry)
+            self.__writeIndex()
+            npResult = np.load(self.__getFile(dctEntry['File']),
+                               mmap_mode='r')
+            return (npResult[0], npResult[1])
+        self.__intMisses += 1
+
+        # Carry on from the saved mean and M2, if any
+        if not boolIsSaved:
+            dctEntry = {'File': None, 'Bytes': 0, 'Complete': False,
+                        'NoChunks': 0, 'NoPaths': 0}
+            dctEntries[strKey] = dctEntry
+            npMoments = None
+        else:
+            npMoments = np.load(self.__getFile(dctEntry['File']))
+        objSampler = MonteCarloSampler(
+            objOption.getConstructorArguments()['strSampling'])
+
+        while dctEntry['NoPaths'] < intNoIter:
+            intChunkIter = min(intChunkSize, intNoIter - dctEntry['NoPaths'])
+            objChunk = self.__getChunkOption(objOption, dctEntry['NoChunks'],
+                                             intChunkIter)
+            (npMean, npSTD) = getattr(objChunk, strFunction)(npStock)
+            npMoments = objSampler.addChunkMoments(
+                npMoments, dctEntry['NoPaths'], dctEntry['NoChunks'], npMean,
+                npSTD, intChunkIter)
+
+            # Save the new moments before the index points at them
+            dctEntry['NoChunks'] += 1
+            dctEntry['NoPaths'] += intChunkIter
+            strOldFile = dctEntry['File']
+            (dctEntry['File'], dctEntry['Bytes']) = self.__saveArray(
+                strKey, 'moments' + str(dctEntry['NoChunks']), npMoments)
+            self.__touch(dctEntry)
+            self.__writeIndex()
+            if strOldFile is not None:
+                self.__removeFile(strOldFile)
+
+        # Turn the moments into the mean and std, and store them
+        (npMean, npSTD) = objSampler.getMomentsMeanAndSTD(
+            npMoments, intNoIter, dctEntry['NoChunks'])
+        strOldFile = dctEntry['File']
+        (dctEntry['File'], dctEntry['Bytes']) = self.__saveArray(
+            strKey, 'result', np.stack((npMean, npSTD)))
+        dctEntry['Complete'] = True
+        self.__touch(dctEntry)
+        self.__evict(strKey)
+        self.__writeIndex()
+        self.__removeFile(strOldFile)
+        npResult = np.load(self.__getFile(dctEntry['File']), mmap_mode='r')
+        return (npResult[0], npResult[1])
+
+    def clear(self):
+        for dctEntry in self.__dctIndex['Entries'].values():
+            self.__removeFile(dctEntry['File'])
+        self.__dctIndex = {'Counter': 0, 'Entries': {}}
+        self.__writeIndex()
+        self.__intHits = 0
+        self.__intMisses = 0
@@ -0,0 +1,314 @@
+import numpy as np
+from analytics.EuropeanOption import BlackScholes
+
+'''
+This section holds a large book of European options on the same stock, eg
+millions of contracts, in as little memory as possible.
+
+A BlackScholes object keeps its values in a __dict__, which costs well over
+a hundred bytes for each contract.   OptionContract is a single contract
+(strike, call/put and expiry) that uses __slots__ instead, so it has no
+__dict__ and is a lot smaller, for when a contract has to be passed around
+on its own.
+
+OptionBook keeps the whole book as a struct of arrays, one typed numpy array
+for each field rather than one object for each contract:
+
+strike        float64   8 bytes
+is call       bool      1 byte
+expiry index  int32     4 bytes
+
+ie 13 bytes for each contract.   The expiries themselves (as times to
+maturity) are only kept once, in npExpiry, and each contract holds the index
+of its expiry, as a book has many contracts on the same few expiries.   The
+arrays grow by doubling as contracts are added (like a python list), so
+adding them one at a time is not slow, and the getters return read only
+views of the contracts that have been added.
+
+getOptionValues prices the contracts (all of them, or any slice or index
+array of them) directly from the arrays with BlackScholes, which takes the
+strike and time to maturity as arrays.   The calls and puts are done as two
+BlackScholes calculations and the results put back in book order.
+
+OptionBookIndex is for when only part of the book needs repricing, eg when
+the vol of one expiry moves.   It sorts the contracts by expiry and then
+strike (np.lexsort) and keeps one bucket for each expiry, so the contracts
+of an expiry are next to each other and a range of strikes within it is
+found with np.searchsorted in O(log n).   The book holds a single stock, so
+there is one index for each stock's book.   Each bucket keeps a BlackScholes
+for its calls and one for its puts, with the strikes as an array, so the
+values that only depend upon the expiry (root T, the discount factor etc)
+are worked out once by BlackScholes rather than for each contract on each
+call.   The vol of each expiry is held by the index and changed with
+setExpiryVol, which builds new BlackScholes for that expiry only.
+
+getOptionValues prices the contracts in the expiries asked for (all of them
+by default) with BlackScholes.getOptionValues, so it takes the same values
+and returns them in the same units.   The results are arrays in book order; the
+contracts that are not priced are NaN, or keep their old values if the
+arrays from an earlier call are passed in as dctValues.   The index is of
+the contracts in the book when it was built, so build a new one after
+adding contracts.
+'''
+
+
+class OptionContract():
+
+    __slots__ = ('__fltStrike', '__boolIsCall', '__intExpiryIndex')
+
+    # Private Functions
+
+    def __init__(self, fltStrike, boolIsCall, intExpiryIndex):
+        self.__fltStrike = fltStrike
+        self.__boolIsCall = boolIsCall
+        self.__intExpiryIndex = intExpiryIndex
+
+    def __str__(self):
+        strF = 'OptionContract: [Strike:{strike}; IsCall:{iscall}; ' \
+               'ExpiryIndex:{expiry}]'
+        return strF.format(strike=self.__fltStrike, iscall=self.__boolIsCall,
+                           expiry=self.__intExpiryIndex)
+
+    # Public Functions
+
+    def getStrike(self):
+        return self.__fltStrike
+
+    def getIsCall(self):
+        return self.__boolIsCall
+
+    def getExpiryIndex(self):
+        return self.__intExpiryIndex
+
+
+class OptionBook():
+
+    # Private Functions
+
+    def __init__(self, npExpiry, intCapacity=1024):
+        self.__npExpiry = np.array(npExpiry, dtype=np.float64, ndmin=1)
+        self.__npExpiry.flags.writeable = False
+        self.__intNoContracts = 0
+        self.__npStrike = np.empty(intCapacity, dtype=np.float64)
+        self.__npIsCall = np.empty(intCapacity, dtype=bool)
+        self.__npExpiryIndex = np.empty(intCapacity, dtype=np.int32)
+
+    def __str__(self):
+        strF = 'OptionBook: [NoContracts:{contracts}; NoExpiries:{expiries}]'
+        return strF.format(contracts=self.__intNoContracts,
+                           expiries=len(self.__npExpiry))
+
+    def __getReadOnly(self, npArray):
+        npView = npArray[:self.__intNoContracts]
+        npView.flags.writeable = False
+        return npView
+
+    def __grow(self, npOld, intCapacity):
+        npNew = np.empty(intCapacity, dtype=npOld.dtype)
+        npNew[:self.__intNoContracts] = npOld[:self.__intNoContracts]
+        return npNew
+
+    def __reserve(self, intNoContracts):
+        # Make room for intNoContracts, at least doubling the arrays when
+        # they need to grow
+        if intNoContracts <= len(self.__npStrike):
+            return
+        intCapacity = max(intNoContracts, 2 * len(self.__npStrike))
+        self.__npStrike = self.__grow(self.__npStrike, intCapacity)
+        self.__npIsCall = self.__grow(self.__npIsCall, intCapacity)
+        self.__npExpiryIndex = self.__grow(self.__npExpiryIndex, intCapacity)
+
+    # Public Functions
+
+    def addContracts(self, npStrike, npIsCall, npExpiryIndex):
+        # Add many contracts at once, npIsCall and npExpiryIndex can also be
+        # a single value for all of them.   Returns the index of the first.
+        npStrike = np.asarray(npStrike, dtype=np.float64).ravel()
+        intNo = len(npStrike)
+        npIsCall = np.broadcast_to(np.asarray(npIsCall, dtype=bool), intNo)
+        npExpiryIndex = np.broadcast_to(np.asarray(npExpiryIndex), intNo)
+        if intNo > 0 and (np.min(npExpiryIndex) < 0 or
+                          np.max(npExpiryIndex) >= len(self.__npExpiry)):
+            raise ValueError('Expiry index must be in 0 to {n}'.format(
+                n=len(self.__npExpiry) - 1))
+
+        intStart = self.__intNoContracts
+        self.__reserve(intStart + intNo)
+        self.__npStrike[intStart:intStart + intNo] = npStrike
+        self.__npIsCall[intStart:intStart + intNo] = npIsCall
+        self.__npExpiryIndex[intStart:intStart + intNo] = npExpiryIndex
+        self.__intNoContracts += intNo
+        return intStart
+
+    def addContract(self, objContract):
+        return self.addContracts(objContract.getStrike(),
+                                 objContract.getIsCall(),
+                                 objContract.getExpiryIndex())
+
+    def getContract(self, intIndex):
+        if not -self.__intNoContracts <= intIndex < self.__intNoContracts:
+            raise IndexError('Contract index out of range')
+        return OptionContract(float(self.__npStrike[intIndex]),
+                              bool(self.__npIsCall[intIndex]),
+                              int(self.__npExpiryIndex[intIndex]))
+
+    def getNoContracts(self):
+        return self.__intNoContracts
+
+    def getExpiry(self):
+        return self.__npExpiry
+
+    def getStrike(self):
+        return self.__getReadOnly(self.__npStrike)
+
+    def getIsCall(self):
+        return self.__getReadOnly(self.__npIsCall)
+
+    def getExpiryIndex(self):
+        return self.__getReadOnly(self.__npExpiryIndex)
+
+    def getTimeToMaturity(self, objIndex=slice(None)):
+        return self.__npExpiry[self.getExpiryIndex()[objIndex]]
+
+    def getBytes(self):
+        # Bytes held by the arrays, including the room not yet used
+        return self.__npStrike.nbytes + self.__npIsCall.nbytes \
+            + self.__npExpiryIndex.nbytes + self.__npExpiry.nbytes
+
+    def getOptionValues(self, fltStock, fltVol, fltRiskFreeRate,
+                        tpCalcRequirements, objIndex=slice(None)):
+        # BlackScholes values (see getOptionValues there) of the contracts
+        # at objIndex (a slice or an index array), in the same order
+        npStrike = self.getStrike()[objIndex]
+        npIsCall = self.getIsCall()[objIndex]
+        npTime = self.getTimeToMaturity(objIndex)
+        dctValues = {strName: np.empty(len(npStrike))
+                     for strName in tpCalcRequirements}
+        for boolIsCall in (True, False):
+            npMask = npIsCall == boolIsCall
+            if not np.any(npMask):
+                continue
+            objBS = BlackScholes(npStrike[npMask], fltVol, fltRiskFreeRate,
+                                 npTime[npMask], boolIsCall)
+            for (strName, npValues) in objBS.getOptionValues(
+                    fltStock, tpCalcRequirements).items():
+                dctValues[strName][npMask] = npValues
+        return dctValues
+
+    def getOptionPrice(self, fltStock, fltVol, fltRiskFreeRate,
+                       objIndex=slice(None)):
+        return self.getOptionValues(fltStock, fltVol, fltRiskFreeRate,
+                                    ('Price',), objIndex)['Price']
+
+
+class OptionBookIndex():
+
+    # Private Functions
+
+    def __init__(self, objBook, fltRiskFreeRate, npVol):
+        self.__fltRiskFreeRate = fltRiskFreeRate
+        self.__npExpiry = objBook.getExpiry()
+        intNoExpiries = len(self.__npExpiry)
+
+        # Book index of each contract in (expiry, strike) order, and the
+        # contracts in that order
+        npExpiryIndex = objBook.getExpiryIndex()
+        self.__npOrder = np.lexsort((objBook.getStrike(), npExpiryIndex))
+        self.__npStrike = objBook.getStrike()[self.__npOrder]
+        npIsCall = objBook.getIsCall()[self.__npOrder]
+
+        # Where each expiry's bucket starts and ends in the sorted contracts
+        npSortedExpiry = npExpiryIndex[self.__npOrder]
+        npExpiries = np.arange(0, intNoExpiries)
+        self.__npStart = np.searchsorted(npSortedExpiry, npExpiries, 'left')
+        self.__npEnd = np.searchsorted(npSortedExpiry, npExpiries, 'right')
+
+        # The calls and puts of each bucket, as (book indices, read only
+        # strikes, is call), and a BlackScholes for each of them
+        self.__lstParts = list()
+        for i in range(0, intNoExpiries):
+            npBucket = slice(self.__npStart[i], self.__npEnd[i])
+            lstParts = list()
+            for boolIsCall in (True, False):
+                npMask = npIsCall[npBucket] == boolIsCall
+                if np.any(npMask):
+                    npStrike = self.__npStrike[npBucket][npMask]
+                    npStrike.flags.writeable = False
+                    lstParts.append((self.__npOrder[npBucket][npMask],
+                                     npStrike, boolIsCall))
+            self.__lstParts.append(lstParts)
+        self.__npVol = np.array(np.broadcast_to(
+            np.asarray(npVol, dtype=np.float64), (intNoExpiries,)))
+        self.__lstOptions = [self.__buildOptions(i)
+                             for i in range(0, intNoExpiries)]
+
+    def __str__(self):
+        strF = 'OptionBookIndex: [NoContracts:{contracts}; ' \
+               'NoExpiries:{expiries}; RFRate:{rfrate}]'
+        return strF.format(contracts=len(self.__npOrder),
+                           expiries=len(self.__npExpiry),
+                           rfrate=self.__fltRiskFreeRate)
+
+    def __buildOptions(self, intExpiryIndex):
+        # (book indices, BlackScholes) for the calls and puts of the expiry
+        return [(npBookIndex, BlackScholes(
+            npStrike, self.__npVol[intExpiryIndex], self.__fltRiskFreeRate,
+            self.__npExpiry[intExpiryIndex], boolIsCall))
+            for (npBookIndex, npStrike, boolIsCall)
+            in self.__lstParts[intExpiryIndex]]
+
+    def __checkExpiry(self, intExpiryIndex):
+        if not 0 <= intExpiryIndex < len(self.__npExpiry):
+            raise ValueError('Expiry index must be in 0 to {n}'.format(
+                n=len(self.__npExpiry) - 1))
+
+    # Public Functions
+
+    def getNoContracts(self):
+        return len(self.__npOrder)
+
+    def getExpiryVol(self):
+        npView = self.__npVol.view()
+        npView.flags.writeable = False
+        return npView
+
+    def setExpiryVol(self, intExpiryIndex, fltVol):
+        self.__checkExpiry(intExpiryIndex)
+        self.__npVol[intExpiryIndex] = fltVol
+        self.__lstOptions[intExpiryIndex] = self.__buildOptions(
+            intExpiryIndex)
+
+    def getBucket(self, intExpiryIndex):
+        # Book indices of the contracts of the expiry, in strike order
+        self.__checkExpiry(intExpiryIndex)
+        return self.__npOrder[self.__npStart[intExpiryIndex]:
+                              self.__npEnd[intExpiryIndex]]
+
+    def getRange(self, intExpiryIndex, fltLowStrike, fltHighStrike):
+        # Book indices of the contracts of the expiry with
+        # fltLowStrike <= strike <= fltHighStrike, in strike order
+        self.__checkExpiry(intExpiryIndex)
+        intStart = self.__npStart[intExpiryIndex]
+        npStrike = self.__npStrike[intStart:self.__npEnd[intExpiryIndex]]
+        return self.__npOrder[
+            intStart + np.searchsorted(npStrike, fltLowStrike, 'left'):
+            intStart + np.searchsorted(npStrike, fltHighStrike, 'right')]
+
+    def getOptionValues(self, fltStock, tpCalcRequirements,
+                        lstExpiryIndex=None, dctValues=None):
+        # BlackScholes values (see getOptionValues there) of the contracts
+        # in the expiries, written into dctValues in book order
+        if lstExpiryIndex is None:
+            lstExpiryIndex = range(0, len(self.__npExpiry))
+        for intExpiryIndex in lstExpiryIndex:
+            self.__checkExpiry(intExpiryIndex)
+        if dctValues is None:
+            dctValues = {strName: np.full(len(self.__npOrder), np.nan)
+                         for strName in tpCalcRequirements}
+
+        for intExpiryIndex in lstExpiryIndex:
+            for (npBookIndex, objBS) in self.__lstOptions[intExpiryIndex]:
+                for (strName, npValues) in objBS.getOptionValues(
+                        fltStock, tpCalcRequirements).items():
+                    dctValues[strName][npBookIndex] = npValues
+        return dctValues
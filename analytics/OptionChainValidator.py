@@ -0,0 +1,127 @@
+import numpy as np
+from analytics.EuropeanOptionBoundaryConditions import \
+    EuropeanOptionBoundaryConditions
+
+'''
+This section checks a whole chain of European option quotes (many strikes
+and maturities on the same stock) for prices that allow an arbitrage, eg to
+clean the quotes before fitting a vol surface to them.
+
+The quotes are passed in as numpy arrays of strike, time to maturity and
+price, sorted by the time to maturity and then by the strike (so each
+maturity is a block of increasing strikes).   Rather than comparing every
+pair of quotes in a loop, each check is a single pass over the sorted arrays
+using np.diff, so it takes O(n) time:
+
+Lower/Upper: the price must be within the boundary conditions of
+EuropeanOptionBoundaryConditions (with the strike and time as arrays).
+
+Strike: within a maturity a call price must not go up as the strike goes up
+and a put price must not go down.
+
+Butterfly: within a maturity the price must be convex in the strike, ie the
+slope between neighbouring strikes, np.diff(price) / np.diff(strike), must
+not go down.   Otherwise buying the butterfly K1, K2, K3 has a negative
+cost.   The difference in slopes is multiplied by the average strike gap so
+that fltTolerance is in terms of the price.
+
+Calendar: for the same strike a call price must not go down as the time to
+maturity goes up.   Puts are turned into calls using put-call parity first.
+The quotes with the same strike are brought together with a stable argsort
+of the strikes (which keeps them in maturity order), the only part that is
+not a single pass.
+
+validate returns a dictionary of boolean arrays, one for each check and
+'Any', with True for each quote that is part of a violation (both quotes of
+a pair and all 3 quotes of a butterfly).
+'''
+
+
+class OptionChainValidator():
+
+    # Private Functions
+
+    def __init__(self, fltStock, fltRiskFreeRate, fltTolerance=1e-8):
+        self.__fltStock = fltStock
+        self.__fltRiskFreeRate = fltRiskFreeRate
+        self.__fltTolerance = fltTolerance
+
+    def __str__(self):
+        strF = 'OptionChainValidator: [Stock:{stock}; RFRate:{rfrate}; ' \
+               'Tolerance:{tolerance}]'
+        return strF.format(stock=self.__fltStock,
+                           rfrate=self.__fltRiskFreeRate,
+                           tolerance=self.__fltTolerance)
+
+    def __flagNeighbours(self, npBad, intNoQuotes, intWidth):
+        # npBad is True for each bad set of intWidth neighbouring quotes
+        # (starting at that index), flag every quote in each bad set
+        npFlags = np.zeros(intNoQuotes, dtype=bool)
+        for i in range(0, intWidth):
+            npFlags[i:i + len(npBad)] |= npBad
+        return npFlags
+
+    # Public Functions
+
+    def validate(self, npStrike, npTime, npPrice, boolIsCall):
+        npStrike = np.asarray(npStrike, dtype=np.float64)
+        npTime = np.asarray(npTime, dtype=np.float64)
+        npPrice = np.asarray(npPrice, dtype=np.float64)
+        if not (npStrike.shape == npTime.shape == npPrice.shape) or \
+                npStrike.ndim != 1 or len(npStrike) < 1:
+            raise ValueError('Strike, time and price must be 1 dimensional '
+                             'arrays of the same length')
+
+        # Neighbouring quotes with the same maturity, which must have
+        # increasing strikes
+        npDiffTime = np.diff(npTime)
+        npDiffStrike = np.diff(npStrike)
+        npSame = npDiffTime == 0
+        if np.any(npDiffTime < 0) or np.any(npSame & (npDiffStrike <= 0)):
+            raise ValueError('Quotes must be sorted by time to maturity '
+                             'and then strike')
+
+        fltTol = self.__fltTolerance
+        dctFlags = dict()
+
+        objBounds = EuropeanOptionBoundaryConditions(
+            npStrike, boolIsCall, self.__fltRiskFreeRate, npTime)
+        (npLower, npUpper) = objBounds.getBounds(self.__fltStock)
+        dctFlags['Lower'] = npPrice < npLower - fltTol
+        dctFlags['Upper'] = npPrice > npUpper + fltTol
+
+        npDiffPrice = np.diff(npPrice)
+        if boolIsCall:
+            npBad = npSame & (npDiffPrice > fltTol)
+        else:
+            npBad = npSame & (npDiffPrice < -fltTol)
+        dctFlags['Strike'] = self.__flagNeighbours(npBad, len(npPrice), 2)
+
+        # Slopes between neighbouring strikes, across a change of maturity
+        # the slope is not used
+        npSlope = np.divide(npDiffPrice, npDiffStrike,
+                            out=np.zeros(len(npDiffPrice)), where=npSame)
+        npTriple = npSame[:-1] & npSame[1:]
+        npConvexity = np.diff(npSlope) \
+            * (npDiffStrike[:-1] + npDiffStrike[1:]) / 2
+        dctFlags['Butterfly'] = self.__flagNeighbours(
+            npTriple & (npConvexity < -fltTol), len(npPrice), 3)
+
+        # Calendar check on the call prices, grouped by strike
+        if boolIsCall:
+            npCall = npPrice
+        else:
+            npCall = npPrice + self.__fltStock \
+                - objBounds.getDiscountedStrike()
+        npOrder = np.argsort(npStrike, kind='stable')
+        npSameStrike = np.diff(npStrike[npOrder]) == 0
+        npFlags = np.zeros(len(npPrice), dtype=bool)
+        npFlags[npOrder] = self.__flagNeighbours(
+            npSameStrike & (np.diff(npCall[npOrder]) < -fltTol),
+            len(npPrice), 2)
+        dctFlags['Calendar'] = npFlags
+
+        dctFlags['Any'] = dctFlags['Lower'] | dctFlags['Upper'] \
+            | dctFlags['Strike'] | dctFlags['Butterfly'] \
+            | dctFlags['Calendar']
+        return dctFlags
@@ -1,10 +1,31 @@
 import numpy as np
-import pandas as pd
-import scipy.stats as si
 
 '''
 This section calculates the intrinsic value of an option which can be compared
 to any European Option calculations to see how it compares.
+
+MultiStrikeIntrinsicValue does the same for many options at once, each with
+its own strike and call/put flag, eg to draw the payoff diagrams of a whole
+strip of options.   getOptionPrice returns the (stock prices x strikes)
+matrix of intrinsic values from a single broadcast np.maximum, with the put
+payoffs found by flipping the sign of S - K.
+
+For a lot of stock prices and strikes the matrix can be too big to hold, so
+getOptionPriceChunks gives it back a block of stock prices at a time, each
+block no bigger than intMaxBytes.   The same block is reused each time, so
+copy it if you want to keep it.
+
+getPositionValue gives the value of a position in the options (a weight for
+each strike) without building the matrix at all.   With the call strikes
+sorted, the calls in the money for a stock price S are the ones with a
+strike below S, found with np.searchsorted, and their value is
+
+sum(w x (S - K)) = S x sum(w) - sum(w x K)
+
+where both sums are read from np.cumsum over the sorted strikes (and the
+same for the puts with a strike above S).   This takes
+O((stock prices + strikes) x log(strikes)) time rather than
+O(stock prices x strikes).
 '''
 
 
@@ -35,3 +56,99 @@ class OptionIntrinsicValue():
             return self.__getCallPrice(npStock)
         else:
             return self.__getPutPrice(npStock)
+
+
+class MultiStrikeIntrinsicValue():
+
+    # Private Functions
+    def __init__(self, npStrike, npIsCall):
+        self.__npStrike = np.array(npStrike, dtype=np.float64, ndmin=1)
+        if self.__npStrike.ndim != 1:
+            raise ValueError('Strike must be a 1 dimensional array')
+        try:
+            self.__npIsCall = np.broadcast_to(
+                np.asarray(npIsCall, dtype=bool), self.__npStrike.shape)
+        except ValueError:
+            raise ValueError('IsCall must be a bool or an array of the same '
+                             'length as the strikes')
+
+        # +1 for a call and -1 for a put, so that the payoff of every
+        # option is max(sign x (S - K), 0)
+        self.__npSign = np.where(self.__npIsCall, 1.0, -1.0)
+
+        # Strikes sorted separately for the calls and the puts, used by
+        # getPositionValue
+        self.__npCallOrder = np.flatnonzero(self.__npIsCall)
+        self.__npCallOrder = self.__npCallOrder[np.argsort(
+            self.__npStrike[self.__npCallOrder], kind='stable')]
+        self.__npPutOrder = np.flatnonzero(~self.__npIsCall)
+        self.__npPutOrder = self.__npPutOrder[np.argsort(
+            self.__npStrike[self.__npPutOrder], kind='stable')]
+
+    def __str__(self):
+        strF = 'MultiStrikeIntrinsicValue: [Strikes:{strikes}; ' \
+               'Calls:{calls};]'
+        return strF.format(strikes=len(self.__npStrike),
+                           calls=len(self.__npCallOrder))
+
+    def __setPrice(self, npStock, npOut):
+        # Fill npOut (stock prices x strikes) with the intrinsic values
+        np.subtract(npStock[:, np.newaxis], self.__npStrike, out=npOut)
+        np.multiply(npOut, self.__npSign, out=npOut)
+        np.maximum(npOut, 0, out=npOut)
+        return npOut
+
+    def __getCumulative(self, npOrder, npPosition):
+        # Cumulative sums of w and w x K over the sorted strikes, with a 0
+        # in front so that index i is the sum of the first i strikes
+        npStrike = self.__npStrike[npOrder]
+        npWeight = npPosition[npOrder]
+        npSumWeight = np.concatenate(([0.0], np.cumsum(npWeight)))
+        npSumWeightStrike = np.concatenate(
+            ([0.0], np.cumsum(npWeight * npStrike)))
+        return (npStrike, npSumWeight, npSumWeightStrike)
+
+    # Public Functions
+    def getOptionPrice(self, npStock):
+        npStock = np.array(npStock, dtype=np.float64, ndmin=1)
+        return self.__setPrice(
+            npStock, np.empty((len(npStock), len(self.__npStrike))))
+
+    def getOptionPriceChunks(self, npStock, intMaxBytes=64 * 1024 * 1024):
+        # Yields (first stock price index, intrinsic values) for blocks of
+        # stock prices, the block is reused so is overwritten each time
+        npStock = np.array(npStock, dtype=np.float64, ndmin=1)
+        intRows = intMaxBytes // (8 * max(len(self.__npStrike), 1))
+        if intRows < 1:
+            raise ValueError('intMaxBytes is too small for one row of '
+                             'strikes')
+        npBuffer = np.empty((min(intRows, len(npStock)),
+                             len(self.__npStrike)))
+        for intStart in range(0, len(npStock), intRows):
+            npChunk = npStock[intStart:intStart + intRows]
+            yield (intStart,
+                   self.__setPrice(npChunk, npBuffer[:len(npChunk)]))
+
+    def getPositionValue(self, npStock, npPosition=None):
+        # Value of holding npPosition of each option (1 of each if None)
+        npStock = np.array(npStock, dtype=np.float64, ndmin=1)
+        if npPosition is None:
+            npPosition = np.ones(len(self.__npStrike))
+        npPosition = np.asarray(npPosition, dtype=np.float64)
+        if npPosition.shape != self.__npStrike.shape:
+            raise ValueError('Position must be the same length as the '
+                             'strikes')
+
+        # Calls with a strike below S, sum w x (S - K)
+        (npStrike, npSumW, npSumWK) = self.__getCumulative(
+            self.__npCallOrder, npPosition)
+        npIndex = np.searchsorted(npStrike, npStock, side='left')
+        npValue = npStock * npSumW[npIndex] - npSumWK[npIndex]
+
+        # Puts with a strike above S, sum w x (K - S)
+        (npStrike, npSumW, npSumWK) = self.__getCumulative(
+            self.__npPutOrder, npPosition)
+        npIndex = np.searchsorted(npStrike, npStock, side='right')
+        npValue += (npSumWK[-1] - npSumWK[npIndex]) \
+            - npStock * (npSumW[-1] - npSumW[npIndex])
+        return npValue
@@ -0,0 +1,77 @@
+import numpy as np
+
+'''
+This section holds the results of a calculation that gives several values
+for each stock price (eg the price, delta and gamma, or their stdevs from a
+monte carlo run), see EuropeanOptionThread.
+
+Building a pandas DataFrame and adding a column to it for each value takes a
+few milliseconds, which is longer than the calculation itself for a small
+set of stock prices.   OptionResults is a lightweight replacement, a
+dictionary of contiguous float64 numpy arrays (one for each value) that are
+all the same length.   A value is got and set by its name, as with a
+DataFrame column, eg
+
+objResults['Price'] = npPrice
+npDelta = objResults['Delta']
+
+but the arrays are handed back as they are, with no copying.   The names
+keep the order they were added in.   toPandas builds a DataFrame from the
+results, only when it is asked for (eg to plot them), so pandas is only
+imported then.
+'''
+
+
+class OptionResults():
+
+    # Private Functions
+
+    def __init__(self, intNoValues, dctValues=None):
+        self.__intNoValues = intNoValues
+        self.__dctValues = dict()
+        if dctValues is not None:
+            for (strName, npValues) in dctValues.items():
+                self[strName] = npValues
+
+    def __str__(self):
+        strF = 'OptionResults: [NoValues:{novalues}; Names:{names}]'
+        return strF.format(novalues=self.__intNoValues,
+                           names=','.join(self.__dctValues.keys()))
+
+    def __getitem__(self, strName):
+        return self.__dctValues[strName]
+
+    def __setitem__(self, strName, npValues):
+        npValues = np.ascontiguousarray(npValues, dtype=np.float64)
+        if npValues.shape != (self.__intNoValues,):
+            raise ValueError('Results must have one value for each of the '
+                             '{n} stock prices'.format(n=self.__intNoValues))
+        self.__dctValues[strName] = npValues
+
+    def __contains__(self, strName):
+        return strName in self.__dctValues
+
+    def __iter__(self):
+        return iter(self.__dctValues)
+
+    # Public Functions
+
+    def getNoValues(self):
+        return self.__intNoValues
+
+    def getNames(self):
+        return list(self.__dctValues.keys())
+
+    def items(self):
+        return self.__dctValues.items()
+
+    def equals(self, objOther):
+        # The same names, in the same order, with exactly the same values
+        return self.getNames() == objOther.getNames() and \
+            all(np.array_equal(npValues, objOther[strName])
+                for (strName, npValues) in self.items())
+
+    def toPandas(self):
+        # Only import pandas when a DataFrame is wanted
+        import pandas as pd
+        return pd.DataFrame(self.__dctValues)
@@ -0,0 +1,57 @@
+import hashlib
+import numbers
+import numpy as np
+
+'''
+This section turns an option's parameters (from getParameters) into a key
+that can be compared, hashed and written down, for the options' own __eq__
+and __hash__ and for the result caches built on top of them (ResultCache,
+MonteCarloStore and the threaded checkpoints).
+
+Rather than keeping an array parameter (eg a vol for each stock price)
+itself, the key uses its shape, dtype and a short blake2b digest of its
+bytes, which is quick to calculate even for a large array.   A key that
+has to be written down (eg as a file name) is turned into a short digest by
+getKeyDigest.   This does not use repr, as repr shortens an array of more
+than 1000 values with '...' and writes np.float64(0.2) differently to 0.2,
+even though the options are equal.
+'''
+
+
+def getArrayDigest(npArray):
+    # The shape, dtype and a short digest of the bytes of an array, which
+    # identify its contents without keeping a copy of it
+    npArray = np.ascontiguousarray(npArray)
+    strDigest = hashlib.blake2b(npArray.view(np.uint8),
+                                digest_size=16).hexdigest()
+    return (npArray.shape, npArray.dtype.str, strDigest)
+
+
+def getParameterKey(tpParameters):
+    # The parameters as a hashable tuple, with any array (eg a vol for each
+    # stock price) replaced by its digest
+    return tuple(getArrayDigest(objParameter)
+                 if isinstance(objParameter, np.ndarray) else objParameter
+                 for objParameter in tpParameters)
+
+
+def getKeyDigest(tpKey):
+    # A short blake2b digest of a key (eg from getParameterKey), which is
+    # the same for keys that are equal
+    return hashlib.blake2b(getKeyText(tpKey).encode(),
+                           digest_size=16).hexdigest()
+
+
+def getKeyText(objValue):
+    # Write the key out so that equal values (eg 50, 50.0 and
+    # np.float64(50)) are written the same way
+    if isinstance(objValue, tuple):
+        return '(' + ','.join(getKeyText(objItem)
+                              for objItem in objValue) + ')'
+    if isinstance(objValue, np.ndarray):
+        return getKeyText(getArrayDigest(objValue))
+    if isinstance(objValue, (bool, np.bool_)):
+        return repr(bool(objValue))
+    if isinstance(objValue, numbers.Real):
+        return repr(float(objValue))
+    return repr(objValue)
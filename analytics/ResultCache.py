@@ -0,0 +1,151 @@
+import collections
+import numpy as np
+from analytics.ParameterKey import getArrayDigest, getParameterKey
+
+'''
+This section keeps the results of the option getters, so that asking for the
+same option on the same stock prices again (eg the same np.linspace of stock
+prices from the UI or a run script) does not recalculate them.   It is opt in,
+the option is wrapped in a CachedOption which has the same getters as the
+option, eg
+
+objCache = ResultCache()
+objOption = CachedOption(BlackScholes(50, 0.2, 0.01, 1, True), objCache)
+npPrice = objOption.getOptionPrice(npStock)
+
+The key for a result is the option's parameters (from getParameters, which
+for BasicMonteCarloOption includes the seed), the name of the getter and the
+stock prices.   Rather than keeping the stock prices themselves, the key uses
+their shape, dtype and a short blake2b digest of their bytes, which is quick
+to calculate even for a large grid.   Monte Carlo results are only the same
+each time if the seed is set, so a BasicMonteCarloOption without a seed is
+not cached (every call still draws new random numbers).
+
+ResultCache is a least recently used (LRU) cache, held in an OrderedDict.
+When either the number of results or the number of bytes held goes above its
+limit, the results that have not been used for the longest are dropped.
+The number of hits and misses are counted so that you can check the cache is
+worth having.
+
+The cached arrays are made read only (and the Monte Carlo (value, std) tuples
+have each array made read only), so the caller cannot change a result that
+will be handed out again.   Copy the array if you need to change it.
+'''
+
+
+class ResultCache():
+
+    # Private Functions
+
+    def __init__(self, intMaxEntries=128, intMaxBytes=64 * 1024 * 1024):
+        if intMaxEntries < 1 or intMaxBytes < 1:
+            raise ValueError('The cache must be able to hold a result')
+        self.__intMaxEntries = intMaxEntries
+        self.__intMaxBytes = intMaxBytes
+        self.__dctResults = collections.OrderedDict()
+        self.__intBytes = 0
+        self.__intHits = 0
+        self.__intMisses = 0
+
+    def __str__(self):
+        strF = 'ResultCache: [MaxEntries:{entries}; MaxBytes:{bytes}]'
+        return strF.format(entries=self.__intMaxEntries,
+                           bytes=self.__intMaxBytes)
+
+    def __getBytes(self, objResult):
+        if isinstance(objResult, tuple):
+            return sum(self.__getBytes(objItem) for objItem in objResult)
+        return np.asarray(objResult).nbytes
+
+    def __freeze(self, objResult):
+        # A read only copy, so that changing the result given back to the
+        # caller does not change the cache
+        if isinstance(objResult, tuple):
+            return tuple(self.__freeze(objItem) for objItem in objResult)
+        npResult = np.array(objResult)
+        npResult.flags.writeable = False
+        return npResult
+
+    def __evict(self):
+        # Drop the least recently used results until within both limits
+        while self.__dctResults and \
+                (len(self.__dctResults) > self.__intMaxEntries
+                 or self.__intBytes > self.__intMaxBytes):
+            (tpKey, objResult) = self.__dctResults.popitem(last=False)
+            self.__intBytes -= self.__getBytes(objResult)
+
+    # Public Functions
+
+    def getKey(self, tpParameters, strFunction, npStock):
+        return (getParameterKey(tpParameters), strFunction) \
+            + getArrayDigest(npStock)
+
+    def getResult(self, tpKey, funcCalculate):
+        # Return the cached result for the key, or calculate and keep it
+        if tpKey in self.__dctResults:
+            self.__intHits += 1
+            self.__dctResults.move_to_end(tpKey)
+            return self.__dctResults[tpKey]
+
+        self.__intMisses += 1
+        objResult = self.__freeze(funcCalculate())
+        self.__dctResults[tpKey] = objResult
+        self.__intBytes += self.__getBytes(objResult)
+        self.__evict()
+        return objResult
+
+    def getStatistics(self):
+        return {'Hits': self.__intHits, 'Misses': self.__intMisses,
+                'Entries': len(self.__dctResults), 'Bytes': self.__intBytes}
+
+    def clear(self):
+        self.__dctResults.clear()
+        self.__intBytes = 0
+        self.__intHits = 0
+        self.__intMisses = 0
+
+
+class CachedOption():
+
+    # Private Functions
+
+    def __init__(self, objOption, objCache):
+        self.__objOption = objOption
+        self.__objCache = objCache
+
+        # A Monte Carlo option only gives the same results each time if it
+        # has a seed.
+        self.__boolIsCached = not (
+            objOption.getParameters()[0] == 'BasicMonteCarloOption'
+            and objOption.getSeed() is None)
+
+    def __str__(self):
+        return 'CachedOption: [' + str(self.__objOption) + ']'
+
+    def __getResult(self, strFunction, npStock):
+        funcGetter = getattr(self.__objOption, strFunction)
+        if not self.__boolIsCached:
+            return funcGetter(npStock)
+        tpKey = self.__objCache.getKey(self.__objOption.getParameters(),
+                                       strFunction, npStock)
+        return self.__objCache.getResult(tpKey, lambda: funcGetter(npStock))
+
+    # Public Functions
+
+    def getOptionPrice(self, npStock):
+        return self.__getResult('getOptionPrice', npStock)
+
+    def getOptionDelta(self, npStock):
+        return self.__getResult('getOptionDelta', npStock)
+
+    def getOptionGamma(self, npStock):
+        return self.__getResult('getOptionGamma', npStock)
+
+    def getOptionVega(self, npStock):
+        return self.__getResult('getOptionVega', npStock)
+
+    def getOptionTheta(self, npStock):
+        return self.__getResult('getOptionTheta', npStock)
+
+    def getOptionRho(self, npStock):
+        return self.__getResult('getOptionRho', npStock)
@@ -0,0 +1,124 @@
+#!../venv/bin/python3
+# Notes: 'ensure shebang has suitable path', 'echo $PATH' , 'ls -l',
+# 'chmod +x filename'  or 'chmod 744 filename'
+# then run './filename.py'   or   'configure python launcher as default
+# application for finder etc'
+# The commonly used path to env does not exist on my mac, so we cannot use
+
+import analytics.OptionBook
+import analytics.EuropeanOption
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plot
+import time
+import tracemalloc
+
+'''
+This section measures the memory used for each contract in a book of
+options held as BlackScholes objects, as OptionContract objects (which use
+__slots__) and in an OptionBook (a typed numpy array for each field).   The
+memory is measured with tracemalloc while the book is built, so it includes
+everything python allocates for it (the objects, their __dict__ and the list
+holding them).   The time to price the whole book is also compared, one
+BlackScholes object at a time against the OptionBook in one go.   Finally
+the BlackScholes objects are built and priced again sharing a ConstantsTable,
+so that the root T, discount factor etc are only worked out once for each
+expiry rather than once for each contract.
+'''
+
+
+def getBytesPerContract(funcBuild, intNoContracts):
+    # Memory held by the result of funcBuild, for each contract
+    tracemalloc.start()
+    objBook = funcBuild()
+    (intBytes, intPeak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (objBook, intBytes / intNoContracts)
+
+
+def testOptionBookMemory(fltStock, fltVol, fltRiskFreeRate, npExpiry,
+                         intNoContracts):
+
+    npStrike = np.random.uniform(0.5 * fltStock, 1.5 * fltStock,
+                                 intNoContracts)
+    npIsCall = np.random.uniform(size=intNoContracts) < 0.5
+    npExpiryIndex = np.random.randint(0, len(npExpiry), intNoContracts)
+    lstStrike = npStrike.tolist()
+    lstIsCall = npIsCall.tolist()
+    lstExpiryIndex = npExpiryIndex.tolist()
+
+    (lstBS, fltBS) = getBytesPerContract(lambda: [
+        analytics.EuropeanOption.BlackScholes(
+            lstStrike[i], fltVol, fltRiskFreeRate,
+            float(npExpiry[lstExpiryIndex[i]]), lstIsCall[i])
+        for i in range(0, intNoContracts)], intNoContracts)
+    (lstContract, fltContract) = getBytesPerContract(lambda: [
+        analytics.OptionBook.OptionContract(
+            lstStrike[i], lstIsCall[i], lstExpiryIndex[i])
+        for i in range(0, intNoContracts)], intNoContracts)
+
+    def buildBook():
+        objBook = analytics.OptionBook.OptionBook(npExpiry, intNoContracts)
+        objBook.addContracts(npStrike, npIsCall, npExpiryIndex)
+        return objBook
+    (objBook, fltBook) = getBytesPerContract(buildBook, intNoContracts)
+
+    pdMemory = pd.DataFrame({
+        'Contracts': ['BlackScholes', 'OptionContract', 'OptionBook'],
+        'BytesPerContract': [fltBS, fltContract, fltBook]})
+    print("\nMemory for each of {0} contracts:".format(intNoContracts))
+    print(pdMemory.to_string(index=False))
+
+    npStock = np.array([fltStock])
+    start = time.time()
+    npPriceBS = np.array([objBS.getOptionPrice(npStock)[0]
+                          for objBS in lstBS])
+    fltTimeBS = time.time() - start
+    start = time.time()
+    npPriceBook = objBook.getOptionPrice(fltStock, fltVol, fltRiskFreeRate)
+    fltTimeBook = time.time() - start
+    print("\nTime to price the book: BlackScholes objects {0:.3f}s, "
+          "OptionBook {1:.3f}s, largest difference {2:.2e}".format(
+              fltTimeBS, fltTimeBook,
+              np.max(np.abs(npPriceBS - npPriceBook))))
+
+    start = time.time()
+    objConstants = analytics.EuropeanOption.ConstantsTable()
+    lstShared = [
+        analytics.EuropeanOption.BlackScholes(
+            lstStrike[i], fltVol, fltRiskFreeRate,
+            float(npExpiry[lstExpiryIndex[i]]), lstIsCall[i], objConstants)
+        for i in range(0, intNoContracts)]
+    npPriceShared = np.array([objBS.getOptionPrice(npStock)[0]
+                              for objBS in lstShared])
+    fltTimeShared = time.time() - start
+    start = time.time()
+    lstBS = [
+        analytics.EuropeanOption.BlackScholes(
+            lstStrike[i], fltVol, fltRiskFreeRate,
+            float(npExpiry[lstExpiryIndex[i]]), lstIsCall[i])
+        for i in range(0, intNoContracts)]
+    npPriceBS = np.array([objBS.getOptionPrice(npStock)[0]
+                          for objBS in lstBS])
+    fltTimeBS = time.time() - start
+    print("\nTime to build and price the BlackScholes objects: on their own "
+          "{0:.3f}s, sharing a ConstantsTable {1:.3f}s ({2} sets of "
+          "constants), largest difference {3:.2e}".format(
+              fltTimeBS, fltTimeShared,
+              objConstants.getStatistics()['Misses'],
+              np.max(np.abs(npPriceBS - npPriceShared))))
+
+    pdMemory.plot.bar(x='Contracts', y='BytesPerContract', color='Blue')
+    plot.show(block=True)
+
+
+if __name__ == "__main__":
+
+    print("\n**************************************************************\n")
+    print("**********************  START *********************************\n")
+    print("***************************************************************\n")
+
+    np.random.seed(1)
+    testOptionBookMemory(fltStock=50, fltVol=0.2, fltRiskFreeRate=0.01,
+                         npExpiry=np.array([0.25, 0.5, 1, 2, 5]),
+                         intNoContracts=100000)
@@ -0,0 +1,97 @@
+#!../venv/bin/python3
+# Notes: 'ensure shebang has suitable path', 'echo $PATH' , 'ls -l',
+# 'chmod +x filename'  or 'chmod 744 filename'
+# then run './filename.py'   or   'configure python launcher as default
+# application for finder etc'
+# The commonly used path to env does not exist on my mac, so we cannot use
+
+import analytics.MonteCarloPathOption
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plot
+import time
+
+'''
+This section compares how quickly the price of an Asian option converges
+when using:
+
+Pseudo:         pseudo random numbers, stepping forward one step at a time
+Sobol:          Sobol numbers, with each dimension used for the next step
+Sobol+Bridge:   Sobol numbers used by a Brownian Bridge
+
+For each number of paths, the option is priced a number of times and the
+root mean square error against a reference price (Sobol+Bridge with many
+more paths) is recorded along with the time taken.   The errors are then
+displayed on a log-log graph.
+'''
+
+
+def buildAsianOption(fltSpot, fltStrike, fltVol, fltRiskFreeRate,
+                     fltTimeToMaturity, intNoSteps, intNoIter, strSampling,
+                     boolBrownianBridge):
+
+    objPayoff = analytics.MonteCarloPathOption.AsianPathPayoff(fltStrike,
+                                                               True)
+    return analytics.MonteCarloPathOption.MonteCarloPathOption(
+        objPayoff, fltVol, fltRiskFreeRate, fltTimeToMaturity, intNoSteps,
+        intNoIter, strSampling=strSampling, intNoBatches=1,
+        boolBrownianBridge=boolBrownianBridge)
+
+
+def testAsianConvergence(fltSpot, fltStrike, fltVol, fltRiskFreeRate,
+                         fltTimeToMaturity, intNoSteps, intNoRepeats):
+
+    npStock = np.array([fltSpot])
+
+    # Build a reference price
+    objReference = buildAsianOption(fltSpot, fltStrike, fltVol,
+                                    fltRiskFreeRate, fltTimeToMaturity,
+                                    intNoSteps, 2 ** 18, 'Sobol', True)
+    fltReference = objReference.getOptionPrice(npStock)[0][0]
+    print("\nReference Price: {0}".format(fltReference))
+
+    dctMethods = {'Pseudo': ('Standard', False),
+                  'Sobol': ('Sobol', False),
+                  'Sobol+Bridge': ('Sobol', True)}
+
+    lstResults = list()
+    for intPower in range(8, 15):
+        intNoIter = 2 ** intPower
+        dctRow = {'NoIter': intNoIter}
+        for strMethod, (strSampling, boolBridge) in dctMethods.items():
+            objOption = buildAsianOption(fltSpot, fltStrike, fltVol,
+                                         fltRiskFreeRate, fltTimeToMaturity,
+                                         intNoSteps, intNoIter, strSampling,
+                                         boolBridge)
+            npPrices = np.empty(intNoRepeats)
+            start = time.time()
+            for i in range(0, intNoRepeats):
+                npPrices[i] = objOption.getOptionPrice(npStock)[0][0]
+            end = time.time()
+            dctRow[strMethod] = np.sqrt(
+                np.mean((npPrices - fltReference) ** 2))
+            dctRow[strMethod + 'Time'] = (end - start) / intNoRepeats
+        lstResults.append(dctRow)
+
+    pdResults = pd.DataFrame(lstResults)
+    print("\nRMSE and time per price for each number of paths:")
+    print(pdResults.to_string(index=False))
+
+    # Plot the errors on a log-log graph
+    ax = pdResults.plot.line(x='NoIter', y='Pseudo', color='Blue',
+                             logx=True, logy=True)
+    pdResults.plot.line(x='NoIter', y='Sobol', color='Red', ax=ax)
+    pdResults.plot.line(x='NoIter', y='Sobol+Bridge', color='Green', ax=ax)
+    plot.show(block=True)
+
+
+if __name__ == "__main__":
+
+    print("\n**************************************************************\n")
+    print("**********************  START *********************************\n")
+    print("***************************************************************\n")
+
+    # At the money, averaged on 64 dates over a year
+    testAsianConvergence(fltSpot=50, fltStrike=50, fltVol=0.2,
+                         fltRiskFreeRate=0.01, fltTimeToMaturity=1,
+                         intNoSteps=64, intNoRepeats=20)
@@ -0,0 +1,99 @@
+#!../venv/bin/python3
+# Notes: 'ensure shebang has suitable path', 'echo $PATH' , 'ls -l',
+# 'chmod +x filename'  or 'chmod 744 filename'
+# then run './filename.py'   or   'configure python launcher as default
+# application for finder etc'
+# The commonly used path to env does not exist on my mac, so we cannot use
+
+import analytics.EuropeanOption
+import analytics.FiniteDifferenceOption
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plot
+import time
+
+'''
+This section compares the price, delta and gamma from the Crank Nicolson
+finite difference method with the bumped greeks from BasicMonteCarloOption.
+Both are compared to the Black Scholes formula over a grid of stock prices,
+and the maximum error and calculation time are recorded.   The gamma from
+both methods is then plotted against the Black Scholes gamma.
+'''
+
+
+def compareFiniteDifferenceToMonteCarlo(npStock, fltStrike, fltVol,
+                                        fltRiskFreeRate, fltTimeToMaturity,
+                                        boolIsCall, intNoIter):
+
+    objBS = analytics.EuropeanOption.BlackScholes(
+        fltStrike, fltVol, fltRiskFreeRate, fltTimeToMaturity, boolIsCall)
+    objFD = analytics.FiniteDifferenceOption.CrankNicolsonOption(
+        fltStrike, fltVol, fltRiskFreeRate, fltTimeToMaturity, boolIsCall)
+    objMC = analytics.EuropeanOption.BasicMonteCarloOption(
+        fltStrike, fltVol, fltRiskFreeRate, fltTimeToMaturity, boolIsCall,
+        intNoIter)
+
+    dctBS = {'Price': objBS.getOptionPrice(npStock),
+             'Delta': objBS.getOptionDelta(npStock),
+             'Gamma': objBS.getOptionGamma(npStock)}
+
+    # The finite difference grid gives all three from the same solve
+    start = time.time()
+    dctFD = {'Price': objFD.getOptionPrice(npStock),
+             'Delta': objFD.getOptionDelta(npStock),
+             'Gamma': objFD.getOptionGamma(npStock)}
+    fltFDTime = time.time() - start
+
+    # The monte carlo needs a separate simulation for each
+    start = time.time()
+    dctMC = {'Price': objMC.getOptionPrice(npStock)[0],
+             'Delta': objMC.getOptionDelta(npStock)[0],
+             'Gamma': objMC.getOptionGamma(npStock)[0]}
+    fltMCTime = time.time() - start
+
+    lstResults = list()
+    for strValue in ('Price', 'Delta', 'Gamma'):
+        lstResults.append({
+            'Value': strValue,
+            'FDMaxError': np.max(np.abs(dctFD[strValue] - dctBS[strValue])),
+            'MCMaxError': np.max(np.abs(dctMC[strValue] - dctBS[strValue]))})
+    pdErrors = pd.DataFrame(lstResults)
+
+    print("\nMaximum error against Black Scholes:")
+    print(pdErrors.to_string(index=False))
+    print("\nCrank Nicolson time (price, delta and gamma):")
+    print(fltFDTime)
+    print("\nMonte Carlo time (price, delta and gamma), {0} paths:".format(
+        intNoIter))
+    print(fltMCTime)
+
+    # Plot the gamma's
+    pdResults = pd.DataFrame({'StockPrice': npStock,
+                              'BSGamma': dctBS['Gamma'],
+                              'FDGamma': dctFD['Gamma'],
+                              'MCGamma': dctMC['Gamma']})
+    ax = pdResults.plot.line(x='StockPrice', y='BSGamma', color='Blue')
+    pdResults.plot.line(x='StockPrice', y='FDGamma', color='Red', ax=ax)
+    pdResults.plot.line(x='StockPrice', y='MCGamma', color='Green', ax=ax)
+    plot.show(block=True)
+
+
+if __name__ == "__main__":
+
+    print("\n**************************************************************\n")
+    print("**********************  START *********************************\n")
+    print("***************************************************************\n")
+
+    # Set data to price the option
+    fltStrike = 50
+
+    # First build a set of stock prices that go from 50% of the strike
+    # price to 150% of the strike price
+    npStock = np.empty(100)
+    for i in range(0, 100):
+        npStock[i] = (i + 50) * fltStrike / 100
+
+    compareFiniteDifferenceToMonteCarlo(npStock=npStock, fltStrike=fltStrike,
+                                        fltVol=0.2, fltRiskFreeRate=0.01,
+                                        fltTimeToMaturity=1, boolIsCall=True,
+                                        intNoIter=200000)
@@ -0,0 +1,82 @@
+#!../venv/bin/python3
+# Notes: 'ensure shebang has suitable path', 'echo $PATH' , 'ls -l',
+# 'chmod +x filename'  or 'chmod 744 filename'
+# then run './filename.py'   or   'configure python launcher as default
+# application for finder etc'
+# The commonly used path to env does not exist on my mac, so we cannot use
+
+import analytics.EuropeanOption
+import analytics.LatticeOption
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plot
+import time
+
+'''
+This section compares the price from the binomial and trinomial lattices,
+with and without Richardson extrapolation, against the Black Scholes price
+for 10^3 to 10^4 time steps.   The maximum error over a set of stock prices
+and the time taken to price them (in one lattice) are recorded and the
+errors are then displayed on a log-log graph.
+'''
+
+
+def testLatticeConvergence(npStock, fltStrike, fltVol, fltRiskFreeRate,
+                           fltTimeToMaturity, boolIsCall, lstNoSteps):
+
+    objBS = analytics.EuropeanOption.BlackScholes(
+        fltStrike, fltVol, fltRiskFreeRate, fltTimeToMaturity, boolIsCall)
+    npBS = objBS.getOptionPrice(npStock)
+
+    dctMethods = {'Binomial': ('Binomial', False),
+                  'BinomialRichardson': ('Binomial', True),
+                  'Trinomial': ('Trinomial', False),
+                  'TrinomialRichardson': ('Trinomial', True)}
+
+    lstResults = list()
+    for intNoSteps in lstNoSteps:
+        dctRow = {'NoSteps': intNoSteps}
+        for strMethod, (strLattice, boolRichardson) in dctMethods.items():
+            objLattice = analytics.LatticeOption.LatticeOption(
+                fltStrike, fltVol, fltRiskFreeRate, fltTimeToMaturity,
+                boolIsCall, intNoSteps, strLattice,
+                boolRichardson=boolRichardson)
+            start = time.time()
+            npPrice = objLattice.getOptionPrice(npStock)
+            end = time.time()
+            dctRow[strMethod] = np.max(np.abs(npPrice - npBS))
+            dctRow[strMethod + 'Time'] = end - start
+        lstResults.append(dctRow)
+
+    pdResults = pd.DataFrame(lstResults)
+    print("\nMaximum error against Black Scholes and time taken for "
+          "{0} stock prices:".format(len(npStock)))
+    print(pdResults.to_string(index=False))
+
+    # Plot the errors on a log-log graph
+    ax = pdResults.plot.line(x='NoSteps', y='Binomial', color='Blue',
+                             logx=True, logy=True)
+    pdResults.plot.line(x='NoSteps', y='BinomialRichardson', color='Red',
+                        ax=ax)
+    pdResults.plot.line(x='NoSteps', y='Trinomial', color='Green', ax=ax)
+    pdResults.plot.line(x='NoSteps', y='TrinomialRichardson',
+                        color='Orange', ax=ax)
+    plot.show(block=True)
+
+
+if __name__ == "__main__":
+
+    print("\n**************************************************************\n")
+    print("**********************  START *********************************\n")
+    print("***************************************************************\n")
+
+    # Set data to price the option
+    fltStrike = 50
+
+    # A lattice is O(n^2) in time, so keep the number of stock prices small
+    npStock = np.linspace(0.8 * fltStrike, 1.2 * fltStrike, 9)
+
+    testLatticeConvergence(npStock=npStock, fltStrike=fltStrike, fltVol=0.2,
+                           fltRiskFreeRate=0.01, fltTimeToMaturity=1,
+                           boolIsCall=True,
+                           lstNoSteps=[1000, 2000, 5000, 10000])
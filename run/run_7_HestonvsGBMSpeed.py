@@ -0,0 +1,93 @@
+#!../venv/bin/python3
+# Notes: 'ensure shebang has suitable path', 'echo $PATH' , 'ls -l',
+# 'chmod +x filename'  or 'chmod 744 filename'
+# then run './filename.py'   or   'configure python launcher as default
+# application for finder etc'
+# The commonly used path to env does not exist on my mac, so we cannot use
+
+import analytics.EuropeanOption
+import analytics.FourierOption
+import analytics.HestonMonteCarloOption
+import analytics.MonteCarloPathOption
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plot
+import time
+
+'''
+This section measures the number of paths per second for the Heston Monte
+Carlo engine and compares it to the constant vol (GBM) engines:
+
+GBMPath:    MonteCarloPathOption, stepping over the same time grid
+GBMSingle:  BasicMonteCarloOption, which only needs the final stock price
+Heston:     HestonMonteCarloOption (QE scheme)
+
+The Heston price is also compared with the price from FourierOption, using
+the Heston characteristic function, so that the random error can be seen.
+The paths per second for each number of paths are then plotted.
+'''
+
+
+def testHestonSpeed(npStock, fltStrike, fltV0, fltKappa, fltTheta, fltXi,
+                    fltRho, fltRiskFreeRate, fltTimeToMaturity, intNoSteps,
+                    lstNoIter):
+
+    objCF = analytics.FourierOption.HestonCharacteristicFunction(
+        fltV0, fltKappa, fltTheta, fltXi, fltRho)
+    objFourier = analytics.FourierOption.FourierOption(
+        objCF, fltRiskFreeRate, fltTimeToMaturity)
+    npFourier = np.array([objFourier.getOptionPrice([fltStrike], fltS)[0]
+                          for fltS in npStock])
+
+    lstResults = list()
+    for intNoIter in lstNoIter:
+        objPayoff = analytics.MonteCarloPathOption.EuropeanPathPayoff(
+            fltStrike, True)
+        dctOptions = {
+            'GBMPath': analytics.MonteCarloPathOption.MonteCarloPathOption(
+                objPayoff, np.sqrt(fltV0), fltRiskFreeRate,
+                fltTimeToMaturity, intNoSteps, intNoIter),
+            'GBMSingle': analytics.EuropeanOption.BasicMonteCarloOption(
+                fltStrike, np.sqrt(fltV0), fltRiskFreeRate,
+                fltTimeToMaturity, True, intNoIter),
+            'Heston': analytics.HestonMonteCarloOption.HestonMonteCarloOption(
+                objPayoff, fltV0, fltKappa, fltTheta, fltXi, fltRho,
+                fltRiskFreeRate, fltTimeToMaturity, intNoSteps, intNoIter)}
+
+        dctRow = {'NoIter': intNoIter}
+        for strMethod, objOption in dctOptions.items():
+            start = time.time()
+            (npPrice, npSTD) = objOption.getOptionPrice(npStock)
+            end = time.time()
+            dctRow[strMethod + 'PathsPerSec'] = intNoIter / (end - start)
+            if strMethod == 'Heston':
+                dctRow['HestonMaxError'] = np.max(np.abs(npPrice - npFourier))
+                dctRow['HestonMaxStdErr'] = np.max(npSTD) / np.sqrt(intNoIter)
+        lstResults.append(dctRow)
+
+    pdResults = pd.DataFrame(lstResults)
+    print("\nPaths per second ({0} steps, {1} stock prices):".format(
+        intNoSteps, len(npStock)))
+    print(pdResults.to_string(index=False))
+
+    # Plot the paths per second
+    ax = pdResults.plot.line(x='NoIter', y='GBMPathPathsPerSec',
+                             color='Blue', logx=True, logy=True)
+    pdResults.plot.line(x='NoIter', y='GBMSinglePathsPerSec', color='Green',
+                        ax=ax)
+    pdResults.plot.line(x='NoIter', y='HestonPathsPerSec', color='Red',
+                        ax=ax)
+    plot.show(block=True)
+
+
+if __name__ == "__main__":
+
+    print("\n**************************************************************\n")
+    print("**********************  START *********************************\n")
+    print("***************************************************************\n")
+
+    testHestonSpeed(npStock=np.array([40.0, 45.0, 50.0, 55.0, 60.0]),
+                    fltStrike=50, fltV0=0.04, fltKappa=1.5, fltTheta=0.04,
+                    fltXi=0.5, fltRho=-0.7, fltRiskFreeRate=0.01,
+                    fltTimeToMaturity=1, intNoSteps=50,
+                    lstNoIter=[10000, 50000, 100000, 200000])
@@ -0,0 +1,100 @@
+#!../venv/bin/python3
+# Notes: 'ensure shebang has suitable path', 'echo $PATH' , 'ls -l',
+# 'chmod +x filename'  or 'chmod 744 filename'
+# then run './filename.py'   or   'configure python launcher as default
+# application for finder etc'
+# The commonly used path to env does not exist on my mac, so we cannot use
+
+import analytics.ChebyshevProxy
+import analytics.EuropeanOption
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plot
+import time
+
+'''
+This section builds a Chebyshev proxy of BasicMonteCarloOption in the stock
+price and vol, then compares the time taken to calculate a price and delta
+with the proxy against running the Monte Carlo.   The error check at random
+points is printed along with the time taken to build the proxy, and the
+proxy and Monte Carlo deltas are plotted against the Black Scholes delta.
+'''
+
+
+def testChebyshevProxySpeed(npStock, fltStrike, fltVol, fltRiskFreeRate,
+                            fltTimeToMaturity, boolIsCall, intNoIter,
+                            intNoRepeats):
+
+    def getMonteCarloPrice(npStock, fltVol):
+        # Use the same random numbers at every node
+        np.random.seed(1)
+        return analytics.EuropeanOption.BasicMonteCarloOption(
+            fltStrike, fltVol, fltRiskFreeRate, fltTimeToMaturity,
+            boolIsCall, intNoIter).getOptionPrice(npStock)[0]
+
+    # Build the proxy offline
+    objProxy = analytics.ChebyshevProxy.ChebyshevProxy(
+        (0.4 * fltStrike, 1.6 * fltStrike), 30, (0.5 * fltVol, 2 * fltVol),
+        10)
+    start = time.time()
+    objProxy.build(getMonteCarloPrice)
+    fltBuildTime = time.time() - start
+    print("\nProxy build time: {0}".format(fltBuildTime))
+    print("Proxy maximum error at 20 random points: {0}".format(
+        objProxy.checkError(20)))
+
+    # Time a price and delta at one stock price
+    npOne = npStock[len(npStock) // 2:len(npStock) // 2 + 1]
+    objMC = analytics.EuropeanOption.BasicMonteCarloOption(
+        fltStrike, fltVol, fltRiskFreeRate, fltTimeToMaturity, boolIsCall,
+        intNoIter)
+    start = time.time()
+    for i in range(0, intNoRepeats):
+        objMC.getOptionPrice(npOne)
+        objMC.getOptionDelta(npOne)
+    fltMCTime = (time.time() - start) / intNoRepeats
+    start = time.time()
+    for i in range(0, intNoRepeats):
+        objProxy.getOptionPrice(npOne, fltVol)
+        objProxy.getOptionDelta(npOne, fltVol)
+    fltProxyTime = (time.time() - start) / intNoRepeats
+    pdTimes = pd.DataFrame([{'Method': 'MonteCarlo',
+                             'Microseconds': fltMCTime * 1e6},
+                            {'Method': 'Proxy',
+                             'Microseconds': fltProxyTime * 1e6}])
+    print("\nTime for a price and delta at one stock price:")
+    print(pdTimes.to_string(index=False))
+
+    # Plot the deltas
+    objBS = analytics.EuropeanOption.BlackScholes(
+        fltStrike, fltVol, fltRiskFreeRate, fltTimeToMaturity, boolIsCall)
+    pdResults = pd.DataFrame({
+        'StockPrice': npStock,
+        'BSDelta': objBS.getOptionDelta(npStock),
+        'ProxyDelta': objProxy.getOptionDelta(npStock, fltVol),
+        'MCDelta': objMC.getOptionDelta(npStock)[0]})
+    ax = pdResults.plot.line(x='StockPrice', y='BSDelta', color='Blue')
+    pdResults.plot.line(x='StockPrice', y='ProxyDelta', color='Red', ax=ax)
+    pdResults.plot.line(x='StockPrice', y='MCDelta', color='Green', ax=ax)
+    plot.show(block=True)
+
+
+if __name__ == "__main__":
+
+    print("\n**************************************************************\n")
+    print("**********************  START *********************************\n")
+    print("***************************************************************\n")
+
+    # Set data to price the option
+    fltStrike = 50
+
+    # First build a set of stock prices that go from 50% of the strike
+    # price to 150% of the strike price
+    npStock = np.empty(100)
+    for i in range(0, 100):
+        npStock[i] = (i + 50) * fltStrike / 100
+
+    testChebyshevProxySpeed(npStock=npStock, fltStrike=fltStrike, fltVol=0.2,
+                            fltRiskFreeRate=0.01, fltTimeToMaturity=1,
+                            boolIsCall=True, intNoIter=100000,
+                            intNoRepeats=20)
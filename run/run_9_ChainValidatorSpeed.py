@@ -0,0 +1,75 @@
+#!../venv/bin/python3
+# Notes: 'ensure shebang has suitable path', 'echo $PATH' , 'ls -l',
+# 'chmod +x filename'  or 'chmod 744 filename'
+# then run './filename.py'   or   'configure python launcher as default
+# application for finder etc'
+# The commonly used path to env does not exist on my mac, so we cannot use
+
+import analytics.OptionChainValidator
+import analytics.EuropeanOption
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plot
+import time
+
+'''
+This section builds a chain of Black Scholes call prices over a grid of
+strikes and maturities (up to 10^6 quotes), adds some random noise to a few
+of the prices so that they break the no arbitrage conditions, then times
+OptionChainValidator on chains of increasing size.   The number of quotes
+flagged by each check is printed and the time taken is plotted against the
+number of quotes.
+'''
+
+
+def testChainValidatorSpeed(fltStock, fltVol, fltRiskFreeRate, intNoTimes,
+                            lstNoStrikes, intNoRepeats):
+
+    lstTimes = list()
+    npTime = np.linspace(0.1, 5, intNoTimes)
+    for intNoStrikes in lstNoStrikes:
+        # The chain, sorted by maturity then strike
+        npStrike = np.tile(np.linspace(0.2 * fltStock, 3 * fltStock,
+                                       intNoStrikes), intNoTimes)
+        npTimes = np.repeat(npTime, intNoStrikes)
+        npPrice = analytics.EuropeanOption.BlackScholes(
+            npStrike, fltVol, fltRiskFreeRate, npTimes, True).getOptionPrice(
+                fltStock)
+
+        # Move 0.1% of the prices by up to 1
+        npIndex = np.random.choice(len(npPrice), len(npPrice) // 1000,
+                                   replace=False)
+        npPrice[npIndex] += np.random.uniform(-1, 1, len(npIndex))
+
+        objValidator = analytics.OptionChainValidator.OptionChainValidator(
+            fltStock, fltRiskFreeRate)
+        start = time.time()
+        for i in range(0, intNoRepeats):
+            dctFlags = objValidator.validate(npStrike, npTimes, npPrice,
+                                             True)
+        fltTime = (time.time() - start) / intNoRepeats
+        lstTimes.append({'NoQuotes': len(npPrice),
+                         'Milliseconds': fltTime * 1000})
+        print("\nQuotes: {0}, flagged: {1}".format(
+            len(npPrice), {strName: int(np.sum(npFlags))
+                           for (strName, npFlags) in dctFlags.items()}))
+
+    pdTimes = pd.DataFrame(lstTimes)
+    print("\nTime to validate the chain:")
+    print(pdTimes.to_string(index=False))
+    pdTimes.plot.line(x='NoQuotes', y='Milliseconds', color='Blue',
+                      marker='o')
+    plot.show(block=True)
+
+
+if __name__ == "__main__":
+
+    print("\n**************************************************************\n")
+    print("**********************  START *********************************\n")
+    print("***************************************************************\n")
+
+    np.random.seed(1)
+    testChainValidatorSpeed(fltStock=50, fltVol=0.2, fltRiskFreeRate=0.01,
+                            intNoTimes=100,
+                            lstNoStrikes=[100, 1000, 2500, 5000, 10000],
+                            intNoRepeats=10)
@@ -0,0 +1,140 @@
+import analytics.FiniteDifferenceOption
+import analytics.EuropeanOption
+import numpy as np
+import unittest
+import test.ExternalData as ED
+
+'''
+These set of tests are used to ensure the CrankNicolsonOption class is
+working correctly.
+It tests the __str__ and compares the price and greeks against the external
+data stored in the ExternalData.py file and against the BlackScholes class
+over a grid of stock prices.   The finite difference method is only accurate
+to the size of the grid, so the comparisons use a small tolerance.
+'''
+
+
+class TestCrankNicolsonOption(unittest.TestCase):
+
+    def setUp(self):
+
+        # Set data to price the option
+        self.__fltStrike = ED.EO_Strike
+        self.__fltVol = ED.EO_Vol
+        self.__fltRiskFreeRate = ED.EO_RiskFreeRate
+        self.__fltTimeToMaturity = ED.EO_TimeToMaturity
+        self.__npSpot = np.asarray(ED.EO_spot, dtype=np.float64)
+
+        # Build some stock prices to run the test against
+        self.__npStock = np.empty(100)
+        for i in range(0, 100):
+            self.__npStock[i] = (i + 50) * self.__fltStrike / 100
+
+        # Add a call and a put
+        self.__objCall = analytics.FiniteDifferenceOption. \
+            CrankNicolsonOption(
+                self.__fltStrike,
+                self.__fltVol,
+                self.__fltRiskFreeRate,
+                self.__fltTimeToMaturity,
+                True)
+        self.__objPut = analytics.FiniteDifferenceOption. \
+            CrankNicolsonOption(
+                self.__fltStrike,
+                self.__fltVol,
+                self.__fltRiskFreeRate,
+                self.__fltTimeToMaturity,
+                False)
+
+    def testStr(self):
+
+        strF = 'CrankNicolsonOption: [Strike:{strike}; Vol:{vol}; ' \
+               'RFRate:{rfrate}; Time:{time}; IsCall:{iscall}; ' \
+               'NoSpaceSteps:400; NoTimeSteps:200]'
+        strF = strF.format(strike=self.__fltStrike, vol=self.__fltVol,
+                           rfrate=self.__fltRiskFreeRate,
+                           time=self.__fltTimeToMaturity,
+                           iscall=True)
+        self.assertEqual(str(self.__objCall), strF)
+
+    def testPricevsExternal(self):
+
+        npCall = self.__objCall.getOptionPrice(self.__npSpot)
+        npPut = self.__objPut.getOptionPrice(self.__npSpot)
+
+        for i in range(0, len(ED.EO_spot)):
+            self.assertLess(abs(npCall[i] - ED.EO_callPrice[i]), 1e-3)
+            self.assertLess(abs(npPut[i] - ED.EO_putPrice[i]), 1e-3)
+
+    def testDeltaGammavsExternal(self):
+
+        npCallDelta = self.__objCall.getOptionDelta(self.__npSpot)
+        npPutDelta = self.__objPut.getOptionDelta(self.__npSpot)
+        npCallGamma = self.__objCall.getOptionGamma(self.__npSpot)
+        npPutGamma = self.__objPut.getOptionGamma(self.__npSpot)
+
+        for i in range(0, len(ED.EO_spot)):
+            self.assertLess(abs(npCallDelta[i] - ED.EO_callDelta[i]), 1e-3)
+            self.assertLess(abs(npPutDelta[i] - ED.EO_putDelta[i]), 1e-3)
+            self.assertLess(abs(npCallGamma[i] - ED.EO_callGamma[i]), 1e-4)
+            self.assertLess(abs(npPutGamma[i] - ED.EO_putGamma[i]), 1e-4)
+
+    def testVegaThetaRhovsExternal(self):
+
+        npVega = self.__objCall.getOptionVega(self.__npSpot)
+        npCallTheta = self.__objCall.getOptionTheta(self.__npSpot)
+        npPutTheta = self.__objPut.getOptionTheta(self.__npSpot)
+        npCallRho = self.__objCall.getOptionRho(self.__npSpot)
+        npPutRho = self.__objPut.getOptionRho(self.__npSpot)
+
+        for i in range(0, len(ED.EO_spot)):
+            # Vega and rho are for a 1% move, theta is for 1 day and is
+            # negative in this library
+            self.assertLess(abs(npVega[i] - 0.01 * ED.EO_callVega[i]), 1e-4)
+            self.assertLess(abs(npCallTheta[i] + ED.EO_callTheta[i] / 365),
+                            1e-4)
+            self.assertLess(abs(npPutTheta[i] + ED.EO_putTheta[i] / 365),
+                            1e-4)
+            self.assertLess(abs(npCallRho[i] - 0.01 * ED.EO_callRho[i]),
+                            1e-3)
+            self.assertLess(abs(npPutRho[i] - 0.01 * ED.EO_putRho[i]), 1e-3)
+
+    def testAgainstBlackScholesGrid(self):
+
+        for boolIsCall in (True, False):
+            objFD = analytics.FiniteDifferenceOption.CrankNicolsonOption(
+                self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+                self.__fltTimeToMaturity, boolIsCall)
+            objBS = analytics.EuropeanOption.BlackScholes(
+                self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+                self.__fltTimeToMaturity, boolIsCall)
+
+            npDiff = objFD.getOptionPrice(self.__npStock) \
+                - objBS.getOptionPrice(self.__npStock)
+            self.assertLess(np.max(np.abs(npDiff)), 1e-3)
+            npDiff = objFD.getOptionGamma(self.__npStock) \
+                - objBS.getOptionGamma(self.__npStock)
+            self.assertLess(np.max(np.abs(npDiff)), 1e-4)
+
+    def testGridValues(self):
+
+        # The grid should cover npStock and be rebuilt if npStock is
+        # beyond the end of it.
+        (npS, npV, npDelta, npGamma, npTheta) = \
+            self.__objCall.getGridValues(self.__npStock)
+        self.assertEqual(len(npS), 401)
+        self.assertEqual(npS[0], 0)
+        self.assertGreaterEqual(npS[-1], 1.5 * np.max(self.__npStock))
+
+        npBigStock = np.array([50.0, 500.0])
+        npS = self.__objCall.getGridValues(npBigStock)[0]
+        self.assertGreaterEqual(npS[-1], 750)
+        npPrice = self.__objCall.getOptionPrice(npBigStock)
+        npBSPrice = analytics.EuropeanOption.BlackScholes(
+            self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+            self.__fltTimeToMaturity, True).getOptionPrice(npBigStock)
+        self.assertLess(np.max(np.abs(npPrice - npBSPrice)), 0.02)
+
+
+if __name__ == '__main__':
+    unittest.main()
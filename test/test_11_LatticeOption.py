@@ -0,0 +1,132 @@
+import analytics.LatticeOption
+import analytics.EuropeanOption
+import numpy as np
+import unittest
+import test.ExternalData as ED
+
+'''
+These set of tests are used to ensure the LatticeOption class is working
+correctly.
+It tests the __str__ and compares the price and greeks of the binomial and
+trinomial lattices against the external data stored in the ExternalData.py
+file.   It also checks that Richardson extrapolation gets closer to the
+Black Scholes price and that an American option is worth at least as much as
+the European option and the payoff.
+'''
+
+
+class TestLatticeOption(unittest.TestCase):
+
+    def setUp(self):
+
+        # Set data to price the option
+        self.__fltStrike = ED.EO_Strike
+        self.__fltVol = ED.EO_Vol
+        self.__fltRiskFreeRate = ED.EO_RiskFreeRate
+        self.__fltTimeToMaturity = ED.EO_TimeToMaturity
+        self.__npSpot = np.asarray(ED.EO_spot, dtype=np.float64)
+
+        # Build some stock prices to run the test against
+        self.__npStock = np.empty(100)
+        for i in range(0, 100):
+            self.__npStock[i] = (i + 50) * self.__fltStrike / 100
+
+    def __getOption(self, boolIsCall, intNoSteps, strLattice='Binomial',
+                    boolIsAmerican=False, boolRichardson=False):
+        return analytics.LatticeOption.LatticeOption(
+            self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+            self.__fltTimeToMaturity, boolIsCall, intNoSteps, strLattice,
+            boolIsAmerican, boolRichardson)
+
+    def testStr(self):
+
+        strF = 'LatticeOption: [Strike:{strike}; Vol:{vol}; ' \
+               'RFRate:{rfrate}; Time:{time}; IsCall:{iscall}; ' \
+               'NoSteps:100; Lattice:Trinomial; IsAmerican:False]'
+        strF = strF.format(strike=self.__fltStrike, vol=self.__fltVol,
+                           rfrate=self.__fltRiskFreeRate,
+                           time=self.__fltTimeToMaturity,
+                           iscall=True)
+        self.assertEqual(str(self.__getOption(True, 100, 'Trinomial')), strF)
+
+    def testInvalidInputs(self):
+
+        with self.assertRaises(ValueError):
+            self.__getOption(True, 100, 'Quadrinomial')
+        with self.assertRaises(ValueError):
+            self.__getOption(True, 2)
+
+    def testPriceGreeksvsExternal(self):
+
+        for strLattice in ('Binomial', 'Trinomial'):
+            (npCall, npCallDelta, npCallGamma, npCallTheta) = \
+                self.__getOption(True, 500, strLattice).getOptionValues(
+                    self.__npSpot)
+            (npPut, npPutDelta, npPutGamma, npPutTheta) = \
+                self.__getOption(False, 500, strLattice).getOptionValues(
+                    self.__npSpot)
+
+            for i in range(0, len(ED.EO_spot)):
+                self.assertLess(abs(npCall[i] - ED.EO_callPrice[i]), 1e-3)
+                self.assertLess(abs(npPut[i] - ED.EO_putPrice[i]), 1e-3)
+                self.assertLess(abs(npCallDelta[i] - ED.EO_callDelta[i]),
+                                1e-3)
+                self.assertLess(abs(npPutDelta[i] - ED.EO_putDelta[i]), 1e-3)
+                self.assertLess(abs(npCallGamma[i] - ED.EO_callGamma[i]),
+                                1e-4)
+                self.assertLess(abs(npPutGamma[i] - ED.EO_putGamma[i]), 1e-4)
+                # Theta is for 1 day and is negative in this library
+                self.assertLess(abs(npCallTheta[i] + ED.EO_callTheta[i] / 365),
+                                1e-4)
+                self.assertLess(abs(npPutTheta[i] + ED.EO_putTheta[i] / 365),
+                                1e-4)
+
+    def testRichardson(self):
+
+        objBS = analytics.EuropeanOption.BlackScholes(
+            self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+            self.__fltTimeToMaturity, True)
+        npBS = objBS.getOptionPrice(self.__npStock)
+
+        for strLattice in ('Binomial', 'Trinomial'):
+            npPlain = self.__getOption(True, 50, strLattice).getOptionPrice(
+                self.__npStock)
+            npRichardson = self.__getOption(
+                True, 50, strLattice, False, True).getOptionPrice(
+                    self.__npStock)
+            fltPlainError = np.max(np.abs(npPlain - npBS))
+            fltRichardsonError = np.max(np.abs(npRichardson - npBS))
+            self.assertLess(fltRichardsonError, fltPlainError)
+            self.assertLess(fltRichardsonError, 5e-4)
+
+    def testAmerican(self):
+
+        for strLattice in ('Binomial', 'Trinomial'):
+            npEuropean = self.__getOption(
+                False, 200, strLattice).getOptionPrice(self.__npStock)
+            npAmerican = self.__getOption(
+                False, 200, strLattice, True).getOptionPrice(self.__npStock)
+            npPayoff = np.maximum(self.__fltStrike - self.__npStock, 0)
+            self.assertTrue(np.all(npAmerican >= npEuropean - 1e-12))
+            self.assertTrue(np.all(npAmerican >= npPayoff - 1e-12))
+            self.assertGreater(np.max(npAmerican - npEuropean), 0)
+
+            # There are no dividends, so an American call is never
+            # exercised early
+            npEuropean = self.__getOption(
+                True, 200, strLattice).getOptionPrice(self.__npStock)
+            npAmerican = self.__getOption(
+                True, 200, strLattice, True).getOptionPrice(self.__npStock)
+            self.assertLess(np.max(np.abs(npAmerican - npEuropean)), 1e-12)
+
+        # Richardson with the Black Scholes step should agree with a large
+        # lattice for the American put
+        npFine = self.__getOption(False, 2000, 'Binomial',
+                                  True).getOptionPrice(self.__npSpot)
+        npRichardson = self.__getOption(False, 200, 'Binomial', True,
+                                        True).getOptionPrice(self.__npSpot)
+        self.assertLess(np.max(np.abs(npFine - npRichardson)), 2e-3)
+
+
+if __name__ == '__main__':
+    unittest.main()
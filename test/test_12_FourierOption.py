@@ -0,0 +1,107 @@
+import analytics.FourierOption
+import analytics.EuropeanOption
+import numpy as np
+import unittest
+import test.ExternalData as ED
+
+'''
+These set of tests are used to ensure the FourierOption class is working
+correctly.
+It tests the __str__ and compares the call and put prices against the
+external data stored in the ExternalData.py file and against the
+BlackScholes class over a strip of strikes.   The Heston characteristic
+function should give the Black Scholes prices when the vol of variance is
+close to zero and the variance starts at its long run level.
+'''
+
+
+class TestFourierOption(unittest.TestCase):
+
+    def setUp(self):
+
+        # Set data to price the option
+        self.__fltStrike = ED.EO_Strike
+        self.__fltVol = ED.EO_Vol
+        self.__fltRiskFreeRate = ED.EO_RiskFreeRate
+        self.__fltTimeToMaturity = ED.EO_TimeToMaturity
+
+        # Build a strip of strikes from 50% to 150% of the strike
+        self.__npStrike = np.empty(100)
+        for i in range(0, 100):
+            self.__npStrike[i] = (i + 50) * self.__fltStrike / 100
+
+        self.__objCF = analytics.FourierOption. \
+            BlackScholesCharacteristicFunction(self.__fltVol)
+        self.__objFourier = analytics.FourierOption.FourierOption(
+            self.__objCF, self.__fltRiskFreeRate, self.__fltTimeToMaturity)
+
+    def testStr(self):
+
+        strF = 'FourierOption: [Model:BlackScholesCharacteristicFunction: ' \
+               '[Vol:{vol}]; RFRate:{rfrate}; Time:{time}; NoPoints:4096; ' \
+               'Eta:0.25; Alpha:1.5]'
+        strF = strF.format(vol=self.__fltVol, rfrate=self.__fltRiskFreeRate,
+                           time=self.__fltTimeToMaturity)
+        self.assertEqual(str(self.__objFourier), strF)
+
+    def testPricevsExternal(self):
+
+        for i in range(0, len(ED.EO_spot)):
+            fltCall = self.__objFourier.getOptionPrice(
+                [self.__fltStrike], ED.EO_spot[i], True)[0]
+            fltPut = self.__objFourier.getOptionPrice(
+                [self.__fltStrike], ED.EO_spot[i], False)[0]
+            self.assertLess(abs(fltCall - ED.EO_callPrice[i]), 1e-4)
+            self.assertLess(abs(fltPut - ED.EO_putPrice[i]), 1e-4)
+
+    def testAgainstBlackScholesStrip(self):
+
+        for fltStock in ED.EO_spot:
+            for boolIsCall in (True, False):
+                npPrice = self.__objFourier.getOptionPrice(
+                    self.__npStrike, fltStock, boolIsCall)
+                npBS = np.empty(len(self.__npStrike))
+                for i in range(0, len(self.__npStrike)):
+                    objBS = analytics.EuropeanOption.BlackScholes(
+                        self.__npStrike[i], self.__fltVol,
+                        self.__fltRiskFreeRate, self.__fltTimeToMaturity,
+                        boolIsCall)
+                    npBS[i] = objBS.getOptionPrice(np.array([fltStock]))[0]
+                self.assertLess(np.max(np.abs(npPrice - npBS)), 1e-5)
+
+    def testStrikeStrip(self):
+
+        # The grid is centred on the stock price and evenly spaced in the
+        # log strike
+        fltStock = 50.0
+        (npStrike, npCall) = self.__objFourier.getStrikeStrip(fltStock)
+        self.assertEqual(len(npStrike), 4096)
+        npLogDiff = np.diff(np.log(npStrike))
+        self.assertLess(np.max(np.abs(npLogDiff - npLogDiff[0])), 1e-9)
+        self.assertAlmostEqual(npStrike[2048], fltStock)
+
+        # Put-call parity
+        (npStrike, npPut) = self.__objFourier.getStrikeStrip(fltStock, False)
+        npParity = npCall - npPut - fltStock + npStrike * np.exp(
+            -self.__fltRiskFreeRate * self.__fltTimeToMaturity)
+        self.assertLess(np.max(np.abs(npParity)), 1e-6)
+
+    def testHestonNearBlackScholes(self):
+
+        fltV0 = self.__fltVol ** 2
+        objHeston = analytics.FourierOption.HestonCharacteristicFunction(
+            fltV0, 2.0, fltV0, 1e-3, -0.5)
+        objFourier = analytics.FourierOption.FourierOption(
+            objHeston, self.__fltRiskFreeRate, self.__fltTimeToMaturity)
+
+        for i in range(0, len(ED.EO_spot)):
+            fltCall = objFourier.getOptionPrice(
+                [self.__fltStrike], ED.EO_spot[i], True)[0]
+            fltPut = objFourier.getOptionPrice(
+                [self.__fltStrike], ED.EO_spot[i], False)[0]
+            self.assertLess(abs(fltCall - ED.EO_callPrice[i]), 1e-3)
+            self.assertLess(abs(fltPut - ED.EO_putPrice[i]), 1e-3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import analytics.LeastSquaresMonteCarloOption
+import analytics.LatticeOption
+import analytics.EuropeanOption
+import unittest
+from unittest.mock import patch
+import test.ExternalData as ED
+from analytics.LeastSquaresMonteCarloOption import np
+
+'''
+These set of tests are used to ensure the LeastSquaresMonteCarloOption class
+is working correctly.
+With a single step there is nothing to regress, so a call should give
+exactly the same result as BasicMonteCarloOption with the fixed random
+numbers in ExternalData.   The American put is compared to the price from a
+large binomial lattice (with standard and stratified sampling) and should
+not be worth less than the European put.
+'''
+
+
+class TestLeastSquaresMonteCarloOption(unittest.TestCase):
+
+    def setUp(self):
+
+        # Seed the random numbers so that the tests are stable
+        np.random.seed(2718)
+
+        # Set data to price the option
+        self.__fltStrike = ED.EO_Strike
+        self.__fltVol = ED.EO_Vol
+        self.__fltRiskFreeRate = ED.EO_RiskFreeRate
+        self.__fltTimeToMaturity = ED.EO_TimeToMaturity
+        self.__intNoIterations = 20000
+        self.__intNoSteps = 25
+
+        # Convert the spot into an array
+        self.__npStock = np.asarray(ED.EO_spot, dtype=np.float32)
+
+    def __buildOption(self, boolIsCall, intNoSteps, intNoIter,
+                      strBasis='Polynomial', strSampling='Standard'):
+        return analytics.LeastSquaresMonteCarloOption. \
+            LeastSquaresMonteCarloOption(
+                self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+                self.__fltTimeToMaturity, boolIsCall, intNoSteps, intNoIter,
+                strBasis, strSampling=strSampling)
+
+    def testStr(self):
+
+        strF = 'LeastSquaresMonteCarloOption: [Strike:{strike}; Vol:{vol}; ' \
+               'RFRate:{rfrate}; Time:{time}; IsCall:False; NoSteps:25; ' \
+               'NoIter:100; Basis:Laguerre; NoBasis:3]'
+        strF = strF.format(strike=self.__fltStrike, vol=self.__fltVol,
+                           rfrate=self.__fltRiskFreeRate,
+                           time=self.__fltTimeToMaturity)
+        objOption = self.__buildOption(False, 25, 100, 'Laguerre')
+        self.assertEqual(str(objOption), strF)
+
+        with self.assertRaises(ValueError):
+            self.__buildOption(False, 25, 100, 'Hermite')
+
+    @patch.object(np.random, 'standard_normal', return_value=ED.npNormal)
+    def testSingleStepMatchesFixedRandomNumbers(self, mock_np_random):
+
+        objCall = self.__buildOption(True, 1, len(ED.lstNormal))
+        npCP = objCall.getOptionPrice(self.__npStock)[0]
+        npCD = objCall.getOptionDelta(self.__npStock)[0]
+        npCG = objCall.getOptionGamma(self.__npStock)[0]
+
+        for i in range(0, len(ED.EO_spot)):
+            self.assertLess(abs(npCP[i] - ED.FN_CALL_PRICE[i]),
+                            ED.FN_ACCURACY)
+            self.assertLess(abs(npCD[i] - ED.FN_CALL_DELTA[i]),
+                            ED.FN_ACCURACY)
+            self.assertLess(abs(npCG[i] - ED.FN_CALL_GAMMA[i]),
+                            ED.FN_ACCURACY)
+
+    def testAmericanPutvsLattice(self):
+
+        npStock = np.array([40.0, 45.0, 50.0, 55.0, 60.0])
+        npLattice = analytics.LatticeOption.LatticeOption(
+            self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+            self.__fltTimeToMaturity, False, 500, 'Binomial',
+            True).getOptionPrice(npStock)
+        npEuropean = analytics.EuropeanOption.BlackScholes(
+            self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+            self.__fltTimeToMaturity, False).getOptionPrice(npStock)
+        fltRootN = np.sqrt(self.__intNoIterations)
+
+        # Stratified numbers are drawn for each step, which must be
+        # independent of each other
+        for (strBasis, strSampling) in (('Polynomial', 'Standard'),
+                                        ('Laguerre', 'Standard'),
+                                        ('Polynomial', 'Stratified')):
+            objPut = self.__buildOption(False, self.__intNoSteps,
+                                        self.__intNoIterations, strBasis,
+                                        strSampling)
+            (npPrice, npSTD) = objPut.getOptionPrice(npStock)
+
+            # Exercising on a few dates with an estimated rule gives a
+            # slightly lower price than the lattice
+            npDiff = np.abs(npPrice - npLattice)
+            self.assertTrue(np.all(npDiff < 4 * npSTD / fltRootN + 0.05))
+            self.assertTrue(np.all(npPrice > npEuropean
+                                   - 4 * npSTD / fltRootN))
+
+    def testDeepInTheMoneyExercisedToday(self):
+
+        # The deep in the money put is worth the payoff, with no error
+        objPut = self.__buildOption(False, 10, 1000)
+        (npPrice, npSTD) = objPut.getOptionPrice(np.array([10.0]))
+        self.assertEqual(npPrice[0], 40.0)
+        self.assertEqual(npSTD[0], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import analytics.HestonMonteCarloOption
+import analytics.MonteCarloPathOption
+import analytics.FourierOption
+import analytics.EuropeanOption
+import unittest
+from analytics.HestonMonteCarloOption import np
+
+'''
+These set of tests are used to ensure the HestonMonteCarloOption class is
+working correctly.
+The price and vega of a European call are compared against the Heston
+characteristic function priced using FourierOption, which has no random error.
+With no vol of vol the variance is not random, so the price is compared against
+black & scholes with the average variance.   The tests also check that a seed
+gives exactly the same results and that the chunk size does not change the
+answer by more than the random error.
+'''
+
+
+class TestHestonMonteCarloOption(unittest.TestCase):
+
+    def setUp(self):
+
+        # Seed the random numbers so that the tests are stable
+        np.random.seed(2718)
+
+        # Heston parameters, with a strong negative skew
+        self.__fltStrike = 50
+        self.__fltV0 = 0.04
+        self.__fltKappa = 1.5
+        self.__fltTheta = 0.04
+        self.__fltXi = 0.5
+        self.__fltRho = -0.7
+        self.__fltRiskFreeRate = 0.01
+        self.__fltTimeToMaturity = 1
+        self.__intNoSteps = 25
+        self.__intNoIterations = 40000
+
+        self.__npStock = np.array([40.0, 50.0, 60.0])
+
+    def __buildOption(self, fltV0=None, intChunkSize=10000, intSeed=None):
+        objPayoff = analytics.MonteCarloPathOption.EuropeanPathPayoff(
+            self.__fltStrike, True)
+        return analytics.HestonMonteCarloOption.HestonMonteCarloOption(
+            objPayoff, self.__fltV0 if fltV0 is None else fltV0,
+            self.__fltKappa, self.__fltTheta, self.__fltXi, self.__fltRho,
+            self.__fltRiskFreeRate, self.__fltTimeToMaturity,
+            self.__intNoSteps, self.__intNoIterations, intChunkSize, intSeed)
+
+    def __getFourierPrice(self, fltV0):
+        objCF = analytics.FourierOption.HestonCharacteristicFunction(
+            fltV0, self.__fltKappa, self.__fltTheta, self.__fltXi,
+            self.__fltRho)
+        objFourier = analytics.FourierOption.FourierOption(
+            objCF, self.__fltRiskFreeRate, self.__fltTimeToMaturity)
+        return np.array([objFourier.getOptionPrice([self.__fltStrike],
+                                                   fltStock)[0]
+                         for fltStock in self.__npStock])
+
+    def testStr(self):
+
+        strF = 'HestonMonteCarloOption: [Payoff:EuropeanPathPayoff: ' \
+               '[Strike:50; IsCall:True;]; V0:0.04; Kappa:1.5; ' \
+               'Theta:0.04; Xi:0.5; Rho:-0.7; RFRate:0.01; Time:1; ' \
+               'NoSteps:25; NoIter:40000]'
+        self.assertEqual(str(self.__buildOption()), strF)
+
+    def testPricevsFourier(self):
+
+        (npPrice, npSTD) = self.__buildOption().getOptionPrice(
+            self.__npStock)
+        npFourier = self.__getFourierPrice(self.__fltV0)
+        fltRootN = np.sqrt(self.__intNoIterations)
+
+        for i in range(0, len(self.__npStock)):
+            self.assertLess(abs(npPrice[i] - npFourier[i]),
+                            4 * npSTD[i] / fltRootN + 0.01)
+
+    def testNoVolOfVolvsBlackScholes(self):
+
+        # With xi = 0 the variance follows its mean from V0 to theta, so the
+        # option is black & scholes with the average variance
+        fltV0 = 0.09
+        objOption = analytics.HestonMonteCarloOption.HestonMonteCarloOption(
+            analytics.MonteCarloPathOption.EuropeanPathPayoff(
+                self.__fltStrike, True), fltV0, self.__fltKappa,
+            self.__fltTheta, 0, self.__fltRho, self.__fltRiskFreeRate,
+            self.__fltTimeToMaturity, self.__intNoSteps,
+            self.__intNoIterations, intSeed=1)
+        (npPrice, npSTD) = objOption.getOptionPrice(self.__npStock)
+
+        fltT = self.__fltTimeToMaturity
+        fltAverageV = self.__fltTheta + (fltV0 - self.__fltTheta) \
+            * (1 - np.exp(-self.__fltKappa * fltT)) / (self.__fltKappa * fltT)
+        objBS = analytics.EuropeanOption.BlackScholes(
+            self.__fltStrike, np.sqrt(fltAverageV), self.__fltRiskFreeRate,
+            fltT, True)
+        npBS = objBS.getOptionPrice(self.__npStock)
+        fltRootN = np.sqrt(self.__intNoIterations)
+        self.assertTrue(np.all(np.isfinite(npPrice)))
+        for i in range(0, len(self.__npStock)):
+            self.assertLess(abs(npPrice[i] - npBS[i]),
+                            4 * npSTD[i] / fltRootN)
+
+    def testVegavsFourier(self):
+
+        # Common random numbers keep the error in the vega small
+        (npVega, npSTD) = self.__buildOption().getOptionVega(self.__npStock)
+        npFourier = (self.__getFourierPrice(0.21 ** 2)
+                     - self.__getFourierPrice(0.19 ** 2)) / 2
+        fltRootN = np.sqrt(self.__intNoIterations)
+
+        for i in range(0, len(self.__npStock)):
+            self.assertLess(abs(npVega[i] - npFourier[i]),
+                            4 * npSTD[i] / fltRootN + 2e-3)
+
+    def testSeedAndChunks(self):
+
+        # The same seed gives exactly the same paths
+        npFirst = self.__buildOption(intSeed=42).getOptionPrice(
+            self.__npStock)[0]
+        npSecond = self.__buildOption(intSeed=42).getOptionPrice(
+            self.__npStock)[0]
+        self.assertTrue(np.array_equal(npFirst, npSecond))
+
+        # A different chunk size uses the random numbers in a different
+        # order, but should agree to within the random error
+        (npChunked, npSTD) = self.__buildOption(
+            intChunkSize=3000, intSeed=42).getOptionPrice(self.__npStock)
+        fltRootN = np.sqrt(self.__intNoIterations)
+        self.assertTrue(np.all(np.abs(npChunked - npFirst)
+                               < 6 * npSTD / fltRootN))
+
+        # np.random.seed still controls the paths when no seed is set
+        np.random.seed(7)
+        npFirst = self.__buildOption().getOptionPrice(self.__npStock)[0]
+        np.random.seed(7)
+        npSecond = self.__buildOption().getOptionPrice(self.__npStock)[0]
+        self.assertTrue(np.array_equal(npFirst, npSecond))
+
+    def testDeltaGamma(self):
+
+        # A call delta is between 0 and 1 and increases with the stock
+        # price, while the gamma is positive
+        npDelta = self.__buildOption().getOptionDelta(self.__npStock)[0]
+        npGamma = self.__buildOption().getOptionGamma(self.__npStock)[0]
+        self.assertTrue(np.all(npDelta > 0) and np.all(npDelta < 1))
+        self.assertTrue(np.all(np.diff(npDelta) > 0))
+        self.assertTrue(np.all(npGamma > 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
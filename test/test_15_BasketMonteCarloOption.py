@@ -0,0 +1,129 @@
+import analytics.BasketMonteCarloOption
+import unittest
+import scipy.stats as si
+import test.ExternalData as ED
+from analytics.BasketMonteCarloOption import np
+
+'''
+These set of tests are used to ensure the BasketMonteCarloOption class is
+working correctly.
+A basket with one asset is a European Option, so it is compared against the
+external data in ExternalData.py.   An option to exchange one stock for
+another (a spread option with a strike of 0) has a closed form price
+(Margrabe's formula), which is used to check the correlation, the price and
+the deltas of each asset.
+'''
+
+
+class TestBasketMonteCarloOption(unittest.TestCase):
+
+    def setUp(self):
+
+        # Seed the random numbers so that the tests are stable
+        np.random.seed(2718)
+
+        self.__fltRiskFreeRate = ED.EO_RiskFreeRate
+        self.__fltTimeToMaturity = ED.EO_TimeToMaturity
+        self.__intNoIterations = 50000
+
+        # Exchange option data
+        self.__npVols = np.array([0.2, 0.3])
+        self.__fltRho = 0.5
+        self.__npCorrelation = np.array([[1, self.__fltRho],
+                                         [self.__fltRho, 1]])
+        self.__npStock = np.array([[50.0, 45.0], [50.0, 50.0],
+                                   [40.0, 60.0]])
+
+    def __getMargrabe(self):
+        # Price and deltas of the option to exchange asset 2 for asset 1
+        fltVol = np.sqrt(self.__npVols[0] ** 2 + self.__npVols[1] ** 2
+                         - 2 * self.__fltRho * self.__npVols[0]
+                         * self.__npVols[1])
+        fltVolRootT = fltVol * np.sqrt(self.__fltTimeToMaturity)
+        npD1 = (np.log(self.__npStock[:, 0] / self.__npStock[:, 1])
+                + 0.5 * fltVolRootT ** 2) / fltVolRootT
+        npD2 = npD1 - fltVolRootT
+        npPrice = self.__npStock[:, 0] * si.norm.cdf(npD1) \
+            - self.__npStock[:, 1] * si.norm.cdf(npD2)
+        npDelta = np.column_stack((si.norm.cdf(npD1), -si.norm.cdf(npD2)))
+        return (npPrice, npDelta)
+
+    def __buildExchangeOption(self, intSeed=None):
+        return analytics.BasketMonteCarloOption.BasketMonteCarloOption(
+            [1, -1], 0, self.__npVols, self.__npCorrelation,
+            self.__fltRiskFreeRate, self.__fltTimeToMaturity, True,
+            self.__intNoIterations, intSeed=intSeed)
+
+    def testStr(self):
+
+        strF = 'BasketMonteCarloOption: [Weights:[1.0, -1.0]; Strike:0; ' \
+               'Vols:[0.2, 0.3]; RFRate:{rfrate}; Time:{time}; ' \
+               'IsCall:True; NoIter:{noiter}]'
+        strF = strF.format(rfrate=self.__fltRiskFreeRate,
+                           time=self.__fltTimeToMaturity,
+                           noiter=self.__intNoIterations)
+        self.assertEqual(str(self.__buildExchangeOption()), strF)
+
+    def testInvalidInputs(self):
+
+        with self.assertRaises(ValueError):
+            analytics.BasketMonteCarloOption.BasketMonteCarloOption(
+                [1, 1], 50, [0.2, 0.2], [[1, 2], [2, 1]], 0.01, 1, True, 10)
+        with self.assertRaises(ValueError):
+            analytics.BasketMonteCarloOption.BasketMonteCarloOption(
+                [1, 1], 50, [0.2], [[1, 0], [0, 1]], 0.01, 1, True, 10)
+
+    def testSingleAssetvsExternal(self):
+
+        npStock = np.reshape(np.asarray(ED.EO_spot, dtype=np.float64),
+                             (-1, 1))
+        fltRootN = np.sqrt(self.__intNoIterations)
+        for boolIsCall in (True, False):
+            objOption = analytics.BasketMonteCarloOption. \
+                BasketMonteCarloOption(
+                    [1], ED.EO_Strike, [ED.EO_Vol], [[1]],
+                    self.__fltRiskFreeRate, self.__fltTimeToMaturity,
+                    boolIsCall, self.__intNoIterations)
+            (npPrice, npSTD) = objOption.getOptionPrice(npStock)
+            npExpected = ED.EO_callPrice if boolIsCall else ED.EO_putPrice
+            for i in range(0, len(ED.EO_spot)):
+                self.assertLess(abs(npPrice[i] - npExpected[i]),
+                                4 * npSTD[i] / fltRootN + 1e-3)
+
+    def testExchangevsMargrabe(self):
+
+        (npMargrabe, npMargrabeDelta) = self.__getMargrabe()
+        objOption = self.__buildExchangeOption()
+        (npPrice, npSTD) = objOption.getOptionPrice(self.__npStock)
+        (npDelta, npDeltaSTD) = objOption.getOptionDelta(self.__npStock)
+        fltRootN = np.sqrt(self.__intNoIterations)
+
+        self.assertTrue(np.all(np.abs(npPrice - npMargrabe)
+                               < 4 * npSTD / fltRootN + 1e-3))
+        self.assertEqual(npDelta.shape, (3, 2))
+        # The forward difference adds a small bias to the delta
+        self.assertTrue(np.all(np.abs(npDelta - npMargrabeDelta)
+                               < 4 * npDeltaSTD / fltRootN + 0.01))
+
+    def testSeedAndChunks(self):
+
+        # The same seed gives the same paths, so the bumped prices in the
+        # delta match separate pricings with the bumped stock prices.
+        objOption = self.__buildExchangeOption(intSeed=42)
+        npPrice = objOption.getOptionPrice(self.__npStock)[0]
+        npBumped = self.__npStock.copy()
+        npBumped[:, 1] *= 1.01
+        npPriceBumped = objOption.getOptionPrice(npBumped)[0]
+        npDelta = objOption.getOptionDelta(self.__npStock)[0]
+        self.assertTrue(np.allclose(
+            npDelta[:, 1],
+            (npPriceBumped - npPrice) / (0.01 * self.__npStock[:, 1])))
+
+        # The gamma of each asset is positive
+        npGamma = objOption.getOptionGamma(self.__npStock)[0]
+        self.assertEqual(npGamma.shape, (3, 2))
+        self.assertTrue(np.all(npGamma > 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import analytics.ChebyshevProxy
+import analytics.EuropeanOption
+import numpy as np
+import os
+import tempfile
+import unittest
+import test.ExternalData as ED
+
+'''
+These set of tests are used to ensure the ChebyshevProxy class is working
+correctly.
+A proxy of the BlackScholes price in the stock price, vol and time is built
+and its price and greeks are compared against the external data stored in
+the ExternalData.py file.   The tests also check the error check, saving and
+loading the proxy and that it cannot be used outside of its ranges.   A
+proxy of BasicMonteCarloOption (with fixed random numbers) is checked
+against the random points of the error check.
+'''
+
+
+class TestChebyshevProxy(unittest.TestCase):
+
+    def setUp(self):
+
+        # Seed the random numbers so that the tests are stable
+        np.random.seed(2718)
+
+        # Set data to price the option
+        self.__fltStrike = ED.EO_Strike
+        self.__fltVol = ED.EO_Vol
+        self.__fltRiskFreeRate = ED.EO_RiskFreeRate
+        self.__fltTimeToMaturity = ED.EO_TimeToMaturity
+        self.__npSpot = np.asarray(ED.EO_spot, dtype=np.float64)
+
+        self.__objProxy = analytics.ChebyshevProxy.ChebyshevProxy(
+            (20, 80), 30, (0.1, 0.4), 12, (0.25, 2), 12)
+        self.__objProxy.build(self.__getBlackScholesPrice)
+
+    def __getBlackScholesPrice(self, npStock, fltVol, fltTime):
+        return analytics.EuropeanOption.BlackScholes(
+            self.__fltStrike, fltVol, self.__fltRiskFreeRate, fltTime,
+            True).getOptionPrice(npStock)
+
+    def testStr(self):
+
+        strF = 'ChebyshevProxy: [SpotRange:(20, 80); VolRange:(0.1, 0.4); ' \
+               'TimeRange:(0.25, 2); NoNodes:[30, 12, 12]]'
+        self.assertEqual(str(self.__objProxy), strF)
+
+    def testPriceGreeksvsExternal(self):
+
+        tpArgs = (self.__npSpot, self.__fltVol, self.__fltTimeToMaturity)
+        npPrice = self.__objProxy.getOptionPrice(*tpArgs)
+        npDelta = self.__objProxy.getOptionDelta(*tpArgs)
+        npGamma = self.__objProxy.getOptionGamma(*tpArgs)
+        npVega = self.__objProxy.getOptionVega(*tpArgs)
+        npTheta = self.__objProxy.getOptionTheta(*tpArgs)
+
+        for i in range(0, len(ED.EO_spot)):
+            self.assertLess(abs(npPrice[i] - ED.EO_callPrice[i]), 1e-4)
+            self.assertLess(abs(npDelta[i] - ED.EO_callDelta[i]), 1e-4)
+            self.assertLess(abs(npGamma[i] - ED.EO_callGamma[i]), 1e-4)
+            # Vega is for a 1% move, theta is for 1 day and is negative in
+            # this library
+            self.assertLess(abs(npVega[i] - 0.01 * ED.EO_callVega[i]), 1e-4)
+            self.assertLess(abs(npTheta[i] + ED.EO_callTheta[i] / 365),
+                            1e-4)
+
+    def testErrorCheckAndRanges(self):
+
+        self.assertLess(self.__objProxy.checkError(20), 1e-4)
+
+        with self.assertRaises(ValueError):
+            self.__objProxy.getOptionPrice(np.array([90.0]), 0.2, 1)
+        with self.assertRaises(ValueError):
+            self.__objProxy.getOptionPrice(np.array([50.0]), 0.5, 1)
+
+        # The vol and time must be given (and be numbers) if the proxy was
+        # built with them
+        with self.assertRaises(ValueError):
+            self.__objProxy.getOptionPrice(np.array([50.0]), 0.2)
+        with self.assertRaises(ValueError):
+            self.__objProxy.getOptionDelta(np.array([50.0]), fltTime=1)
+        with self.assertRaises(ValueError):
+            self.__objProxy.getOptionPrice(np.array([np.nan]), 0.2, 1)
+
+        # A spot only proxy has no vega or theta, and nothing can be priced
+        # before it is built
+        objProxy = analytics.ChebyshevProxy.ChebyshevProxy((20, 80), 30)
+        for funcGetter in (objProxy.getOptionPrice, objProxy.getOptionDelta,
+                           objProxy.getOptionGamma):
+            with self.assertRaises(ValueError):
+                funcGetter(self.__npSpot)
+        objProxy.build(lambda npStock: self.__getBlackScholesPrice(
+            npStock, self.__fltVol, self.__fltTimeToMaturity))
+        with self.assertRaises(ValueError):
+            objProxy.getOptionVega(self.__npSpot)
+        with self.assertRaises(ValueError):
+            objProxy.getOptionTheta(self.__npSpot)
+
+    def testSaveAndLoad(self):
+
+        with tempfile.TemporaryDirectory() as strDir:
+            strFile = os.path.join(strDir, 'proxy.npz')
+            self.__objProxy.save(strFile)
+            objLoaded = analytics.ChebyshevProxy.loadChebyshevProxy(strFile)
+
+        self.assertEqual(str(objLoaded), 'ChebyshevProxy: [SpotRange:'
+                         '(20.0, 80.0); VolRange:(0.1, 0.4); TimeRange:'
+                         '(0.25, 2.0); NoNodes:[30, 12, 12]]')
+        tpArgs = (self.__npSpot, self.__fltVol, self.__fltTimeToMaturity)
+        self.assertTrue(np.array_equal(
+            objLoaded.getOptionPrice(*tpArgs),
+            self.__objProxy.getOptionPrice(*tpArgs)))
+        self.assertTrue(np.array_equal(
+            objLoaded.getOptionTheta(*tpArgs),
+            self.__objProxy.getOptionTheta(*tpArgs)))
+
+        # There is no pricer after loading, so nothing to check against
+        with self.assertRaises(ValueError):
+            objLoaded.checkError()
+
+    def testMonteCarloProxy(self):
+
+        def getMonteCarloPrice(npStock):
+            # The same random numbers at every node
+            np.random.seed(1)
+            return analytics.EuropeanOption.BasicMonteCarloOption(
+                self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+                self.__fltTimeToMaturity, True, 20000).getOptionPrice(
+                    npStock)[0]
+
+        objProxy = analytics.ChebyshevProxy.ChebyshevProxy((20, 80), 30)
+        objProxy.build(getMonteCarloPrice)
+        self.assertLess(objProxy.checkError(10), 1e-2)
+
+
+if __name__ == '__main__':
+    unittest.main()
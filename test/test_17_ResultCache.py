@@ -0,0 +1,145 @@
+import analytics.ResultCache
+import analytics.EuropeanOption
+import numpy as np
+import unittest
+import test.ExternalData as ED
+
+'''
+These set of tests are used to ensure the ResultCache and CachedOption
+classes are working correctly.
+A cached BlackScholes option must give the same results as the option, count
+its hits and misses, keep the results read only and drop the least recently
+used results when it is full.   A BasicMonteCarloOption is only cached when
+it has a seed, and the seed is part of the key.
+'''
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+
+        # Seed the random numbers so that the tests are stable
+        np.random.seed(2718)
+
+        # Set data to price the option
+        self.__fltStrike = ED.EO_Strike
+        self.__fltVol = ED.EO_Vol
+        self.__fltRiskFreeRate = ED.EO_RiskFreeRate
+        self.__fltTimeToMaturity = ED.EO_TimeToMaturity
+        self.__npStock = np.linspace(20, 80, 61)
+
+        self.__objBS = analytics.EuropeanOption.BlackScholes(
+            self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+            self.__fltTimeToMaturity, True)
+
+    def __buildMonteCarlo(self, intSeed):
+        return analytics.EuropeanOption.BasicMonteCarloOption(
+            self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+            self.__fltTimeToMaturity, True, 2000, intSeed=intSeed)
+
+    def testStr(self):
+
+        objCache = analytics.ResultCache.ResultCache(10, 1000)
+        self.assertEqual(str(objCache),
+                         'ResultCache: [MaxEntries:10; MaxBytes:1000]')
+        with self.assertRaises(ValueError):
+            analytics.ResultCache.ResultCache(0)
+
+    def testHitsAndMisses(self):
+
+        objCache = analytics.ResultCache.ResultCache()
+        objOption = analytics.ResultCache.CachedOption(self.__objBS, objCache)
+
+        npPrice = objOption.getOptionPrice(self.__npStock)
+        self.assertTrue(np.array_equal(
+            npPrice, self.__objBS.getOptionPrice(self.__npStock)))
+        self.assertIs(objOption.getOptionPrice(self.__npStock.copy()),
+                      npPrice)
+        objOption.getOptionDelta(self.__npStock)
+        objOption.getOptionPrice(self.__npStock[:-1])
+        objOption.getOptionPrice(self.__npStock.astype(np.float32))
+
+        # A different option with the same stock prices is a new result
+        objPut = analytics.ResultCache.CachedOption(
+            analytics.EuropeanOption.BlackScholes(
+                self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+                self.__fltTimeToMaturity, False), objCache)
+        objPut.getOptionPrice(self.__npStock)
+
+        dctStatistics = objCache.getStatistics()
+        self.assertEqual(dctStatistics['Hits'], 1)
+        self.assertEqual(dctStatistics['Misses'], 5)
+        self.assertEqual(dctStatistics['Entries'], 5)
+
+        objCache.clear()
+        self.assertEqual(objCache.getStatistics(),
+                         {'Hits': 0, 'Misses': 0, 'Entries': 0, 'Bytes': 0})
+
+    def testResultsAreReadOnly(self):
+
+        objCache = analytics.ResultCache.ResultCache()
+        objOption = analytics.ResultCache.CachedOption(self.__objBS, objCache)
+        npPrice = objOption.getOptionPrice(self.__npStock)
+        with self.assertRaises(ValueError):
+            npPrice[0] = 0
+
+        (npPrice, npSTD) = analytics.ResultCache.CachedOption(
+            self.__buildMonteCarlo(1), objCache).getOptionPrice(
+                self.__npStock)
+        with self.assertRaises(ValueError):
+            npSTD[0] = 0
+
+    def testEviction(self):
+
+        # Each result is 61 float64s = 488 bytes
+        objCache = analytics.ResultCache.ResultCache(3)
+        objOption = analytics.ResultCache.CachedOption(self.__objBS, objCache)
+        for strFunction in ('Price', 'Delta', 'Gamma'):
+            getattr(objOption, 'getOption' + strFunction)(self.__npStock)
+        objOption.getOptionPrice(self.__npStock)
+        objOption.getOptionVega(self.__npStock)
+        self.assertEqual(objCache.getStatistics()['Entries'], 3)
+
+        # The delta was least recently used so has gone, the price has not
+        objOption.getOptionPrice(self.__npStock)
+        self.assertEqual(objCache.getStatistics()['Hits'], 2)
+        objOption.getOptionDelta(self.__npStock)
+        self.assertEqual(objCache.getStatistics()['Misses'], 5)
+
+        # The byte limit holds two results
+        objCache = analytics.ResultCache.ResultCache(100, 1000)
+        objOption = analytics.ResultCache.CachedOption(self.__objBS, objCache)
+        for strFunction in ('Price', 'Delta', 'Gamma'):
+            getattr(objOption, 'getOption' + strFunction)(self.__npStock)
+        self.assertEqual(objCache.getStatistics()['Entries'], 2)
+        self.assertEqual(objCache.getStatistics()['Bytes'], 976)
+
+    def testMonteCarloSeed(self):
+
+        objCache = analytics.ResultCache.ResultCache()
+
+        # Without a seed every call is a new set of paths, so no caching
+        objOption = analytics.ResultCache.CachedOption(
+            self.__buildMonteCarlo(None), objCache)
+        npPrice = objOption.getOptionPrice(self.__npStock)[0]
+        self.assertFalse(np.array_equal(
+            objOption.getOptionPrice(self.__npStock)[0], npPrice))
+        self.assertEqual(objCache.getStatistics()['Misses'], 0)
+
+        # With a seed the cached result is the same as recalculating it,
+        # and a different seed is a different result
+        objMC = self.__buildMonteCarlo(1)
+        objOption = analytics.ResultCache.CachedOption(objMC, objCache)
+        (npPrice, npSTD) = objOption.getOptionPrice(self.__npStock)
+        self.assertTrue(np.array_equal(
+            objMC.getOptionPrice(self.__npStock)[0], npPrice))
+        self.assertIs(objOption.getOptionPrice(self.__npStock)[0], npPrice)
+        analytics.ResultCache.CachedOption(
+            self.__buildMonteCarlo(2), objCache).getOptionPrice(
+                self.__npStock)
+        self.assertEqual(objCache.getStatistics()['Hits'], 1)
+        self.assertEqual(objCache.getStatistics()['Misses'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,240 @@
+import analytics.MonteCarloStore
+import analytics.EuropeanOption
+import numpy as np
+import os
+import tempfile
+import unittest
+import test.ExternalData as ED
+from unittest.mock import patch
+
+'''
+These set of tests are used to ensure the MonteCarloStore class is working
+correctly.
+A seeded BasicMonteCarloOption is run through the store and compared against
+the external data, then read back (from a new store on the same directory)
+without running the Monte Carlo.   A run that stops part of the way through
+is resumed and must give exactly the same answer as a run that was not
+stopped.   The tests also check that the key matches the options being
+equal, the engine version, the size quota, stratified chunks and that an
+option without a seed cannot be stored.
+'''
+
+
+class TestMonteCarloStore(unittest.TestCase):
+
+    def setUp(self):
+
+        # Seed the random numbers so that the tests are stable
+        np.random.seed(2718)
+
+        # Set data to price the option
+        self.__fltStrike = ED.EO_Strike
+        self.__fltVol = ED.EO_Vol
+        self.__fltRiskFreeRate = ED.EO_RiskFreeRate
+        self.__fltTimeToMaturity = ED.EO_TimeToMaturity
+        self.__intNoIterations = 50000
+        self.__npStock = np.asarray(ED.EO_spot, dtype=np.float64)
+
+        self.__objDirectory = tempfile.TemporaryDirectory()
+        self.__strDirectory = self.__objDirectory.name
+
+    def tearDown(self):
+        self.__objDirectory.cleanup()
+
+    def __buildOption(self, intSeed=1, boolIsCall=True):
+        return analytics.EuropeanOption.BasicMonteCarloOption(
+            self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+            self.__fltTimeToMaturity, boolIsCall, self.__intNoIterations,
+            intSeed=intSeed)
+
+    def testStr(self):
+
+        objStore = analytics.MonteCarloStore.MonteCarloStore(
+            self.__strDirectory, 1000, '2')
+        strF = 'MonteCarloStore: [Directory:{directory}; MaxBytes:1000; ' \
+               'EngineVersion:2]'
+        self.assertEqual(str(objStore),
+                         strF.format(directory=self.__strDirectory))
+
+    def testPricevsExternalAndReload(self):
+
+        objStore = analytics.MonteCarloStore.MonteCarloStore(
+            self.__strDirectory)
+        (npPrice, npSTD) = objStore.getOptionValue(
+            self.__buildOption(), 'getOptionPrice', self.__npStock, 20000)
+        fltRootN = np.sqrt(self.__intNoIterations)
+        for i in range(0, len(ED.EO_spot)):
+            self.assertLess(abs(npPrice[i] - ED.EO_callPrice[i]),
+                            4 * npSTD[i] / fltRootN + 1e-3)
+
+        # A new store on the same directory returns the stored, read only,
+        # result without running the Monte Carlo
+        objStore = analytics.MonteCarloStore.MonteCarloStore(
+            self.__strDirectory)
+        with patch.object(analytics.EuropeanOption.BasicMonteCarloOption,
+                          'getOptionPrice') as objMock:
+            (npStored, npSTDStored) = objStore.getOptionValue(
+                self.__buildOption(), 'getOptionPrice', self.__npStock,
+                20000)
+            objMock.assert_not_called()
+        self.assertTrue(np.array_equal(npStored, npPrice))
+        self.assertTrue(np.array_equal(npSTDStored, npSTD))
+        with self.assertRaises(ValueError):
+            npStored[0] = 0
+        self.assertEqual(objStore.getStatistics()['Hits'], 1)
+
+        # A different getter, seed or engine version is a new run
+        objStore.getOptionValue(self.__buildOption(), 'getOptionDelta',
+                                self.__npStock, 20000)
+        objStore.getOptionValue(self.__buildOption(2), 'getOptionPrice',
+                                self.__npStock, 20000)
+        self.assertEqual(objStore.getStatistics()['Misses'], 2)
+        objStore = analytics.MonteCarloStore.MonteCarloStore(
+            self.__strDirectory, strEngineVersion='2')
+        objStore.getOptionValue(self.__buildOption(), 'getOptionPrice',
+                                self.__npStock, 20000)
+        self.assertEqual(objStore.getStatistics(),
+                         {'Hits': 0, 'Misses': 1, 'Entries': 4,
+                          'Complete': 4, 'Bytes': objStore.getBytes()})
+
+    def testResume(self):
+
+        objStore = analytics.MonteCarloStore.MonteCarloStore(
+            os.path.join(self.__strDirectory, 'full'))
+        tpFull = objStore.getOptionValue(
+            self.__buildOption(), 'getOptionPrice', self.__npStock, 10000)
+
+        # Stop the run after 2 of the 5 chunks
+        funcGetter = analytics.EuropeanOption.BasicMonteCarloOption. \
+            getOptionPrice
+        lstCalls = []
+        lstStopAfter = [2]
+
+        def getFailingPrice(objOption, npStock):
+            lstCalls.append(1)
+            if len(lstCalls) > lstStopAfter[0]:
+                raise RuntimeError('Worker stopped')
+            return funcGetter(objOption, npStock)
+
+        strDirectory = os.path.join(self.__strDirectory, 'resumed')
+        objStore = analytics.MonteCarloStore.MonteCarloStore(strDirectory)
+        with patch.object(analytics.EuropeanOption.BasicMonteCarloOption,
+                          'getOptionPrice', getFailingPrice):
+            with self.assertRaises(RuntimeError):
+                objStore.getOptionValue(self.__buildOption(),
+                                        'getOptionPrice', self.__npStock,
+                                        10000)
+        self.assertEqual(objStore.getStatistics()['Complete'], 0)
+
+        # A new store only runs the 3 chunks that are left
+        lstCalls.clear()
+        lstStopAfter[0] = 5
+        objStore = analytics.MonteCarloStore.MonteCarloStore(strDirectory)
+        with patch.object(analytics.EuropeanOption.BasicMonteCarloOption,
+                          'getOptionPrice', getFailingPrice):
+            tpResumed = objStore.getOptionValue(
+                self.__buildOption(), 'getOptionPrice', self.__npStock,
+                10000)
+        self.assertEqual(len(lstCalls), 3)
+        self.assertTrue(np.array_equal(tpResumed[0], tpFull[0]))
+        self.assertTrue(np.array_equal(tpResumed[1], tpFull[1]))
+
+        # Only the result file and the index are left
+        self.assertEqual(len(os.listdir(strDirectory)), 2)
+
+    def testStratifiedChunks(self):
+
+        # With sampling other than Standard each chunk is a replicate, the
+        # error coming from the spread of the chunk means
+        objStore = analytics.MonteCarloStore.MonteCarloStore(
+            self.__strDirectory)
+        objOption = analytics.EuropeanOption.BasicMonteCarloOption(
+            self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+            self.__fltTimeToMaturity, True, self.__intNoIterations,
+            'Stratified', intSeed=1)
+        (npPrice, npSTD) = objStore.getOptionValue(
+            objOption, 'getOptionPrice', self.__npStock, 10000)
+        fltRootN = np.sqrt(self.__intNoIterations)
+        for i in range(0, len(ED.EO_spot)):
+            self.assertLess(abs(npPrice[i] - ED.EO_callPrice[i]),
+                            4 * npSTD[i] / fltRootN + 1e-3)
+
+    def testKeyMatchesEquality(self):
+
+        # Large strike arrays that only differ in one element are different
+        # runs (repr would shorten them to the same string)
+        objStore = analytics.MonteCarloStore.MonteCarloStore(
+            self.__strDirectory)
+        npStock = np.linspace(20, 80, 2000)
+        npStrike = np.full((2000, 1), self.__fltStrike)
+        npOtherStrike = npStrike.copy()
+        npOtherStrike[1000] += 5
+        lstResults = []
+        for npK in (npStrike, npOtherStrike):
+            objOption = analytics.EuropeanOption.BasicMonteCarloOption(
+                npK, self.__fltVol, self.__fltRiskFreeRate,
+                self.__fltTimeToMaturity, True, 1000, intSeed=1)
+            lstResults.append(objStore.getOptionValue(
+                objOption, 'getOptionPrice', npStock, 500))
+        self.assertEqual(objStore.getStatistics()['Misses'], 2)
+        self.assertNotEqual(lstResults[0][0][1000], lstResults[1][0][1000])
+
+        # Options that are equal are the same run, eg with np.float64
+        # parameters rather than floats
+        objOption = analytics.EuropeanOption.BasicMonteCarloOption(
+            np.float64(self.__fltStrike), np.float64(self.__fltVol),
+            self.__fltRiskFreeRate, self.__fltTimeToMaturity, True,
+            self.__intNoIterations, intSeed=1)
+        self.assertEqual(objOption, self.__buildOption())
+        objStore.getOptionValue(self.__buildOption(), 'getOptionPrice',
+                                self.__npStock)
+        objStore.getOptionValue(objOption, 'getOptionPrice', self.__npStock)
+        self.assertEqual(objStore.getStatistics()['Hits'], 1)
+
+    def testQuotaAndInvalid(self):
+
+        # Each result is 48 bytes of data plus a 128 byte .npy header
+        objStore = analytics.MonteCarloStore.MonteCarloStore(
+            self.__strDirectory, 400)
+        for intSeed in (1, 2, 3):
+            objStore.getOptionValue(self.__buildOption(intSeed),
+                                    'getOptionPrice', self.__npStock)
+        self.assertEqual(objStore.getStatistics()['Entries'], 2)
+        self.assertLessEqual(objStore.getBytes(), 400)
+        self.assertEqual(len(os.listdir(self.__strDirectory)), 3)
+
+        # The first seed was dropped, the last two are still there
+        objStore.getOptionValue(self.__buildOption(3), 'getOptionPrice',
+                                self.__npStock)
+        objStore.getOptionValue(self.__buildOption(1), 'getOptionPrice',
+                                self.__npStock)
+        self.assertEqual(objStore.getStatistics()['Hits'], 1)
+
+        objStore.clear()
+        self.assertEqual(os.listdir(self.__strDirectory), ['index.json'])
+
+        with self.assertRaises(ValueError):
+            objStore.getOptionValue(self.__buildOption(None),
+                                    'getOptionPrice', self.__npStock)
+        with self.assertRaises(ValueError):
+            objStore.getOptionValue(analytics.EuropeanOption.BlackScholes(
+                50, 0.2, 0.01, 1, True), 'getOptionPrice', self.__npStock)
+
+        # A chunk size of 0 or an option with no paths would never finish,
+        # and are rejected before anything is added to the index
+        for intChunkSize in (0, -1, 0.5):
+            with self.assertRaises(ValueError):
+                objStore.getOptionValue(self.__buildOption(),
+                                        'getOptionPrice', self.__npStock,
+                                        intChunkSize)
+        with self.assertRaises(ValueError):
+            objStore.getOptionValue(
+                analytics.EuropeanOption.BasicMonteCarloOption(
+                    self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+                    self.__fltTimeToMaturity, True, 0, intSeed=1),
+                'getOptionPrice', self.__npStock)
+        self.assertEqual(objStore.getStatistics()['Entries'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
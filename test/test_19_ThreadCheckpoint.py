@@ -0,0 +1,205 @@
+import analytics.EuropeanOptionThread
+import analytics.MonteCarloSampling
+import numpy as np
+import os
+import tempfile
+import unittest
+import test.ExternalData as ED
+from unittest.mock import patch
+
+'''
+These set of tests are used to ensure the checkpointing of the
+BasicMonteCarloOptionThreaded class and PackageForThreading is working
+correctly.
+A package is stopped part of the way through its calculation (by making the
+random number generator fail) and then run again as a new package, which
+must carry on from the last checkpoint and give exactly the same results as
+a package that did not stop.   The chunked results are also compared against
+the external data in ExternalData.py, for each of the sampling methods.
+'''
+
+
+class TestThreadCheckpoint(unittest.TestCase):
+
+    def setUp(self):
+
+        # Set data to price the option
+        self.__fltStrike = ED.EO_Strike
+        self.__fltVol = ED.EO_Vol
+        self.__fltRiskFreeRate = ED.EO_RiskFreeRate
+        self.__fltTimeToMaturity = ED.EO_TimeToMaturity
+        self.__intNoIterations = 50000
+        self.__npStock = np.asarray(ED.EO_spot, dtype=np.float64)
+
+        self.__objDirectory = tempfile.TemporaryDirectory()
+        self.__strDirectory = self.__objDirectory.name
+
+    def tearDown(self):
+        self.__objDirectory.cleanup()
+
+    def __buildPackage(self, intSeed=1, intCheckpointPaths=None,
+                       fltCheckpointSeconds=None, boolIsNamed=True,
+                       strSampling='Standard'):
+        objPackage = analytics.EuropeanOptionThread.PackageForThreading(
+            1, 'Straddle')
+        for boolIsCall in (True, False):
+            objPackage.addOption(analytics.EuropeanOptionThread.
+                                 BasicMonteCarloOptionThreaded(
+                                     ('Price', 'Delta', 'Vega'),
+                                     self.__fltStrike, self.__fltVol,
+                                     self.__fltRiskFreeRate,
+                                     self.__fltTimeToMaturity, boolIsCall,
+                                     self.__intNoIterations, strSampling,
+                                     intSeed=intSeed, intChunkSize=10000,
+                                     name=None if not boolIsNamed
+                                     else 'Call' if boolIsCall else 'Put'))
+        if intCheckpointPaths is not None or fltCheckpointSeconds is not None:
+            objPackage.setCheckpointDirectory(self.__strDirectory,
+                                              intCheckpointPaths,
+                                              fltCheckpointSeconds)
+        return objPackage
+
+    def __runPackage(self, objPackage, intStopAfter=None):
+        # Run the package, making the random number generator fail after
+        # intStopAfter chunks, and return the number of chunks run
+        funcGetNormals = analytics.MonteCarloSampling.MonteCarloSampler. \
+            getNormals
+        lstCalls = []
+
+        def getFailingNormals(objSampler, intNoIter):
+            if intStopAfter is not None and len(lstCalls) >= intStopAfter:
+                raise RuntimeError('Worker stopped')
+            lstCalls.append(intNoIter)
+            return funcGetNormals(objSampler, intNoIter)
+
+        with patch.object(analytics.MonteCarloSampling.MonteCarloSampler,
+                          'getNormals', getFailingNormals):
+            if intStopAfter is None:
+                tpResults = objPackage.calculateSyncronousResults(
+                    self.__npStock)
+                return (len(lstCalls),) + tpResults
+            with self.assertRaises(RuntimeError):
+                objPackage.calculateSyncronousResults(self.__npStock)
+        return (len(lstCalls), None, None)
+
+    def testChunksvsExternal(self):
+
+        objOption = analytics.EuropeanOptionThread. \
+            BasicMonteCarloOptionThreaded(
+                ('Price', 'Delta'), self.__fltStrike, self.__fltVol,
+                self.__fltRiskFreeRate, self.__fltTimeToMaturity, True,
+                self.__intNoIterations, intSeed=3, intChunkSize=7000)
+        (pdResults, pdSTDResults) = objOption.calculateOption(self.__npStock)
+        fltRootN = np.sqrt(self.__intNoIterations)
+        for i in range(0, len(ED.EO_spot)):
+            self.assertLess(abs(pdResults['Price'][i]
+                                - ED.EO_callPrice[i]),
+                            4 * pdSTDResults['PriceSTD'][i] / fltRootN
+                            + 1e-3)
+            self.assertLess(abs(pdResults['Delta'][i]
+                                - ED.EO_callDelta[i]),
+                            4 * pdSTDResults['DeltaSTD'][i] / fltRootN
+                            + 1e-3)
+
+        # The same seed gives the same results every time
+        self.assertTrue(np.array_equal(
+            objOption.calculateOption(self.__npStock)[0]['Price'],
+            pdResults['Price']))
+
+    def testResumeMatchesUninterrupted(self):
+
+        (intNoChunks, pdFull, pdFullSTD) = self.__runPackage(
+            self.__buildPackage())
+        self.assertEqual(intNoChunks, 10)
+
+        # Stop the call after 3 of its 5 chunks, with a checkpoint every
+        # 20000 paths, ie the last checkpoint is after 2 chunks
+        self.__runPackage(self.__buildPackage(intCheckpointPaths=20000), 3)
+        self.assertEqual(os.listdir(self.__strDirectory), ['1_0.npz'])
+
+        # A new package only runs the last 3 chunks of the call and all of
+        # the put, then removes the checkpoint
+        (intNoChunks, pdResumed, pdResumedSTD) = self.__runPackage(
+            self.__buildPackage(intCheckpointPaths=20000))
+        self.assertEqual(intNoChunks, 8)
+        self.assertEqual(os.listdir(self.__strDirectory), [])
+        self.assertTrue(pdResumed.equals(pdFull))
+        self.assertTrue(pdResumedSTD.equals(pdFullSTD))
+
+    def testCheckpointBySeconds(self):
+
+        # With a checkpoint after every chunk, stopping in the 2nd chunk of
+        # the put leaves the call finished and 1 chunk of the put saved
+        self.__runPackage(self.__buildPackage(fltCheckpointSeconds=0), 6)
+        self.assertEqual(os.listdir(self.__strDirectory), ['1_1.npz'])
+
+        # The checkpoint is only used by the same option on the same stock
+        # prices, so a different seed runs every chunk
+        (intNoChunks, pdSeed2, pdSeed2STD) = self.__runPackage(
+            self.__buildPackage(2, fltCheckpointSeconds=0))
+        self.assertEqual(intNoChunks, 10)
+        (intNoChunks, pdFull, pdFullSTD) = self.__runPackage(
+            self.__buildPackage(2))
+        self.assertTrue(pdSeed2.equals(pdFull))
+
+    def testResumeWithoutNames(self):
+
+        # Without a name each thread is called Thread-N, which changes with
+        # every thread made, but the checkpoint is still found
+        self.__runPackage(self.__buildPackage(intCheckpointPaths=20000,
+                                              boolIsNamed=False), 3)
+        self.assertEqual(os.listdir(self.__strDirectory), ['1_0.npz'])
+        (intNoChunks, pdResumed, pdResumedSTD) = self.__runPackage(
+            self.__buildPackage(intCheckpointPaths=20000, boolIsNamed=False))
+        self.assertEqual(intNoChunks, 8)
+        self.assertEqual(os.listdir(self.__strDirectory), [])
+
+    def testCheckpointNeedsSeed(self):
+
+        with self.assertRaises(ValueError):
+            self.__buildPackage(None, intCheckpointPaths=10000)
+
+    def testInvalidChunkSize(self):
+
+        for intChunkSize in (0, -1000, 0.5):
+            with self.assertRaises(ValueError):
+                analytics.EuropeanOptionThread.BasicMonteCarloOptionThreaded(
+                    ('Price',), self.__fltStrike, self.__fltVol,
+                    self.__fltRiskFreeRate, self.__fltTimeToMaturity, True,
+                    self.__intNoIterations, intSeed=1,
+                    intChunkSize=intChunkSize)
+
+    def testChunkedSampling(self):
+
+        # With the other sampling methods the chunks are replicates, so the
+        # chunked results are still close to the external data and a
+        # resumed run still matches one that did not stop
+        fltRootN = np.sqrt(self.__intNoIterations)
+        for strSampling in ('Stratified', 'MomentMatched', 'Sobol'):
+            objOption = analytics.EuropeanOptionThread. \
+                BasicMonteCarloOptionThreaded(
+                    ('Price',), self.__fltStrike, self.__fltVol,
+                    self.__fltRiskFreeRate, self.__fltTimeToMaturity, True,
+                    self.__intNoIterations, strSampling, intSeed=3,
+                    intChunkSize=10000)
+            (objResults, objSTDResults) = objOption.calculateOption(
+                self.__npStock)
+            for i in range(0, len(ED.EO_spot)):
+                self.assertLess(abs(objResults['Price'][i]
+                                    - ED.EO_callPrice[i]),
+                                4 * objSTDResults['PriceSTD'][i] / fltRootN
+                                + 1e-3)
+
+        self.__runPackage(self.__buildPackage(
+            intCheckpointPaths=20000, strSampling='Stratified'), 3)
+        (intNoChunks, pdResumed, pdResumedSTD) = self.__runPackage(
+            self.__buildPackage(intCheckpointPaths=20000,
+                                strSampling='Stratified'))
+        self.assertEqual(intNoChunks, 8)
+        (intNoChunks, pdFull, pdFullSTD) = self.__runPackage(
+            self.__buildPackage(strSampling='Stratified'))
+        self.assertTrue(pdResumed.equals(pdFull))
+
+
+if __name__ == '__main__':
+    unittest.main()
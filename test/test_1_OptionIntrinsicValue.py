@@ -6,6 +6,8 @@ import unittest
 These set of tests are used to ensure the OptionIntrinsicValue class
 is working correctly.
 It tests the value and the __str__ function for both calls and puts.
+MultiStrikeIntrinsicValue is compared against OptionIntrinsicValue for each
+strike, in one go, in chunks and as a weighted position.
 '''
 
 
@@ -86,5 +88,79 @@ class TestIntrinsicOption(unittest.TestCase):
         self.assertEqual(str(objIntrinsicPut), strF)
 
 
+class TestMultiStrikeIntrinsicValue(unittest.TestCase):
+
+    def setUp(self):
+
+        # Seed the random numbers so that the tests are stable
+        np.random.seed(1618)
+
+        # Strikes (with a repeat) and a mix of calls and puts, and stock
+        # prices that include some of the strikes exactly
+        self.__npStrike = np.array([60, 40, 50, 45, 50, 55, 70, 35.5])
+        self.__npIsCall = np.array([True, False, True, True, False, False,
+                                    True, False])
+        self.__npStock = np.concatenate((np.linspace(20, 80, 97),
+                                         self.__npStrike))
+        self.__objMulti = analytics.OptionIntrinsicValue. \
+            MultiStrikeIntrinsicValue(self.__npStrike, self.__npIsCall)
+
+    def __getExpected(self):
+        npExpected = np.empty((len(self.__npStock), len(self.__npStrike)))
+        for j in range(0, len(self.__npStrike)):
+            npExpected[:, j] = analytics.OptionIntrinsicValue. \
+                OptionIntrinsicValue(self.__npStrike[j], self.__npIsCall[j]). \
+                getOptionPrice(self.__npStock)
+        return npExpected
+
+    def testStr(self):
+
+        strF = 'MultiStrikeIntrinsicValue: [Strikes:8; Calls:4;]'
+        self.assertEqual(str(self.__objMulti), strF)
+        with self.assertRaises(ValueError):
+            analytics.OptionIntrinsicValue.MultiStrikeIntrinsicValue(
+                self.__npStrike, [True, False])
+
+    def testMatrixAndChunks(self):
+
+        npExpected = self.__getExpected()
+        npPrice = self.__objMulti.getOptionPrice(self.__npStock)
+        self.assertEqual(npPrice.shape, npExpected.shape)
+        self.assertTrue(np.array_equal(npPrice, npExpected))
+
+        # 3 rows of 8 strikes in each chunk
+        lstStart = []
+        for (intStart, npChunk) in self.__objMulti.getOptionPriceChunks(
+                self.__npStock, 3 * 8 * 8):
+            self.assertLessEqual(len(npChunk), 3)
+            self.assertTrue(np.array_equal(
+                npChunk, npExpected[intStart:intStart + len(npChunk)]))
+            lstStart.append(intStart)
+        self.assertEqual(lstStart, list(range(0, len(self.__npStock), 3)))
+        with self.assertRaises(ValueError):
+            next(self.__objMulti.getOptionPriceChunks(self.__npStock, 8))
+
+        # A single flag for every strike
+        objCalls = analytics.OptionIntrinsicValue.MultiStrikeIntrinsicValue(
+            self.__npStrike, True)
+        self.assertTrue(np.array_equal(
+            objCalls.getOptionPrice(self.__npStock),
+            np.maximum(self.__npStock[:, np.newaxis] - self.__npStrike, 0)))
+
+    def testPositionValue(self):
+
+        npExpected = self.__getExpected()
+        self.assertTrue(np.allclose(
+            self.__objMulti.getPositionValue(self.__npStock),
+            npExpected.sum(axis=1), rtol=0, atol=1e-10))
+
+        npPosition = np.random.uniform(-2, 2, len(self.__npStrike))
+        self.assertTrue(np.allclose(
+            self.__objMulti.getPositionValue(self.__npStock, npPosition),
+            npExpected @ npPosition, rtol=0, atol=1e-10))
+        with self.assertRaises(ValueError):
+            self.__objMulti.getPositionValue(self.__npStock, [1.0])
+
+
 if __name__ == '__main__':
     unittest.main()
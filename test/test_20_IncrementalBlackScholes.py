@@ -0,0 +1,176 @@
+import analytics.IncrementalBlackScholes
+import analytics.EuropeanOption
+import numpy as np
+import unittest
+import test.ExternalData as ED
+
+'''
+These set of tests are used to ensure the IncrementalBlackScholes class is
+working correctly.
+The prices, deltas and gammas after a set of updates are compared against
+BlackScholes on the new stock prices, within the tolerance for the prices
+that were estimated from the Taylor expansion and exactly for the ones that
+were recalculated.   The tests also check the counts, that only the indices
+given are changed and that the returned arrays are read only.   A big move
+from the stock price where speed is 0 must still be recalculated, and a
+move to the edge of the radius must give the price within the tolerance and
+the delta within its bound.
+'''
+
+
+class TestIncrementalBlackScholes(unittest.TestCase):
+
+    def setUp(self):
+
+        # Seed the random numbers so that the tests are stable
+        np.random.seed(2718)
+
+        # Set data to price the option
+        self.__fltStrike = ED.EO_Strike
+        self.__fltVol = ED.EO_Vol
+        self.__fltRiskFreeRate = ED.EO_RiskFreeRate
+        self.__fltTimeToMaturity = ED.EO_TimeToMaturity
+        self.__npStock = np.linspace(25, 75, 1001)
+
+    def __buildOptions(self, boolIsCall, fltTolerance):
+        objIncremental = analytics.IncrementalBlackScholes. \
+            IncrementalBlackScholes(
+                self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+                self.__fltTimeToMaturity, boolIsCall, fltTolerance)
+        objBS = analytics.EuropeanOption.BlackScholes(
+            self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+            self.__fltTimeToMaturity, boolIsCall)
+        return (objIncremental, objBS)
+
+    def testStr(self):
+
+        (objIncremental, objBS) = self.__buildOptions(True, 1e-6)
+        strF = 'IncrementalBlackScholes: [EuropeanOption: [Strike:50; ' \
+               'Vol:0.2; RFRate:0.01; Time:1; IsCall:True;]; ' \
+               'Tolerance:1e-06]'
+        self.assertEqual(str(objIncremental), strF)
+        with self.assertRaises(ValueError):
+            objIncremental.updateStock([0], [50.0])
+
+    def testUpdatesvsBlackScholes(self):
+
+        for boolIsCall in (True, False):
+            (objIncremental, objBS) = self.__buildOptions(boolIsCall, 1e-6)
+            objIncremental.setStock(self.__npStock)
+            npStock = self.__npStock.copy()
+
+            # Many ticks, each moving a few stock prices by a small amount
+            # and now and again by a big one
+            for intTick in range(0, 200):
+                npIndex = np.random.choice(len(npStock), 5, replace=False)
+                fltSize = 1.0 if intTick % 20 == 0 else 0.01
+                npStock[npIndex] += np.random.uniform(-fltSize, fltSize, 5)
+                (npPrice, npDelta, npGamma) = objIncremental.updateStock(
+                    npIndex, npStock[npIndex])
+                self.assertTrue(np.allclose(
+                    npPrice, objBS.getOptionPrice(npStock[npIndex]),
+                    rtol=0, atol=2e-6))
+
+            self.assertTrue(np.array_equal(objIncremental.getStock(),
+                                           npStock))
+            self.assertTrue(np.allclose(objIncremental.getOptionPrice(),
+                                        objBS.getOptionPrice(npStock),
+                                        rtol=0, atol=2e-6))
+            self.assertTrue(np.allclose(objIncremental.getOptionDelta(),
+                                        objBS.getOptionDelta(npStock),
+                                        rtol=0, atol=1e-4))
+            self.assertTrue(np.allclose(objIncremental.getOptionGamma(),
+                                        objBS.getOptionGamma(npStock),
+                                        rtol=0, atol=1e-4))
+
+            # Most of the updates were estimated
+            dctStatistics = objIncremental.getStatistics()
+            self.assertEqual(dctStatistics['SetStock'], 1)
+            self.assertEqual(dctStatistics['Full'] + dctStatistics['Taylor'],
+                             len(npStock) + 1000)
+            self.assertGreater(dctStatistics['Taylor'], 800)
+
+    def testToleranceAndReadOnly(self):
+
+        # A tolerance of 0 always recalculates, so is exact
+        (objIncremental, objBS) = self.__buildOptions(True, 0)
+        (npPrice, npDelta, npGamma) = objIncremental.setStock(self.__npStock)
+        objIncremental.updateStock([3, 500], [26.5, 50.1])
+        npStock = self.__npStock.copy()
+        npStock[[3, 500]] = [26.5, 50.1]
+        self.assertTrue(np.array_equal(npPrice, objBS.getOptionPrice(npStock)))
+        self.assertEqual(objIncremental.getStatistics()['Taylor'], 0)
+        with self.assertRaises(ValueError):
+            npPrice[0] = 0
+
+        # A big tolerance always uses the Taylor expansion, so a big move
+        # is not exact
+        (objIncremental, objBS) = self.__buildOptions(True, 1e6)
+        objIncremental.setStock(self.__npStock)
+        npPrice = objIncremental.updateStock(500, 60.0)[0]
+        self.assertEqual(objIncremental.getStatistics()['Taylor'], 1)
+        self.assertGreater(abs(npPrice - objBS.getOptionPrice(
+            np.array([60.0]))[0]), 1e-3)
+
+    def testDuplicateIndices(self):
+
+        # An index that is ticked more than once takes the last tick, and
+        # is only counted once
+        (objIncremental, objBS) = self.__buildOptions(True, 1e-6)
+        objIncremental.setStock(self.__npStock)
+        (npPrice, npDelta, npGamma) = objIncremental.updateStock(
+            [3, 500, 3], [60.0, 50.1, 26.5])
+        npStock = self.__npStock.copy()
+        npStock[[3, 500]] = [26.5, 50.1]
+        self.assertEqual(objIncremental.getStock()[3], 26.5)
+        self.assertTrue(np.allclose(npPrice, objBS.getOptionPrice(
+            npStock[[3, 500, 3]]), rtol=0, atol=1e-6))
+        dctStatistics = objIncremental.getStatistics()
+        self.assertEqual(dctStatistics['Full'] + dctStatistics['Taylor'],
+                         len(self.__npStock) + 2)
+
+    def testMoveFromZeroSpeed(self):
+
+        # Speed is 0 where d1 = -vol root T, but a 20% move from there is
+        # still far outside the tolerance, so must be recalculated
+        fltVolRootT = self.__fltVol * np.sqrt(self.__fltTimeToMaturity)
+        fltStock = self.__fltStrike * np.exp(
+            -fltVolRootT ** 2 - (self.__fltRiskFreeRate + self.__fltVol ** 2
+                                 / 2) * self.__fltTimeToMaturity)
+        (objIncremental, objBS) = self.__buildOptions(True, 1e-6)
+        objIncremental.setStock([fltStock])
+        self.assertAlmostEqual(objBS.getOptionSpeed(np.array([fltStock]))[0],
+                               0, places=12)
+        npPrice = objIncremental.updateStock([0], [fltStock * 1.2])[0]
+        self.assertEqual(npPrice[0], objBS.getOptionPrice(
+            np.array([fltStock * 1.2]))[0])
+        self.assertEqual(objIncremental.getStatistics()['Taylor'], 0)
+
+    def testEdgeOfRadius(self):
+
+        # A move to just inside the radius is estimated, with the price
+        # within the tolerance and the delta within 3 x tolerance / radius.
+        # The gamma is not bounded, but is still close.
+        for boolIsCall in (True, False):
+            (objIncremental, objBS) = self.__buildOptions(boolIsCall, 1e-6)
+            npRadius = objBS.getQuickValues(self.__npStock, 1e-6)['Radius']
+            self.assertTrue(np.all(npRadius > 0))
+            for fltSign in (1, -1):
+                objIncremental.setStock(self.__npStock)
+                npStock = self.__npStock + fltSign * 0.999 * npRadius
+                (npPrice, npDelta, npGamma) = objIncremental.updateStock(
+                    np.arange(len(npStock)), npStock)
+                self.assertTrue(np.all(np.abs(
+                    npPrice - objBS.getOptionPrice(npStock)) <= 1e-6))
+                self.assertTrue(np.all(np.abs(
+                    npDelta - objBS.getOptionDelta(npStock))
+                    <= 3e-6 / npRadius))
+                self.assertTrue(np.allclose(
+                    npGamma, objBS.getOptionGamma(npStock), rtol=0,
+                    atol=1e-4))
+            self.assertEqual(objIncremental.getStatistics()['Full'],
+                             2 * len(self.__npStock))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import analytics.OptionChainValidator
+import analytics.EuropeanOption
+import numpy as np
+import unittest
+import test.ExternalData as ED
+
+'''
+These set of tests are used to ensure the OptionChainValidator class is
+working correctly.
+A chain of BlackScholes prices over several strikes and maturities has no
+arbitrage, so nothing should be flagged.   Each type of violation is then
+added to the chain in turn and only the quotes involved should be flagged.
+This is done for both Call and Put options.
+'''
+
+
+class TestOptionChainValidator(unittest.TestCase):
+
+    def setUp(self):
+
+        # Set data to price the options
+        self.__fltStock = 50.0
+        self.__fltVol = ED.EO_Vol
+        self.__fltRiskFreeRate = ED.EO_RiskFreeRate
+
+        # 5 maturities of 9 strikes, sorted by maturity and then strike
+        npStrike = np.linspace(30, 70, 9)
+        npTime = np.array([0.25, 0.5, 1, 2, 3])
+        self.__npStrike = np.tile(npStrike, len(npTime))
+        self.__npTime = np.repeat(npTime, len(npStrike))
+        self.__objValidator = analytics.OptionChainValidator. \
+            OptionChainValidator(self.__fltStock, self.__fltRiskFreeRate)
+
+    def __getPrices(self, boolIsCall):
+        return analytics.EuropeanOption.BlackScholes(
+            self.__npStrike, self.__fltVol, self.__fltRiskFreeRate,
+            self.__npTime, boolIsCall).getOptionPrice(self.__fltStock)
+
+    def __getFlagged(self, dctFlags):
+        return {strName: list(np.flatnonzero(npFlags))
+                for (strName, npFlags) in dctFlags.items()}
+
+    def testStr(self):
+
+        strF = 'OptionChainValidator: [Stock:50.0; RFRate:0.01; ' \
+               'Tolerance:1e-08]'
+        self.assertEqual(str(self.__objValidator), strF)
+
+    def testNoArbitrage(self):
+
+        for boolIsCall in (True, False):
+            dctFlags = self.__objValidator.validate(
+                self.__npStrike, self.__npTime, self.__getPrices(boolIsCall),
+                boolIsCall)
+            self.assertEqual(sorted(dctFlags.keys()),
+                             ['Any', 'Butterfly', 'Calendar', 'Lower',
+                              'Strike', 'Upper'])
+            self.assertFalse(np.any(dctFlags['Any']))
+
+    def testCallViolations(self):
+
+        # Quote 10 (2nd strike of the 2nd maturity) is set above quote 9,
+        # which breaks the strike order (9, 10), the butterfly (9, 10, 11)
+        # and its calendar with quote 19, but not the upper bound.
+        # Quote 40 (the middle strike of the last maturity) is set to 0,
+        # which is below the lower bound and breaks the strike order
+        # (40, 41), every butterfly it is in and its calendar with quote
+        # 31.
+        npPrice = self.__getPrices(True)
+        npPrice[10] = npPrice[9] + 0.5
+        npPrice[40] = 0
+        dctFlagged = self.__getFlagged(self.__objValidator.validate(
+            self.__npStrike, self.__npTime, npPrice, True))
+        self.assertEqual(dctFlagged['Lower'], [40])
+        self.assertEqual(dctFlagged['Upper'], [])
+        self.assertEqual(dctFlagged['Strike'], [9, 10, 40, 41])
+        self.assertEqual(dctFlagged['Butterfly'],
+                         [9, 10, 11, 38, 39, 40, 41, 42])
+        self.assertEqual(dctFlagged['Calendar'], [10, 19, 31, 40])
+
+    def testPutViolations(self):
+
+        # A put price above the discounted strike (which also breaks its
+        # calendar with quote 17), and a butterfly that costs too much in
+        # the middle of the last maturity
+        npPrice = self.__getPrices(False)
+        npPrice[8] = 80
+        npPrice[40] += 0.5
+        dctFlagged = self.__getFlagged(self.__objValidator.validate(
+            self.__npStrike, self.__npTime, npPrice, False))
+        self.assertEqual(dctFlagged['Upper'], [8])
+        self.assertEqual(dctFlagged['Lower'], [])
+        self.assertEqual(dctFlagged['Strike'], [])
+        self.assertEqual(dctFlagged['Butterfly'], [39, 40, 41])
+        self.assertEqual(dctFlagged['Calendar'], [8, 17])
+
+    def testUnsorted(self):
+
+        npPrice = self.__getPrices(True)
+        with self.assertRaises(ValueError):
+            self.__objValidator.validate(self.__npStrike[::-1],
+                                         self.__npTime, npPrice, True)
+        with self.assertRaises(ValueError):
+            self.__objValidator.validate(self.__npStrike, self.__npTime[1:],
+                                         npPrice, True)
+
+
+if __name__ == '__main__':
+    unittest.main()
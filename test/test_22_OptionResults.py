@@ -0,0 +1,64 @@
+import analytics.OptionResults
+import numpy as np
+import unittest
+
+'''
+These set of tests are used to ensure the OptionResults class is working
+correctly.
+It tests the __str__, that values are kept as contiguous float64 arrays in
+the order they were added, that a value of the wrong length is rejected and
+that toPandas gives the same columns.
+'''
+
+
+class TestOptionResults(unittest.TestCase):
+
+    def setUp(self):
+
+        self.__npPrice = np.array([1.5, 2.5, 3.5])
+        self.__objResults = analytics.OptionResults.OptionResults(
+            3, {'Price': self.__npPrice})
+        self.__objResults['Delta'] = [0.1, 0.5, 0.9]
+
+    def testStr(self):
+
+        strF = 'OptionResults: [NoValues:3; Names:Price,Delta]'
+        self.assertEqual(str(self.__objResults), strF)
+
+    def testValues(self):
+
+        # The array passed in is kept as it is, with no copy
+        self.assertIs(self.__objResults['Price'], self.__npPrice)
+        npDelta = self.__objResults['Delta']
+        self.assertEqual(npDelta.dtype, np.float64)
+        self.assertTrue(npDelta.flags.c_contiguous)
+        self.assertEqual(self.__objResults.getNames(), ['Price', 'Delta'])
+        self.assertEqual(list(self.__objResults), ['Price', 'Delta'])
+        self.assertIn('Delta', self.__objResults)
+        self.assertNotIn('Gamma', self.__objResults)
+
+        # A strided slice is made contiguous
+        self.__objResults['Gamma'] = np.arange(6.0)[::2]
+        self.assertTrue(self.__objResults['Gamma'].flags.c_contiguous)
+
+        with self.assertRaises(ValueError):
+            self.__objResults['Vega'] = np.zeros(4)
+        with self.assertRaises(KeyError):
+            self.__objResults['Vega']
+
+    def testEqualsAndPandas(self):
+
+        objOther = analytics.OptionResults.OptionResults(
+            3, {'Price': [1.5, 2.5, 3.5], 'Delta': [0.1, 0.5, 0.9]})
+        self.assertTrue(self.__objResults.equals(objOther))
+        objOther['Delta'][0] = 0.2
+        self.assertFalse(self.__objResults.equals(objOther))
+
+        pdResults = self.__objResults.toPandas()
+        self.assertEqual(list(pdResults.columns), ['Price', 'Delta'])
+        self.assertTrue(np.array_equal(pdResults['Delta'].values,
+                                       self.__objResults['Delta']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import analytics.LazyImport
+import os
+import subprocess
+import sys
+import unittest
+
+'''
+These set of tests are used to ensure the LazyModule class is working
+correctly and that the analytics modules do not import their heavy
+dependencies when they are loaded.
+The import time of analytics.EuropeanOption is measured in a new python
+with -X importtime, which writes the time taken to import each module (in
+microseconds) to stderr.   It must be within fltImportBudget seconds, and
+scipy.stats, pandas and matplotlib must not have been imported.
+'''
+
+
+class TestLazyImport(unittest.TestCase):
+
+    def setUp(self):
+
+        # Time allowed to import analytics.EuropeanOption, most of which is
+        # numpy
+        self.__fltImportBudget = 0.4
+        self.__strRoot = os.path.dirname(os.path.dirname(
+            os.path.abspath(__file__)))
+
+    def __runPython(self, strCode):
+        # Run the code in a new python (so nothing is imported already)
+        # from the root of the package, returning (stdout, stderr)
+        objProcess = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', strCode],
+            cwd=self.__strRoot, capture_output=True, text=True, check=True)
+        return (objProcess.stdout, objProcess.stderr)
+
+    def testLazyModule(self):
+
+        objModule = analytics.LazyImport.LazyModule('json')
+        self.assertEqual(str(objModule),
+                         'LazyModule: [Name:json; IsLoaded:False]')
+        self.assertEqual(objModule.dumps([1, 2]), '[1, 2]')
+        self.assertTrue(objModule.isLoaded())
+        self.assertEqual(objModule.getName(), 'json')
+        with self.assertRaises(AttributeError):
+            objModule.notAnAttribute
+
+        # A module that is not installed only fails when it is used
+        objMissing = analytics.LazyImport.LazyModule('not_a_module')
+        with self.assertRaises(ImportError):
+            objMissing.anything
+
+    def testImportTime(self):
+
+        (strOut, strErr) = self.__runPython(
+            'import sys, analytics.EuropeanOption; '
+            'print([m for m in ("scipy.stats", "pandas", "matplotlib") '
+            'if m in sys.modules])')
+        self.assertEqual(strOut.strip(), '[]')
+
+        # Lines are 'import time: self | cumulative | name'
+        intCumulative = None
+        for strLine in strErr.splitlines():
+            lstParts = strLine.split('|')
+            if len(lstParts) == 3 and \
+                    lstParts[2].strip() == 'analytics.EuropeanOption':
+                intCumulative = int(lstParts[1])
+        self.assertIsNotNone(intCumulative)
+        self.assertLess(intCumulative / 1e6, self.__fltImportBudget)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,205 @@
+import analytics.OptionBook
+import analytics.EuropeanOption
+import numpy as np
+import unittest
+import test.ExternalData as ED
+
+'''
+These set of tests are used to ensure the OptionContract and OptionBook
+classes are working correctly.
+It tests the __str__, that an OptionContract has no __dict__, that the book
+keeps its contracts in typed arrays as they are added (one at a time and
+many at once) and that the values of the book, or a slice of it, match
+BlackScholes priced one contract at a time.
+OptionBookIndex is checked against the book: its buckets and strike ranges
+against a simple filter of the contracts and its values against the book's
+values, including repricing one expiry after its vol has moved.
+'''
+
+
+class TestOptionBook(unittest.TestCase):
+
+    def setUp(self):
+
+        # Seed the random numbers so that the tests are stable
+        np.random.seed(4669)
+
+        # Set data to price the options
+        self.__fltStock = 50.0
+        self.__fltVol = ED.EO_Vol
+        self.__fltRiskFreeRate = ED.EO_RiskFreeRate
+        self.__npExpiry = np.array([0.25, 0.5, 1, 2])
+
+        # A small capacity so that the arrays have to grow
+        self.__objBook = analytics.OptionBook.OptionBook(self.__npExpiry, 4)
+        self.__objBook.addContract(
+            analytics.OptionBook.OptionContract(50.0, True, 2))
+        self.__objBook.addContracts(
+            np.random.uniform(30, 70, 99), np.random.uniform(size=99) < 0.5,
+            np.random.randint(0, len(self.__npExpiry), 99))
+
+    def testStr(self):
+
+        objContract = analytics.OptionBook.OptionContract(45.0, False, 1)
+        strF = 'OptionContract: [Strike:45.0; IsCall:False; ExpiryIndex:1]'
+        self.assertEqual(str(objContract), strF)
+        self.assertFalse(hasattr(objContract, '__dict__'))
+        with self.assertRaises(AttributeError):
+            objContract.fltStrike = 10
+        strF = 'OptionBook: [NoContracts:100; NoExpiries:4]'
+        self.assertEqual(str(self.__objBook), strF)
+
+    def testContracts(self):
+
+        objBook = self.__objBook
+        self.assertEqual(objBook.getNoContracts(), 100)
+        self.assertEqual(objBook.getStrike().dtype, np.float64)
+        self.assertEqual(objBook.getIsCall().dtype, bool)
+        self.assertEqual(objBook.getExpiryIndex().dtype, np.int32)
+        self.assertEqual(len(objBook.getStrike()), 100)
+        with self.assertRaises(ValueError):
+            objBook.getStrike()[0] = 0
+
+        objContract = objBook.getContract(0)
+        self.assertEqual((objContract.getStrike(), objContract.getIsCall(),
+                          objContract.getExpiryIndex()), (50.0, True, 2))
+        self.assertEqual(objBook.getTimeToMaturity()[0], 1)
+        with self.assertRaises(IndexError):
+            objBook.getContract(100)
+        with self.assertRaises(ValueError):
+            objBook.addContracts([50.0], True, 4)
+        self.assertEqual(objBook.getNoContracts(), 100)
+
+        # A single flag and expiry for all of the contracts
+        self.assertEqual(objBook.addContracts([20, 30], False, 3), 100)
+        self.assertTrue(np.array_equal(objBook.getTimeToMaturity([100, 101]),
+                                       [2, 2]))
+        self.assertGreaterEqual(objBook.getBytes(), 102 * 13)
+
+    def testValuesvsBlackScholes(self):
+
+        objBook = self.__objBook
+        tpCalcRequirements = ('Price', 'Delta', 'Gamma', 'Vega')
+        dctValues = objBook.getOptionValues(
+            self.__fltStock, self.__fltVol, self.__fltRiskFreeRate,
+            tpCalcRequirements)
+        npStock = np.array([self.__fltStock])
+        for i in range(0, objBook.getNoContracts()):
+            objContract = objBook.getContract(i)
+            objBS = analytics.EuropeanOption.BlackScholes(
+                objContract.getStrike(), self.__fltVol,
+                self.__fltRiskFreeRate,
+                self.__npExpiry[objContract.getExpiryIndex()],
+                objContract.getIsCall())
+            dctExpected = objBS.getOptionValues(npStock, tpCalcRequirements)
+            for strName in tpCalcRequirements:
+                self.assertAlmostEqual(dctValues[strName][i],
+                                       dctExpected[strName][0], places=10)
+
+        # A slice and an index array give the same values
+        self.assertTrue(np.array_equal(
+            objBook.getOptionPrice(self.__fltStock, self.__fltVol,
+                                   self.__fltRiskFreeRate, slice(10, 20)),
+            dctValues['Price'][10:20]))
+        self.assertTrue(np.array_equal(
+            objBook.getOptionPrice(self.__fltStock, self.__fltVol,
+                                   self.__fltRiskFreeRate, [5, 0, 7]),
+            dctValues['Price'][[5, 0, 7]]))
+
+
+class TestOptionBookIndex(unittest.TestCase):
+
+    def setUp(self):
+
+        # Seed the random numbers so that the tests are stable
+        np.random.seed(1414)
+
+        # Set data to price the options, with strikes that repeat
+        self.__fltStock = 50.0
+        self.__npVol = np.array([0.3, 0.25, 0.2, 0.18])
+        self.__fltRiskFreeRate = ED.EO_RiskFreeRate
+        self.__npExpiry = np.array([0.25, 0.5, 1, 2])
+        self.__objBook = analytics.OptionBook.OptionBook(self.__npExpiry)
+        self.__objBook.addContracts(
+            np.random.randint(30, 71, 500), np.random.uniform(size=500) < 0.5,
+            np.random.randint(0, len(self.__npExpiry), 500))
+        self.__objIndex = analytics.OptionBook.OptionBookIndex(
+            self.__objBook, self.__fltRiskFreeRate, self.__npVol)
+
+    def __getBookValues(self, intExpiryIndex, tpCalcRequirements):
+        # The book's values of the contracts of the expiry, using its vol
+        npBucket = np.flatnonzero(
+            self.__objBook.getExpiryIndex() == intExpiryIndex)
+        return (npBucket, self.__objBook.getOptionValues(
+            self.__fltStock, self.__npVol[intExpiryIndex],
+            self.__fltRiskFreeRate, tpCalcRequirements, npBucket))
+
+    def testStr(self):
+
+        strF = 'OptionBookIndex: [NoContracts:500; NoExpiries:4; ' \
+               'RFRate:0.01]'
+        self.assertEqual(str(self.__objIndex), strF)
+
+    def testBucketsAndRanges(self):
+
+        npStrike = self.__objBook.getStrike()
+        npExpiryIndex = self.__objBook.getExpiryIndex()
+        for intExpiryIndex in range(0, len(self.__npExpiry)):
+            npBucket = self.__objIndex.getBucket(intExpiryIndex)
+            self.assertEqual(sorted(npBucket), list(np.flatnonzero(
+                npExpiryIndex == intExpiryIndex)))
+            self.assertTrue(np.all(np.diff(npStrike[npBucket]) >= 0))
+
+            # Both ends of the range are included
+            npRange = self.__objIndex.getRange(intExpiryIndex, 40, 45)
+            self.assertEqual(sorted(npRange), list(np.flatnonzero(
+                (npExpiryIndex == intExpiryIndex) & (npStrike >= 40)
+                & (npStrike <= 45))))
+        self.assertEqual(len(self.__objIndex.getRange(0, 80, 90)), 0)
+        with self.assertRaises(ValueError):
+            self.__objIndex.getBucket(4)
+
+    def testValuesvsBook(self):
+
+        tpCalcRequirements = ('Price', 'Delta', 'Gamma', 'Vega', 'Theta',
+                              'Rho', 'Speed', 'Charm')
+        dctValues = self.__objIndex.getOptionValues(self.__fltStock,
+                                                    tpCalcRequirements)
+        for intExpiryIndex in range(0, len(self.__npExpiry)):
+            (npBucket, dctExpected) = self.__getBookValues(
+                intExpiryIndex, tpCalcRequirements)
+            for strName in tpCalcRequirements:
+                self.assertTrue(np.allclose(dctValues[strName][npBucket],
+                                            dctExpected[strName], rtol=1e-10,
+                                            atol=1e-12))
+        with self.assertRaises(ValueError):
+            self.__objIndex.getOptionValues(self.__fltStock, ('Omega',))
+
+        # Move the vol of one expiry and only reprice it, the others keep
+        # their values
+        dctOld = {strName: npValues.copy()
+                  for (strName, npValues) in dctValues.items()}
+        self.__npVol[1] = 0.35
+        self.__objIndex.setExpiryVol(1, 0.35)
+        self.assertEqual(list(self.__objIndex.getExpiryVol()),
+                         list(self.__npVol))
+        self.__objIndex.getOptionValues(self.__fltStock, tpCalcRequirements,
+                                        [1], dctValues)
+        (npBucket, dctExpected) = self.__getBookValues(1, tpCalcRequirements)
+        npOther = np.setdiff1d(np.arange(0, 500), npBucket)
+        for strName in tpCalcRequirements:
+            self.assertTrue(np.allclose(dctValues[strName][npBucket],
+                                        dctExpected[strName], rtol=1e-10,
+                                        atol=1e-12))
+            self.assertTrue(np.array_equal(dctValues[strName][npOther],
+                                           dctOld[strName][npOther]))
+
+        # Without dctValues, the contracts not priced are NaN
+        npPrice = self.__objIndex.getOptionValues(
+            self.__fltStock, ('Price',), [1])['Price']
+        self.assertTrue(np.all(np.isnan(npPrice[npOther])))
+        self.assertFalse(np.any(np.isnan(npPrice[npBucket])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,7 +7,8 @@ import math
 These set of tests are used to ensure the EuropeanOptionBoundaryConditions
 class s working correctly.
 It tests the  __str__, upper boundary and lower boundary for both call
-and put options.
+and put options.   It also checks that the upper boundaries are read only and
+not copies, that npOut is filled and that getBounds gives the same results.
 '''
 
 
@@ -108,3 +109,40 @@ class TestEuropeanOptionBoundaryConditions(unittest.TestCase):
             lb = max(a1, 0)
             diff = abs(lb - lBound[i])
             self.assertLessEqual(diff, 0.01*lb)
+
+    def testReadOnlyAndOut(self):
+
+        for objBound in (self.__objBoundCall, self.__objBoundPut):
+
+            # The upper boundary is read only and does not copy the stock
+            # prices
+            npUpper = objBound.getUpperBoundary(self.__npStock)
+            self.assertEqual(npUpper.shape, self.__npStock.shape)
+            with self.assertRaises(ValueError):
+                npUpper[0] = 0
+            self.assertTrue(self.__npStock.flags.writeable)
+
+            # npOut is filled with the same values and returned
+            npOut = np.empty(len(self.__npStock))
+            self.assertIs(objBound.getUpperBoundary(self.__npStock, npOut),
+                          npOut)
+            self.assertTrue(np.array_equal(npOut, npUpper))
+            npLower = objBound.getLowerBoundary(self.__npStock)
+            self.assertIs(objBound.getLowerBoundary(self.__npStock, npOut),
+                          npOut)
+            self.assertTrue(np.array_equal(npOut, npLower))
+
+            # getBounds gives both boundaries
+            (npLowerBoth, npUpperBoth) = objBound.getBounds(self.__npStock)
+            self.assertTrue(np.array_equal(npLowerBoth, npLower))
+            self.assertTrue(np.array_equal(npUpperBoth, npUpper))
+
+        # The call upper boundary shares memory with the stock prices and a
+        # single stock price gives a single boundary
+        self.assertTrue(np.shares_memory(
+            self.__objBoundCall.getUpperBoundary(self.__npStock),
+            self.__npStock))
+        self.assertEqual(self.__objBoundPut.getLowerBoundary(100.0), 0)
+        self.assertAlmostEqual(
+            self.__objBoundCall.getLowerBoundary(100.0),
+            100 - self.__objBoundCall.getDiscountedStrike())
@@ -13,6 +13,8 @@ against the BoundaryConditions, put-call parity, delta range and compares
 the price and greek calculations against a set of external data that is
 stored in the ExternalData.py file.
 This is done for both Call and Put options.
+The bound on the error of the Taylor expansion is checked against the
+actual error, including from the stock price where speed is 0.
 '''
 
 
@@ -292,6 +294,278 @@ class TestEuropeanOption(unittest.TestCase):
             diffPut = abs(-365 * npP[i] - ED.EO_putTheta[i])
             self.assertLess(diffPut, 0.00001)
 
+    def testHigherOrderGreeksvsDifferences(self):
+
+        # Each of the higher order greeks against a central difference of
+        # the delta, gamma or vega.   The vol greeks are for a 1% move and
+        # charm and colour are for 1 day (ie minus the time derivative).
+        fltBump = 0.001
+        fltVolBump = 0.0001
+        fltTimeBump = 0.0001
+        for boolIsCall in (True, False):
+            tpArgs = (self.__fltStrike, self.__fltVol,
+                      self.__fltRiskFreeRate, self.__fltTimeToMaturity,
+                      boolIsCall)
+            objOption = analytics.EuropeanOption.BlackScholes(*tpArgs)
+            objVolUp = analytics.EuropeanOption.BlackScholes(
+                *tpArgs[0:1], self.__fltVol + fltVolBump, *tpArgs[2:])
+            objVolDown = analytics.EuropeanOption.BlackScholes(
+                *tpArgs[0:1], self.__fltVol - fltVolBump, *tpArgs[2:])
+            objTimeUp = analytics.EuropeanOption.BlackScholes(
+                *tpArgs[0:3], self.__fltTimeToMaturity + fltTimeBump,
+                boolIsCall)
+            objTimeDown = analytics.EuropeanOption.BlackScholes(
+                *tpArgs[0:3], self.__fltTimeToMaturity - fltTimeBump,
+                boolIsCall)
+            npS = self.__npStock
+
+            lstChecks = [
+                (objOption.getOptionSpeed(npS),
+                 (objOption.getOptionGamma(npS + fltBump)
+                  - objOption.getOptionGamma(npS - fltBump))
+                 / (2 * fltBump)),
+                (objOption.getOptionVanna(npS),
+                 (objVolUp.getOptionDelta(npS)
+                  - objVolDown.getOptionDelta(npS))
+                 / (2 * fltVolBump) * 0.01),
+                (objOption.getOptionVolga(npS),
+                 (objVolUp.getOptionVega(npS)
+                  - objVolDown.getOptionVega(npS))
+                 / (2 * fltVolBump) * 0.01),
+                (objOption.getOptionCharm(npS),
+                 -(objTimeUp.getOptionDelta(npS)
+                   - objTimeDown.getOptionDelta(npS))
+                 / (2 * fltTimeBump) / 365),
+                (objOption.getOptionColour(npS),
+                 -(objTimeUp.getOptionGamma(npS)
+                   - objTimeDown.getOptionGamma(npS))
+                 / (2 * fltTimeBump) / 365)]
+            for (npGreek, npDiff) in lstChecks:
+                self.assertTrue(np.allclose(npGreek, npDiff, rtol=1e-5,
+                                            atol=1e-9))
+
+    def testOptionValuesvsGetters(self):
+
+        tpNames = ('Price', 'Delta', 'Gamma', 'Vega', 'Theta', 'Rho',
+                   'Speed', 'Vanna', 'Volga', 'Charm', 'Colour')
+        for objOption in (self.__objEuropeanCall, self.__objEuropeanPut):
+            dctValues = objOption.getOptionValues(self.__npStock, tpNames)
+            for strName in tpNames:
+                npGetter = getattr(objOption, 'getOption' + strName)(
+                    self.__npStock)
+                self.assertTrue(np.allclose(dctValues[strName], npGetter,
+                                            rtol=1e-12, atol=1e-14))
+
+        with self.assertRaises(ValueError):
+            self.__objEuropeanCall.getOptionValues(self.__npStock, ('Bob',))
+
+    def testHigherOrdervsDifferences(self):
+
+        # Each higher order value against a central difference of a lower
+        # order one, with the vol bumped by 0.01% (the vol greeks are for a
+        # 1% move)
+        fltVolBump = 0.0001
+        tpNames = ('Delta', 'Gamma', 'Vega', 'Vanna', 'Volga')
+        for boolIsCall in (True, False):
+            lstValues = [analytics.EuropeanOption.BlackScholes(
+                self.__fltStrike, self.__fltVol + fltBump,
+                self.__fltRiskFreeRate, self.__fltTimeToMaturity,
+                boolIsCall).getOptionValues(self.__npStock, tpNames)
+                for fltBump in (-fltVolBump, 0, fltVolBump)]
+            dctValues = analytics.EuropeanOption.BlackScholes(
+                self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+                self.__fltTimeToMaturity, boolIsCall).getOptionValues(
+                    self.__npStock, ('Vanna', 'Volga', 'Zomma', 'DVannaDVol',
+                                     'Ultima'))
+            for (strName, strDiff) in (('Vanna', 'Delta'), ('Volga', 'Vega'),
+                                       ('Zomma', 'Gamma'),
+                                       ('DVannaDVol', 'Vanna'),
+                                       ('Ultima', 'Volga')):
+                npDiff = (lstValues[2][strDiff] - lstValues[0][strDiff]) \
+                    / (2 * fltVolBump) * 0.01
+                self.assertTrue(np.allclose(dctValues[strName], npDiff,
+                                            rtol=1e-5, atol=1e-8))
+
+    def testQuickOptionPrice(self):
+
+        for objOption in (self.__objEuropeanCall, self.__objEuropeanPut):
+            dctValues = objOption.getQuickValues(self.__npStock, 1e-6, 0.001)
+            npNewStock = self.__npStock * 1.001
+
+            # Small moves are all estimated, within the tolerance
+            (npPrice, npIsFull) = objOption.getQuickOptionPrice(
+                self.__npStock, dctValues, npNewStock, self.__fltVol + 0.0009)
+            objNewVol = analytics.EuropeanOption.BlackScholes(
+                *objOption.getParameters()[1:2], self.__fltVol + 0.0009,
+                *objOption.getParameters()[3:])
+            self.assertFalse(np.any(npIsFull))
+            self.assertTrue(np.allclose(
+                npPrice, objNewVol.getOptionPrice(npNewStock), rtol=0,
+                atol=1e-6))
+
+            # Big moves fall back to the full calculation
+            npNewStock = self.__npStock * 1.1
+            (npPrice, npIsFull) = objOption.getQuickOptionPrice(
+                self.__npStock, dctValues, npNewStock)
+            self.assertTrue(np.any(npIsFull))
+            self.assertTrue(np.array_equal(
+                npPrice[npIsFull],
+                objOption.getOptionPrice(npNewStock)[npIsFull]))
+            self.assertTrue(np.allclose(
+                npPrice, objOption.getOptionPrice(npNewStock), rtol=0,
+                atol=1e-5))
+
+            # As does a move in the vol bigger than the vol radius
+            (npPrice, npIsFull) = objOption.getQuickOptionPrice(
+                self.__npStock, dctValues, self.__npStock,
+                self.__fltVol + 0.002)
+            self.assertTrue(np.all(npIsFull))
+
+        with self.assertRaises(ValueError):
+            self.__objEuropeanCall.getQuickOptionPrice(
+                self.__npStock, {'Price': self.__npStock}, self.__npStock)
+        with self.assertRaises(ValueError):
+            self.__objEuropeanCall.getQuickValues(self.__npStock, 1e-6,
+                                                  self.__fltVol)
+
+    def testQuickRadius(self):
+
+        # Any move within the radius (and the vol radius) is estimated to
+        # within the tolerance
+        np.random.seed(2718)
+        for objOption in (self.__objEuropeanCall, self.__objEuropeanPut):
+            for fltVolRadius in (0.0, 0.001):
+                dctValues = objOption.getQuickValues(self.__npStock, 1e-6,
+                                                     fltVolRadius)
+                self.assertTrue(np.all(dctValues['Radius'] > 0))
+                for i in range(0, 5):
+                    npNewStock = self.__npStock + dctValues['Radius'] \
+                        * np.random.uniform(-1, 1, len(self.__npStock))
+                    fltNewVol = self.__fltVol \
+                        + fltVolRadius * np.random.uniform(-1, 1)
+                    (npPrice, npIsFull) = objOption.getQuickOptionPrice(
+                        self.__npStock, dctValues, npNewStock, fltNewVol)
+                    objNew = analytics.EuropeanOption.BlackScholes(
+                        *objOption.getParameters()[1:2], fltNewVol,
+                        *objOption.getParameters()[3:])
+                    self.assertFalse(np.any(npIsFull))
+                    self.assertTrue(np.all(np.abs(
+                        npPrice - objNew.getOptionPrice(npNewStock))
+                        <= 1e-6))
+
+    def testTaylorPriceBound(self):
+
+        # Speed is 0 where d1 = -vol root T, so the third order term at the
+        # stock price says nothing about a big move from there
+        fltVolRootT = self.__fltVol * math.sqrt(self.__fltTimeToMaturity)
+        npStock = np.array([self.__fltStrike * math.exp(
+            -fltVolRootT ** 2 - (self.__fltRiskFreeRate + self.__fltVol ** 2
+                                 / 2) * self.__fltTimeToMaturity)])
+        objOption = self.__objEuropeanCall
+        self.assertAlmostEqual(objOption.getOptionSpeed(npStock)[0], 0,
+                               places=12)
+        dctValues = objOption.getQuickValues(npStock, 1e-6)
+        (npPrice, npIsFull) = objOption.getQuickOptionPrice(
+            npStock, dctValues, npStock * 1.2)
+        self.assertTrue(npIsFull[0])
+        self.assertEqual(npPrice[0],
+                         objOption.getOptionPrice(npStock * 1.2)[0])
+
+        # The bound is never less than the actual error
+        np.random.seed(1618)
+        for objOption in (self.__objEuropeanCall, self.__objEuropeanPut):
+            dctValues = objOption.getOptionValues(
+                self.__npStock, ('Price', 'Delta', 'Gamma', 'Vega', 'Vanna',
+                                 'Volga'))
+            for fltNewVol in (None, self.__fltVol * 1.05,
+                              self.__fltVol * 0.95):
+                npNewStock = self.__npStock * np.exp(
+                    np.random.normal(0, 0.05, len(self.__npStock)))
+                (npPrice, npError) = objOption.getTaylorPrice(
+                    self.__npStock, dctValues, npNewStock, fltNewVol)
+                objNew = objOption if fltNewVol is None else \
+                    analytics.EuropeanOption.BlackScholes(
+                        *objOption.getParameters()[1:2], fltNewVol,
+                        *objOption.getParameters()[3:])
+                self.assertTrue(np.all(np.abs(
+                    npPrice - objNew.getOptionPrice(npNewStock))
+                    <= npError + 1e-12))
+
+    def testImmutableAndHashable(self):
+
+        objCall = analytics.EuropeanOption.BlackScholes(
+            *self.__objEuropeanCall.getParameters()[1:])
+        self.assertEqual(objCall, self.__objEuropeanCall)
+        self.assertEqual(hash(objCall), hash(self.__objEuropeanCall))
+        self.assertNotEqual(objCall, self.__objEuropeanPut)
+        self.assertEqual(len({objCall, self.__objEuropeanCall,
+                              self.__objEuropeanPut}), 2)
+        with self.assertRaises(AttributeError):
+            objCall.fltVol = 0.3
+        with self.assertRaises(AttributeError):
+            del objCall._BlackScholes__fltVol
+        self.assertEqual(objCall.getParameters()[2], self.__fltVol)
+
+        # An array parameter is copied, so changing it afterwards does not
+        # change the option
+        npVol = np.full(len(self.__npStock), self.__fltVol)
+        objVolArray = analytics.EuropeanOption.BlackScholes(
+            self.__fltStrike, npVol, self.__fltRiskFreeRate,
+            self.__fltTimeToMaturity, True)
+        npVol[:] = 0.5
+        self.assertTrue(np.allclose(
+            objVolArray.getOptionPrice(self.__npStock),
+            objCall.getOptionPrice(self.__npStock), rtol=0, atol=1e-12))
+        self.assertEqual(hash(objVolArray), hash(
+            analytics.EuropeanOption.BlackScholes(
+                self.__fltStrike, np.full(len(self.__npStock), self.__fltVol),
+                self.__fltRiskFreeRate, self.__fltTimeToMaturity, True)))
+
+        # As is a read only view of an array that can be changed
+        npVol = np.full(len(self.__npStock), self.__fltVol)
+        npView = npVol[:]
+        npView.flags.writeable = False
+        objVolView = analytics.EuropeanOption.BlackScholes(
+            self.__fltStrike, npView, self.__fltRiskFreeRate,
+            self.__fltTimeToMaturity, True)
+        intHash = hash(objVolView)
+        npVol[:] = 0.5
+        self.assertEqual(hash(objVolView), intHash)
+        self.assertTrue(np.allclose(
+            objVolView.getOptionPrice(self.__npStock),
+            objCall.getOptionPrice(self.__npStock), rtol=0, atol=1e-12))
+
+    def testConstantsTable(self):
+
+        # Many contracts over 12 expiries only calculate the constants for
+        # each expiry once, and give the same values as without the table
+        objConstants = analytics.EuropeanOption.ConstantsTable()
+        npExpiry = np.arange(1, 13) / 12
+        tpCalcRequirements = ('Price', 'Delta', 'Gamma', 'Vega', 'Theta',
+                              'Rho')
+        for i in range(0, 120):
+            tpParameters = (40 + i / 4, self.__fltVol, self.__fltRiskFreeRate,
+                            npExpiry[i % 12], i % 2 == 0)
+            dctShared = analytics.EuropeanOption.BlackScholes(
+                *tpParameters, objConstants).getOptionValues(
+                    self.__npStock, tpCalcRequirements)
+            dctOwn = analytics.EuropeanOption.BlackScholes(
+                *tpParameters).getOptionValues(
+                    self.__npStock, tpCalcRequirements)
+            for strName in tpCalcRequirements:
+                self.assertTrue(np.array_equal(dctShared[strName],
+                                               dctOwn[strName]))
+        self.assertEqual(objConstants.getStatistics(),
+                         {'Hits': 108, 'Misses': 12, 'Entries': 12})
+        self.assertEqual(str(objConstants), 'ConstantsTable: [Entries:12]')
+
+        # An array is worked out each time rather than kept
+        objConstants.getConstants(np.array([0.2, 0.3]),
+                                  self.__fltRiskFreeRate, 1)
+        self.assertEqual(objConstants.getStatistics()['Entries'], 12)
+        objConstants.clear()
+        self.assertEqual(objConstants.getStatistics()['Entries'], 0)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -23,6 +23,9 @@ and built some tests with these random numbers patched into the monte carlo
 calculation results.   These tests should produce stable results, but are
 not as accurate because only 200 numbers are used.   The results are
 compared to an accuracy of 10dp, defined in ExternalData.
+The short circuit is tested on a wide range of stock prices: the stock
+prices that are simulated must match a run without it exactly (with the same
+seed) and the rest must match black & scholes.
 '''
 
 
@@ -423,6 +426,99 @@ class TestBasicMonteCarloOption(unittest.TestCase):
             diffPut = abs(npP[i] + ED.EO_putTheta[i]/365)
             self.assertLess(diffPut, 0.1 * stdDevP[i])
 
+    def testShortCircuit(self):
+
+        npStock = np.linspace(1, 200, 200)
+        for boolIsCall in (True, False):
+            objBS = analytics.EuropeanOption.BlackScholes(
+                self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+                self.__fltTimeToMaturity, boolIsCall)
+            objFull = analytics.EuropeanOption.BasicMonteCarloOption(
+                self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+                self.__fltTimeToMaturity, boolIsCall, 20000, intSeed=42)
+            objShort = analytics.EuropeanOption.BasicMonteCarloOption(
+                self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+                self.__fltTimeToMaturity, boolIsCall, 20000, intSeed=42,
+                fltShortCircuit=1e-4)
+            self.assertEqual(objShort.getParameters()[9:], (42, 1e-4))
+
+            (npFullPrice, npFullSTD) = objFull.getOptionPrice(npStock)
+            (npPrice, npSTD) = objShort.getOptionPrice(npStock)
+
+            # Most of the stock prices are determined, and priced within
+            # the short circuit of black & scholes
+            npIsDetermined = npSTD == 0
+            self.assertGreater(np.sum(npIsDetermined), len(npStock) / 2)
+            self.assertTrue(np.allclose(
+                npPrice[npIsDetermined],
+                objBS.getOptionPrice(npStock[npIsDetermined]), rtol=0,
+                atol=1e-4))
+
+            # The rest are the same as the full run
+            self.assertTrue(np.array_equal(npPrice[~npIsDetermined],
+                                           npFullPrice[~npIsDetermined]))
+            self.assertTrue(np.array_equal(npSTD[~npIsDetermined],
+                                           npFullSTD[~npIsDetermined]))
+
+    def testConstantsTable(self):
+
+        # Sharing the constants gives exactly the same results, and the
+        # option can be hashed but not changed
+        npStock = np.linspace(40, 60, 5)
+        objConstants = analytics.EuropeanOption.ConstantsTable()
+        tpParameters = (self.__fltStrike, self.__fltVol,
+                        self.__fltRiskFreeRate, self.__fltTimeToMaturity,
+                        True, 20000, 'MomentMatched', 10, 42)
+        objOwn = analytics.EuropeanOption.BasicMonteCarloOption(
+            *tpParameters)
+        objShared = analytics.EuropeanOption.BasicMonteCarloOption(
+            *tpParameters, objConstants=objConstants)
+        for (npOwn, npShared) in zip(objOwn.getOptionPrice(npStock),
+                                     objShared.getOptionPrice(npStock)):
+            self.assertTrue(np.array_equal(npOwn, npShared))
+        self.assertEqual(objConstants.getStatistics()['Misses'], 1)
+        self.assertEqual(objOwn, objShared)
+        self.assertEqual(hash(objOwn), hash(objShared))
+        with self.assertRaises(AttributeError):
+            objShared.intNoIter = 10
+        with self.assertRaises(AttributeError):
+            del objShared._BasicMonteCarloOption__intNoIter
+
+    def testConstructorArguments(self):
+
+        # The arguments build an equal option, with the same seed
+        objOption = analytics.EuropeanOption.BasicMonteCarloOption(
+            self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+            self.__fltTimeToMaturity, False, 20000, strSampling='Stratified',
+            intNoBatches=5, intSeed=42, fltShortCircuit=1e-4)
+        dctArguments = objOption.getConstructorArguments()
+        self.assertEqual(objOption.getSeed(), 42)
+        self.assertEqual(dctArguments['intNoIter'], 20000)
+        self.assertEqual(dctArguments['strSampling'], 'Stratified')
+        self.assertEqual(
+            analytics.EuropeanOption.BasicMonteCarloOption(**dctArguments),
+            objOption)
+        self.assertIsNone(analytics.EuropeanOption.BasicMonteCarloOption(
+            self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+            self.__fltTimeToMaturity, False, 20000).getSeed())
+
+    def testUnseededEquality(self):
+
+        # Without a seed each call gives different results, so options with
+        # the same parameters are not equal, only each option to itself
+        tpParameters = (self.__fltStrike, self.__fltVol,
+                        self.__fltRiskFreeRate, self.__fltTimeToMaturity,
+                        True, 2000)
+        objFirst = analytics.EuropeanOption.BasicMonteCarloOption(
+            *tpParameters)
+        objSecond = analytics.EuropeanOption.BasicMonteCarloOption(
+            *tpParameters)
+        self.assertNotEqual(objFirst, objSecond)
+        self.assertEqual(objFirst, objFirst)
+        self.assertEqual(len({objFirst, objSecond, objFirst}), 2)
+        self.assertNotEqual(objFirst, analytics.EuropeanOption.
+                            BasicMonteCarloOption(*tpParameters, intSeed=1))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -166,12 +166,12 @@ class TestBasicMonteCarloOptionThreaded(unittest.TestCase):
         # monte carlo method
         for i in range(0, len(ED.EO_spot)):
             # Call Price
-            diff = abs(npCP["Price"].values[i] - ED.EO_callPrice[i])
-            maxErr = 0.1*stdDevC["PriceSTD"].values[i]
+            diff = abs(npCP["Price"][i] - ED.EO_callPrice[i])
+            maxErr = 0.1*stdDevC["PriceSTD"][i]
             self.assertLess(diff, maxErr)
             # Put Price
-            diff = abs(npPP["Price"].values[i] - ED.EO_putPrice[i])
-            maxErr = 0.1*stdDevP["PriceSTD"].values[i]
+            diff = abs(npPP["Price"][i] - ED.EO_putPrice[i])
+            maxErr = 0.1*stdDevP["PriceSTD"][i]
             self.assertLess(diff, maxErr)
 
     @patch.object(np.random, 'standard_normal', return_value=ED.npNormal)
@@ -219,12 +219,12 @@ class TestBasicMonteCarloOptionThreaded(unittest.TestCase):
         # monte carlo method
         for i in range(0, len(ED.EO_spot)):
             # Call Delta
-            diff = abs(npCP["Delta"].values[i] - ED.EO_callDelta[i])
-            maxErr = 0.1*stdDevC["DeltaSTD"].values[i]
+            diff = abs(npCP["Delta"][i] - ED.EO_callDelta[i])
+            maxErr = 0.1*stdDevC["DeltaSTD"][i]
             self.assertLess(diff, maxErr)
             # Put Delta
-            diff = abs(npPP["Delta"].values[i] - ED.EO_putDelta[i])
-            maxErr = 0.1*stdDevP["DeltaSTD"].values[i]
+            diff = abs(npPP["Delta"][i] - ED.EO_putDelta[i])
+            maxErr = 0.1*stdDevP["DeltaSTD"][i]
             self.assertLess(diff, maxErr)
 
     @patch.object(np.random, 'standard_normal', return_value=ED.npNormal)
@@ -272,12 +272,12 @@ class TestBasicMonteCarloOptionThreaded(unittest.TestCase):
         # monte carlo method
         for i in range(0, len(ED.EO_spot)):
             # Call Gamma
-            diff = abs(npCP["Gamma"].values[i] - ED.EO_callGamma[i])
-            maxErr = 0.1*stdDevC["GammaSTD"].values[i]
+            diff = abs(npCP["Gamma"][i] - ED.EO_callGamma[i])
+            maxErr = 0.1*stdDevC["GammaSTD"][i]
             self.assertLess(diff, maxErr)
             # Put Gamma
-            diff = abs(npPP["Gamma"].values[i] - ED.EO_putGamma[i])
-            maxErr = 0.1*stdDevP["GammaSTD"].values[i]
+            diff = abs(npPP["Gamma"][i] - ED.EO_putGamma[i])
+            maxErr = 0.1*stdDevP["GammaSTD"][i]
             self.assertLess(diff, maxErr)
 
     @patch.object(np.random, 'standard_normal', return_value=ED.npNormal)
@@ -325,12 +325,12 @@ class TestBasicMonteCarloOptionThreaded(unittest.TestCase):
         # monte carlo method
         for i in range(0, len(ED.EO_spot)):
             # Call Vega - I change my vega by 0.01, (1% move) so adjust here
-            diff = abs(npCP["Vega"].values[i] - 0.01*ED.EO_callVega[i])
-            maxErr = 0.1*stdDevC["VegaSTD"].values[i]
+            diff = abs(npCP["Vega"][i] - 0.01*ED.EO_callVega[i])
+            maxErr = 0.1*stdDevC["VegaSTD"][i]
             self.assertLess(diff, maxErr)
             # Put Vega
-            diff = abs(npPP["Vega"].values[i] - 0.01*ED.EO_putVega[i])
-            maxErr = 0.1*stdDevP["VegaSTD"].values[i]
+            diff = abs(npPP["Vega"][i] - 0.01*ED.EO_putVega[i])
+            maxErr = 0.1*stdDevP["VegaSTD"][i]
             self.assertLess(diff, maxErr)
 
     @patch.object(np.random, 'standard_normal', return_value=ED.npNormal)
@@ -379,12 +379,12 @@ class TestBasicMonteCarloOptionThreaded(unittest.TestCase):
         for i in range(0, len(ED.EO_spot)):
             # Call Theta - I express theta in 365 day terms and as a largely
             # negative value, so change here
-            diff = abs(npCP["Theta"].values[i] + ED.EO_callTheta[i]/365)
-            maxErr = 0.1*stdDevC["ThetaSTD"].values[i]
+            diff = abs(npCP["Theta"][i] + ED.EO_callTheta[i]/365)
+            maxErr = 0.1*stdDevC["ThetaSTD"][i]
             self.assertLess(diff, maxErr)
             # Put Theta
-            diff = abs(npPP["Theta"].values[i] + ED.EO_putTheta[i]/365)
-            maxErr = 0.1*stdDevP["ThetaSTD"].values[i]
+            diff = abs(npPP["Theta"][i] + ED.EO_putTheta[i]/365)
+            maxErr = 0.1*stdDevP["ThetaSTD"][i]
             self.assertLess(diff, maxErr)
 
     @patch.object(np.random, 'standard_normal', return_value=ED.npNormal)
@@ -432,10 +432,10 @@ class TestBasicMonteCarloOptionThreaded(unittest.TestCase):
         # monte carlo method
         for i in range(0, len(ED.EO_spot)):
             # Call Rho - I change my rho by 0.01, (1%) so adjust here
-            diff = abs(npCP["Rho"].values[i] - 0.01*ED.EO_callRho[i])
-            maxErr = 0.1*stdDevC["RhoSTD"].values[i]
+            diff = abs(npCP["Rho"][i] - 0.01*ED.EO_callRho[i])
+            maxErr = 0.1*stdDevC["RhoSTD"][i]
             self.assertLess(diff, maxErr)
             # Put Rho - I change my rho by 0.01, (1%) so adjust here
-            diff = abs(npPP["Rho"].values[i] - 0.01*ED.EO_putRho[i])
-            maxErr = 0.1*stdDevP["RhoSTD"].values[i]
+            diff = abs(npPP["Rho"][i] - 0.01*ED.EO_putRho[i])
+            maxErr = 0.1*stdDevP["RhoSTD"][i]
             self.assertLess(diff, maxErr)
@@ -25,6 +25,8 @@ not as accurate because only 200 numbers are used.   The results are
 compared to an accuracy of 10dp, defined in ExternalData.
 The packages only return std results for packages with 1 option in it, so this
 test cannot be run on a package of 2 options at the same time.
+Adding the options of a package together must not change the results that
+each option returned.
 '''
 
 
@@ -133,14 +135,14 @@ class TestBasicMonteCarloOptionThreaded(unittest.TestCase):
         # monte carlo method
         for i in range(0, len(ED.EO_spot)):
             # Call Price
-            diff = abs(self.__objMonteResults["Price"].values[i] -
+            diff = abs(self.__objMonteResults["Price"][i] -
                        ED.EO_callPrice[i])
-            maxErr = 0.1*self.__objMonteSTD["PriceSTD"].values[i]
+            maxErr = 0.1*self.__objMonteSTD["PriceSTD"][i]
             self.assertLess(diff, maxErr)
             # Call Price Syncronous
-            diff = abs(self.__objMonteResultsSync["Price"].values[i] -
+            diff = abs(self.__objMonteResultsSync["Price"][i] -
                        ED.EO_callPrice[i])
-            maxErr = 0.1*self.__objMonteSTDSync["PriceSTD"].values[i]
+            maxErr = 0.1*self.__objMonteSTDSync["PriceSTD"][i]
             self.assertLess(diff, maxErr)
 
     def testDeltavsFixedRandomNumbers(self):
@@ -166,14 +168,14 @@ class TestBasicMonteCarloOptionThreaded(unittest.TestCase):
         # monte carlo method
         for i in range(0, len(ED.EO_spot)):
             # Call Delta
-            diff = abs(self.__objMonteResults["Delta"].values[i] -
+            diff = abs(self.__objMonteResults["Delta"][i] -
                        ED.EO_callDelta[i])
-            maxErr = 0.1*self.__objMonteSTD["DeltaSTD"].values[i]
+            maxErr = 0.1*self.__objMonteSTD["DeltaSTD"][i]
             self.assertLess(diff, maxErr)
             # Call Delta Sync
-            diff = abs(self.__objMonteResultsSync["Delta"].values[i] -
+            diff = abs(self.__objMonteResultsSync["Delta"][i] -
                        ED.EO_callDelta[i])
-            maxErr = 0.1*self.__objMonteSTDSync["DeltaSTD"].values[i]
+            maxErr = 0.1*self.__objMonteSTDSync["DeltaSTD"][i]
             self.assertLess(diff, maxErr)
 
     def testGammavsFixedRandomNumbers(self):
@@ -199,14 +201,14 @@ class TestBasicMonteCarloOptionThreaded(unittest.TestCase):
         # monte carlo method
         for i in range(0, len(ED.EO_spot)):
             # Call Gamma
-            diff = abs(self.__objMonteResults["Gamma"].values[i] -
+            diff = abs(self.__objMonteResults["Gamma"][i] -
                        ED.EO_callGamma[i])
-            maxErr = 0.1*self.__objMonteSTD["GammaSTD"].values[i]
+            maxErr = 0.1*self.__objMonteSTD["GammaSTD"][i]
             self.assertLess(diff, maxErr)
             # Call Gamma Sync
-            diff = abs(self.__objMonteResultsSync["Gamma"].values[i] -
+            diff = abs(self.__objMonteResultsSync["Gamma"][i] -
                        ED.EO_callGamma[i])
-            maxErr = 0.1*self.__objMonteSTDSync["GammaSTD"].values[i]
+            maxErr = 0.1*self.__objMonteSTDSync["GammaSTD"][i]
             self.assertLess(diff, maxErr)
 
     def testVegavsFixedRandomNumbers(self):
@@ -232,14 +234,14 @@ class TestBasicMonteCarloOptionThreaded(unittest.TestCase):
         # monte carlo method
         for i in range(0, len(ED.EO_spot)):
             # Call Vega - I change my vega by 0.01, (1% move) so adjust here
-            diff = abs(self.__objMonteResults["Vega"].values[i] -
+            diff = abs(self.__objMonteResults["Vega"][i] -
                        0.01*ED.EO_callVega[i])
-            maxErr = 0.1*self.__objMonteSTD["VegaSTD"].values[i]
+            maxErr = 0.1*self.__objMonteSTD["VegaSTD"][i]
             self.assertLess(diff, maxErr)
             # Call Vega Sync
-            diff = abs(self.__objMonteResultsSync["Vega"].values[i] -
+            diff = abs(self.__objMonteResultsSync["Vega"][i] -
                        0.01*ED.EO_callVega[i])
-            maxErr = 0.1*self.__objMonteSTDSync["VegaSTD"].values[i]
+            maxErr = 0.1*self.__objMonteSTDSync["VegaSTD"][i]
             self.assertLess(diff, maxErr)
 
     def testThetavsFixedRandomNumbers(self):
@@ -266,14 +268,14 @@ class TestBasicMonteCarloOptionThreaded(unittest.TestCase):
         for i in range(0, len(ED.EO_spot)):
             # Call Theta - I express theta in 365 day terms and as a largely
             # negative value, so change here
-            diff = abs(self.__objMonteResults["Theta"].values[i] +
+            diff = abs(self.__objMonteResults["Theta"][i] +
                        ED.EO_callTheta[i]/365)
-            maxErr = 0.1*self.__objMonteSTD["ThetaSTD"].values[i]
+            maxErr = 0.1*self.__objMonteSTD["ThetaSTD"][i]
             self.assertLess(diff, maxErr)
             # Call Theta sync
-            diff = abs(self.__objMonteResultsSync["Theta"].values[i] +
+            diff = abs(self.__objMonteResultsSync["Theta"][i] +
                        ED.EO_callTheta[i]/365)
-            maxErr = 0.1*self.__objMonteSTDSync["ThetaSTD"].values[i]
+            maxErr = 0.1*self.__objMonteSTDSync["ThetaSTD"][i]
             self.assertLess(diff, maxErr)
 
     def testRhovsFixedRandomNumbers(self):
@@ -299,12 +301,62 @@ class TestBasicMonteCarloOptionThreaded(unittest.TestCase):
         # monte carlo method
         for i in range(0, len(ED.EO_spot)):
             # Call Rho - I change my rho by 0.01, (1%) so adjust here
-            diff = abs(self.__objMonteResults["Rho"].values[i] -
+            diff = abs(self.__objMonteResults["Rho"][i] -
                        0.01*ED.EO_callRho[i])
-            maxErr = 0.1*self.__objMonteSTD["RhoSTD"].values[i]
+            maxErr = 0.1*self.__objMonteSTD["RhoSTD"][i]
             self.assertLess(diff, maxErr)
             # Call Rho Sync
-            diff = abs(self.__objMonteResultsSync["Rho"].values[i] -
+            diff = abs(self.__objMonteResultsSync["Rho"][i] -
                        0.01*ED.EO_callRho[i])
-            maxErr = 0.1*self.__objMonteSTDSync["RhoSTD"].values[i]
+            maxErr = 0.1*self.__objMonteSTDSync["RhoSTD"][i]
             self.assertLess(diff, maxErr)
+
+
+class TestPackageResults(unittest.TestCase):
+
+    def setUp(self):
+
+        self.__npStock = np.asarray(ED.EO_spot, dtype=np.float64)
+        self.__objPackage = analytics.EuropeanOptionThread. \
+            PackageForThreading(1, "Straddle")
+        for boolIsCall in (True, False):
+            self.__objPackage.addOption(
+                analytics.EuropeanOptionThread.BasicMonteCarloOptionThreaded(
+                    ("Price", "Delta"), ED.EO_Strike, ED.EO_Vol,
+                    ED.EO_RiskFreeRate, ED.EO_TimeToMaturity, boolIsCall,
+                    2000, intSeed=1))
+
+    def testOptionResultsUnchanged(self):
+
+        # Adding the options together must not change the results each
+        # option returned
+        funcCalculate = analytics.EuropeanOptionThread. \
+            BasicMonteCarloOptionThreaded.calculateOption
+        lstReturned = []
+
+        def getRecordedResults(objOption, npStock):
+            tpResults = funcCalculate(objOption, npStock)
+            lstReturned.append((objOption, tpResults))
+            return tpResults
+
+        with patch.object(analytics.EuropeanOptionThread.
+                          BasicMonteCarloOptionThreaded, 'calculateOption',
+                          getRecordedResults):
+            (objResults, objSTDResults) = \
+                self.__objPackage.calculateSyncronousResults(self.__npStock)
+
+        # The options have a seed, so calculating them again gives the same
+        # results as they returned in the package
+        npTotal = np.zeros(len(self.__npStock))
+        for (objOption, (objOptRes, objOptSTDRes)) in lstReturned:
+            (objExpected, objExpectedSTD) = objOption.calculateOption(
+                self.__npStock)
+            for strName in ("Price", "Delta"):
+                self.assertTrue(np.array_equal(objOptRes[strName],
+                                               objExpected[strName]))
+                self.assertTrue(np.array_equal(
+                    objOptSTDRes[strName + 'STD'],
+                    objExpectedSTD[strName + 'STD']))
+            npTotal += objExpected["Price"]
+        self.assertTrue(np.allclose(objResults["Price"], npTotal, rtol=0,
+                                    atol=1e-12))
@@ -0,0 +1,265 @@
+import analytics.MonteCarloSampling
+import analytics.EuropeanOption
+import analytics.EuropeanOptionThread
+import numpy as np
+import unittest
+import test.ExternalData as ED
+
+'''
+These set of tests are used to ensure the MonteCarloSampler class is working
+correctly and that the stratified and moment matched sampling methods give
+sensible prices when used by BasicMonteCarloOption and
+BasicMonteCarloOptionThreaded.
+The random number generator is seeded in setUp so that the results are
+stable.   The returned standard deviation is a per path figure, so the
+standard error of the price is std / sqrt(number of paths) and the prices
+are compared to the external data within 4 standard errors.
+'''
+
+
+class TestMonteCarloSampler(unittest.TestCase):
+
+    def setUp(self):
+
+        # Seed the random numbers so that the tests are stable
+        np.random.seed(12345)
+
+        # Set data to price the option
+        self.__fltStrike = ED.EO_Strike
+        self.__fltVol = ED.EO_Vol
+        self.__fltRiskFreeRate = ED.EO_RiskFreeRate
+        self.__fltTimeToMaturity = ED.EO_TimeToMaturity
+        self.__intNoIterations = 20000
+
+        # Convert the spot into an array
+        self.__npStock = np.asarray(ED.EO_spot, dtype=np.float64)
+
+    def testSamplerStr(self):
+
+        objSampler = analytics.MonteCarloSampling. \
+            MonteCarloSampler('Stratified', 20)
+
+        strF = 'MonteCarloSampler: [Sampling:Stratified; NoBatches:20]'
+        self.assertEqual(str(objSampler), strF)
+
+    def testUnknownSampling(self):
+
+        # An unknown sampling method should be rejected
+        with self.assertRaises(ValueError):
+            analytics.MonteCarloSampling.MonteCarloSampler('Halton')
+
+    def testStratifiedOnePerStratum(self):
+
+        # Each batch should have exactly one uniform number in each stratum
+        objSampler = analytics.MonteCarloSampling. \
+            MonteCarloSampler('Stratified', 4)
+        Z = objSampler.getNormals(400)
+        self.assertEqual(Z.shape, (1, 400))
+
+        for npBatch in np.split(Z[0], 4):
+            npU = analytics.MonteCarloSampling.si.norm.cdf(npBatch)
+            npStrata = np.floor(npU * len(npBatch)).astype(int)
+            self.assertTrue(np.array_equal(np.sort(npStrata),
+                                           np.arange(len(npBatch))))
+
+    def testMomentMatchedMoments(self):
+
+        # Each batch should have a mean of 0 and variance of 1
+        objSampler = analytics.MonteCarloSampling. \
+            MonteCarloSampler('MomentMatched', 5)
+        Z = objSampler.getNormals(1000)
+
+        for npBatch in np.split(Z[0], 5):
+            self.assertLess(abs(np.mean(npBatch)), 1e-12)
+            self.assertLess(abs(np.var(npBatch) - 1), 1e-12)
+
+        # The multipliers should match the forward in every batch
+        Mult = objSampler.getMultiplier(Z, self.__fltVol,
+                                        self.__fltRiskFreeRate,
+                                        self.__fltTimeToMaturity)
+        fltForward = np.exp(self.__fltRiskFreeRate * self.__fltTimeToMaturity)
+        for npBatch in np.split(Mult[0], 5):
+            self.assertLess(abs(np.mean(npBatch) - fltForward), 1e-12)
+
+    def testStandardIsUnchanged(self):
+
+        # The standard sampler should give the plain mean and std
+        objSampler = analytics.MonteCarloSampling.MonteCarloSampler()
+        npValues = np.random.standard_normal((3, 100))
+        (npMean, npSTD) = objSampler.getMeanAndSTD(npValues)
+
+        self.assertTrue(np.array_equal(npMean, np.mean(npValues, axis=1)))
+        self.assertTrue(np.array_equal(npSTD, np.std(npValues, axis=1)))
+
+    def testChunkedMeanAndSTD(self):
+
+        # Accumulating chunks of paths gives the same mean and std as all of
+        # the paths at once, but only for standard sampling
+        objSampler = analytics.MonteCarloSampling.MonteCarloSampler()
+        npValues = np.random.standard_normal((3, 100)) + 5
+        (npMean, npSTD) = objSampler.getChunkedMeanAndSTD(
+            npChunk for npChunk in np.array_split(npValues, 7, axis=1))
+
+        self.assertTrue(np.allclose(npMean, np.mean(npValues, axis=1),
+                                    rtol=0, atol=1e-12))
+        self.assertTrue(np.allclose(npSTD, np.std(npValues, axis=1),
+                                    rtol=0, atol=1e-10))
+
+        # For the other methods each chunk is a replicate, so the error
+        # comes from the spread of the chunk means, and a single chunk is
+        # the same as getMeanAndSTD
+        objStratified = analytics.MonteCarloSampling.MonteCarloSampler(
+            'Stratified')
+        (npMean, npSTD) = objStratified.getChunkedMeanAndSTD(
+            npChunk for npChunk in np.split(npValues, 5, axis=1))
+        npChunkMeans = np.mean(np.reshape(npValues, (3, 5, 20)), axis=2)
+        self.assertTrue(np.allclose(npMean, np.mean(npValues, axis=1),
+                                    rtol=0, atol=1e-12))
+        self.assertTrue(np.allclose(
+            npSTD, np.std(npChunkMeans, axis=1, ddof=1) / np.sqrt(5)
+            * np.sqrt(100), rtol=1e-10, atol=0))
+        (npMean, npSTD) = objStratified.getChunkedMeanAndSTD([npValues])
+        self.assertTrue(np.allclose(npSTD,
+                                    objStratified.getMeanAndSTD(npValues)[1],
+                                    rtol=1e-10, atol=0))
+        with self.assertRaises(ValueError):
+            objSampler.getChunkedMeanAndSTD(iter([]))
+
+        # A large mean does not lose the std, as a sum of squares would
+        npValues = np.random.standard_normal((3, 100)) + 1e8
+        (npMean, npSTD) = objSampler.getChunkedMeanAndSTD(
+            npChunk for npChunk in np.array_split(npValues, 7, axis=1))
+        self.assertTrue(np.allclose(npSTD, np.std(npValues, axis=1),
+                                    rtol=1e-6, atol=0))
+
+    def testChunkMoments(self):
+
+        # Adding chunks by their mean and std gives the same mean and std as
+        # all of the paths at once, even when the mean is large
+        objSampler = analytics.MonteCarloSampling.MonteCarloSampler()
+        npValues = np.random.standard_normal((3, 100)) + 1e8
+        npMoments = None
+        intNoPaths = 0
+        intNoChunks = 0
+        for npChunk in np.array_split(npValues, 7, axis=1):
+            (npMean, npSTD) = objSampler.getMeanAndSTD(npChunk)
+            npMoments = objSampler.addChunkMoments(
+                npMoments, intNoPaths, intNoChunks, npMean, npSTD,
+                npChunk.shape[1])
+            intNoPaths += npChunk.shape[1]
+            intNoChunks += 1
+        (npMean, npSTD) = objSampler.getMomentsMeanAndSTD(
+            npMoments, intNoPaths, intNoChunks)
+        self.assertTrue(np.allclose(npMean, np.mean(npValues, axis=1),
+                                    rtol=1e-12, atol=0))
+        self.assertTrue(np.allclose(npSTD, np.std(npValues, axis=1),
+                                    rtol=1e-6, atol=0))
+
+    def testSeedRepeatsRun(self):
+
+        # With a seed every run starts from the same random numbers, for
+        # each of the sampling methods
+        for strSampling in ('Standard', 'Stratified', 'MomentMatched',
+                            'Sobol'):
+            objSampler = analytics.MonteCarloSampling. \
+                MonteCarloSampler(strSampling, 4, intSeed=7)
+            self.assertEqual(objSampler.getSeed(), 7)
+            objSampler.startRun()
+            Z = objSampler.getNormals(64)
+            objSampler.startRun()
+            self.assertTrue(np.array_equal(objSampler.getNormals(64), Z))
+
+        # The seeded option gives the same price however often it is called
+        objOption = analytics.EuropeanOption.BasicMonteCarloOption(
+            self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+            self.__fltTimeToMaturity, True, 1000, intSeed=7)
+        npPrice = objOption.getOptionPrice(self.__npStock)[0]
+        objOption.getOptionDelta(self.__npStock)
+        self.assertTrue(np.array_equal(
+            objOption.getOptionPrice(self.__npStock)[0], npPrice))
+
+    def testStratifiedReducesError(self):
+
+        # A stratified price should have a smaller error than a standard
+        # price for the same number of paths
+        objStandard = analytics.EuropeanOption.BasicMonteCarloOption(
+            self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+            self.__fltTimeToMaturity, True, self.__intNoIterations)
+        objStratified = analytics.EuropeanOption.BasicMonteCarloOption(
+            self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+            self.__fltTimeToMaturity, True, self.__intNoIterations,
+            strSampling='Stratified', intNoBatches=20)
+
+        npSTDStandard = objStandard.getOptionPrice(self.__npStock)[1]
+        npSTDStratified = objStratified.getOptionPrice(self.__npStock)[1]
+
+        # Ignore the deep out of the money option, which is almost zero
+        for i in range(1, len(ED.EO_spot)):
+            self.assertLess(npSTDStratified[i], npSTDStandard[i])
+
+    def testMonteCarloPricevsExternal(self):
+
+        # Price calls and puts with both sampling methods and compare them
+        # to the external data
+        for strSampling in ('Stratified', 'MomentMatched'):
+            objCall = analytics.EuropeanOption.BasicMonteCarloOption(
+                self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+                self.__fltTimeToMaturity, True, self.__intNoIterations,
+                strSampling=strSampling, intNoBatches=20)
+            objPut = analytics.EuropeanOption.BasicMonteCarloOption(
+                self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+                self.__fltTimeToMaturity, False, self.__intNoIterations,
+                strSampling=strSampling, intNoBatches=20)
+
+            (npCP, stdDevC) = objCall.getOptionPrice(self.__npStock)
+            (npPP, stdDevP) = objPut.getOptionPrice(self.__npStock)
+            fltRootN = np.sqrt(self.__intNoIterations)
+
+            for i in range(0, len(ED.EO_spot)):
+                diff = abs(npCP[i] - ED.EO_callPrice[i])
+                self.assertLess(diff, 4 * stdDevC[i] / fltRootN + 1e-3)
+                diff = abs(npPP[i] - ED.EO_putPrice[i])
+                self.assertLess(diff, 4 * stdDevP[i] / fltRootN + 1e-3)
+
+    def testMonteCarloDeltavsExternal(self):
+
+        objCall = analytics.EuropeanOption.BasicMonteCarloOption(
+            self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+            self.__fltTimeToMaturity, True, self.__intNoIterations,
+            strSampling='MomentMatched', intNoBatches=20)
+
+        (npC, stdDevC) = objCall.getOptionDelta(self.__npStock)
+        fltRootN = np.sqrt(self.__intNoIterations)
+
+        for i in range(0, len(ED.EO_spot)):
+            diff = abs(npC[i] - ED.EO_callDelta[i])
+            self.assertLess(diff, 4 * stdDevC[i] / fltRootN + 0.01)
+
+    def testThreadedPricevsExternal(self):
+
+        # The threaded option should support the same sampling methods
+        for strSampling in ('Stratified', 'MomentMatched'):
+            objCall = analytics.EuropeanOptionThread. \
+                BasicMonteCarloOptionThreaded(
+                    ("Price", "Delta"),
+                    self.__fltStrike,
+                    self.__fltVol,
+                    self.__fltRiskFreeRate,
+                    self.__fltTimeToMaturity,
+                    True,
+                    self.__intNoIterations,
+                    strSampling=strSampling,
+                    intNoBatches=20,
+                    name="MyCallOption")
+
+            (pdRes, pdSTD) = objCall.calculateOption(self.__npStock)
+            fltRootN = np.sqrt(self.__intNoIterations)
+
+            for i in range(0, len(ED.EO_spot)):
+                diff = abs(pdRes['Price'][i] - ED.EO_callPrice[i])
+                maxErr = 4 * pdSTD['PriceSTD'][i] / fltRootN + 1e-3
+                self.assertLess(diff, maxErr)
+
+
+if __name__ == '__main__':
+    unittest.main()
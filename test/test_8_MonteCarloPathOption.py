@@ -0,0 +1,208 @@
+import analytics.MonteCarloPathOption
+import analytics.EuropeanOption
+import unittest
+from unittest.mock import patch
+import test.ExternalData as ED
+from analytics.MonteCarloPathOption import np
+
+'''
+These set of tests are used to ensure the MonteCarloPathOption class and its
+payoffs are working correctly.
+A European payoff with a single step should give exactly the same result as
+BasicMonteCarloOption, so this is checked using the fixed random numbers in
+ExternalData.   A European payoff with many steps is compared to the
+external data (including with stratified sampling) and the path dependent
+payoffs are checked against the relationships they should have with the
+European price (eg an up and out call is worth less than a call, but the
+same if the barrier is never hit).
+'''
+
+
+class TestMonteCarloPathOption(unittest.TestCase):
+
+    def setUp(self):
+
+        # Seed the random numbers so that the tests are stable
+        np.random.seed(2718)
+
+        # Set data to price the option
+        self.__fltStrike = ED.EO_Strike
+        self.__fltVol = ED.EO_Vol
+        self.__fltRiskFreeRate = ED.EO_RiskFreeRate
+        self.__fltTimeToMaturity = ED.EO_TimeToMaturity
+        self.__intNoIterations = 20000
+        self.__intNoSteps = 12
+
+        # Convert the spot into an array
+        self.__npStock = np.asarray(ED.EO_spot, dtype=np.float32)
+
+    def __buildOption(self, objPayoff, intNoSteps, intNoIter):
+        return analytics.MonteCarloPathOption.MonteCarloPathOption(
+            objPayoff, self.__fltVol, self.__fltRiskFreeRate,
+            self.__fltTimeToMaturity, intNoSteps, intNoIter)
+
+    def testStr(self):
+
+        objPayoff = analytics.MonteCarloPathOption. \
+            EuropeanPathPayoff(self.__fltStrike, True)
+        objOption = self.__buildOption(objPayoff, 4, 100)
+
+        strF = 'MonteCarloPathOption: [Payoff:EuropeanPathPayoff: ' \
+               '[Strike:{strike}; IsCall:True;]; Vol:{vol}; ' \
+               'RFRate:{rfrate}; Time:{time}; NoSteps:4; NoIter:100]'
+        strF = strF.format(strike=self.__fltStrike, vol=self.__fltVol,
+                           rfrate=self.__fltRiskFreeRate,
+                           time=self.__fltTimeToMaturity)
+        self.assertEqual(str(objOption), strF)
+
+    @patch.object(np.random, 'standard_normal', return_value=ED.npNormal)
+    def testSingleStepMatchesFixedRandomNumbers(self, mock_np_random):
+
+        # A single step European payoff should reproduce the fixed
+        # random number results of BasicMonteCarloOption
+        objCall = self.__buildOption(
+            analytics.MonteCarloPathOption.EuropeanPathPayoff(
+                self.__fltStrike, True), 1, len(ED.lstNormal))
+        objPut = self.__buildOption(
+            analytics.MonteCarloPathOption.EuropeanPathPayoff(
+                self.__fltStrike, False), 1, len(ED.lstNormal))
+
+        npCP = objCall.getOptionPrice(self.__npStock)[0]
+        npPP = objPut.getOptionPrice(self.__npStock)[0]
+        npCD = objCall.getOptionDelta(self.__npStock)[0]
+        npPG = objPut.getOptionGamma(self.__npStock)[0]
+
+        for i in range(0, len(ED.EO_spot)):
+            self.assertLess(abs(npCP[i] - ED.FN_CALL_PRICE[i]),
+                            ED.FN_ACCURACY)
+            self.assertLess(abs(npPP[i] - ED.FN_PUT_PRICE[i]),
+                            ED.FN_ACCURACY)
+            self.assertLess(abs(npCD[i] - ED.FN_CALL_DELTA[i]),
+                            ED.FN_ACCURACY)
+            self.assertLess(abs(npPG[i] - ED.FN_PUT_GAMMA[i]),
+                            ED.FN_ACCURACY)
+
+    def testMultiStepEuropeanvsExternal(self):
+
+        objCall = self.__buildOption(
+            analytics.MonteCarloPathOption.EuropeanPathPayoff(
+                self.__fltStrike, True),
+            self.__intNoSteps, self.__intNoIterations)
+
+        (npCP, stdDevC) = objCall.getOptionPrice(self.__npStock)
+        fltRootN = np.sqrt(self.__intNoIterations)
+
+        for i in range(0, len(ED.EO_spot)):
+            diff = abs(npCP[i] - ED.EO_callPrice[i])
+            self.assertLess(diff, 4 * stdDevC[i] / fltRootN + 1e-3)
+
+    def testMultiStepStratifiedvsExternal(self):
+
+        # Each step draws its own stratified numbers, which must be
+        # independent of the last step's (with and without the bridge)
+        for boolBrownianBridge in (False, True):
+            objCall = analytics.MonteCarloPathOption.MonteCarloPathOption(
+                analytics.MonteCarloPathOption.EuropeanPathPayoff(
+                    self.__fltStrike, True), self.__fltVol,
+                self.__fltRiskFreeRate, self.__fltTimeToMaturity,
+                self.__intNoSteps, self.__intNoIterations, 'Stratified', 20,
+                boolBrownianBridge)
+
+            (npCP, stdDevC) = objCall.getOptionPrice(self.__npStock)
+            fltRootN = np.sqrt(self.__intNoIterations)
+
+            for i in range(0, len(ED.EO_spot)):
+                diff = abs(npCP[i] - ED.EO_callPrice[i])
+                self.assertLess(diff, 4 * stdDevC[i] / fltRootN + 1e-3)
+
+    def testAsianLessThanEuropean(self):
+
+        # Averaging reduces the volatility, so an at the money Asian call
+        # should be worth less than the European call, but more than zero
+        objAsian = self.__buildOption(
+            analytics.MonteCarloPathOption.AsianPathPayoff(
+                self.__fltStrike, True),
+            self.__intNoSteps, self.__intNoIterations)
+        npStock = np.array([50.0])
+
+        fltAsian = objAsian.getOptionPrice(npStock)[0][0]
+        fltEuropean = analytics.EuropeanOption.BlackScholes(
+            self.__fltStrike, self.__fltVol, self.__fltRiskFreeRate,
+            self.__fltTimeToMaturity, True).getOptionPrice(npStock)[0]
+
+        self.assertGreater(fltAsian, 0.5 * fltEuropean)
+        self.assertLess(fltAsian, 0.7 * fltEuropean)
+
+    def testBarrierFarAwayMatchesEuropean(self):
+
+        # A barrier that can never be hit leaves the price unchanged and a
+        # nearer barrier can only make the call cheaper.
+        objFar = self.__buildOption(
+            analytics.MonteCarloPathOption.BarrierPathPayoff(
+                self.__fltStrike, True, 1e9, True),
+            self.__intNoSteps, self.__intNoIterations)
+        objEuropean = self.__buildOption(
+            analytics.MonteCarloPathOption.EuropeanPathPayoff(
+                self.__fltStrike, True),
+            self.__intNoSteps, self.__intNoIterations)
+        objNear = self.__buildOption(
+            analytics.MonteCarloPathOption.BarrierPathPayoff(
+                self.__fltStrike, True, 60, True),
+            self.__intNoSteps, self.__intNoIterations)
+
+        np.random.seed(1)
+        npFar = objFar.getOptionPrice(self.__npStock)[0]
+        np.random.seed(1)
+        npEuropean = objEuropean.getOptionPrice(self.__npStock)[0]
+        np.random.seed(1)
+        npNear = objNear.getOptionPrice(self.__npStock)[0]
+
+        self.assertTrue(np.allclose(npFar, npEuropean))
+        self.assertTrue(np.all(npNear <= npEuropean))
+        # The spot of 65 starts above the barrier, so is already knocked out
+        self.assertEqual(npNear[2], 0)
+
+    def testLookbackMoreThanEuropean(self):
+
+        # A floating strike lookback call is always worth at least the
+        # at the money European call.
+        objLookback = self.__buildOption(
+            analytics.MonteCarloPathOption.LookbackPathPayoff(True),
+            self.__intNoSteps, self.__intNoIterations)
+        npStock = np.array([50.0])
+
+        fltLookback = objLookback.getOptionPrice(npStock)[0][0]
+        fltEuropean = analytics.EuropeanOption.BlackScholes(
+            50.0, self.__fltVol, self.__fltRiskFreeRate,
+            self.__fltTimeToMaturity, True).getOptionPrice(npStock)[0]
+
+        self.assertGreater(fltLookback, fltEuropean)
+
+    def testSeed(self):
+
+        # With a seed every call gives the same results, a different seed
+        # gives different results
+        lstPrices = []
+        for intSeed in (1, 1, 2):
+            objOption = analytics.MonteCarloPathOption.MonteCarloPathOption(
+                analytics.MonteCarloPathOption.AsianPathPayoff(
+                    self.__fltStrike, True), self.__fltVol,
+                self.__fltRiskFreeRate, self.__fltTimeToMaturity,
+                self.__intNoSteps, 1000, intSeed=intSeed)
+            lstPrices.append(objOption.getOptionPrice(self.__npStock)[0])
+            self.assertTrue(np.array_equal(
+                objOption.getOptionPrice(self.__npStock)[0], lstPrices[-1]))
+        self.assertTrue(np.array_equal(lstPrices[0], lstPrices[1]))
+        self.assertFalse(np.array_equal(lstPrices[0], lstPrices[2]))
+
+    def testTimeGrid(self):
+
+        objOption = self.__buildOption(
+            analytics.MonteCarloPathOption.EuropeanPathPayoff(
+                self.__fltStrike, True), 4, 10)
+        npTimes = objOption.getTimeGrid()
+        self.assertTrue(np.allclose(npTimes, [0, 0.25, 0.5, 0.75, 1.0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import analytics.BrownianBridge
+import analytics.MonteCarloPathOption
+import analytics.MonteCarloSampling
+import numpy as np
+import unittest
+import test.ExternalData as ED
+
+'''
+These set of tests are used to ensure the BrownianBridge class is working
+correctly, ie that the paths it builds have the right end point and the
+right variance at every point in the time grid, and that it can be used with
+Sobol numbers in MonteCarloPathOption.
+'''
+
+
+class TestBrownianBridge(unittest.TestCase):
+
+    def setUp(self):
+
+        # Seed the random numbers so that the tests are stable
+        np.random.seed(31415)
+
+        # An uneven time grid to make sure the weights are right
+        self.__npTimes = np.array([0.0, 0.1, 0.25, 0.3, 0.6, 0.65, 1.0])
+        self.__objBridge = analytics.BrownianBridge.BrownianBridge(
+            self.__npTimes)
+
+    def testStr(self):
+
+        strF = 'BrownianBridge: [NoSteps:6; Time:1.0]'
+        self.assertEqual(str(self.__objBridge), strF)
+
+    def testFirstNumberSetsFinalPoint(self):
+
+        npZ = np.random.standard_normal((6, 10))
+        npW = self.__objBridge.buildPath(npZ)
+
+        self.assertEqual(npW.shape, (7, 10))
+        self.assertTrue(np.all(npW[0] == 0))
+        self.assertTrue(np.allclose(npW[-1], npZ[0]))
+
+    def testPathVariance(self):
+
+        # The variance of W(t) should be t and the increments should be
+        # independent standard normal numbers once divided by sqrt(dt)
+        npZ = np.random.standard_normal((6, 200000))
+        npW = self.__objBridge.buildPath(npZ)
+        npVar = np.var(npW, axis=1)
+        self.assertTrue(np.allclose(npVar, self.__npTimes, atol=0.01))
+
+        npInc = self.__objBridge.getIncrements(npZ)
+        npCov = np.cov(npInc)
+        self.assertTrue(np.allclose(npCov, np.eye(6), atol=0.02))
+
+    def testSobolNormalBlock(self):
+
+        objSampler = analytics.MonteCarloSampling. \
+            MonteCarloSampler('Sobol', 4)
+        npZ = objSampler.getNormalBlock(6, 4096)
+
+        self.assertEqual(npZ.shape, (6, 4096))
+        self.assertTrue(np.all(np.isfinite(npZ)))
+        self.assertLess(np.max(np.abs(np.mean(npZ, axis=1))), 0.01)
+
+    def testAsianSobolBridgevsPseudoRandom(self):
+
+        # An Asian option priced using Sobol numbers and a bridge should
+        # agree with a pseudo random price with many more paths
+        objPayoff = analytics.MonteCarloPathOption.AsianPathPayoff(
+            ED.EO_Strike, True)
+        npStock = np.array([45.0, 50.0, 55.0])
+
+        objPseudo = analytics.MonteCarloPathOption.MonteCarloPathOption(
+            objPayoff, ED.EO_Vol, ED.EO_RiskFreeRate, ED.EO_TimeToMaturity,
+            16, 100000)
+        objSobol = analytics.MonteCarloPathOption.MonteCarloPathOption(
+            objPayoff, ED.EO_Vol, ED.EO_RiskFreeRate, ED.EO_TimeToMaturity,
+            16, 8192, strSampling='Sobol', intNoBatches=8,
+            boolBrownianBridge=True)
+
+        (npPseudo, npPseudoSTD) = objPseudo.getOptionPrice(npStock)
+        (npSobol, npSobolSTD) = objSobol.getOptionPrice(npStock)
+
+        for i in range(0, len(npStock)):
+            fltErr = 4 * npPseudoSTD[i] / np.sqrt(100000) \
+                + 4 * npSobolSTD[i] / np.sqrt(8192)
+            self.assertLess(abs(npPseudo[i] - npSobol[i]), fltErr)
+            # Sobol with a bridge should be much more accurate per path
+            self.assertLess(npSobolSTD[i], 0.5 * npPseudoSTD[i])
+
+
+if __name__ == '__main__':
+    unittest.main()